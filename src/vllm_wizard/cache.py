@@ -0,0 +1,41 @@
+"""On-disk cache and data locations shared by detection and model lookups."""
+
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """Return the vllm-wizard cache directory.
+
+    Honours VLLM_WIZARD_CACHE_DIR, then XDG_CACHE_HOME, then ~/.cache.
+    The directory is not created here.
+
+    Returns:
+        Path to the cache directory
+    """
+    override = os.environ.get("VLLM_WIZARD_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache).expanduser() if xdg_cache else Path.home() / ".cache"
+    return base / "vllm-wizard"
+
+
+def get_data_dir() -> Path:
+    """Return the vllm-wizard data directory for persistent user data.
+
+    Honours VLLM_WIZARD_DATA_DIR, then XDG_DATA_HOME, then ~/.local/share.
+    Unlike the cache, its contents are not safe to delete.
+    The directory is not created here.
+
+    Returns:
+        Path to the data directory
+    """
+    override = os.environ.get("VLLM_WIZARD_DATA_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    xdg_data = os.environ.get("XDG_DATA_HOME")
+    base = Path(xdg_data).expanduser() if xdg_data else Path.home() / ".local" / "share"
+    return base / "vllm-wizard"
@@ -1,7 +1,9 @@
 """vLLM Wizard CLI - Configuration generator and GPU sizing tool."""
 
 import json
+import sys
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -9,8 +11,19 @@ import typer
 from rich.console import Console
 
 from vllm_wizard import __version__
-from vllm_wizard.hardware.detect import detect_gpus
+from vllm_wizard.hardware.detect import detect_gpus, detect_topology
+from vllm_wizard.models.metadata import ModelMetadata, import_model_configs
+from vllm_wizard.models.registry import ModelRegistry
+from vllm_wizard.planning.batch import iter_request_lines, run_batch
+from vllm_wizard.planning.fleet import load_entries, load_fleet_plan, load_inventory, place_fleet
+from vllm_wizard.planning.mig import plan_mig_layout
 from vllm_wizard.planning.planner import run_plan
+from vllm_wizard.planning.replicas import run_replica_plan
+from vllm_wizard.planning.search import run_search
+from vllm_wizard.planning.simulator import run_simulation
+from vllm_wizard.planning.slo import has_latency_targets, run_slo_plan
+from vllm_wizard.planning.sweep import run_sweep
+from vllm_wizard.planning.trace import read_trace, trace_arrivals
 from vllm_wizard.render.commands import render_docker_compose, render_k8s_values
 from vllm_wizard.render.profile import (
     load_profile,
@@ -18,19 +31,33 @@ from vllm_wizard.render.profile import (
     request_to_profile,
     save_profile,
 )
-from vllm_wizard.render.report import render_console_report, render_gpu_list, render_json
+from vllm_wizard.render.report import (
+    render_console_report,
+    render_fleet_report,
+    render_gpu_list,
+    render_json,
+    render_mig_report,
+    render_registry_list,
+    render_search_report,
+    render_simulation_report,
+    render_sweep_report,
+    render_trace_report,
+)
 from vllm_wizard.schemas.inputs import (
     BatchingMode,
     DType,
+    EngineInput,
     HardwareInput,
     Interconnect,
     KVCacheDType,
     ModelInput,
+    PlanAgainst,
     PlanRequest,
     PolicyInput,
     Quantization,
     WorkloadInput,
 )
+from vllm_wizard.schemas.trace import WorkloadTrace
 
 app = typer.Typer(
     name="vllm-wizard",
@@ -38,6 +65,9 @@ app = typer.Typer(
     no_args_is_help=True,
 )
 
+registry_app = typer.Typer(help="Manage the local model metadata registry.", no_args_is_help=True)
+app.add_typer(registry_app, name="registry")
+
 console = Console()
 
 
@@ -64,16 +94,23 @@ def detect(
     json_output: Annotated[
         bool, typer.Option("--json", help="Output as JSON")
     ] = False,
+    refresh: Annotated[
+        bool, typer.Option("--refresh", help="Ignore the cached detection result")
+    ] = False,
+    processes: Annotated[
+        bool, typer.Option("--processes", help="Query live and list processes using each GPU")
+    ] = False,
 ) -> None:
     """Detect available GPUs on this system."""
-    gpus = detect_gpus()
+    gpus = detect_gpus(use_cache=not (refresh or processes), processes=processes)
 
     if json_output:
         output = [gpu.model_dump() for gpu in gpus]
         console.print(json.dumps(output, indent=2))
     else:
         if gpus:
-            render_gpu_list(gpus, console)
+            topology = detect_topology(use_cache=not refresh) if len(gpus) > 1 else None
+            render_gpu_list(gpus, console, topology)
         else:
             console.print("[yellow]No NVIDIA GPUs detected.[/yellow]")
             console.print("Ensure nvidia-smi is installed and GPUs are available.")
@@ -82,7 +119,9 @@ def detect(
 @app.command()
 def plan(
     # Model options
-    model: Annotated[str, typer.Option("--model", "-m", help="HF model id or local path")],
+    model: Annotated[
+        Optional[str], typer.Option("--model", "-m", help="HF model id or local path")
+    ] = None,
     revision: Annotated[Optional[str], typer.Option("--revision", help="Model revision")] = None,
     trust_remote_code: Annotated[
         bool, typer.Option("--trust-remote-code", help="Trust remote code")
@@ -104,9 +143,10 @@ def plan(
     ] = None,
     # Hardware options
     gpu: Annotated[
-        str, typer.Option("--gpu", help="GPU name or 'auto' for detection")
+        str,
+        typer.Option("--gpu", help="GPU name, a list like '2x A100 80GB, A100 40GB', or 'auto'"),
     ] = "auto",
-    gpus: Annotated[int, typer.Option("--gpus", help="Number of GPUs")] = 1,
+    gpus: Annotated[int, typer.Option("--gpus", help="GPUs per node")] = 1,
     vram_gb: Annotated[
         Optional[float], typer.Option("--vram-gb", help="VRAM per GPU in GB")
     ] = None,
@@ -116,19 +156,54 @@ def plan(
     tensor_parallel_size: Annotated[
         Optional[int], typer.Option("--tensor-parallel-size", "--tp", help="Tensor parallel size")
     ] = None,
+    pipeline_parallel_size: Annotated[
+        Optional[int],
+        typer.Option("--pipeline-parallel-size", "--pp", help="Pipeline parallel size"),
+    ] = None,
+    nodes: Annotated[int, typer.Option("--nodes", help="Number of nodes", min=1)] = 1,
+    inter_node_gbps: Annotated[
+        Optional[float],
+        typer.Option("--inter-node-gbps", help="Inter-node bandwidth per GPU in GB/s"),
+    ] = None,
+    plan_against: Annotated[
+        PlanAgainst,
+        typer.Option("--plan-against", help="Budget from total or currently free GPU memory"),
+    ] = PlanAgainst.TOTAL,
     # Workload options
     prompt_tokens: Annotated[
-        int, typer.Option("--prompt-tokens", help="Typical prompt token count")
-    ] = 512,
+        Optional[int],
+        typer.Option("--prompt-tokens", help="Typical prompt token count [default: 512]"),
+    ] = None,
     gen_tokens: Annotated[
-        int, typer.Option("--gen-tokens", help="Typical generation token count")
-    ] = 256,
+        Optional[int],
+        typer.Option("--gen-tokens", help="Typical generation token count [default: 256]"),
+    ] = None,
+    trace: Annotated[
+        Optional[Path],
+        typer.Option("--trace", help="Request log (JSONL/CSV) sizing KV from its lengths"),
+    ] = None,
     concurrency: Annotated[
         int, typer.Option("--concurrency", "-c", help="Simultaneous sequences")
     ] = 1,
     batching_mode: Annotated[
         BatchingMode, typer.Option("--batching-mode", help="Batching optimization mode")
     ] = BatchingMode.BALANCED,
+    target_ttft_ms: Annotated[
+        Optional[float],
+        typer.Option("--target-ttft-ms", help="TTFT target; enables SLO search", min=0),
+    ] = None,
+    target_latency_ms: Annotated[
+        Optional[float],
+        typer.Option(
+            "--target-latency-ms", help="Per-output-token latency target; enables SLO search", min=0
+        ),
+    ] = None,
+    target_qps: Annotated[
+        Optional[float],
+        typer.Option(
+            "--target-qps", help="Request rate target; ranks TP x DP replica layouts", min=0
+        ),
+    ] = None,
     # Policy options
     gpu_memory_utilization: Annotated[
         float, typer.Option("--gpu-memory-utilization", help="GPU memory utilization")
@@ -137,11 +212,33 @@ def plan(
         Optional[float], typer.Option("--overhead-gb", help="Fixed overhead in GB")
     ] = None,
     fragmentation_factor: Annotated[
-        float, typer.Option("--fragmentation-factor", help="KV cache fragmentation factor")
-    ] = 1.15,
+        float, typer.Option("--fragmentation-factor", help="Extra KV cache margin")
+    ] = 1.0,
     headroom_gb: Annotated[
         float, typer.Option("--headroom-gb", help="Minimum headroom in GB")
     ] = 1.0,
+    block_size: Annotated[
+        int, typer.Option("--block-size", help="Tokens per KV cache block", min=1)
+    ] = 16,
+    max_num_seqs: Annotated[
+        Optional[int], typer.Option("--max-num-seqs", help="Max running sequences", min=1)
+    ] = None,
+    max_num_batched_tokens: Annotated[
+        Optional[int],
+        typer.Option("--max-num-batched-tokens", help="Max tokens per step", min=1),
+    ] = None,
+    enforce_eager: Annotated[
+        Optional[bool],
+        typer.Option("--enforce-eager/--cuda-graphs", help="Disable or keep CUDA graphs"),
+    ] = None,
+    # Co-location options
+    colocate: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--colocate",
+            help="Further engine on the same GPUs: MODEL or key=value pairs (repeatable)",
+        ),
+    ] = None,
     # Output options
     profile: Annotated[
         Optional[Path], typer.Option("--profile", "-p", help="Load settings from profile YAML")
@@ -150,14 +247,34 @@ def plan(
     explain: Annotated[
         bool, typer.Option("--explain", help="Include parameter explanations")
     ] = False,
+    batch: Annotated[
+        Optional[Path],
+        typer.Option("--batch", help="Plan every PlanRequest in a JSONL file, emit NDJSON"),
+    ] = None,
+    workers: Annotated[
+        Optional[int], typer.Option("--workers", help="Worker processes for --batch", min=1)
+    ] = None,
 ) -> None:
     """Plan vLLM configuration and estimate VRAM usage."""
     try:
+        if batch:
+            # Per-record failures are reported inline as {"index": ..., "error": ...}
+            for line in run_batch(iter_request_lines(batch), workers=workers):
+                sys.stdout.write(line + "\n")
+                sys.stdout.flush()
+            return
+
+        workload_trace = read_trace(trace) if trace else None
+
         # Load from profile or build request
         if profile:
             loaded_profile = load_profile(profile)
             request = profile_to_request(loaded_profile)
             request.explain = explain
+            if workload_trace is not None:
+                request.workload.trace = workload_trace
+        elif not model:
+            raise ValueError("Provide --model, --profile or --batch.")
         else:
             request = PlanRequest(
                 model=ModelInput(
@@ -176,28 +293,51 @@ def plan(
                     vram_gb=vram_gb,
                     interconnect=interconnect,
                     tensor_parallel_size=tensor_parallel_size,
+                    pipeline_parallel_size=pipeline_parallel_size,
+                    nodes=nodes,
+                    inter_node_gbps=inter_node_gbps,
+                    plan_against=plan_against,
                 ),
                 workload=WorkloadInput(
-                    prompt_tokens=prompt_tokens,
-                    gen_tokens=gen_tokens,
+                    **_workload_lengths(workload_trace, prompt_tokens, gen_tokens),
                     concurrency=concurrency,
                     batching_mode=batching_mode,
+                    trace=workload_trace,
+                    target_ttft_ms=target_ttft_ms,
+                    target_latency_ms=target_latency_ms,
+                    target_qps=target_qps,
                 ),
                 policy=PolicyInput(
                     gpu_memory_utilization=gpu_memory_utilization,
                     overhead_gb=overhead_gb,
                     fragmentation_factor=fragmentation_factor,
                     headroom_gb=headroom_gb,
+                    block_size=block_size,
+                    max_num_seqs=max_num_seqs,
+                    max_num_batched_tokens=max_num_batched_tokens,
+                    enforce_eager=enforce_eager,
                 ),
+                colocate=[_parse_engine(value) for value in colocate or []],
                 explain=explain,
             )
 
-        # Run planning
-        response = run_plan(request)
+        # Run planning; a request rate ranks replica layouts, latency targets alone
+        # switch to the SLO search
+        if request.colocate:
+            if request.workload.target_qps is not None or has_latency_targets(request.workload):
+                raise ValueError("--colocate cannot be combined with rate or latency targets.")
+            response = run_plan(request)
+        elif request.workload.target_qps is not None:
+            response = run_replica_plan(request)
+        elif has_latency_targets(request.workload):
+            response = run_slo_plan(request)
+        else:
+            response = run_plan(request)
 
         # Output
         if json_output:
-            console.print(render_json(response))
+            # Bypass rich so long string values are not wrapped mid-JSON
+            typer.echo(render_json(response))
         else:
             render_console_report(response, console)
 
@@ -212,6 +352,527 @@ def plan(
         raise typer.Exit(1)
 
 
+def _workload_lengths(
+    trace: Optional[WorkloadTrace], prompt_tokens: Optional[int], gen_tokens: Optional[int]
+) -> dict[str, int]:
+    """Prompt and output lengths: as given, else the trace means, else the defaults."""
+    if trace is not None:
+        prompt_default = max(1, round(trace.prompt_tokens.mean))
+        gen_default = max(1, round(trace.gen_tokens.mean))
+    else:
+        prompt_default, gen_default = 512, 256
+    return {
+        "prompt_tokens": prompt_tokens or prompt_default,
+        "gen_tokens": gen_tokens or gen_default,
+    }
+
+
+def _parse_engine(value: str) -> EngineInput:
+    """Parse a co-located engine like "MODEL" or "model=MODEL,params_b=3,concurrency=8".
+
+    Keys are ModelInput or WorkloadInput fields.
+    """
+    if "=" not in value:
+        return EngineInput(model=ModelInput(model=value.strip()))
+
+    model_fields: dict[str, str] = {}
+    workload_fields: dict[str, str] = {}
+    for item in value.split(","):
+        key, sep, raw = item.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or not key:
+            raise ValueError(f"Invalid co-located engine {value!r}; expected key=value pairs.")
+        if key in ModelInput.model_fields:
+            model_fields[key] = raw.strip()
+        elif key in WorkloadInput.model_fields:
+            workload_fields[key] = raw.strip()
+        else:
+            raise ValueError(f"Unknown co-located engine field: {key}")
+
+    return EngineInput(model=ModelInput(**model_fields), workload=WorkloadInput(**workload_fields))
+
+
+def _parse_int_grid(value: str) -> list[int]:
+    """Parse a grid axis like "1024,2048" or "1:64" / "1024:32768:1024" (inclusive)."""
+    values: list[int] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ":" in item:
+            parts = [int(p) for p in item.split(":")]
+            if len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] <= 0):
+                raise ValueError(f"Invalid range '{item}'. Use start:stop or start:stop:step.")
+            start, stop = parts[0], parts[1]
+            step = parts[2] if len(parts) == 3 else 1
+            values.extend(range(start, stop + 1, step))
+        else:
+            values.append(int(item))
+
+    if not values or min(values) < 1:
+        raise ValueError(f"Grid '{value}' must contain positive integers.")
+
+    return sorted(set(values))
+
+
+@app.command()
+def sweep(
+    # Model options
+    model: Annotated[str, typer.Option("--model", "-m", help="HF model id or local path")],
+    revision: Annotated[Optional[str], typer.Option("--revision", help="Model revision")] = None,
+    dtype: Annotated[DType, typer.Option("--dtype", help="Model weight dtype")] = DType.AUTO,
+    params_b: Annotated[
+        Optional[float], typer.Option("--params-b", help="Model parameters in billions")
+    ] = None,
+    # Grid options
+    max_model_len: Annotated[
+        str, typer.Option("--max-model-len", help="Context lengths (list or start:stop[:step])")
+    ] = "2048,4096,8192,16384,32768",
+    concurrency: Annotated[
+        str, typer.Option("--concurrency", "-c", help="Concurrencies (list or start:stop[:step])")
+    ] = "1,2,4,8,16,32,64,128,256",
+    kv_cache_dtype: Annotated[
+        str, typer.Option("--kv-cache-dtype", help="KV cache dtypes (comma-separated)")
+    ] = "auto,fp8_e4m3fn",
+    quantization: Annotated[
+        str, typer.Option("--quantization", "-q", help="Quantization methods (comma-separated)")
+    ] = "none,awq",
+    # Hardware options
+    gpu: Annotated[str, typer.Option("--gpu", help="GPU name or 'auto'")] = "auto",
+    gpus: Annotated[int, typer.Option("--gpus", help="GPUs per node")] = 1,
+    vram_gb: Annotated[Optional[float], typer.Option("--vram-gb", help="VRAM per GPU")] = None,
+    tensor_parallel_size: Annotated[
+        Optional[int], typer.Option("--tensor-parallel-size", "--tp", help="TP size")
+    ] = None,
+    pipeline_parallel_size: Annotated[
+        Optional[int], typer.Option("--pipeline-parallel-size", "--pp", help="PP size")
+    ] = None,
+    nodes: Annotated[int, typer.Option("--nodes", help="Number of nodes", min=1)] = 1,
+    # Policy options
+    gpu_memory_utilization: Annotated[
+        float, typer.Option("--gpu-memory-utilization", help="GPU memory utilization")
+    ] = 0.90,
+    overhead_gb: Annotated[Optional[float], typer.Option("--overhead-gb", help="Overhead GB")] = None,
+    fragmentation_factor: Annotated[
+        float, typer.Option("--fragmentation-factor", help="Extra KV cache margin")
+    ] = 1.0,
+    headroom_gb: Annotated[float, typer.Option("--headroom-gb", help="Headroom GB")] = 1.0,
+    # Output options
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Sweep feasibility over context x concurrency x dtype grids."""
+    try:
+        context_lens = _parse_int_grid(max_model_len)
+        concurrencies = _parse_int_grid(concurrency)
+        kv_dtypes = [KVCacheDType(v.strip()) for v in kv_cache_dtype.split(",") if v.strip()]
+        quants = [Quantization(v.strip()) for v in quantization.split(",") if v.strip()]
+
+        request = PlanRequest(
+            model=ModelInput(
+                model=model,
+                revision=revision,
+                dtype=dtype,
+                params_b=params_b,
+            ),
+            hardware=HardwareInput(
+                gpu=gpu,
+                gpus=gpus,
+                vram_gb=vram_gb,
+                tensor_parallel_size=tensor_parallel_size,
+                pipeline_parallel_size=pipeline_parallel_size,
+                nodes=nodes,
+            ),
+            policy=PolicyInput(
+                gpu_memory_utilization=gpu_memory_utilization,
+                overhead_gb=overhead_gb,
+                fragmentation_factor=fragmentation_factor,
+                headroom_gb=headroom_gb,
+            ),
+        )
+
+        result = run_sweep(
+            request,
+            context_lens=context_lens,
+            concurrencies=concurrencies,
+            kv_cache_dtypes=kv_dtypes,
+            quantizations=quants,
+        )
+
+        if json_output:
+            # Bypass rich so large matrices are not wrapped or highlighted
+            typer.echo(json.dumps(result.to_dict()))
+        else:
+            render_sweep_report(result, console)
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+class LengthDistribution(str, Enum):
+    """Prompt and output length distributions for simulation."""
+
+    FIXED = "fixed"
+    EXPONENTIAL = "exponential"
+
+
+@app.command()
+def search(
+    # Model options
+    model: Annotated[str, typer.Option("--model", "-m", help="HF model id or local path")],
+    revision: Annotated[Optional[str], typer.Option("--revision", help="Model revision")] = None,
+    dtype: Annotated[DType, typer.Option("--dtype", help="Model weight dtype")] = DType.AUTO,
+    params_b: Annotated[
+        Optional[float], typer.Option("--params-b", help="Model parameters in billions")
+    ] = None,
+    # Search space options
+    max_model_len: Annotated[
+        str, typer.Option("--max-model-len", help="Context lengths (list or start:stop[:step])")
+    ] = "2048,4096,8192,16384,32768",
+    max_num_seqs: Annotated[
+        str, typer.Option("--max-num-seqs", help="max_num_seqs values (list or start:stop[:step])")
+    ] = "1,2,4,8,16,32,64,128,256",
+    kv_cache_dtype: Annotated[
+        str, typer.Option("--kv-cache-dtype", help="KV cache dtypes (comma-separated)")
+    ] = "auto,fp8_e4m3fn",
+    quantization: Annotated[
+        str, typer.Option("--quantization", "-q", help="Quantization methods (comma-separated)")
+    ] = "none,fp8,awq",
+    # Hardware options
+    gpu: Annotated[str, typer.Option("--gpu", help="GPU name or 'auto'")] = "auto",
+    gpus: Annotated[int, typer.Option("--gpus", help="GPUs per node")] = 1,
+    vram_gb: Annotated[Optional[float], typer.Option("--vram-gb", help="VRAM per GPU")] = None,
+    interconnect: Annotated[
+        Interconnect, typer.Option("--interconnect", help="GPU interconnect")
+    ] = Interconnect.UNKNOWN,
+    tensor_parallel_size: Annotated[
+        Optional[int], typer.Option("--tensor-parallel-size", "--tp", help="TP size (default: all)")
+    ] = None,
+    nodes: Annotated[int, typer.Option("--nodes", help="Number of nodes", min=1)] = 1,
+    # Workload options
+    prompt_tokens: Annotated[int, typer.Option("--prompt-tokens", help="Prompt tokens")] = 512,
+    gen_tokens: Annotated[int, typer.Option("--gen-tokens", help="Generation tokens")] = 256,
+    # Policy options
+    gpu_memory_utilization: Annotated[
+        float, typer.Option("--gpu-memory-utilization", help="GPU memory utilization")
+    ] = 0.90,
+    overhead_gb: Annotated[Optional[float], typer.Option("--overhead-gb", help="Overhead GB")] = None,
+    fragmentation_factor: Annotated[
+        float, typer.Option("--fragmentation-factor", help="Extra KV cache margin")
+    ] = 1.0,
+    headroom_gb: Annotated[float, typer.Option("--headroom-gb", help="Headroom GB")] = 1.0,
+    # Output options
+    limit: Annotated[int, typer.Option("--limit", help="Frontier rows to show", min=1)] = 20,
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Find the Pareto frontier of headroom, throughput, TTFT and context."""
+    try:
+        context_lens = _parse_int_grid(max_model_len)
+        seqs_grid = _parse_int_grid(max_num_seqs)
+        kv_dtypes = [KVCacheDType(v.strip()) for v in kv_cache_dtype.split(",") if v.strip()]
+        quants = [Quantization(v.strip()) for v in quantization.split(",") if v.strip()]
+
+        request = PlanRequest(
+            model=ModelInput(
+                model=model,
+                revision=revision,
+                dtype=dtype,
+                params_b=params_b,
+            ),
+            hardware=HardwareInput(
+                gpu=gpu,
+                gpus=gpus,
+                vram_gb=vram_gb,
+                interconnect=interconnect,
+                tensor_parallel_size=tensor_parallel_size,
+                nodes=nodes,
+            ),
+            workload=WorkloadInput(
+                prompt_tokens=prompt_tokens,
+                gen_tokens=gen_tokens,
+            ),
+            policy=PolicyInput(
+                gpu_memory_utilization=gpu_memory_utilization,
+                overhead_gb=overhead_gb,
+                fragmentation_factor=fragmentation_factor,
+                headroom_gb=headroom_gb,
+            ),
+        )
+
+        result = run_search(
+            request,
+            context_lens=context_lens,
+            max_num_seqs=seqs_grid,
+            kv_cache_dtypes=kv_dtypes,
+            quantizations=quants,
+        )
+
+        if json_output:
+            typer.echo(json.dumps(result.to_dict()))
+        else:
+            render_search_report(result, console, limit)
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def fleet(
+    inventory: Annotated[
+        Path, typer.Option("--inventory", "-i", help="Inventory of nodes (YAML or JSON)")
+    ],
+    entries: Annotated[
+        Path, typer.Option("--entries", "-e", help="Model/workload entries (YAML or JSON)")
+    ],
+    previous: Annotated[
+        Optional[Path],
+        typer.Option("--previous", help="Earlier placement; unchanged entries stay put"),
+    ] = None,
+    output: Annotated[
+        Optional[Path], typer.Option("--output", "-o", help="Write the placement as JSON")
+    ] = None,
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Bin-pack models onto a GPU inventory using the fewest GPUs."""
+    try:
+        plan = place_fleet(
+            load_inventory(inventory),
+            load_entries(entries),
+            load_fleet_plan(previous) if previous else None,
+        )
+
+        if output:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(plan.model_dump_json(indent=2))
+
+        if json_output:
+            typer.echo(plan.model_dump_json(indent=2))
+        else:
+            render_fleet_report(plan, console)
+            if output:
+                console.print(f"[green]Placement written to:[/green] {output}")
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def mig(
+    gpu: Annotated[str, typer.Option("--gpu", help="GPU to partition (A100, H100 or H200)")],
+    entries: Annotated[
+        Path, typer.Option("--entries", "-e", help="Model/workload entries (YAML or JSON)")
+    ],
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Split one GPU into MIG slices for the most aggregate throughput."""
+    try:
+        layout = plan_mig_layout(gpu, load_entries(entries))
+
+        if json_output:
+            typer.echo(layout.model_dump_json(indent=2))
+        else:
+            render_mig_report(layout, console)
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+@app.command("trace")
+def trace_command(
+    path: Annotated[
+        Path, typer.Argument(help="Request log: JSONL, CSV or TSV, optionally gzip-compressed")
+    ],
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Summarize the request lengths and arrival rate of a request log."""
+    try:
+        workload_trace = read_trace(path)
+
+        if json_output:
+            typer.echo(workload_trace.model_dump_json(indent=2))
+        else:
+            render_trace_report(workload_trace, console)
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def simulate(
+    # Model options
+    model: Annotated[str, typer.Option("--model", "-m", help="HF model id or local path")],
+    revision: Annotated[Optional[str], typer.Option("--revision", help="Model revision")] = None,
+    dtype: Annotated[DType, typer.Option("--dtype", help="Model weight dtype")] = DType.AUTO,
+    quantization: Annotated[
+        Quantization, typer.Option("--quantization", "-q", help="Quantization method")
+    ] = Quantization.NONE,
+    kv_cache_dtype: Annotated[
+        KVCacheDType, typer.Option("--kv-cache-dtype", help="KV cache dtype")
+    ] = KVCacheDType.AUTO,
+    max_model_len: Annotated[
+        Optional[int], typer.Option("--max-model-len", help="Target context length")
+    ] = None,
+    params_b: Annotated[
+        Optional[float], typer.Option("--params-b", help="Model parameters in billions")
+    ] = None,
+    # Hardware options
+    gpu: Annotated[str, typer.Option("--gpu", help="GPU name or 'auto'")] = "auto",
+    gpus: Annotated[int, typer.Option("--gpus", help="GPUs per node")] = 1,
+    vram_gb: Annotated[Optional[float], typer.Option("--vram-gb", help="VRAM per GPU")] = None,
+    interconnect: Annotated[
+        Interconnect, typer.Option("--interconnect", help="GPU interconnect")
+    ] = Interconnect.UNKNOWN,
+    tensor_parallel_size: Annotated[
+        Optional[int], typer.Option("--tensor-parallel-size", "--tp", help="TP size")
+    ] = None,
+    pipeline_parallel_size: Annotated[
+        Optional[int], typer.Option("--pipeline-parallel-size", "--pp", help="PP size")
+    ] = None,
+    nodes: Annotated[int, typer.Option("--nodes", help="Number of nodes", min=1)] = 1,
+    # Workload options
+    rate: Annotated[float, typer.Option("--rate", help="Arrival rate in requests/s", min=0.001)] = 1.0,
+    num_requests: Annotated[
+        int, typer.Option("--num-requests", "-n", help="Requests to simulate", min=1)
+    ] = 1000,
+    prompt_tokens: Annotated[
+        Optional[int], typer.Option("--prompt-tokens", help="Prompt tokens [default: 512]")
+    ] = None,
+    gen_tokens: Annotated[
+        Optional[int], typer.Option("--gen-tokens", help="Generation tokens [default: 256]")
+    ] = None,
+    lengths: Annotated[
+        LengthDistribution, typer.Option("--lengths", help="Token length distribution")
+    ] = LengthDistribution.FIXED,
+    trace: Annotated[
+        Optional[Path],
+        typer.Option("--trace", help="Replay the first --num-requests requests of a log"),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", help="Concurrency used for recommendations")
+    ] = 1,
+    batching_mode: Annotated[
+        BatchingMode, typer.Option("--batching-mode", help="Batching mode")
+    ] = BatchingMode.BALANCED,
+    seed: Annotated[int, typer.Option("--seed", help="Random seed")] = 0,
+    # Scheduler options
+    max_num_seqs: Annotated[
+        Optional[int], typer.Option("--max-num-seqs", help="Max running sequences", min=1)
+    ] = None,
+    max_num_batched_tokens: Annotated[
+        Optional[int],
+        typer.Option("--max-num-batched-tokens", help="Max tokens per step", min=1),
+    ] = None,
+    block_size: Annotated[
+        int, typer.Option("--block-size", help="Tokens per KV cache block", min=1)
+    ] = 16,
+    chunked_prefill: Annotated[
+        bool, typer.Option("--chunked-prefill/--no-chunked-prefill", help="Chunk long prefills")
+    ] = True,
+    # Policy options
+    gpu_memory_utilization: Annotated[
+        float, typer.Option("--gpu-memory-utilization", help="GPU memory utilization")
+    ] = 0.90,
+    overhead_gb: Annotated[Optional[float], typer.Option("--overhead-gb", help="Overhead GB")] = None,
+    # Output options
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Simulate continuous batching under Poisson arrivals or a replayed log."""
+    try:
+        workload_trace = read_trace(trace) if trace else None
+        request = PlanRequest(
+            model=ModelInput(
+                model=model,
+                revision=revision,
+                dtype=dtype,
+                quantization=quantization,
+                kv_cache_dtype=kv_cache_dtype,
+                max_model_len=max_model_len,
+                params_b=params_b,
+            ),
+            hardware=HardwareInput(
+                gpu=gpu,
+                gpus=gpus,
+                vram_gb=vram_gb,
+                interconnect=interconnect,
+                tensor_parallel_size=tensor_parallel_size,
+                pipeline_parallel_size=pipeline_parallel_size,
+                nodes=nodes,
+            ),
+            workload=WorkloadInput(
+                **_workload_lengths(workload_trace, prompt_tokens, gen_tokens),
+                concurrency=concurrency,
+                batching_mode=batching_mode,
+                trace=workload_trace,
+            ),
+            policy=PolicyInput(
+                gpu_memory_utilization=gpu_memory_utilization,
+                overhead_gb=overhead_gb,
+                block_size=block_size,
+                max_num_seqs=max_num_seqs,
+                max_num_batched_tokens=max_num_batched_tokens,
+            ),
+        )
+
+        report = run_simulation(
+            request,
+            rate=rate,
+            num_requests=num_requests,
+            chunked_prefill=chunked_prefill,
+            lengths=lengths.value,
+            seed=seed,
+            arrivals=islice(trace_arrivals(trace), num_requests) if trace else None,
+        )
+
+        if json_output:
+            typer.echo(report.model_dump_json(indent=2))
+        else:
+            render_simulation_report(report, console)
+
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+        raise typer.Exit(1)
+
+
 @app.command()
 def generate(
     # Output options (required)
@@ -239,7 +900,7 @@ def generate(
     ] = None,
     # Hardware options
     gpu: Annotated[str, typer.Option("--gpu", help="GPU name or 'auto'")] = "auto",
-    gpus: Annotated[int, typer.Option("--gpus", help="Number of GPUs")] = 1,
+    gpus: Annotated[int, typer.Option("--gpus", help="GPUs per node")] = 1,
     vram_gb: Annotated[Optional[float], typer.Option("--vram-gb", help="VRAM per GPU")] = None,
     interconnect: Annotated[
         Interconnect, typer.Option("--interconnect", help="GPU interconnect")
@@ -247,6 +908,18 @@ def generate(
     tensor_parallel_size: Annotated[
         Optional[int], typer.Option("--tensor-parallel-size", "--tp", help="TP size")
     ] = None,
+    pipeline_parallel_size: Annotated[
+        Optional[int], typer.Option("--pipeline-parallel-size", "--pp", help="PP size")
+    ] = None,
+    nodes: Annotated[int, typer.Option("--nodes", help="Number of nodes", min=1)] = 1,
+    inter_node_gbps: Annotated[
+        Optional[float],
+        typer.Option("--inter-node-gbps", help="Inter-node bandwidth per GPU in GB/s"),
+    ] = None,
+    plan_against: Annotated[
+        PlanAgainst,
+        typer.Option("--plan-against", help="Budget from total or currently free GPU memory"),
+    ] = PlanAgainst.TOTAL,
     # Workload options
     prompt_tokens: Annotated[int, typer.Option("--prompt-tokens", help="Prompt tokens")] = 512,
     gen_tokens: Annotated[int, typer.Option("--gen-tokens", help="Generation tokens")] = 256,
@@ -260,9 +933,31 @@ def generate(
     ] = 0.90,
     overhead_gb: Annotated[Optional[float], typer.Option("--overhead-gb", help="Overhead GB")] = None,
     fragmentation_factor: Annotated[
-        float, typer.Option("--fragmentation-factor", help="Fragmentation factor")
-    ] = 1.15,
+        float, typer.Option("--fragmentation-factor", help="Extra KV cache margin")
+    ] = 1.0,
     headroom_gb: Annotated[float, typer.Option("--headroom-gb", help="Headroom GB")] = 1.0,
+    block_size: Annotated[
+        int, typer.Option("--block-size", help="Tokens per KV cache block", min=1)
+    ] = 16,
+    max_num_seqs: Annotated[
+        Optional[int], typer.Option("--max-num-seqs", help="Max running sequences", min=1)
+    ] = None,
+    max_num_batched_tokens: Annotated[
+        Optional[int],
+        typer.Option("--max-num-batched-tokens", help="Max tokens per step", min=1),
+    ] = None,
+    enforce_eager: Annotated[
+        Optional[bool],
+        typer.Option("--enforce-eager/--cuda-graphs", help="Disable or keep CUDA graphs"),
+    ] = None,
+    # Co-location options
+    colocate: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--colocate",
+            help="Further engine on the same GPUs: MODEL or key=value pairs (repeatable)",
+        ),
+    ] = None,
     # Output options
     emit: Annotated[
         str, typer.Option("--emit", help="Artifacts to emit (comma-separated: command,profile,compose,k8s)")
@@ -298,6 +993,10 @@ def generate(
                     vram_gb=vram_gb,
                     interconnect=interconnect,
                     tensor_parallel_size=tensor_parallel_size,
+                    pipeline_parallel_size=pipeline_parallel_size,
+                    nodes=nodes,
+                    inter_node_gbps=inter_node_gbps,
+                    plan_against=plan_against,
                 ),
                 workload=WorkloadInput(
                     prompt_tokens=prompt_tokens,
@@ -310,7 +1009,12 @@ def generate(
                     overhead_gb=overhead_gb,
                     fragmentation_factor=fragmentation_factor,
                     headroom_gb=headroom_gb,
+                    block_size=block_size,
+                    max_num_seqs=max_num_seqs,
+                    max_num_batched_tokens=max_num_batched_tokens,
+                    enforce_eager=enforce_eager,
                 ),
+                colocate=[_parse_engine(value) for value in colocate or []],
             )
 
         # Run planning
@@ -380,5 +1084,44 @@ def generate(
         raise typer.Exit(1)
 
 
+@registry_app.command("import")
+def registry_import(
+    directory: Annotated[
+        Path, typer.Argument(help="Directory of model directories or config JSON files")
+    ],
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Output imported names as JSON")
+    ] = False,
+) -> None:
+    """Register the architecture of every model config under a directory."""
+    try:
+        names = import_model_configs(directory)
+    except (ValueError, FileNotFoundError, json.JSONDecodeError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    if json_output:
+        typer.echo(json.dumps(names, indent=2))
+    else:
+        console.print(f"[green]Imported {len(names)} model(s) into the registry.[/green]")
+
+
+@registry_app.command("list")
+def registry_list(
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Output as JSON")
+    ] = False,
+) -> None:
+    """List the models in the registry."""
+    entries = list(ModelRegistry())
+
+    if json_output:
+        typer.echo(json.dumps(dict(entries), indent=2))
+    else:
+        render_registry_list(
+            [(name, ModelMetadata.from_record(record)) for name, record in entries], console
+        )
+
+
 if __name__ == "__main__":
     app()
@@ -1,8 +1,35 @@
 """Hardware detection module."""
 
-from vllm_wizard.hardware.detect import detect_gpus, recommend_tensor_parallel
+from vllm_wizard.hardware.detect import (
+    GPUTopology,
+    detect_gpus,
+    detect_topology,
+    parse_mig_listing,
+    parse_topology,
+    recommend_tensor_parallel,
+)
+from vllm_wizard.hardware.mig import MIGProfile, mig_profiles, parse_mig_name
+from vllm_wizard.hardware.specs import (
+    GPUSpec,
+    device_group,
+    get_gpu_spec,
+    gpu_types,
+    slowest_gpu,
+)
 
 __all__ = [
     "detect_gpus",
     "recommend_tensor_parallel",
+    "parse_mig_listing",
+    "GPUTopology",
+    "detect_topology",
+    "parse_topology",
+    "MIGProfile",
+    "mig_profiles",
+    "parse_mig_name",
+    "GPUSpec",
+    "get_gpu_spec",
+    "device_group",
+    "gpu_types",
+    "slowest_gpu",
 ]
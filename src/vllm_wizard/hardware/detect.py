@@ -1,66 +1,191 @@
 """GPU detection via nvidia-smi."""
 
+import itertools
+import json
+import math
+import os
 import re
 import subprocess
-from typing import Optional
-
-from vllm_wizard.schemas.outputs import GPUInfo
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from vllm_wizard.cache import get_cache_dir
+from vllm_wizard.hardware.mig import mig_device_name, parse_mig_name
+from vllm_wizard.matching import longest_match
+from vllm_wizard.schemas.inputs import Interconnect
+from vllm_wizard.schemas.outputs import GPUInfo, GPUProcess
+
+# Detection cache lifetime in seconds
+DETECTION_CACHE_TTL_S = 3600.0
+
+# Detection cache format version
+DETECTION_CACHE_VERSION = 4
+
+# Kernel driver procfs directory (Linux); read to invalidate the cache cheaply
+NVIDIA_PROC_DIR = Path("/proc/driver/nvidia")
+
+# All fields fetched in a single nvidia-smi query
+NVIDIA_SMI_QUERY_FIELDS = [
+    "name",
+    "memory.total",
+    "driver_version",
+    "compute_cap",
+    "mig.mode.current",
+    "memory.used",
+    "memory.free",
+    "uuid",
+]
+
+# Fields of the per-process query; the name goes last as it may contain commas
+NVIDIA_SMI_APP_FIELDS = ["gpu_uuid", "pid", "used_memory", "process_name"]
+
+# Lines of `nvidia-smi -L`: a GPU, then one line per MIG instance on it
+_LIST_GPU_PATTERN = re.compile(r"^GPU\s+(\d+):\s*(.+?)\s*\(UUID:\s*([^)]+)\)")
+_LIST_MIG_PATTERN = re.compile(r"^\s+MIG\s+(\S+)\s+Device\s+(\d+):\s*\(UUID:\s*([^)]+)\)")
+
+# Links of `nvidia-smi topo -m`, best first: NV# (bonded NVLinks) ranks above
+# every PCIe path, and SYS (through the CPUs' inter-socket link) ranks last
+TOPOLOGY_LINK_RANK: dict[str, int] = {
+    "PIX": 5,  # At most one PCIe bridge
+    "PXB": 4,  # Several PCIe bridges, no host bridge
+    "PHB": 3,  # Through a PCIe host bridge (the CPU)
+    "NODE": 2,  # Between host bridges of one NUMA node
+    "SYS": 1,  # Across NUMA nodes (CPU sockets)
+    "SOC": 1,  # Older drivers' name for SYS
+}
+_NVLINK_PATTERN = re.compile(r"^NV(\d+)$")
+
+# Largest number of candidate groups best_group scores exhaustively
+_MAX_GROUP_CANDIDATES = 20000
+
+# Minimum Linux driver version for each CUDA release, newest first.
+# nvidia-smi reports the newest CUDA version the driver supports in its header.
+CUDA_DRIVER_MINIMUMS: list[tuple[tuple[int, ...], str]] = [
+    ((580, 65, 6), "13.0"),
+    ((575, 51, 3), "12.9"),
+    ((570, 26), "12.8"),
+    ((560, 28, 3), "12.6"),
+    ((555, 42, 2), "12.5"),
+    ((550, 54, 14), "12.4"),
+    ((545, 23, 6), "12.3"),
+    ((535, 54, 3), "12.2"),
+    ((530, 30, 2), "12.1"),
+    ((525, 60, 13), "12.0"),
+    ((520, 61, 5), "11.8"),
+    ((515, 43, 4), "11.7"),
+    ((510, 39, 1), "11.6"),
+    ((495, 29, 5), "11.5"),
+    ((470, 42, 1), "11.4"),
+    ((465, 19, 1), "11.3"),
+    ((460, 27, 3), "11.2"),
+    ((455, 23), "11.1"),
+    ((450, 36, 6), "11.0"),
+]
+
+# Known GPU VRAM in MiB, keyed by normalized name fragments
+KNOWN_GPU_VRAM_MIB: dict[str, int] = {
+    # Consumer NVIDIA
+    "4090": 24576,
+    "4080": 16384,
+    "4070 ti": 12288,
+    "4070": 12288,
+    "3090 ti": 24576,
+    "3090": 24576,
+    "3080 ti": 12288,
+    "3080": 10240,
+    "3070 ti": 8192,
+    "3070": 8192,
+    "3060 ti": 8192,
+    "3060": 12288,
+    # Professional NVIDIA
+    "a6000": 49152,
+    "a5000": 24576,
+    "a4000": 16384,
+    # Datacenter NVIDIA
+    "a100 80gb": 81920,
+    "a100 sxm4 80gb": 81920,
+    "a100 pcie 80gb": 81920,
+    "a100 40gb": 40960,
+    "a100": 40960,
+    "h100 80gb": 81920,
+    "h100": 81920,
+    "h200": 143360,
+    "l40s": 49152,
+    "l40": 49152,
+    "l4": 24576,
+    "a10g": 24576,
+    "a10": 24576,
+    "v100 32gb": 32768,
+    "v100 16gb": 16384,
+    "v100": 16384,
+    "t4": 16384,
+    "p100 16gb": 16384,
+    "p100": 16384,
+    # Apple Silicon (for reference)
+    "m1 max": 32768,
+    "m1 ultra": 65536,
+    "m2 max": 32768,
+    "m2 ultra": 65536,
+    "m3 max": 40960,
+}
+
+
+def detect_gpus(use_cache: bool = True, processes: bool = False) -> list[GPUInfo]:
+    """Detect available NVIDIA GPUs using nvidia-smi.
 
+    Runs a single nvidia-smi query for all fields. GPUs in MIG mode are
+    replaced by their MIG instances, listed with one further `nvidia-smi -L`
+    call only when some GPU has MIG enabled. Results are cached on disk for
+    DETECTION_CACHE_TTL_S seconds and invalidated when the kernel driver
+    version, set of GPUs or MIG instances change. Used and free memory are
+    as of the query, so pass use_cache=False to read them live.
 
-def detect_gpus() -> list[GPUInfo]:
-    """Detect available NVIDIA GPUs using nvidia-smi.
+    Args:
+        use_cache: Read and write the on-disk detection cache
+        processes: Also list the compute processes holding memory on each GPU,
+            with one more nvidia-smi call that is never cached
 
     Returns:
         List of GPUInfo objects with detected GPU information.
         Returns empty list if nvidia-smi fails or no GPUs found.
     """
-    try:
-        # Query GPU name and memory
-        result = subprocess.run(
-            [
-                "nvidia-smi",
-                "--query-gpu=name,memory.total",
-                "--format=csv,noheader,nounits",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+    fingerprint = _get_driver_fingerprint()
 
-        if result.returncode != 0:
-            return []
+    if use_cache:
+        cached = _load_detection_cache("gpus", fingerprint)
+        if cached is not None:
+            try:
+                return [GPUInfo(**gpu) for gpu in cached]
+            except (TypeError, ValueError):
+                pass
 
-        gpus: list[GPUInfo] = []
+    gpus = _query_nvidia_smi()
 
-        for line in result.stdout.strip().split("\n"):
-            if not line.strip():
-                continue
+    # Empty results are not cached so newly installed drivers are picked up
+    if use_cache and gpus:
+        _save_detection_cache("gpus", [gpu.model_dump() for gpu in gpus], fingerprint)
 
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) >= 2:
-                name = parts[0]
-                try:
-                    vram_mib = int(float(parts[1]))
-                except ValueError:
-                    continue
+    if processes and gpus:
+        gpus = _attach_processes(gpus)
 
-                gpus.append(GPUInfo(name=name, vram_mib=vram_mib))
+    return gpus
 
-        # Try to get driver and CUDA version
-        driver_version, cuda_version = _get_nvidia_versions()
 
-        # Update all GPUs with version info
-        for gpu in gpus:
-            gpu.driver_version = driver_version
-            gpu.cuda_version = cuda_version
+def _query_nvidia_smi() -> list[GPUInfo]:
+    """Query every GPU field in one nvidia-smi invocation."""
+    fields = NVIDIA_SMI_QUERY_FIELDS
+    try:
+        result = _run_query(fields)
 
-        # Try to get compute capability for each GPU
-        compute_caps = _get_compute_capabilities()
-        for i, gpu in enumerate(gpus):
-            if i < len(compute_caps):
-                gpu.compute_capability = compute_caps[i]
+        # Drivers older than 510 do not know compute_cap
+        if result.returncode != 0 and "compute_cap" in fields:
+            fields = [f for f in fields if f != "compute_cap"]
+            result = _run_query(fields)
 
-        return gpus
+        if result.returncode != 0:
+            return []
 
     except FileNotFoundError:
         # nvidia-smi not found
@@ -70,75 +195,517 @@ def detect_gpus() -> list[GPUInfo]:
     except Exception:
         return []
 
+    gpus, mig_indices = _parse_query_output(result.stdout, fields)
+    if mig_indices:
+        gpus = _expand_mig_instances(gpus, mig_indices)
+    return gpus
 
-def _get_nvidia_versions() -> tuple[Optional[str], Optional[str]]:
-    """Get NVIDIA driver and CUDA versions."""
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
 
-        driver_version = None
-        if result.returncode == 0 and result.stdout.strip():
-            driver_version = result.stdout.strip().split("\n")[0]
+def _run_query(fields: list[str]) -> subprocess.CompletedProcess:
+    """Run nvidia-smi --query-gpu for the given fields."""
+    return subprocess.run(
+        [
+            "nvidia-smi",
+            f"--query-gpu={','.join(fields)}",
+            "--format=csv,noheader,nounits",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
 
-        # Get CUDA version from nvidia-smi header
-        result = subprocess.run(
-            ["nvidia-smi"],
-            capture_output=True,
-            text=True,
-            timeout=5,
+
+def _parse_query_output(output: str, fields: list[str]) -> tuple[list[GPUInfo], set[int]]:
+    """Parse CSV output of nvidia-smi --query-gpu.
+
+    Returns the GPUs and the indices of those with MIG mode enabled.
+    """
+    gpus: list[GPUInfo] = []
+    mig_indices: set[int] = set()
+
+    lines = [line for line in output.strip().split("\n") if line.strip()]
+    for index, line in enumerate(lines):
+        # GPU names do not contain commas, so a plain split is safe
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) < len(fields):
+            continue
+
+        values = {
+            field: (None if value in ("", "[N/A]", "N/A") else value)
+            for field, value in zip(fields, parts)
+        }
+
+        try:
+            vram_mib = int(float(values["memory.total"] or ""))
+        except ValueError:
+            continue
+
+        driver_version = values.get("driver_version")
+        if (values.get("mig.mode.current") or "").lower() == "enabled":
+            mig_indices.add(len(gpus))
+
+        gpus.append(
+            GPUInfo(
+                name=values["name"] or "Unknown GPU",
+                vram_mib=vram_mib,
+                index=index,
+                compute_capability=values.get("compute_cap"),
+                driver_version=driver_version,
+                cuda_version=cuda_version_for_driver(driver_version),
+                uuid=values.get("uuid"),
+                vram_used_mib=_parse_mib(values.get("memory.used")),
+                vram_free_mib=_parse_mib(values.get("memory.free")),
+            )
         )
 
-        cuda_version = None
-        if result.returncode == 0:
-            # Parse CUDA Version from nvidia-smi output
-            match = re.search(r"CUDA Version:\s*([\d.]+)", result.stdout)
-            if match:
-                cuda_version = match.group(1)
+    return gpus, mig_indices
 
-        return driver_version, cuda_version
 
-    except Exception:
-        return None, None
+def _parse_mib(value: Optional[str]) -> Optional[int]:
+    """Parse a MiB figure, or None if missing."""
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
 
 
-def _get_compute_capabilities() -> list[str]:
-    """Get compute capabilities for each GPU."""
+def _expand_mig_instances(gpus: list[GPUInfo], mig_indices: set[int]) -> list[GPUInfo]:
+    """Replace GPUs in MIG mode by the MIG instances `nvidia-smi -L` lists.
+
+    CUDA only sees a MIG-enabled GPU through its instances, so one without
+    instances is dropped. If the listing fails the whole GPUs are kept.
+    """
+    try:
+        result = subprocess.run(["nvidia-smi", "-L"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return gpus
+    if result.returncode != 0:
+        return gpus
+
+    instances = parse_mig_listing(result.stdout)
+    expanded: list[GPUInfo] = []
+    for index, gpu in enumerate(gpus):
+        if index not in mig_indices:
+            expanded.append(gpu)
+            continue
+        for profile, uuid in instances.get(index, []):
+            device = get_gpu_by_name(mig_device_name(gpu.name, profile))
+            if device is not None:
+                expanded.append(
+                    gpu.model_copy(
+                        update={
+                            "name": device.name,
+                            "vram_mib": device.vram_mib,
+                            "mig_profile": device.mig_profile,
+                            "uuid": uuid,
+                            # The parent's usage says nothing about one instance
+                            "vram_used_mib": None,
+                            "vram_free_mib": None,
+                        }
+                    )
+                )
+    return expanded
+
+
+def _attach_processes(gpus: list[GPUInfo]) -> list[GPUInfo]:
+    """Add the compute processes on each GPU, matched by UUID."""
     try:
         result = subprocess.run(
             [
                 "nvidia-smi",
-                "--query-gpu=compute_cap",
-                "--format=csv,noheader",
+                f"--query-compute-apps={','.join(NVIDIA_SMI_APP_FIELDS)}",
+                "--format=csv,noheader,nounits",
             ],
             capture_output=True,
             text=True,
-            timeout=5,
+            timeout=10,
         )
+    except (OSError, subprocess.TimeoutExpired):
+        return gpus
+    if result.returncode != 0:
+        return gpus
 
-        if result.returncode != 0:
-            return []
+    by_uuid = parse_compute_apps(result.stdout)
+    return [
+        gpu.model_copy(update={"processes": by_uuid.get(gpu.uuid, [])}) if gpu.uuid else gpu
+        for gpu in gpus
+    ]
 
-        caps = []
-        for line in result.stdout.strip().split("\n"):
-            line = line.strip()
-            if line:
-                caps.append(line)
 
-        return caps
+def parse_compute_apps(output: str) -> dict[str, list[GPUProcess]]:
+    """Parse `nvidia-smi --query-compute-apps` output into processes per GPU UUID.
+
+    Args:
+        output: CSV lines of gpu_uuid, pid, used_memory (MiB) and process_name
+
+    Returns:
+        Processes by GPU UUID, largest memory first
+    """
+    by_uuid: dict[str, list[GPUProcess]] = {}
+
+    for line in output.strip().split("\n"):
+        parts = [p.strip() for p in line.split(",", len(NVIDIA_SMI_APP_FIELDS) - 1)]
+        if len(parts) < len(NVIDIA_SMI_APP_FIELDS):
+            continue
+        uuid, pid, used, name = parts
+        used_mib = _parse_mib(used)
+        if not pid.isdigit() or used_mib is None:
+            continue
+        by_uuid.setdefault(uuid, []).append(GPUProcess(pid=int(pid), name=name, used_mib=used_mib))
+
+    for processes in by_uuid.values():
+        processes.sort(key=lambda process: process.used_mib, reverse=True)
+    return by_uuid
+
+
+def parse_mig_listing(output: str) -> dict[int, list[tuple[str, str]]]:
+    """Parse the MIG instances of each GPU from `nvidia-smi -L` output.
+
+    The listing looks like::
+
+        GPU 0: NVIDIA A100-SXM4-80GB (UUID: GPU-5d5ba0d6-...)
+          MIG 3g.40gb     Device  0: (UUID: MIG-c6d4f1ef-...)
+          MIG 1g.10gb     Device  1: (UUID: MIG-cba663e8-...)
+
+    Args:
+        output: Text printed by `nvidia-smi -L`
+
+    Returns:
+        (profile, MIG UUID) pairs by GPU index, in device order
+    """
+    instances: dict[int, list[tuple[str, str]]] = {}
+    index: Optional[int] = None
+
+    for line in output.splitlines():
+        gpu_match = _LIST_GPU_PATTERN.match(line)
+        if gpu_match:
+            index = int(gpu_match.group(1))
+            continue
+        mig_match = _LIST_MIG_PATTERN.match(line)
+        if mig_match and index is not None:
+            instances.setdefault(index, []).append(
+                (mig_match.group(1), mig_match.group(3).strip())
+            )
+
+    return instances
 
-    except Exception:
-        return []
+
+@dataclass
+class GPUTopology:
+    """Links between the GPUs of a node, as `nvidia-smi topo -m` reports them.
+
+    GPUs are numbered as nvidia-smi and CUDA_VISIBLE_DEVICES number them.
+    """
+
+    links: list[list[str]]
+    cpu_affinity: list[Optional[str]] = field(default_factory=list)
+    numa_affinity: list[Optional[int]] = field(default_factory=list)
+
+    @property
+    def gpu_count(self) -> int:
+        """Number of GPUs in the matrix."""
+        return len(self.links)
+
+    def link(self, a: int, b: int) -> str:
+        """Link label between two GPUs (e.g., "NV12", "PIX", "SYS")."""
+        return self.links[a][b]
+
+    def numa_nodes(self, indices: list[int]) -> list[int]:
+        """Distinct known NUMA nodes the given GPUs are attached to."""
+        nodes = {
+            self.numa_affinity[i]
+            for i in indices
+            if i < len(self.numa_affinity) and self.numa_affinity[i] is not None
+        }
+        return sorted(node for node in nodes if node is not None)
+
+    def group_interconnect(self, indices: list[int]) -> Interconnect:
+        """Interconnect of a group, set by its worst link.
+
+        Args:
+            indices: GPUs of the group
+
+        Returns:
+            NVLINK if every pair shares NVLink, CROSS_SOCKET if some pair only
+            connects through the inter-socket link, else PCIE
+        """
+        pairs = list(itertools.combinations(indices, 2))
+        if not pairs:
+            return Interconnect.UNKNOWN
+        labels = [self.link(a, b) for a, b in pairs]
+        if all(_NVLINK_PATTERN.match(label) for label in labels):
+            return Interconnect.NVLINK
+        if any(link_rank(label) == TOPOLOGY_LINK_RANK["SYS"] for label in labels):
+            return Interconnect.CROSS_SOCKET
+        return Interconnect.PCIE
+
+    def best_group(self, size: int, among: Optional[list[int]] = None) -> list[int]:
+        """The best-connected group of GPUs of a given size.
+
+        Groups are ranked by their worst link, then by the sum of all their
+        links, then by lowest indices. Every group is scored when there are
+        few enough; otherwise each GPU seeds a group grown greedily.
+
+        Args:
+            size: GPUs in the group
+            among: Candidate GPUs (all by default)
+
+        Returns:
+            Indices of the group, ascending
+        """
+        candidates = sorted(range(self.gpu_count) if among is None else among)
+        if size >= len(candidates):
+            return candidates
+        if size <= 1:
+            return candidates[:size]
+
+        def score(group: tuple[int, ...]) -> tuple[int, int]:
+            ranks = [link_rank(self.link(a, b)) for a, b in itertools.combinations(group, 2)]
+            return min(ranks), sum(ranks)
+
+        if math.comb(len(candidates), size) <= _MAX_GROUP_CANDIDATES:
+            groups: Iterable[tuple[int, ...]] = itertools.combinations(candidates, size)
+        else:
+            groups = (self._grow_group(seed, size, candidates) for seed in candidates)
+
+        best: Optional[tuple[int, ...]] = None
+        for group in groups:
+            if best is None or score(group) > score(best):
+                best = group
+        return list(best or ())
+
+    def _grow_group(self, seed: int, size: int, candidates: list[int]) -> tuple[int, ...]:
+        """Grow a group from one GPU, adding the best-linked GPU each step."""
+        group = [seed]
+        while len(group) < size:
+            rest = [i for i in candidates if i not in group]
+            ranks = {i: [link_rank(self.link(i, j)) for j in group] for i in rest}
+            group.append(max(rest, key=lambda i: (min(ranks[i]), sum(ranks[i]), -i)))
+        return tuple(sorted(group))
+
+
+def link_rank(label: str) -> int:
+    """Rank a topology link label; higher is faster, 0 if unknown.
+
+    Args:
+        label: Label from `nvidia-smi topo -m` (e.g., "NV12", "PXB", "SYS")
+
+    Returns:
+        100 plus the number of bonded NVLinks for NV#, else the PCIe path rank
+    """
+    match = _NVLINK_PATTERN.match(label)
+    if match:
+        return 100 + int(match.group(1))
+    return TOPOLOGY_LINK_RANK.get(label.upper(), 0)
+
+
+def parse_topology(output: str) -> Optional[GPUTopology]:
+    """Parse the matrix printed by `nvidia-smi topo -m`.
+
+    The header names the GPU (and NIC) columns followed by "CPU Affinity"
+    and "NUMA Affinity"; each GPU row then gives its link to every column.
+    Columns are separated by tabs (or runs of spaces), and the legend after
+    the matrix is ignored.
+
+    Args:
+        output: Output of `nvidia-smi topo -m`
+
+    Returns:
+        GPUTopology, or None if the output holds no GPU matrix
+    """
+    header: Optional[list[str]] = None
+    rows: dict[int, list[str]] = {}
+    for line in output.splitlines():
+        if line.strip().startswith("Legend"):
+            break
+        cells = [cell.strip() for cell in re.split(r"\t+|\s{2,}", line) if cell.strip()]
+        if not cells:
+            continue
+        if header is None:
+            if cells[0].startswith("GPU"):
+                header = cells
+            continue
+        match = re.match(r"^GPU(\d+)$", cells[0])
+        if match:
+            rows[int(match.group(1))] = cells[1:]
+
+    if header is None or not rows:
+        return None
+
+    gpu_columns = [
+        column for column, name in enumerate(header) if re.match(r"^GPU\d+$", name)
+    ]
+    if len(gpu_columns) != len(rows) or sorted(rows) != list(range(len(rows))):
+        return None
+
+    def cell(row: list[str], name: str) -> Optional[str]:
+        if name not in header:
+            return None
+        column = header.index(name)
+        value = row[column] if column < len(row) else None
+        return None if value in (None, "N/A") else value
+
+    links: list[list[str]] = []
+    cpu_affinity: list[Optional[str]] = []
+    numa_affinity: list[Optional[int]] = []
+    for index in range(len(rows)):
+        row = rows[index]
+        if len(row) < len(gpu_columns):
+            return None
+        links.append([row[column] for column in gpu_columns])
+        cpu_affinity.append(cell(row, "CPU Affinity"))
+        numa = cell(row, "NUMA Affinity")
+        numa_affinity.append(int(numa) if numa is not None and numa.isdigit() else None)
+
+    return GPUTopology(links=links, cpu_affinity=cpu_affinity, numa_affinity=numa_affinity)
+
+
+def detect_topology(use_cache: bool = True) -> Optional[GPUTopology]:
+    """Detect how the GPUs of this node are connected.
+
+    Runs `nvidia-smi topo -m`, cached like detect_gpus() and invalidated
+    with it.
+
+    Args:
+        use_cache: Read and write the on-disk detection cache
+
+    Returns:
+        GPUTopology, or None if nvidia-smi is missing or prints no matrix
+    """
+    fingerprint = _get_driver_fingerprint()
+
+    if use_cache:
+        cached = _load_detection_cache("topology", fingerprint)
+        if cached is not None:
+            try:
+                return GPUTopology(**cached)
+            except TypeError:
+                pass
+
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "topo", "-m"], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+
+    topology = parse_topology(result.stdout)
+    if use_cache and topology is not None:
+        _save_detection_cache("topology", asdict(topology), fingerprint)
+    return topology
+
+
+def cuda_version_for_driver(driver_version: Optional[str]) -> Optional[str]:
+    """Return the newest CUDA version supported by a driver version.
+
+    Matches the "CUDA Version" shown in the nvidia-smi header without
+    running nvidia-smi a second time.
+
+    Args:
+        driver_version: Driver version string (e.g., "535.104.05")
+
+    Returns:
+        CUDA version string, or None if unknown
+    """
+    if not driver_version:
+        return None
+
+    try:
+        version = tuple(int(p) for p in driver_version.split("."))
+    except ValueError:
+        return None
+
+    for minimum, cuda_version in CUDA_DRIVER_MINIMUMS:
+        if version >= minimum:
+            return cuda_version
+
+    return None
+
+
+def _get_driver_fingerprint() -> Optional[str]:
+    """Identify the loaded driver and GPU set without running nvidia-smi.
+
+    Reads the kernel module version, the per-GPU procfs entries and the
+    MIG GPU instance capabilities (which change when slices are
+    created or destroyed). Returns None where procfs is unavailable (non-Linux, containers without
+    the driver mounted), in which case only the TTL applies.
+    """
+    try:
+        version_text = (NVIDIA_PROC_DIR / "version").read_text()
+    except OSError:
+        return None
+
+    first_line = version_text.strip().split("\n")[0]
+
+    gpus_dir = NVIDIA_PROC_DIR / "gpus"
+    try:
+        bus_ids = sorted(p.name for p in gpus_dir.iterdir())
+    except OSError:
+        bus_ids = []
+
+    # capabilities/gpu<N>/mig/gi<M> exists for each MIG GPU instance
+    capabilities_dir = NVIDIA_PROC_DIR / "capabilities"
+    try:
+        mig_instances = sorted(
+            str(p.relative_to(capabilities_dir)) for p in capabilities_dir.glob("gpu*/mig/gi*")
+        )
+    except OSError:
+        mig_instances = []
+
+    return f"{first_line}|{','.join(bus_ids)}|{','.join(mig_instances)}"
+
+
+def _detection_cache_path(name: str) -> Path:
+    """Path of one on-disk detection cache ("gpus" or "topology")."""
+    return get_cache_dir() / f"{name}.json"
+
+
+def _load_detection_cache(name: str, fingerprint: Optional[str]) -> Optional[Any]:
+    """Load a cached detection result if it is fresh and matches the driver."""
+    path = _detection_cache_path(name)
+    try:
+        with open(path, "r") as f:
+            data: dict[str, Any] = json.load(f)
+
+        if data.get("version") != DETECTION_CACHE_VERSION:
+            return None
+        if data.get("driver_fingerprint") != fingerprint:
+            return None
+        if time.time() - float(data["timestamp"]) > DETECTION_CACHE_TTL_S:
+            return None
+
+        return data["result"]
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_detection_cache(name: str, result: Any, fingerprint: Optional[str]) -> None:
+    """Save a JSON-serializable detection result; failures are ignored."""
+    path = _detection_cache_path(name)
+    data = {
+        "version": DETECTION_CACHE_VERSION,
+        "timestamp": time.time(),
+        "driver_fingerprint": fingerprint,
+        "result": result,
+    }
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(path)
+    except OSError:
+        pass
 
 
 def recommend_tensor_parallel(gpus: list[GPUInfo]) -> int:
     """Recommend tensor parallel size based on available GPUs.
 
-    Chooses the largest power of 2 that is <= number of GPUs.
+    Chooses the largest power of 2 that is <= number of GPUs. MIG instances
+    cannot join a NCCL group, so they always get 1.
 
     Args:
         gpus: List of detected GPUs
@@ -148,7 +715,7 @@ def recommend_tensor_parallel(gpus: list[GPUInfo]) -> int:
     """
     num_gpus = len(gpus)
 
-    if num_gpus <= 1:
+    if num_gpus <= 1 or any(gpu.mig_profile for gpu in gpus):
         return 1
 
     # Find largest power of 2 <= num_gpus
@@ -163,66 +730,23 @@ def get_gpu_by_name(name: str) -> Optional[GPUInfo]:
     """Create a GPUInfo from a known GPU name.
 
     Provides approximate VRAM for common GPUs when auto-detection fails.
+    The longest table key whose tokens appear in the name wins, so
+    "A100 80GB" is not read as "a100" and "A10" is not read as "a100".
+    A MIG instance such as "H100 MIG 1g.10gb" gets its profile's memory.
 
     Args:
-        name: GPU name (e.g., "RTX 4090", "A100 80GB")
+        name: GPU name (e.g., "RTX 4090", "A100 80GB", "A100 MIG 3g.20gb")
 
     Returns:
         GPUInfo with approximate specs, or None if unknown
     """
-    # Known GPU VRAM in MiB
-    known_gpus: dict[str, int] = {
-        # Consumer NVIDIA
-        "rtx 4090": 24576,
-        "rtx 4080": 16384,
-        "rtx 4070 ti": 12288,
-        "rtx 4070": 12288,
-        "rtx 3090 ti": 24576,
-        "rtx 3090": 24576,
-        "rtx 3080 ti": 12288,
-        "rtx 3080": 10240,
-        "rtx 3070 ti": 8192,
-        "rtx 3070": 8192,
-        "rtx 3060 ti": 8192,
-        "rtx 3060": 12288,
-        "rtx a6000": 49152,
-        "rtx a5000": 24576,
-        "rtx a4000": 16384,
-        # Datacenter NVIDIA
-        "a100 80gb": 81920,
-        "a100 40gb": 40960,
-        "a100": 40960,
-        "h100 80gb": 81920,
-        "h100": 81920,
-        "h200": 143360,
-        "l40s": 49152,
-        "l40": 49152,
-        "l4": 24576,
-        "a10g": 24576,
-        "a10": 24576,
-        "v100 32gb": 32768,
-        "v100 16gb": 16384,
-        "v100": 16384,
-        "t4": 16384,
-        "p100 16gb": 16384,
-        "p100": 16384,
-        # Apple Silicon (for reference)
-        "m1 max": 32768,
-        "m1 ultra": 65536,
-        "m2 max": 32768,
-        "m2 ultra": 65536,
-        "m3 max": 40960,
-    }
-
-    name_lower = name.lower().strip()
+    mig = parse_mig_name(name)
+    if mig is not None:
+        _, profile = mig
+        return GPUInfo(name=name, vram_mib=profile.vram_mib, mig_profile=profile.name)
 
-    # Exact match first
-    if name_lower in known_gpus:
-        return GPUInfo(name=name, vram_mib=known_gpus[name_lower])
+    key = longest_match(name, KNOWN_GPU_VRAM_MIB)
+    if key is None:
+        return None
 
-    # Partial match
-    for known_name, vram in known_gpus.items():
-        if known_name in name_lower or name_lower in known_name:
-            return GPUInfo(name=name, vram_mib=vram)
-
-    return None
+    return GPUInfo(name=name, vram_mib=KNOWN_GPU_VRAM_MIB[key])
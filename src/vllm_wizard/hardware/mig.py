@@ -0,0 +1,152 @@
+"""Multi-Instance GPU (MIG) profiles of A100, H100 and H200 GPUs."""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from vllm_wizard.matching import longest_match
+
+# A MIG-capable GPU splits into 7 compute slices and 8 memory slices
+MIG_COMPUTE_SLICES = 7
+MIG_MEMORY_SLICES = 8
+
+# Profile names such as "1g.10gb": compute slices and nominal memory in GB
+_PROFILE_PATTERN = re.compile(r"\b(\d+)g\.(\d+)gb\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class MIGProfile:
+    """One GPU instance profile: its share of the SMs and of the memory."""
+
+    name: str
+    compute_slices: int
+    memory_slices: int
+
+    @property
+    def compute_fraction(self) -> float:
+        """Fraction of the parent GPU's SMs (and tensor throughput)."""
+        return self.compute_slices / MIG_COMPUTE_SLICES
+
+    @property
+    def memory_fraction(self) -> float:
+        """Fraction of the parent GPU's memory and memory bandwidth."""
+        return self.memory_slices / MIG_MEMORY_SLICES
+
+    @property
+    def vram_mib(self) -> int:
+        """Usable memory in MiB, from the nominal (decimal) GB in the name.
+
+        A slice holds slightly less than its share of the parent's memory;
+        the decimal figure in the profile name is the conservative bound.
+        """
+        memory_gb = int(self.name.split(".")[1].rstrip("gb"))
+        return memory_gb * 1000**3 // 1024**2
+
+
+def _profiles(*specs: tuple[str, int, int]) -> list[MIGProfile]:
+    """Build profiles from (name, compute slices, memory slices) tuples."""
+    return [MIGProfile(name, compute, memory) for name, compute, memory in specs]
+
+
+_A100_40GB_PROFILES = _profiles(
+    ("1g.5gb", 1, 1),
+    ("1g.10gb", 1, 2),
+    ("2g.10gb", 2, 2),
+    ("3g.20gb", 3, 4),
+    ("4g.20gb", 4, 4),
+    ("7g.40gb", 7, 8),
+)
+
+_80GB_PROFILES = _profiles(
+    ("1g.10gb", 1, 1),
+    ("1g.20gb", 1, 2),
+    ("2g.20gb", 2, 2),
+    ("3g.40gb", 3, 4),
+    ("4g.40gb", 4, 4),
+    ("7g.80gb", 7, 8),
+)
+
+# Keys are normalized name fragments matched against GPU name tokens
+MIG_PROFILES: dict[str, list[MIGProfile]] = {
+    "a100": _A100_40GB_PROFILES,
+    "a100 40gb": _A100_40GB_PROFILES,
+    "a100 80gb": _80GB_PROFILES,
+    "a100 sxm4 80gb": _80GB_PROFILES,
+    "a100 pcie 80gb": _80GB_PROFILES,
+    "h100": _80GB_PROFILES,
+    "h100 nvl": _profiles(
+        ("1g.12gb", 1, 1),
+        ("1g.24gb", 1, 2),
+        ("2g.24gb", 2, 2),
+        ("3g.47gb", 3, 4),
+        ("4g.47gb", 4, 4),
+        ("7g.94gb", 7, 8),
+    ),
+    "h200": _profiles(
+        ("1g.18gb", 1, 1),
+        ("1g.35gb", 1, 2),
+        ("2g.35gb", 2, 2),
+        ("3g.71gb", 3, 4),
+        ("4g.71gb", 4, 4),
+        ("7g.141gb", 7, 8),
+    ),
+}
+
+
+def mig_profiles(gpu_name: str) -> list[MIGProfile]:
+    """List the MIG profiles a GPU can be split into.
+
+    Args:
+        gpu_name: Name of the whole GPU (e.g., "H100", "NVIDIA A100-SXM4-40GB")
+
+    Returns:
+        Profiles smallest first, or an empty list if the GPU has no MIG support
+    """
+    key = longest_match(gpu_name, MIG_PROFILES)
+    return list(MIG_PROFILES[key]) if key else []
+
+
+def mig_device_name(gpu_name: str, profile: str) -> str:
+    """Name a MIG instance the way detection and --gpu do.
+
+    Args:
+        gpu_name: Name of the parent GPU
+        profile: Profile name (e.g., "1g.10gb")
+
+    Returns:
+        Device name such as "H100 MIG 1g.10gb"
+    """
+    return f"{gpu_name} MIG {profile}"
+
+
+def parse_mig_name(name: str) -> Optional[tuple[str, MIGProfile]]:
+    """Split a MIG device name into its parent GPU and profile.
+
+    Accepts names such as "H100 MIG 1g.10gb" or "NVIDIA A100-SXM4-40GB 3g.20gb".
+    A profile unknown for the parent (or an unknown parent) is sized from
+    its name alone.
+
+    Args:
+        name: GPU name
+
+    Returns:
+        (parent GPU name, profile), or None if the name has no MIG profile
+    """
+    match = _PROFILE_PATTERN.search(name)
+    if match is None:
+        return None
+
+    profile_name = match.group(0).lower()
+    parent = name[: match.start()].strip()
+    parent = re.sub(r"\s*\bMIG\b\s*$", "", parent, flags=re.IGNORECASE).strip()
+
+    for profile in mig_profiles(parent):
+        if profile.name == profile_name:
+            return parent, profile
+
+    compute_slices = min(int(match.group(1)), MIG_COMPUTE_SLICES)
+    return parent, MIGProfile(
+        profile_name,
+        compute_slices,
+        max(1, round(compute_slices * MIG_MEMORY_SLICES / MIG_COMPUTE_SLICES)),
+    )
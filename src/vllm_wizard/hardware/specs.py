@@ -0,0 +1,187 @@
+"""Published GPU specifications for roofline performance modelling."""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from vllm_wizard.hardware.mig import parse_mig_name
+from vllm_wizard.matching import longest_match
+from vllm_wizard.schemas.outputs import GPUInfo
+
+
+@dataclass(frozen=True)
+class GPUSpec:
+    """Peak memory bandwidth, tensor throughput and links of a GPU.
+
+    TFLOPS figures are dense (no sparsity) tensor-core rates. Link figures
+    are per direction: all NVLinks of the GPU together (None without NVLink),
+    and its PCIe x16 slot (32 GB/s for Gen4). SXM modules sit on a baseboard
+    with NVLink to every GPU of the node; PCIe cards bridge pairs at most.
+    """
+
+    name: str
+    memory_bandwidth_gbps: float
+    fp16_tflops: float
+    fp8_tflops: Optional[float] = None
+    int8_tops: Optional[float] = None
+    nvlink_gbps: Optional[float] = None
+    pcie_gbps: float = 32.0
+    sxm: bool = False
+
+    @property
+    def supports_fp8(self) -> bool:
+        """Whether the GPU has FP8 tensor cores (Ada/Hopper and newer)."""
+        return self.fp8_tflops is not None
+
+    def tflops_for(self, precision: str) -> float:
+        """Peak dense TFLOPS for a compute precision ("fp16", "fp8" or "int8").
+
+        Falls back to the FP16 rate when the GPU lacks a faster path.
+        """
+        if precision == "fp8" and self.fp8_tflops:
+            return self.fp8_tflops
+        if precision == "int8" and self.int8_tops:
+            return self.int8_tops
+        return self.fp16_tflops
+
+
+# Keys are normalized name fragments matched against GPU name tokens.
+GPU_SPECS: dict[str, GPUSpec] = {
+    # Datacenter NVIDIA
+    "b200": GPUSpec(
+        "B200", 8000.0, 2250.0, 4500.0, 4500.0, nvlink_gbps=900.0, pcie_gbps=64.0, sxm=True
+    ),
+    "h200": GPUSpec(
+        "H200", 4800.0, 989.0, 1979.0, 1979.0, nvlink_gbps=450.0, pcie_gbps=64.0, sxm=True
+    ),
+    "h100 nvl": GPUSpec(
+        "H100 NVL", 3900.0, 835.0, 1671.0, 1671.0, nvlink_gbps=300.0, pcie_gbps=64.0
+    ),
+    "h100 pcie": GPUSpec(
+        "H100 PCIe", 2000.0, 756.0, 1513.0, 1513.0, nvlink_gbps=300.0, pcie_gbps=64.0
+    ),
+    "h100": GPUSpec(
+        "H100 SXM", 3350.0, 989.0, 1979.0, 1979.0, nvlink_gbps=450.0, pcie_gbps=64.0, sxm=True
+    ),
+    "a100 sxm4 80gb": GPUSpec("A100 80GB", 2039.0, 312.0, None, 624.0, nvlink_gbps=300.0, sxm=True),
+    "a100 80gb": GPUSpec("A100 80GB", 2039.0, 312.0, None, 624.0, nvlink_gbps=300.0, sxm=True),
+    "a100 40gb": GPUSpec("A100 40GB", 1555.0, 312.0, None, 624.0, nvlink_gbps=300.0, sxm=True),
+    "a100": GPUSpec("A100 40GB", 1555.0, 312.0, None, 624.0, nvlink_gbps=300.0, sxm=True),
+    "l40s": GPUSpec("L40S", 864.0, 362.0, 733.0, 733.0),
+    "l40": GPUSpec("L40", 864.0, 181.0, 362.0, 362.0),
+    "l4": GPUSpec("L4", 300.0, 121.0, 242.0, 242.0),
+    "a10g": GPUSpec("A10G", 600.0, 70.0, None, 140.0),
+    "a10": GPUSpec("A10", 600.0, 125.0, None, 250.0),
+    "v100": GPUSpec("V100", 900.0, 125.0, nvlink_gbps=150.0, pcie_gbps=16.0, sxm=True),
+    "t4": GPUSpec("T4", 320.0, 65.0, None, 130.0, pcie_gbps=16.0),
+    "p100": GPUSpec("P100", 732.0, 19.0, pcie_gbps=16.0),
+    # Professional
+    "rtx 6000 ada": GPUSpec("RTX 6000 Ada", 960.0, 364.0, 728.0, 728.0),
+    "rtx a6000": GPUSpec("RTX A6000", 768.0, 155.0, None, 310.0, nvlink_gbps=56.0),
+    "rtx a5000": GPUSpec("RTX A5000", 768.0, 111.0, None, 222.0),
+    "rtx a4000": GPUSpec("RTX A4000", 448.0, 77.0, None, 153.0),
+    # Consumer
+    "4090": GPUSpec("RTX 4090", 1008.0, 165.0, 330.0, 330.0),
+    "4080": GPUSpec("RTX 4080", 717.0, 97.0, 195.0, 195.0),
+    "4070 ti": GPUSpec("RTX 4070 Ti", 504.0, 80.0, 160.0, 160.0),
+    "4070": GPUSpec("RTX 4070", 504.0, 58.0, 117.0, 117.0),
+    "3090 ti": GPUSpec("RTX 3090 Ti", 1008.0, 80.0, None, 160.0),
+    "3090": GPUSpec("RTX 3090", 936.0, 71.0, None, 142.0, nvlink_gbps=56.0),
+    "3080 ti": GPUSpec("RTX 3080 Ti", 912.0, 68.0, None, 136.0),
+    "3080": GPUSpec("RTX 3080", 760.0, 59.0, None, 119.0),
+    "3070": GPUSpec("RTX 3070", 448.0, 40.0, None, 81.0),
+    "3060": GPUSpec("RTX 3060", 360.0, 25.0, None, 51.0),
+}
+
+# Used when the GPU is not in GPU_SPECS
+DEFAULT_GPU_SPEC = GPUSpec("Unknown GPU", 900.0, 100.0)
+
+
+def get_gpu_spec(gpu_name: str) -> Optional[GPUSpec]:
+    """Look up specs for a GPU name, preferring the longest matching key.
+
+    Longest match keeps "h100 pcie" from resolving to "h100", and matching
+    whole tokens keeps "a100" from resolving to "a10". Dashes are treated as
+    spaces so nvidia-smi names like "NVIDIA A100-SXM4-80GB" match.
+
+    A MIG instance ("H100 MIG 1g.10gb") gets its parent's spec scaled to
+    its share: bandwidth by its memory slices, TFLOPS by its compute slices.
+
+    Args:
+        gpu_name: GPU name (e.g., "NVIDIA H100 80GB HBM3", "RTX 4090")
+
+    Returns:
+        GPUSpec if known, None otherwise
+    """
+    mig = parse_mig_name(gpu_name)
+    if mig is not None:
+        parent, profile = mig
+        spec = get_gpu_spec(parent)
+        if spec is None:
+            return None
+        return replace(
+            spec,
+            name=f"{spec.name} MIG {profile.name}",
+            memory_bandwidth_gbps=spec.memory_bandwidth_gbps * profile.memory_fraction,
+            fp16_tflops=spec.fp16_tflops * profile.compute_fraction,
+            fp8_tflops=spec.fp8_tflops and spec.fp8_tflops * profile.compute_fraction,
+            int8_tops=spec.int8_tops and spec.int8_tops * profile.compute_fraction,
+        )
+
+    key = longest_match(gpu_name, GPU_SPECS)
+    return GPU_SPECS[key] if key else None
+
+
+def _capability(gpu: GPUInfo) -> tuple[bool, float, float]:
+    """Sort key ranking GPUs by FP8 support, then bandwidth, then FLOPS."""
+    spec = get_gpu_spec(gpu.name) or DEFAULT_GPU_SPEC
+    return (spec.supports_fp8, spec.memory_bandwidth_gbps, spec.fp16_tflops)
+
+
+def slowest_gpu(gpus: list[GPUInfo]) -> GPUInfo:
+    """The GPU that bounds the speed of a group working in lockstep.
+
+    Tensor and pipeline parallel ranks wait on each other every step, so a
+    group runs at the pace of its slowest member. A GPU without FP8 tensor
+    cores ranks below any with them, since one such member keeps the whole
+    group off the FP8 path.
+
+    Args:
+        gpus: GPUs in the group
+
+    Returns:
+        The least capable GPU
+    """
+    return min(gpus, key=_capability)
+
+
+def device_group(gpus: list[GPUInfo], size: int) -> list[GPUInfo]:
+    """The GPUs a TP x PP group of the given size runs on.
+
+    Takes the largest GPUs first, then the fastest, since every rank is
+    bounded by the smallest and slowest member of its group.
+
+    Args:
+        gpus: Available GPUs
+        size: Ranks in the group (TP x PP)
+
+    Returns:
+        The size GPUs chosen for the group
+    """
+    ranked = sorted(gpus, key=lambda gpu: (gpu.vram_mib, _capability(gpu)), reverse=True)
+    return ranked[:size]
+
+
+def gpu_types(gpus: list[GPUInfo]) -> list[tuple[GPUInfo, int]]:
+    """Group GPUs by model and memory size.
+
+    Args:
+        gpus: GPUs to group
+
+    Returns:
+        (example GPU, count) per distinct type, largest memory first
+    """
+    counts: dict[tuple[str, int], list[GPUInfo]] = {}
+    for gpu in gpus:
+        counts.setdefault((gpu.name, gpu.vram_mib), []).append(gpu)
+    groups = [(members[0], len(members)) for members in counts.values()]
+    return sorted(groups, key=lambda group: group[0].vram_mib, reverse=True)
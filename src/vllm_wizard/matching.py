@@ -0,0 +1,62 @@
+"""Token-aligned longest-match lookup for model and GPU names."""
+
+import re
+from typing import Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Separators between name tokens; dots stay inside tokens ("llama-3.1-8b")
+_SEPARATORS = re.compile(r"[\s\-_/:]+")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name to lowercase tokens joined by single spaces.
+
+    "meta-llama/Llama-3.1-8B" and "meta llama llama 3.1 8b" normalize alike.
+
+    Args:
+        name: Model id, GPU name or table key
+
+    Returns:
+        Normalized name
+    """
+    return " ".join(token for token in _SEPARATORS.split(name.lower()) if token)
+
+
+def name_candidates(name: str) -> list[str]:
+    """List every contiguous run of tokens in a name, longest first.
+
+    Matching keys against these candidates instead of scanning the table for
+    substrings keeps lookups independent of table size, and stops "a10" from
+    matching "a100" or "llama-7b" from matching "codellama-7b".
+
+    Args:
+        name: Name to match
+
+    Returns:
+        Normalized candidate keys, longest first
+    """
+    tokens = normalize_name(name).split(" ")
+    candidates = {
+        " ".join(tokens[start:end])
+        for start in range(len(tokens))
+        for end in range(start + 1, len(tokens) + 1)
+    }
+    candidates.discard("")
+    return sorted(candidates, key=len, reverse=True)
+
+
+def longest_match(name: str, table: Mapping[str, T]) -> Optional[str]:
+    """Find the longest key of a table whose tokens appear contiguously in a name.
+
+    Args:
+        name: Name to match
+        table: Mapping keyed by normalized names
+
+    Returns:
+        Matching key, or None
+    """
+    for candidate in name_candidates(name):
+        if candidate in table:
+            return candidate
+    return None
@@ -1,13 +1,31 @@
 """Model metadata extraction and parsing."""
 
+from vllm_wizard.models.checkpoint import (
+    CheckpointInfo,
+    load_checkpoint_info,
+    read_safetensors_header,
+)
+from vllm_wizard.models.hub_cache import get_hf_hub_cache, resolve_hub_snapshot
 from vllm_wizard.models.metadata import (
     ModelMetadata,
     estimate_params_from_config,
+    import_model_configs,
     load_model_metadata,
+    lookup_registered_model,
 )
+from vllm_wizard.models.registry import ModelRegistry, get_registry_path
 
 __all__ = [
     "ModelMetadata",
     "load_model_metadata",
     "estimate_params_from_config",
+    "CheckpointInfo",
+    "load_checkpoint_info",
+    "read_safetensors_header",
+    "get_hf_hub_cache",
+    "resolve_hub_snapshot",
+    "ModelRegistry",
+    "get_registry_path",
+    "import_model_configs",
+    "lookup_registered_model",
 ]
@@ -0,0 +1,157 @@
+"""Exact weight sizes from safetensors checkpoint headers."""
+
+import json
+import math
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+# Full-precision dtypes that vLLM casts to 16-bit when dtype is "auto"
+AUTO_CAST_DTYPES = ("F64", "F32")
+
+SAFETENSORS_INDEX_FILE = "model.safetensors.index.json"
+
+# Headers larger than this are rejected as corrupt (the format caps them at 100 MB)
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+# Threads reading shard headers; header reads are small and I/O bound
+MAX_HEADER_WORKERS = 32
+
+
+@dataclass
+class CheckpointInfo:
+    """Tensor counts and sizes summed over all shards of a checkpoint."""
+
+    num_shards: int
+    num_tensors: int
+    num_elements: int
+    total_bytes: int
+    bytes_by_dtype: dict[str, int] = field(default_factory=dict)
+    elements_by_dtype: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def auto_dtype_bytes(self) -> int:
+        """Bytes once loaded with dtype "auto" (FP32/FP64 tensors cast to 16-bit)."""
+        total = 0
+        for dtype, size in self.bytes_by_dtype.items():
+            if dtype in AUTO_CAST_DTYPES:
+                total += self.elements_by_dtype[dtype] * 2
+            else:
+                total += size
+        return total
+
+
+def read_safetensors_header(path: Path) -> dict[str, Any]:
+    """Read the JSON header of a safetensors file without touching the tensor data.
+
+    The file starts with a little-endian u64 header length followed by the
+    JSON header, so two small reads suffice regardless of file size.
+
+    Args:
+        path: Path to a .safetensors file
+
+    Returns:
+        Parsed header mapping tensor names to dtype, shape and data_offsets
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError(f"Not a safetensors file: {path}")
+
+        (header_len,) = struct.unpack("<Q", prefix)
+        if header_len > MAX_HEADER_BYTES:
+            raise ValueError(f"Safetensors header too large in {path}")
+
+        header = f.read(header_len)
+        if len(header) != header_len:
+            raise ValueError(f"Truncated safetensors header in {path}")
+
+    return json.loads(header)
+
+
+def _summarize_header(header: dict[str, Any]) -> tuple[int, dict[str, int], dict[str, int]]:
+    """Count tensors and sum elements and bytes per dtype for one shard."""
+    num_tensors = 0
+    bytes_by_dtype: dict[str, int] = {}
+    elements_by_dtype: dict[str, int] = {}
+
+    for name, tensor in header.items():
+        if name == "__metadata__":
+            continue
+
+        dtype = tensor["dtype"]
+        start, end = tensor["data_offsets"]
+        num_tensors += 1
+        bytes_by_dtype[dtype] = bytes_by_dtype.get(dtype, 0) + (end - start)
+        elements_by_dtype[dtype] = elements_by_dtype.get(dtype, 0) + math.prod(tensor["shape"])
+
+    return num_tensors, bytes_by_dtype, elements_by_dtype
+
+
+def _read_shard_summary(path: Path) -> tuple[int, dict[str, int], dict[str, int]]:
+    """Read and summarize one shard header."""
+    return _summarize_header(read_safetensors_header(path))
+
+
+def find_safetensors_shards(model_dir: Path) -> list[Path]:
+    """List the safetensors shards of a local checkpoint.
+
+    Uses model.safetensors.index.json when present so stray files (e.g.
+    consolidated copies) are not double counted; otherwise globs *.safetensors.
+
+    Args:
+        model_dir: Local model directory
+
+    Returns:
+        Sorted shard paths (empty if the checkpoint is not in safetensors format)
+    """
+    index_path = model_dir / SAFETENSORS_INDEX_FILE
+    if index_path.exists():
+        with open(index_path, "r") as f:
+            weight_map: dict[str, str] = json.load(f).get("weight_map", {})
+        return sorted({model_dir / shard for shard in weight_map.values()})
+
+    return sorted(model_dir.glob("*.safetensors"))
+
+
+def load_checkpoint_info(
+    model_dir: Path,
+    max_workers: Optional[int] = None,
+) -> Optional[CheckpointInfo]:
+    """Sum tensor sizes over every safetensors shard in a model directory.
+
+    Only the headers are read, in parallel across shards, so even checkpoints
+    with hundreds of shards are summarized in milliseconds.
+
+    Args:
+        model_dir: Local model directory
+        max_workers: Header reader threads (default: one per shard, up to 32)
+
+    Returns:
+        CheckpointInfo, or None if the directory has no safetensors shards or
+        shards listed in the index are missing
+    """
+    shards = find_safetensors_shards(model_dir)
+    if not shards or not all(shard.exists() for shard in shards):
+        return None
+
+    workers = max_workers or min(MAX_HEADER_WORKERS, len(shards))
+    if workers <= 1:
+        summaries = [_read_shard_summary(shard) for shard in shards]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            summaries = list(executor.map(_read_shard_summary, shards))
+
+    info = CheckpointInfo(num_shards=len(shards), num_tensors=0, num_elements=0, total_bytes=0)
+    for num_tensors, bytes_by_dtype, elements_by_dtype in summaries:
+        info.num_tensors += num_tensors
+        for dtype, size in bytes_by_dtype.items():
+            info.bytes_by_dtype[dtype] = info.bytes_by_dtype.get(dtype, 0) + size
+            info.total_bytes += size
+        for dtype, count in elements_by_dtype.items():
+            info.elements_by_dtype[dtype] = info.elements_by_dtype.get(dtype, 0) + count
+            info.num_elements += count
+
+    return info
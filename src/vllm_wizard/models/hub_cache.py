@@ -0,0 +1,90 @@
+"""Offline lookup of model snapshots in the local Hugging Face hub cache."""
+
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+# Full commit hashes name snapshot directories
+_COMMIT_HASH = re.compile(r"^[0-9a-f]{40}$")
+
+DEFAULT_REVISION = "main"
+
+
+def get_hf_hub_cache() -> Path:
+    """Get the Hugging Face hub cache directory.
+
+    Follows huggingface_hub: HF_HUB_CACHE, then the legacy
+    HUGGINGFACE_HUB_CACHE, then HF_HOME/hub, then
+    $XDG_CACHE_HOME/huggingface/hub, then ~/.cache/huggingface/hub.
+
+    Returns:
+        Hub cache directory (may not exist)
+    """
+    for var in ("HF_HUB_CACHE", "HUGGINGFACE_HUB_CACHE"):
+        value = os.environ.get(var)
+        if value:
+            return Path(value).expanduser()
+
+    hf_home = os.environ.get("HF_HOME")
+    if hf_home:
+        return Path(hf_home).expanduser() / "hub"
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "huggingface" / "hub"
+
+
+def _repo_cache_dir(model_id: str, cache_dir: Path) -> Optional[Path]:
+    """Map "org/name" to the models--org--name cache folder."""
+    parts = model_id.strip("/").split("/")
+    if not parts or len(parts) > 2 or any(not part or part in (".", "..") for part in parts):
+        return None
+    return cache_dir / ("models--" + "--".join(parts))
+
+
+def resolve_hub_snapshot(
+    model_id: str,
+    revision: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+) -> Optional[Path]:
+    """Find the cached snapshot of a model that has a config.json.
+
+    The revision may be a branch or tag (resolved through refs/) or a commit
+    hash. Without a revision, refs/main is used; if it is missing the most
+    recently modified snapshot with a config.json is picked.
+
+    Args:
+        model_id: HF model id (e.g., "meta-llama/Llama-3.1-8B-Instruct")
+        revision: Branch, tag or commit hash
+        cache_dir: Hub cache directory (default: get_hf_hub_cache())
+
+    Returns:
+        Snapshot directory, or None if the model is not cached
+    """
+    repo_dir = _repo_cache_dir(model_id, cache_dir or get_hf_hub_cache())
+    if repo_dir is None or not repo_dir.is_dir():
+        return None
+
+    snapshots = repo_dir / "snapshots"
+    ref = revision or DEFAULT_REVISION
+
+    commit: Optional[str] = None
+    ref_file = repo_dir / "refs" / ref
+    if ref_file.is_file():
+        commit = ref_file.read_text().strip()
+    elif _COMMIT_HASH.match(ref):
+        commit = ref
+
+    if commit:
+        snapshot = snapshots / commit
+        return snapshot if (snapshot / "config.json").exists() else None
+
+    # An explicit revision that cannot be resolved must not fall back
+    if revision or not snapshots.is_dir():
+        return None
+
+    candidates = [s for s in snapshots.iterdir() if (s / "config.json").exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda s: s.stat().st_mtime)
@@ -1,9 +1,14 @@
 """Model metadata extraction - offline estimation."""
 
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+from vllm_wizard.matching import longest_match, normalize_name
+from vllm_wizard.models.checkpoint import load_checkpoint_info
+from vllm_wizard.models.hub_cache import resolve_hub_snapshot
+from vllm_wizard.models.registry import ModelRegistry
 
 
 @dataclass
@@ -19,12 +24,30 @@ class ModelMetadata:
     model_type: str
     intermediate_size: Optional[int] = None
     num_params: Optional[int] = None
+    weights_bytes: Optional[int] = None  # Exact checkpoint size as loaded with dtype auto
+    quant_method: Optional[str] = None  # Quantization the checkpoint is stored in
+    config_head_dim: Optional[int] = None  # Explicit head_dim from config.json
+    num_experts: Optional[int] = None  # Routed experts per MoE layer
+    num_experts_per_tok: Optional[int] = None  # Experts activated per token
+    tie_word_embeddings: bool = False  # lm_head shares the input embedding
 
     @property
     def head_dim(self) -> int:
-        """Compute head dimension."""
+        """Head dimension, from config.json when given, else hidden_size / heads."""
+        if self.config_head_dim:
+            return self.config_head_dim
         return self.hidden_size // self.num_attention_heads
 
+    def to_record(self) -> dict[str, Any]:
+        """Serialize to a plain dict for the model registry."""
+        return asdict(self)
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "ModelMetadata":
+        """Build from a registry record, ignoring keys this version does not know."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in record.items() if key in known})
+
     @property
     def params_billions(self) -> Optional[float]:
         """Return parameters in billions if known."""
@@ -70,6 +93,11 @@ KNOWN_MODEL_SIZES: dict[str, float] = {
     "codellama-34b": 34.0,
 }
 
+# KNOWN_MODEL_SIZES keyed by normalized name for token-aligned lookups
+_KNOWN_MODEL_INDEX: dict[str, float] = {
+    normalize_name(key): params_b for key, params_b in KNOWN_MODEL_SIZES.items()
+}
+
 
 def _load_config_from_path(config_path: Path) -> dict[str, Any]:
     """Load config.json from a local path."""
@@ -127,6 +155,13 @@ def _parse_config(config: dict[str, Any], model_id: str) -> ModelMetadata:
         "intermediate_size", config.get("ffn_dim", config.get("n_inner"))
     )
 
+    quant_method = (config.get("quantization_config") or {}).get("quant_method")
+
+    # MoE shape: Mixtral/Qwen-MoE/DeepSeek name the expert count differently
+    num_experts = config.get(
+        "num_local_experts", config.get("num_experts", config.get("n_routed_experts"))
+    )
+
     return ModelMetadata(
         num_hidden_layers=num_hidden_layers,
         hidden_size=hidden_size,
@@ -136,6 +171,11 @@ def _parse_config(config: dict[str, Any], model_id: str) -> ModelMetadata:
         max_position_embeddings=max_position_embeddings,
         model_type=model_type,
         intermediate_size=intermediate_size,
+        quant_method=quant_method,
+        config_head_dim=config.get("head_dim"),
+        num_experts=num_experts,
+        num_experts_per_tok=config.get("num_experts_per_tok"),
+        tie_word_embeddings=bool(config.get("tie_word_embeddings", False)),
     )
 
 
@@ -172,19 +212,96 @@ def estimate_params_from_config(metadata: ModelMetadata) -> int:
 def lookup_known_model_size(model_id: str) -> Optional[float]:
     """Look up model size from known model table.
 
+    The longest known name whose tokens appear in the model id wins, so
+    "codellama-7b" never resolves to a "llama" entry.
+
     Args:
         model_id: Model ID or path
 
     Returns:
         Parameters in billions if found, None otherwise
     """
-    model_lower = model_id.lower()
+    key = longest_match(model_id, _KNOWN_MODEL_INDEX)
+    return _KNOWN_MODEL_INDEX[key] if key is not None else None
+
 
-    for key, params_b in KNOWN_MODEL_SIZES.items():
-        if key in model_lower:
-            return params_b
+def _metadata_from_dir(model_dir: Path) -> ModelMetadata:
+    """Build metadata from a local directory with config.json and optional safetensors."""
+    config = _load_config_from_path(model_dir / "config.json")
+    metadata = _parse_config(config, str(model_dir))
+    metadata.num_params = estimate_params_from_config(metadata)
+
+    checkpoint = load_checkpoint_info(model_dir)
+    if checkpoint is not None:
+        metadata.weights_bytes = checkpoint.auto_dtype_bytes
+        # Packed quantized tensors hold several parameters per element
+        if metadata.quant_method is None:
+            metadata.num_params = checkpoint.num_elements
+
+    return metadata
 
-    return None
+
+def _iter_config_files(directory: Path) -> Iterator[tuple[str, Path]]:
+    """Yield (model name, config path) for every config under a directory.
+
+    <dir>/config.json is named after the directory, <dir>/<name>.json after
+    the file stem, and <dir>/<org>/<name>/config.json after its relative path.
+    """
+    if (directory / "config.json").is_file():
+        yield directory.name, directory / "config.json"
+
+    for config_path in sorted(directory.glob("*.json")):
+        if config_path.name != "config.json":
+            yield config_path.stem, config_path
+
+    for config_path in sorted(directory.glob("*/**/config.json")):
+        yield config_path.parent.relative_to(directory).as_posix(), config_path
+
+
+def import_model_configs(directory: Path, registry: Optional[ModelRegistry] = None) -> list[str]:
+    """Register the architecture of every model config found under a directory.
+
+    Model directories also pick up exact parameter counts and weight sizes
+    from their safetensors headers. All records are written in one transaction.
+
+    Args:
+        directory: Directory of model directories and/or config JSON files
+        registry: Target registry (default: the user registry)
+
+    Returns:
+        Names of the imported models
+    """
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Not a directory: {directory}")
+
+    records: list[tuple[str, dict[str, Any]]] = []
+    for name, config_path in _iter_config_files(directory):
+        if config_path.name == "config.json":
+            metadata = _metadata_from_dir(config_path.parent)
+        else:
+            metadata = _parse_config(_load_config_from_path(config_path), name)
+            metadata.num_params = estimate_params_from_config(metadata)
+        records.append((name, metadata.to_record()))
+
+    if registry is None:
+        registry = ModelRegistry()
+    registry.add_many(records)
+    return [name for name, _ in records]
+
+
+def lookup_registered_model(model_id: str) -> Optional[ModelMetadata]:
+    """Look up a model in the user registry by exact or longest token match.
+
+    Args:
+        model_id: Model ID or path
+
+    Returns:
+        Registered ModelMetadata, or None
+    """
+    match = ModelRegistry().lookup(model_id)
+    if match is None:
+        return None
+    return ModelMetadata.from_record(match[1])
 
 
 def load_model_metadata(
@@ -195,54 +312,58 @@ def load_model_metadata(
 ) -> ModelMetadata:
     """Load model metadata from local path or estimate from known model families.
 
-    This function does NOT download models from HuggingFace. For VRAM estimation,
-    we only need the parameter count which can be provided via --params-b or
-    looked up from known model sizes.
+    This function does NOT download models from HuggingFace. Model ids are
+    resolved against the local hub cache (HF_HUB_CACHE / HF_HOME) at the given
+    revision, so cached models use their real config.json offline. Otherwise
+    the model is looked up in the registry (vllm-wizard registry import), and
+    finally the parameter count is provided via --params-b or looked up from
+    known model sizes. For directories with safetensors shards, exact parameter
+    counts and weight bytes are read from the headers.
 
     Args:
-        model_id_or_path: Model identifier (used for size lookup)
-        revision: Ignored (kept for API compatibility)
+        model_id_or_path: Local path or HF model id
+        revision: Branch, tag or commit hash to resolve in the hub cache
         trust_remote_code: Ignored (kept for API compatibility)
-        params_b: Parameter count in billions. If provided, skips HF download.
+        params_b: Parameter count in billions. If provided, the config is estimated from it.
 
     Returns:
         ModelMetadata with extracted architecture information
     """
-    # If params_b is provided or can be looked up, use estimated config
-    if params_b is None:
-        params_b = lookup_known_model_size(model_id_or_path)
+    model_dir: Optional[Path] = None
 
-    if params_b is not None:
-        # Generate estimated config based on parameter count
-        config = _estimate_config_from_params(params_b)
-    else:
-        # Try to load from local path
+    if params_b is None:
         path = Path(model_id_or_path)
         if path.exists() and path.is_dir():
-            config_path = path / "config.json"
-            if config_path.exists():
-                config = _load_config_from_path(config_path)
-            else:
+            if not (path / "config.json").exists():
                 raise FileNotFoundError(
                     f"config.json not found in {path}. "
                     f"Provide --params-b to estimate without config file."
                 )
+            model_dir = path
         else:
-            # Unknown model without params - use a safe default
-            raise ValueError(
-                f"Cannot determine model parameters for '{model_id_or_path}'.\n"
-                f"Please provide --params-b (e.g., --params-b 7 for 7B model)."
-            )
+            model_dir = resolve_hub_snapshot(model_id_or_path, revision)
 
-    metadata = _parse_config(config, model_id_or_path)
+        if model_dir is not None:
+            return _metadata_from_dir(model_dir)
 
-    # Set parameter count
-    if params_b is not None:
-        metadata.num_params = int(params_b * 1e9)
-    else:
-        # Estimate from config
-        metadata.num_params = estimate_params_from_config(metadata)
+        registered = lookup_registered_model(model_id_or_path)
+        if registered is not None:
+            return registered
+
+        params_b = lookup_known_model_size(model_id_or_path)
+
+    if params_b is None:
+        revision_note = f" at revision '{revision}'" if revision else ""
+        raise ValueError(
+            f"Cannot determine model parameters for '{model_id_or_path}'. "
+            f"It is not a local directory, cached in the Hugging Face hub{revision_note}, "
+            f"or in the model registry.\n"
+            f"Please provide --params-b (e.g., --params-b 7 for 7B model)."
+        )
 
+    # Generate estimated config based on parameter count
+    metadata = _parse_config(_estimate_config_from_params(params_b), model_id_or_path)
+    metadata.num_params = int(params_b * 1e9)
     return metadata
 
 
@@ -0,0 +1,174 @@
+"""Persistent SQLite registry of model architecture records."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from vllm_wizard.cache import get_data_dir
+from vllm_wizard.matching import name_candidates, normalize_name
+
+REGISTRY_FILE = "registry.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    record TEXT NOT NULL
+)
+"""
+
+# SQLite's default limit on bound parameters per statement
+_MAX_QUERY_PARAMS = 999
+
+
+def get_registry_path() -> Path:
+    """Return the default registry database path."""
+    return get_data_dir() / REGISTRY_FILE
+
+
+class ModelRegistry:
+    """Architecture records keyed by normalized model name.
+
+    Records are JSON objects stored under the normalized name, so both exact and
+    longest-match lookups are primary-key probes and stay O(log n) as the
+    registry grows.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or get_registry_path()
+
+    def _connect(self, create: bool = False) -> Optional[sqlite3.Connection]:
+        """Open the database, or return None if it does not exist and create is False."""
+        if not create and not self.path.exists():
+            return None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute(_SCHEMA)
+        return conn
+
+    def add_many(self, records: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        """Insert or replace records in one transaction.
+
+        Args:
+            records: (model name, architecture record) pairs
+
+        Returns:
+            Number of records written
+        """
+        rows = [(normalize_name(name), name, json.dumps(record)) for name, record in records]
+        if not rows:
+            return 0
+
+        conn = self._connect(create=True)
+        assert conn is not None
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO models (key, name, record) VALUES (?, ?, ?)", rows
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def add(self, name: str, record: dict[str, Any]) -> None:
+        """Insert or replace one record."""
+        self.add_many([(name, record)])
+
+    def get(self, name: str) -> Optional[dict[str, Any]]:
+        """Look up a record by exact (normalized) name.
+
+        Args:
+            name: Model name
+
+        Returns:
+            Architecture record, or None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        try:
+            row = conn.execute(
+                "SELECT record FROM models WHERE key = ?", (normalize_name(name),)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def lookup(self, model_id: str) -> Optional[tuple[str, dict[str, Any]]]:
+        """Find the longest registered name whose tokens appear in a model id.
+
+        An exact match is the longest possible match, so it always wins.
+
+        Args:
+            model_id: Model id or path (e.g., "acme/llama-3.1-8b-support-ft")
+
+        Returns:
+            (registered name, record), or None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        candidates = name_candidates(model_id)[:_MAX_QUERY_PARAMS]
+        if not candidates:
+            conn.close()
+            return None
+
+        placeholders = ",".join("?" * len(candidates))
+        try:
+            rows = conn.execute(
+                f"SELECT key, name, record FROM models WHERE key IN ({placeholders})", candidates
+            ).fetchall()
+        finally:
+            conn.close()
+
+        if not rows:
+            return None
+
+        _, name, record = max(rows, key=lambda row: len(row[0]))
+        return name, json.loads(record)
+
+    def remove(self, name: str) -> bool:
+        """Delete a record by exact name.
+
+        Returns:
+            True if a record was deleted
+        """
+        conn = self._connect()
+        if conn is None:
+            return False
+
+        try:
+            with conn:
+                cursor = conn.execute("DELETE FROM models WHERE key = ?", (normalize_name(name),))
+        finally:
+            conn.close()
+        return cursor.rowcount > 0
+
+    def __iter__(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Iterate over (name, record) pairs in name order."""
+        conn = self._connect()
+        if conn is None:
+            return
+
+        try:
+            rows = conn.execute("SELECT name, record FROM models ORDER BY key").fetchall()
+        finally:
+            conn.close()
+
+        for name, record in rows:
+            yield name, json.loads(record)
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        if conn is None:
+            return 0
+
+        try:
+            (count,) = conn.execute("SELECT COUNT(*) FROM models").fetchone()
+        finally:
+            conn.close()
+        return count
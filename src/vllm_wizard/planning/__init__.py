@@ -1,31 +1,96 @@
 """Planning module for VRAM calculations and recommendations."""
 
+from vllm_wizard.planning.fleet import place_fleet
 from vllm_wizard.planning.memory import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_MAX_CUDA_GRAPH_SIZE,
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    DEFAULT_MAX_NUM_SEQS,
     DTYPE_BYTES,
+    compute_activation_memory,
+    compute_blocks_per_seq,
+    compute_cuda_graph_memory,
     compute_feasibility,
+    compute_kv_block_bytes,
     compute_kv_cache_memory,
     compute_max_concurrency_at_context,
     compute_max_context_at_concurrency,
+    compute_num_gpu_blocks,
     compute_overhead,
     compute_weights_memory,
+    cuda_graph_capture_sizes,
+    free_memory_at_start,
+    get_kv_bytes_per_element,
+    split_memory_utilization,
 )
-from vllm_wizard.planning.perf import estimate_performance
-from vllm_wizard.planning.planner import run_plan
+from vllm_wizard.planning.mig import plan_mig_layout
+from vllm_wizard.planning.perf import RooflinePoint, compute_roofline, estimate_performance
+from vllm_wizard.planning.planner import run_colocated_plan, run_plan
 from vllm_wizard.planning.recommend import generate_recommendations
+from vllm_wizard.planning.replicas import run_replica_plan, search_replica_layouts
+from vllm_wizard.planning.search import SearchPoint, SearchResult, pareto_frontier, run_search
+from vllm_wizard.planning.simulator import SimulationResult, run_simulation, simulate
+from vllm_wizard.planning.slo import SLOCandidate, run_slo_plan, search_slo_configs
+from vllm_wizard.planning.sweep import SweepResult, compute_sweep, run_sweep
+from vllm_wizard.planning.trace import concurrent_kv_tokens, read_trace, trace_arrivals
 
 __all__ = [
     # Memory
     "DTYPE_BYTES",
+    "DEFAULT_BLOCK_SIZE",
+    "DEFAULT_MAX_CUDA_GRAPH_SIZE",
+    "DEFAULT_MAX_NUM_BATCHED_TOKENS",
+    "DEFAULT_MAX_NUM_SEQS",
+    "compute_activation_memory",
+    "compute_cuda_graph_memory",
+    "cuda_graph_capture_sizes",
     "compute_weights_memory",
     "compute_kv_cache_memory",
     "compute_overhead",
     "compute_feasibility",
     "compute_max_concurrency_at_context",
     "compute_max_context_at_concurrency",
+    "get_kv_bytes_per_element",
+    "compute_kv_block_bytes",
+    "compute_blocks_per_seq",
+    "compute_num_gpu_blocks",
+    "split_memory_utilization",
+    "free_memory_at_start",
+    # Fleet
+    "place_fleet",
+    # MIG
+    "plan_mig_layout",
     # Perf
+    "RooflinePoint",
+    "compute_roofline",
     "estimate_performance",
     # Recommend
     "generate_recommendations",
     # Planner
     "run_plan",
+    "run_colocated_plan",
+    # Replicas
+    "search_replica_layouts",
+    "run_replica_plan",
+    # Search
+    "SearchPoint",
+    "SearchResult",
+    "pareto_frontier",
+    "run_search",
+    # Simulator
+    "SimulationResult",
+    "simulate",
+    "run_simulation",
+    # SLO
+    "SLOCandidate",
+    "search_slo_configs",
+    "run_slo_plan",
+    # Sweep
+    "SweepResult",
+    "compute_sweep",
+    "run_sweep",
+    # Trace
+    "read_trace",
+    "concurrent_kv_tokens",
+    "trace_arrivals",
 ]
@@ -0,0 +1,100 @@
+"""Batch planning over JSONL request files with a process pool."""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from vllm_wizard.planning.planner import run_plan
+from vllm_wizard.planning.slo import has_latency_targets, run_slo_plan
+from vllm_wizard.schemas.inputs import PlanRequest
+
+# Pending futures allowed per worker; bounds memory for arbitrarily large inputs
+INFLIGHT_PER_WORKER = 4
+
+
+def iter_request_lines(path: Path) -> Iterator[tuple[int, str]]:
+    """Lazily read non-empty lines from a JSONL file.
+
+    Args:
+        path: Path to a JSONL file with one PlanRequest per line
+
+    Yields:
+        (index, line) pairs where index is the 0-based line number
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Batch file not found: {path}")
+
+    with open(path, "r") as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if line:
+                yield index, line
+
+
+def plan_line(index: int, line: str) -> str:
+    """Plan a single JSONL request line and return one NDJSON result line.
+
+    Errors are reported in the result instead of raised, so one bad record
+    does not abort the batch.
+
+    Args:
+        index: Line number of the request
+        line: PlanRequest JSON
+
+    Returns:
+        NDJSON line with either "response" or "error"
+    """
+    try:
+        request = PlanRequest.model_validate_json(line)
+        if has_latency_targets(request.workload) and not request.colocate:
+            response = run_slo_plan(request)
+        else:
+            response = run_plan(request)
+    except Exception as e:
+        return json.dumps({"index": index, "error": str(e)})
+
+    return f'{{"index": {index}, "response": {response.model_dump_json()}}}'
+
+
+def run_batch(
+    lines: Iterable[tuple[int, str]],
+    workers: Optional[int] = None,
+) -> Iterator[str]:
+    """Plan requests across a process pool, yielding results as they complete.
+
+    Results are yielded in completion order, not input order; each carries the
+    index of its input line. At most INFLIGHT_PER_WORKER requests per worker are
+    queued at a time, so memory use does not grow with the input size.
+
+    Args:
+        lines: (index, line) pairs, e.g. from iter_request_lines
+        workers: Number of worker processes (default: CPU count; 1 plans in-process)
+
+    Yields:
+        NDJSON result lines
+    """
+    num_workers = workers or os.cpu_count() or 1
+
+    if num_workers <= 1:
+        for index, line in lines:
+            yield plan_line(index, line)
+        return
+
+    max_inflight = num_workers * INFLIGHT_PER_WORKER
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending: set[Future[str]] = set()
+
+        for index, line in lines:
+            pending.add(executor.submit(plan_line, index, line))
+            if len(pending) >= max_inflight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
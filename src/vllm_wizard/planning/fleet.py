@@ -0,0 +1,368 @@
+"""Fleet placement: bin-pack many models onto a GPU inventory."""
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import yaml
+
+from vllm_wizard.planning.memory import is_valid_tp_size
+from vllm_wizard.planning.planner import run_plan
+from vllm_wizard.planning.slo import load_plan_inputs
+from vllm_wizard.schemas.fleet import (
+    FleetEntries,
+    FleetEntry,
+    FleetInventory,
+    FleetNode,
+    FleetPlacement,
+    FleetPlan,
+    FleetUnplaced,
+)
+from vllm_wizard.schemas.inputs import HardwareInput, PlanRequest
+
+
+def _load_yaml(path: Path) -> Any:
+    """Read a YAML (or JSON) file."""
+    if not path.exists():
+        raise FileNotFoundError(f"Fleet file not found: {path}")
+
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_inventory(path: Path) -> FleetInventory:
+    """Load a GPU inventory from YAML or JSON.
+
+    Args:
+        path: File with a "nodes" list, or the list itself
+
+    Returns:
+        Parsed inventory
+    """
+    data = _load_yaml(path)
+    if isinstance(data, list):
+        data = {"nodes": data}
+    return FleetInventory.model_validate(data)
+
+
+def load_entries(path: Path) -> list[FleetEntry]:
+    """Load fleet entries from YAML or JSON.
+
+    Args:
+        path: File with an "entries" list, or the list itself
+
+    Returns:
+        Parsed entries
+    """
+    data = _load_yaml(path)
+    if isinstance(data, list):
+        data = {"entries": data}
+    return FleetEntries.model_validate(data).entries
+
+
+def load_fleet_plan(path: Path) -> FleetPlan:
+    """Load a placement written by a previous fleet run.
+
+    Args:
+        path: JSON or YAML placement file
+
+    Returns:
+        Parsed placement
+    """
+    return FleetPlan.model_validate(_load_yaml(path))
+
+
+def entry_fingerprint(entry: FleetEntry) -> str:
+    """Hash everything about an entry except its name.
+
+    Args:
+        entry: Fleet entry
+
+    Returns:
+        Short hex digest; equal specs under different names share it
+    """
+    spec = entry.model_dump_json(exclude={"name"})
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+@dataclass
+class EntryDemand:
+    """Smallest tensor parallel group an entry fits on, for one GPU type."""
+
+    tensor_parallel_size: int
+    headroom_gb: float
+    serve_command: str
+
+
+def _node_kind(node: FleetNode) -> tuple:
+    """Nodes of the same kind size every entry identically."""
+    return (node.gpu, node.vram_gb, node.interconnect)
+
+
+def entry_request(entry: FleetEntry, node: FleetNode, tp_size: int) -> PlanRequest:
+    """Planning request for an entry on tp_size GPUs of a node.
+
+    Args:
+        entry: Fleet entry
+        node: Node supplying the GPU type
+        tp_size: Tensor parallel size
+
+    Returns:
+        PlanRequest for a single-stage replica on tp_size GPUs
+    """
+    return PlanRequest(
+        model=entry.model,
+        hardware=HardwareInput(
+            gpu=node.gpu,
+            gpus=tp_size,
+            vram_gb=node.vram_gb,
+            interconnect=node.interconnect,
+            tensor_parallel_size=tp_size,
+            pipeline_parallel_size=1,
+        ),
+        workload=entry.workload,
+        policy=entry.policy,
+    )
+
+
+def size_entry(entry: FleetEntry, node: FleetNode, max_gpus: int) -> EntryDemand:
+    """Find the smallest TP size at which an entry fits a node's GPU type.
+
+    Feasibility is run_plan's: weights, KV cache, activations and CUDA
+    graphs per rank. TP sizes must be ones vLLM can shard the attention and
+    KV heads over, and stay within one node.
+
+    Args:
+        entry: Fleet entry
+        node: Node supplying the GPU type
+        max_gpus: Largest TP size to try (GPUs in the biggest node of the type)
+
+    Returns:
+        Demand at the smallest fitting TP size
+
+    Raises:
+        ValueError: If the entry does not fit on up to max_gpus GPUs
+    """
+    metadata, _, _ = load_plan_inputs(entry_request(entry, node, 1))
+
+    if entry.tensor_parallel_size is not None:
+        candidates = [entry.tensor_parallel_size]
+    else:
+        candidates = [
+            tp_size for tp_size in range(1, max_gpus + 1) if is_valid_tp_size(metadata, tp_size)
+        ]
+
+    for tp_size in candidates:
+        if tp_size > max_gpus:
+            break
+        response = run_plan(entry_request(entry, node, tp_size))
+        if response.feasibility.fits:
+            return EntryDemand(
+                tensor_parallel_size=tp_size,
+                headroom_gb=response.feasibility.headroom_gb,
+                serve_command=response.artifacts.serve_command,
+            )
+
+    raise ValueError(f"does not fit on up to {max_gpus} x {node.gpu}")
+
+
+@dataclass
+class _NodeState:
+    """Free GPUs of a node during placement."""
+
+    node: FleetNode
+    free: list[bool] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.free = [True] * self.node.gpus
+
+    @property
+    def num_free(self) -> int:
+        return sum(self.free)
+
+    def can_take(self, indices: list[int]) -> bool:
+        return all(0 <= i < self.node.gpus and self.free[i] for i in indices)
+
+    def take(self, indices: list[int]) -> None:
+        for i in indices:
+            self.free[i] = False
+
+    def allocate(self, size: int, preferred: Optional[list[int]] = None) -> list[int]:
+        """Claim size GPUs, keeping preferred ones, else an aligned block.
+
+        Blocks aligned to their size keep TP groups on neighbouring GPUs
+        (NVLink pairs/quads) and, with sizes placed largest first, avoid
+        fragmenting the node.
+        """
+        if preferred is not None and len(preferred) == size and self.can_take(preferred):
+            indices = list(preferred)
+        else:
+            indices = []
+            for start in range(0, self.node.gpus - size + 1, size):
+                block = list(range(start, start + size))
+                if self.can_take(block):
+                    indices = block
+                    break
+            if not indices:
+                indices = [i for i, free in enumerate(self.free) if free][:size]
+
+        self.take(indices)
+        return indices
+
+
+def place_fleet(
+    inventory: FleetInventory,
+    entries: list[FleetEntry],
+    previous: Optional[FleetPlan] = None,
+) -> FleetPlan:
+    """Place entries onto the inventory using the fewest GPUs.
+
+    Each entry is sized once per GPU type (the smallest TP group that fits)
+    and identical specs share the result. Entries are then placed by
+    best-fit decreasing: largest demand first, each onto the node where it
+    needs the fewest GPUs, breaking ties by the least VRAM headroom (so
+    small models take small GPUs) and then the least free capacity left
+    over. This is O(entries x nodes); as a heuristic it can leave GPUs
+    idle that an exact packing would fill.
+
+    With a previous plan, unchanged entries stay on their GPUs and only
+    new or changed entries (or those whose GPUs disappeared) are placed;
+    a changed entry prefers its previous node and GPUs.
+
+    Args:
+        inventory: Nodes and GPUs available
+        entries: Models and workloads to place
+        previous: Placement from an earlier run, for incremental re-placement
+
+    Returns:
+        FleetPlan with placements, unplaced entries and usage totals
+
+    Raises:
+        ValueError: If node or entry names are not unique
+    """
+    node_names = [node.name for node in inventory.nodes]
+    entry_names = [entry.name for entry in entries]
+    for kind, names in (("node", node_names), ("entry", entry_names)):
+        duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate {kind} names: {', '.join(duplicates)}")
+
+    states = [_NodeState(node) for node in inventory.nodes]
+    states_by_name = {state.node.name: state for state in states}
+    entries_by_name = {entry.name: entry for entry in entries}
+    fingerprints = {entry.name: entry_fingerprint(entry) for entry in entries}
+
+    # Keep unchanged entries where they were
+    placements: dict[str, FleetPlacement] = {}
+    previous_by_entry: dict[str, FleetPlacement] = {}
+    kept: list[str] = []
+    for placement in previous.placements if previous else []:
+        previous_by_entry[placement.entry] = placement
+        state = states_by_name.get(placement.node)
+        if (
+            placement.entry in entries_by_name
+            and fingerprints[placement.entry] == placement.fingerprint
+            and state is not None
+            and state.node.gpu == placement.gpu
+            and state.can_take(placement.gpu_indices)
+        ):
+            state.take(placement.gpu_indices)
+            placements[placement.entry] = placement
+            kept.append(placement.entry)
+
+    # Size pending entries once per (spec, GPU type)
+    max_gpus_by_kind: dict[tuple, int] = {}
+    node_by_kind: dict[tuple, FleetNode] = {}
+    for node in inventory.nodes:
+        kind = _node_kind(node)
+        max_gpus_by_kind[kind] = max(max_gpus_by_kind.get(kind, 0), node.gpus)
+        node_by_kind.setdefault(kind, node)
+
+    cache: dict[tuple[str, tuple], Union[EntryDemand, str]] = {}
+    demands: dict[str, dict[tuple, EntryDemand]] = {}
+    unplaced: list[FleetUnplaced] = []
+    for entry in entries:
+        if entry.name in placements:
+            continue
+        options: dict[tuple, EntryDemand] = {}
+        reasons: list[str] = []
+        for kind, node in node_by_kind.items():
+            key = (fingerprints[entry.name], kind)
+            if key not in cache:
+                try:
+                    cache[key] = size_entry(entry, node, max_gpus_by_kind[kind])
+                except (ValueError, FileNotFoundError) as e:
+                    cache[key] = str(e)
+            result = cache[key]
+            if isinstance(result, EntryDemand):
+                options[kind] = result
+            elif result not in reasons:
+                reasons.append(result)
+        if options:
+            demands[entry.name] = options
+        else:
+            unplaced.append(FleetUnplaced(entry=entry.name, reason="; ".join(reasons)))
+
+    # Best-fit decreasing over the remaining capacity
+    def smallest_demand(name: str) -> int:
+        return min(demand.tensor_parallel_size for demand in demands[name].values())
+
+    for name in sorted(demands, key=lambda name: (-smallest_demand(name), name)):
+        prior = previous_by_entry.get(name)
+        best = None
+        for order, state in enumerate(states):
+            demand = demands[name].get(_node_kind(state.node))
+            if demand is None or state.num_free < demand.tensor_parallel_size:
+                continue
+            key = (
+                demand.tensor_parallel_size,
+                prior is None or prior.node != state.node.name,
+                demand.headroom_gb,
+                state.num_free - demand.tensor_parallel_size,
+                order,
+            )
+            if best is None or key < best[0]:
+                best = (key, state, demand)
+
+        if best is None:
+            unplaced.append(
+                FleetUnplaced(
+                    entry=name,
+                    reason=f"no node has {smallest_demand(name)} free GPU(s) of a fitting type",
+                )
+            )
+            continue
+
+        _, state, demand = best
+        preferred = prior.gpu_indices if prior and prior.node == state.node.name else None
+        indices = state.allocate(demand.tensor_parallel_size, preferred)
+        devices = ",".join(map(str, indices))
+        placements[name] = FleetPlacement(
+            entry=name,
+            fingerprint=fingerprints[name],
+            node=state.node.name,
+            gpu=state.node.gpu,
+            gpu_indices=indices,
+            tensor_parallel_size=demand.tensor_parallel_size,
+            headroom_gb=round(demand.headroom_gb, 2),
+            serve_command=f"CUDA_VISIBLE_DEVICES={devices} {demand.serve_command}",
+        )
+
+    node_order = {name: order for order, name in enumerate(node_names)}
+    ordered = sorted(
+        placements.values(),
+        key=lambda p: (node_order[p.node], min(p.gpu_indices, default=0)),
+    )
+    entry_order = {name: order for order, name in enumerate(entry_names)}
+    unplaced.sort(key=lambda u: entry_order[u.entry])
+
+    return FleetPlan(
+        placements=ordered,
+        unplaced=unplaced,
+        gpus_used=sum(len(p.gpu_indices) for p in ordered),
+        gpus_total=sum(node.gpus for node in inventory.nodes),
+        nodes_used=len({p.node for p in ordered}),
+        kept=sorted(kept, key=lambda name: entry_order[name]),
+    )
@@ -27,22 +27,56 @@ QUANT_BYTES: dict[str, float] = {
 # Bytes to GiB conversion
 BYTES_TO_GIB = 1024**3
 
+# vLLM's default tokens per KV cache block
+DEFAULT_BLOCK_SIZE = 16
+
+# Scheduler defaults assumed when no recommendation is available
+DEFAULT_MAX_NUM_BATCHED_TOKENS = 8192
+DEFAULT_MAX_NUM_SEQS = 256
+
+# The sampler upcasts logits to fp32 and holds logits, probs and logprobs at once
+SAMPLER_BYTES_PER_LOGIT = 4
+SAMPLER_VOCAB_BUFFERS = 3
+
+# vLLM pads the vocabulary to a multiple of this before splitting it across TP ranks
+VOCAB_PADDING_SIZE = 64
+
+# vLLM captures decode CUDA graphs for batch sizes up to this by default
+DEFAULT_MAX_CUDA_GRAPH_SIZE = 512
+
+# Captured kernel nodes and their parameters, per layer per captured batch size
+CUDA_GRAPH_BYTES_PER_LAYER = 384 * 1024
+
 
 def compute_weights_memory(
     params_b: float,
     dtype: DType = DType.AUTO,
     quantization: Quantization = Quantization.NONE,
+    metadata: Optional[ModelMetadata] = None,
 ) -> int:
     """Compute model weights memory in bytes.
 
+    Uses the exact checkpoint size from safetensors headers when the weights
+    are loaded as stored: dtype auto with no quantization, or the quantization
+    the checkpoint was saved in.
+
     Args:
         params_b: Model parameters in billions
         dtype: Weight data type
         quantization: Quantization method
+        metadata: Model metadata with the checkpoint size, if known
 
     Returns:
         Memory in bytes
     """
+    if metadata is not None and metadata.weights_bytes:
+        if metadata.quant_method:
+            as_stored = quantization in (Quantization.NONE, metadata.quant_method)
+        else:
+            as_stored = quantization == Quantization.NONE and dtype == DType.AUTO
+        if as_stored:
+            return metadata.weights_bytes
+
     params = int(params_b * 1e9)
 
     # Determine bytes per parameter
@@ -56,13 +90,177 @@ def compute_weights_memory(
     return int(params * bytes_per_param)
 
 
+def pipeline_stage_layers(num_layers: int, pp_size: int = 1) -> list[int]:
+    """Decoder layers held by each pipeline stage, as vLLM partitions them.
+
+    Layers are split evenly; the remainder goes to the stages just before
+    the last one, which already holds the final norm and lm_head.
+
+    Args:
+        num_layers: Decoder layers of the model
+        pp_size: Pipeline parallel size
+
+    Returns:
+        Layer count per stage, first stage first
+    """
+    partitions = [num_layers // pp_size] * pp_size
+    for i in range(2, num_layers % pp_size + 2):
+        partitions[-i] += 1
+    return partitions
+
+
+def compute_weights_per_rank(
+    weights_bytes: int,
+    metadata: Optional[ModelMetadata] = None,
+    tp_size: int = 1,
+    pp_size: int = 1,
+) -> int:
+    """Compute weights held by the worst-loaded parallel rank in bytes.
+
+    Query/output projections, MLPs and experts are split across TP ranks, K/V
+    projections are split by KV head and replicated once the heads run out,
+    embeddings and lm_head are vocab-parallel over the padded vocabulary,
+    and layer norms are replicated on every rank. Pipeline stages hold their
+    share of the layers; the first stage adds the embeddings and the last the
+    final norm and lm_head (a separate copy even when tied). The model's
+    bytes are apportioned by parameter count, so quantized and exact
+    checkpoint sizes keep their bytes per parameter.
+
+    Args:
+        weights_bytes: Weights memory of the whole model in bytes
+        metadata: Model metadata (None to split evenly)
+        tp_size: Tensor parallel size
+        pp_size: Pipeline parallel size
+
+    Returns:
+        Weights memory of the heaviest rank in bytes
+    """
+    if tp_size * pp_size <= 1:
+        return weights_bytes
+    if metadata is None:
+        return weights_bytes // (tp_size * pp_size)
+
+    hidden = metadata.hidden_size
+    head_dim = metadata.head_dim
+    intermediate = metadata.intermediate_size or 4 * hidden
+    experts = metadata.num_experts or 1
+    padded_vocab = -(-metadata.vocab_size // VOCAB_PADDING_SIZE) * VOCAB_PADDING_SIZE
+
+    def layer_params(heads: int, kv_heads: int, mlp_width: int) -> int:
+        attention = 2 * hidden * heads * head_dim + 2 * hidden * kv_heads * head_dim
+        return attention + 3 * hidden * mlp_width * experts + 2 * hidden
+
+    full_layer = layer_params(
+        metadata.num_attention_heads, metadata.num_key_value_heads, intermediate
+    )
+    embeddings = 1 if metadata.tie_word_embeddings else 2
+    total = (
+        metadata.num_hidden_layers * full_layer
+        + embeddings * metadata.vocab_size * hidden
+        + hidden
+    )
+
+    rank_layer = layer_params(
+        -(-metadata.num_attention_heads // tp_size),
+        kv_heads_per_rank(metadata.num_key_value_heads, tp_size),
+        -(-intermediate // tp_size),
+    )
+    vocab_shard = padded_vocab // tp_size * hidden
+
+    stages = pipeline_stage_layers(metadata.num_hidden_layers, pp_size)
+    heaviest = 0
+    for stage, layers in enumerate(stages):
+        params = layers * rank_layer
+        if stage == 0:
+            params += vocab_shard
+        if stage == pp_size - 1:
+            # Final norm and lm_head; a single stage shares tied embeddings
+            params += hidden
+            if pp_size > 1 or not metadata.tie_word_embeddings:
+                params += vocab_shard
+        heaviest = max(heaviest, params)
+
+    return int(weights_bytes * heaviest / total)
+
+
+def kv_heads_per_rank(num_kv_heads: int, tp_size: int = 1) -> int:
+    """KV heads held by one tensor-parallel rank.
+
+    Heads are split across ranks; with more ranks than KV heads, vLLM
+    replicates them so that every rank holds one.
+
+    Args:
+        num_kv_heads: KV heads of the model
+        tp_size: Tensor parallel size
+
+    Returns:
+        KV heads on the worst-loaded rank
+    """
+    return max(1, -(-num_kv_heads // tp_size))
+
+
+def is_valid_tp_size(metadata: ModelMetadata, tp_size: int) -> bool:
+    """Whether vLLM can shard a model's attention over a tensor parallel size.
+
+    The attention heads must divide evenly across ranks. KV heads must too,
+    unless there are more ranks than KV heads, in which case the ranks must
+    be a multiple of the KV heads so each head is replicated evenly.
+
+    Args:
+        metadata: Model metadata
+        tp_size: Tensor parallel size
+
+    Returns:
+        True if vLLM accepts the TP size for this model
+    """
+    num_kv_heads = metadata.num_key_value_heads
+    if metadata.num_attention_heads % tp_size != 0:
+        return False
+    if tp_size > num_kv_heads:
+        return tp_size % num_kv_heads == 0
+    return num_kv_heads % tp_size == 0
+
+
+def get_kv_bytes_per_element(
+    kv_dtype: KVCacheDType = KVCacheDType.AUTO,
+    dtype: DType = DType.AUTO,
+) -> float:
+    """Get bytes per KV cache element.
+
+    Args:
+        kv_dtype: KV cache data type
+        dtype: Model weight dtype (used if kv_dtype is auto)
+
+    Returns:
+        Bytes per element
+    """
+    if kv_dtype == KVCacheDType.AUTO:
+        # Default to model dtype
+        kv_dtype_str = dtype.value if dtype != DType.AUTO else "bf16"
+    else:
+        kv_dtype_str = kv_dtype.value
+
+    # Map KV dtype to bytes
+    if "fp8" in kv_dtype_str:
+        return 1.0
+    elif kv_dtype_str in ("fp16", "bf16"):
+        return 2.0
+    elif kv_dtype_str == "fp32":
+        return 4.0
+
+    return 2.0  # Default to fp16
+
+
 def compute_kv_cache_memory(
     metadata: ModelMetadata,
     context_len: int,
     concurrency: int,
     kv_dtype: KVCacheDType = KVCacheDType.AUTO,
     dtype: DType = DType.AUTO,
-    fragmentation_factor: float = 1.15,
+    fragmentation_factor: float = 1.0,
+    tp_size: int = 1,
+    pp_size: int = 1,
+    block_size: int = 1,
 ) -> int:
     """Compute KV cache memory in bytes.
 
@@ -71,40 +269,38 @@ def compute_kv_cache_memory(
     - V: num_kv_heads * head_dim
     - Total elements per token per layer = 2 * num_kv_heads * head_dim
 
+    With tensor parallelism this is the KV cache of one rank, which holds
+    its share of the KV heads (at least one, replicated). With pipeline
+    parallelism it covers the layers of the largest stage.
+
+    With a block_size above 1, each sequence holds whole blocks, as in vLLM's
+    paged allocator, so its context is rounded up to a multiple of block_size.
+
     Args:
         metadata: Model metadata
         context_len: Maximum context length (tokens)
         concurrency: Number of concurrent sequences
         kv_dtype: KV cache data type
         dtype: Model weight dtype (used if kv_dtype is auto)
-        fragmentation_factor: Safety factor for fragmentation
+        fragmentation_factor: Explicit safety margin on top of the block count
+        tp_size: Tensor parallel size
+        pp_size: Pipeline parallel size
+        block_size: Tokens per KV cache block (1 for exact token counts)
 
     Returns:
         Memory in bytes
     """
     head_dim = metadata.head_dim
-    num_kv_heads = metadata.num_key_value_heads
-    num_layers = metadata.num_hidden_layers
+    num_kv_heads = kv_heads_per_rank(metadata.num_key_value_heads, tp_size)
+    num_layers = max(pipeline_stage_layers(metadata.num_hidden_layers, pp_size))
 
     # Elements per token per layer (K + V)
     elements_per_token_per_layer = 2 * num_kv_heads * head_dim
 
-    # Determine bytes per element
-    if kv_dtype == KVCacheDType.AUTO:
-        # Default to model dtype
-        kv_dtype_str = dtype.value if dtype != DType.AUTO else "bf16"
-    else:
-        kv_dtype_str = kv_dtype.value
+    bytes_per_element = get_kv_bytes_per_element(kv_dtype, dtype)
 
-    # Map KV dtype to bytes
-    if "fp8" in kv_dtype_str:
-        bytes_per_element = 1.0
-    elif kv_dtype_str in ("fp16", "bf16"):
-        bytes_per_element = 2.0
-    elif kv_dtype_str == "fp32":
-        bytes_per_element = 4.0
-    else:
-        bytes_per_element = 2.0  # Default to fp16
+    # Whole blocks per sequence
+    context_len = compute_blocks_per_seq(context_len, block_size) * block_size
 
     # Total KV cache bytes
     kv_bytes = (
@@ -115,12 +311,184 @@ def compute_kv_cache_memory(
         * bytes_per_element
     )
 
-    # Apply fragmentation factor
+    # Apply the safety margin
     kv_bytes = int(kv_bytes * fragmentation_factor)
 
     return kv_bytes
 
 
+def compute_kv_block_bytes(
+    metadata: ModelMetadata,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    kv_dtype: KVCacheDType = KVCacheDType.AUTO,
+    dtype: DType = DType.AUTO,
+    tp_size: int = 1,
+    pp_size: int = 1,
+) -> int:
+    """Compute the size of one KV cache block in bytes.
+
+    A block holds K and V for block_size tokens across all layers.
+
+    Args:
+        metadata: Model metadata
+        block_size: Tokens per block
+        kv_dtype: KV cache data type
+        dtype: Model weight dtype (used if kv_dtype is auto)
+        tp_size: Tensor parallel size (block of one rank)
+        pp_size: Pipeline parallel size (block of the largest stage)
+
+    Returns:
+        Block size in bytes
+    """
+    return compute_kv_cache_memory(
+        metadata=metadata,
+        context_len=block_size,
+        concurrency=1,
+        kv_dtype=kv_dtype,
+        dtype=dtype,
+        fragmentation_factor=1.0,
+        tp_size=tp_size,
+        pp_size=pp_size,
+    )
+
+
+def compute_blocks_per_seq(context_len: int, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """Compute KV cache blocks held by one sequence.
+
+    The last block of a sequence is allocated whole even when partly filled.
+
+    Args:
+        context_len: Tokens in the sequence
+        block_size: Tokens per block
+
+    Returns:
+        Number of blocks
+    """
+    return -(-context_len // block_size)
+
+
+def compute_num_gpu_blocks(available_for_kv_bytes: int, block_bytes: int) -> int:
+    """Compute KV cache blocks that fit in the KV budget, as vLLM does at startup.
+
+    Args:
+        available_for_kv_bytes: Memory left for KV cache after weights and overhead
+        block_bytes: Size of one block in bytes
+
+    Returns:
+        Number of whole blocks (0 if nothing fits)
+    """
+    if available_for_kv_bytes <= 0 or block_bytes <= 0:
+        return 0
+    return available_for_kv_bytes // block_bytes
+
+
+def _activation_bytes_per_token(metadata: ModelMetadata, dtype: DType, tp_size: int) -> float:
+    """Bytes of one layer's live activations per token on one GPU."""
+    act_bytes = 4 if dtype == DType.FP32 else 2
+    hidden = metadata.hidden_size
+    intermediate = metadata.intermediate_size or 4 * hidden
+
+    # MoE layers run the MLP once per routed expert
+    experts_per_token = metadata.num_experts_per_tok or 1
+
+    return (2 * hidden + 3 * intermediate * experts_per_token / tp_size) * act_bytes
+
+
+def compute_activation_memory(
+    metadata: ModelMetadata,
+    max_num_batched_tokens: int = DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    max_num_seqs: int = DEFAULT_MAX_NUM_SEQS,
+    dtype: DType = DType.AUTO,
+    tp_size: int = 1,
+) -> int:
+    """Compute the peak activation memory of vLLM's startup profile run in bytes.
+
+    The profile run pushes a dummy batch of max_num_batched_tokens tokens
+    through the model, and vLLM sizes the KV cache from what is left after
+    that peak. One layer's activations are live at a time: the residual and
+    normed hidden states plus the MLP gate/up output and its activation, with
+    the MLP sharded across TP ranks. Logits cover the full vocabulary for the
+    last token of up to max_num_seqs sequences, in fp32 sampler buffers.
+
+    Args:
+        metadata: Model metadata
+        max_num_batched_tokens: Scheduler token budget per step
+        max_num_seqs: Scheduler sequence limit
+        dtype: Model weight dtype (activations use the same precision)
+        tp_size: Tensor parallel size
+
+    Returns:
+        Peak activation bytes per GPU
+    """
+    layer_peak = max_num_batched_tokens * _activation_bytes_per_token(metadata, dtype, tp_size)
+
+    sampled = min(max_num_seqs, max_num_batched_tokens)
+    sampler = sampled * metadata.vocab_size * SAMPLER_BYTES_PER_LOGIT * SAMPLER_VOCAB_BUFFERS
+
+    return int(layer_peak + sampler)
+
+
+def cuda_graph_capture_sizes(
+    max_num_seqs: int = DEFAULT_MAX_NUM_SEQS,
+    cuda_graph_sizes: Optional[list[int]] = None,
+) -> list[int]:
+    """Batch sizes vLLM captures decode CUDA graphs for.
+
+    A single size N expands to 1, 2, 4 and every multiple of 8 up to N; a
+    longer list is captured as given. Sizes above max_num_seqs are never
+    scheduled and are dropped.
+
+    Args:
+        max_num_seqs: Scheduler sequence limit
+        cuda_graph_sizes: Value of --cuda-graph-sizes (None for vLLM's default)
+
+    Returns:
+        Sorted capture batch sizes
+    """
+    sizes = cuda_graph_sizes or [DEFAULT_MAX_CUDA_GRAPH_SIZE]
+    if len(sizes) == 1:
+        sizes = [1, 2, 4] + list(range(8, sizes[0] + 1, 8))
+
+    captured = sorted({size for size in sizes if size <= max_num_seqs})
+    if not captured:
+        # vLLM always captures at least the smallest size
+        captured = [min(sizes)]
+    return captured
+
+
+def compute_cuda_graph_memory(
+    metadata: ModelMetadata,
+    capture_sizes: list[int],
+    dtype: DType = DType.AUTO,
+    tp_size: int = 1,
+    pp_size: int = 1,
+) -> int:
+    """Compute the memory held by captured decode CUDA graphs in bytes.
+
+    Graphs are captured largest batch first into one shared memory pool, so
+    the pool holds the decode activations of the largest captured batch.
+    Each captured graph also keeps its kernel nodes alive, which grows with
+    the number of layers and the number of capture sizes.
+
+    Args:
+        metadata: Model metadata
+        capture_sizes: Captured batch sizes (empty for enforce_eager)
+        dtype: Model weight dtype (activations use the same precision)
+        tp_size: Tensor parallel size
+        pp_size: Pipeline parallel size (graphs of the largest stage)
+
+    Returns:
+        CUDA graph memory bytes per GPU
+    """
+    if not capture_sizes:
+        return 0
+
+    pool = max(capture_sizes) * _activation_bytes_per_token(metadata, dtype, tp_size)
+    layers = max(pipeline_stage_layers(metadata.num_hidden_layers, pp_size))
+    graphs = len(capture_sizes) * layers * CUDA_GRAPH_BYTES_PER_LAYER
+    return int(pool + graphs)
+
+
 def compute_overhead(
     vram_total_bytes: int,
     tp_size: int = 1,
@@ -128,6 +496,10 @@ def compute_overhead(
 ) -> int:
     """Compute framework overhead in bytes.
 
+    Covers the CUDA context, NCCL buffers and allocator slack. Profile-run
+    activations and CUDA graphs are estimated separately by
+    compute_activation_memory and compute_cuda_graph_memory.
+
     Args:
         vram_total_bytes: Total VRAM in bytes
         tp_size: Tensor parallel size
@@ -164,10 +536,27 @@ def compute_feasibility(
     metadata: Optional[ModelMetadata] = None,
     kv_dtype: KVCacheDType = KVCacheDType.AUTO,
     dtype: DType = DType.AUTO,
-    fragmentation_factor: float = 1.15,
+    fragmentation_factor: float = 1.0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    activation_bytes: int = 0,
+    cuda_graph_bytes: int = 0,
+    tp_size: int = 1,
+    pp_size: int = 1,
 ) -> FeasibilityReport:
     """Compute VRAM feasibility analysis.
 
+    KV figures follow vLLM's allocator: whole blocks of block_size tokens
+    carved from the KV budget, with each sequence's last block partly empty.
+    The KV budget is what remains after weights, overhead, the profile-run
+    activation peak and captured CUDA graphs. kv_cache_bytes is expected in
+    whole blocks too (compute_kv_cache_memory with block_size), so the fit
+    check and the block counts agree; the fragmentation factor is only an
+    optional explicit margin on top.
+
+    With tensor or pipeline parallelism every figure is for one rank: the
+    VRAM of one GPU and the weights, KV cache and overhead of the
+    worst-loaded rank.
+
     Args:
         weights_bytes: Model weights memory in bytes
         kv_cache_bytes: KV cache memory in bytes
@@ -180,7 +569,12 @@ def compute_feasibility(
         metadata: Model metadata for max calculations
         kv_dtype: KV cache dtype
         dtype: Model dtype
-        fragmentation_factor: Fragmentation factor
+        fragmentation_factor: Explicit KV safety margin (1.0 for none)
+        block_size: Tokens per KV cache block
+        activation_bytes: Peak profile-run activation memory in bytes
+        cuda_graph_bytes: Captured CUDA graph memory in bytes
+        tp_size: Tensor parallel size (for per-rank KV heads)
+        pp_size: Pipeline parallel size (for per-stage layers)
 
     Returns:
         FeasibilityReport with analysis results
@@ -189,7 +583,12 @@ def compute_feasibility(
     allocatable_bytes = int(vram_total_bytes * gpu_memory_utilization)
 
     # Total required
-    required_bytes = weights_bytes + kv_cache_bytes + overhead_bytes
+    required_bytes = (
+        weights_bytes + kv_cache_bytes + overhead_bytes + activation_bytes + cuda_graph_bytes
+    )
+
+    # Everything vLLM reserves before sizing the KV cache
+    reserved_bytes = overhead_bytes + activation_bytes + cuda_graph_bytes
 
     # Headroom
     headroom_bytes = allocatable_bytes - required_bytes
@@ -209,29 +608,60 @@ def compute_feasibility(
     # Calculate max concurrency and context
     max_concurrency = 0
     max_context = 0
+    num_gpu_blocks = 0
+    blocks_per_seq = 0
+    max_concurrency_by_blocks = 0
+    block_waste_bytes = 0
+    kv_heads = 0
+    kv_bytes_per_token = 0
 
     if metadata:
+        kv_heads = kv_heads_per_rank(metadata.num_key_value_heads, tp_size)
+        kv_bytes_per_token = compute_kv_cache_memory(
+            metadata, 1, 1, kv_dtype, dtype, 1.0, tp_size, pp_size
+        )
+
         max_concurrency = compute_max_concurrency_at_context(
             allocatable_bytes=allocatable_bytes,
             weights_bytes=weights_bytes,
-            overhead_bytes=overhead_bytes,
+            overhead_bytes=reserved_bytes,
             metadata=metadata,
             context_len=context_len,
             kv_dtype=kv_dtype,
             dtype=dtype,
             fragmentation_factor=fragmentation_factor,
+            tp_size=tp_size,
+            pp_size=pp_size,
+            block_size=block_size,
         )
 
         max_context = compute_max_context_at_concurrency(
             allocatable_bytes=allocatable_bytes,
             weights_bytes=weights_bytes,
-            overhead_bytes=overhead_bytes,
+            overhead_bytes=reserved_bytes,
             metadata=metadata,
             concurrency=concurrency,
             kv_dtype=kv_dtype,
             dtype=dtype,
             fragmentation_factor=fragmentation_factor,
+            tp_size=tp_size,
+            pp_size=pp_size,
+            block_size=block_size,
+        )
+
+        block_bytes = compute_kv_block_bytes(
+            metadata, block_size, kv_dtype, dtype, tp_size, pp_size
+        )
+        num_gpu_blocks = compute_num_gpu_blocks(
+            allocatable_bytes - weights_bytes - reserved_bytes, block_bytes
         )
+        blocks_per_seq = compute_blocks_per_seq(context_len, block_size)
+        if blocks_per_seq > 0:
+            max_concurrency_by_blocks = num_gpu_blocks // blocks_per_seq
+
+        # Empty slots in each sequence's last block at the target context
+        waste_tokens = blocks_per_seq * block_size - context_len
+        block_waste_bytes = waste_tokens * concurrency * block_bytes // block_size
 
     # Generate warnings
     warnings: list[str] = []
@@ -248,6 +678,20 @@ def compute_feasibility(
     elif oom_risk == OOMRisk.MEDIUM:
         warnings.append("Medium OOM risk - monitor memory usage during inference")
 
+    if metadata and max_concurrency_by_blocks < concurrency:
+        warnings.append(
+            f"KV cache holds {num_gpu_blocks:,} blocks of {block_size} tokens: "
+            f"{max_concurrency_by_blocks} sequences at {context_len:,} tokens, "
+            f"below the target concurrency of {concurrency}"
+        )
+
+    if metadata and tp_size > metadata.num_key_value_heads:
+        warnings.append(
+            f"Tensor parallel size {tp_size} exceeds the model's "
+            f"{metadata.num_key_value_heads} KV heads: each rank holds a replicated KV head, "
+            f"so KV cache per rank stops shrinking beyond TP {metadata.num_key_value_heads}"
+        )
+
     kv_ratio = kv_cache_bytes / allocatable_bytes if allocatable_bytes > 0 else 0
     if kv_ratio > 0.5:
         warnings.append(
@@ -263,9 +707,23 @@ def compute_feasibility(
         weights_gb=weights_bytes / BYTES_TO_GIB,
         kv_cache_gb=kv_cache_bytes / BYTES_TO_GIB,
         overhead_gb=overhead_bytes / BYTES_TO_GIB,
+        activation_gb=activation_bytes / BYTES_TO_GIB,
+        cuda_graph_gb=cuda_graph_bytes / BYTES_TO_GIB,
         headroom_gb=max(0, headroom_gb_actual),
         max_concurrency_at_context=max_concurrency,
         max_context_at_concurrency=max_context,
+        block_size=block_size,
+        num_gpu_blocks=num_gpu_blocks,
+        blocks_per_seq=blocks_per_seq,
+        max_concurrency_by_blocks=max_concurrency_by_blocks,
+        kv_block_waste_gb=block_waste_bytes / BYTES_TO_GIB,
+        tensor_parallel_size=tp_size,
+        pipeline_parallel_size=pp_size,
+        stage_layers=(
+            pipeline_stage_layers(metadata.num_hidden_layers, pp_size) if metadata else []
+        ),
+        kv_heads_per_rank=kv_heads,
+        kv_bytes_per_token=kv_bytes_per_token,
         warnings=warnings,
     )
 
@@ -278,10 +736,16 @@ def compute_max_concurrency_at_context(
     context_len: int,
     kv_dtype: KVCacheDType = KVCacheDType.AUTO,
     dtype: DType = DType.AUTO,
-    fragmentation_factor: float = 1.15,
+    fragmentation_factor: float = 1.0,
+    tp_size: int = 1,
+    pp_size: int = 1,
+    block_size: int = 1,
 ) -> int:
     """Compute maximum concurrency at a given context length.
 
+    With block_size set, each sequence takes whole blocks, which gives the
+    maximum concurrency vLLM logs at startup.
+
     Args:
         allocatable_bytes: Allocatable VRAM in bytes
         weights_bytes: Model weights in bytes
@@ -291,6 +755,9 @@ def compute_max_concurrency_at_context(
         kv_dtype: KV cache dtype
         dtype: Model dtype
         fragmentation_factor: Fragmentation factor
+        tp_size: Tensor parallel size (per-rank KV heads)
+        pp_size: Pipeline parallel size (per-stage layers)
+        block_size: Tokens per KV cache block
 
     Returns:
         Maximum number of concurrent sequences (0 if doesn't fit)
@@ -308,6 +775,9 @@ def compute_max_concurrency_at_context(
         kv_dtype=kv_dtype,
         dtype=dtype,
         fragmentation_factor=fragmentation_factor,
+        tp_size=tp_size,
+        pp_size=pp_size,
+        block_size=block_size,
     )
 
     if kv_per_seq <= 0:
@@ -324,10 +794,16 @@ def compute_max_context_at_concurrency(
     concurrency: int,
     kv_dtype: KVCacheDType = KVCacheDType.AUTO,
     dtype: DType = DType.AUTO,
-    fragmentation_factor: float = 1.15,
+    fragmentation_factor: float = 1.0,
+    tp_size: int = 1,
+    pp_size: int = 1,
+    block_size: int = 1,
 ) -> int:
     """Compute maximum context length at a given concurrency.
 
+    With block_size set, the KV budget is split into whole blocks, and each
+    sequence's share is a whole number of blocks.
+
     Args:
         allocatable_bytes: Allocatable VRAM in bytes
         weights_bytes: Model weights in bytes
@@ -337,6 +813,9 @@ def compute_max_context_at_concurrency(
         kv_dtype: KV cache dtype
         dtype: Model dtype
         fragmentation_factor: Fragmentation factor
+        tp_size: Tensor parallel size (per-rank KV heads)
+        pp_size: Pipeline parallel size (per-stage layers)
+        block_size: Tokens per KV cache block
 
     Returns:
         Maximum context length (0 if doesn't fit)
@@ -346,21 +825,87 @@ def compute_max_context_at_concurrency(
     if available_for_kv <= 0 or concurrency <= 0:
         return 0
 
-    # Compute KV cache per token per sequence
-    kv_per_token_per_seq = compute_kv_cache_memory(
+    # Compute KV cache per block of one sequence
+    kv_per_block = compute_kv_cache_memory(
         metadata=metadata,
-        context_len=1,
+        context_len=block_size,
         concurrency=1,
         kv_dtype=kv_dtype,
         dtype=dtype,
         fragmentation_factor=fragmentation_factor,
+        tp_size=tp_size,
+        pp_size=pp_size,
     )
 
-    if kv_per_token_per_seq <= 0:
+    if kv_per_block <= 0:
         return 0
 
-    # Total tokens available across all sequences
-    total_tokens = available_for_kv // kv_per_token_per_seq
+    # Total blocks available across all sequences
+    total_blocks = available_for_kv // kv_per_block
 
     # Divide by concurrency
-    return max(0, total_tokens // concurrency)
+    return max(0, (total_blocks // concurrency) * block_size)
+
+
+def split_memory_utilization(
+    required_bytes: list[int],
+    kv_cache_bytes: list[int],
+    vram_total_bytes: int,
+    gpu_memory_utilization: float = 0.90,
+    headroom_gb: float = 1.0,
+) -> list[float]:
+    """Split one GPU's memory budget between engines sharing it.
+
+    Each engine first gets what it requires (weights, KV cache, overhead,
+    activations and CUDA graphs) plus the minimum headroom. Memory left in
+    the budget is shared in proportion to each engine's KV cache, so larger
+    caches gain the most sequences. If the engines do not fit, the budget is
+    split in proportion to their needs and none of them will fit.
+
+    Args:
+        required_bytes: Memory each engine requires on one GPU
+        kv_cache_bytes: KV cache each engine requires on one GPU
+        vram_total_bytes: VRAM of one GPU
+        gpu_memory_utilization: Fraction of the GPU all engines may use together
+        headroom_gb: Minimum headroom each engine keeps
+
+    Returns:
+        Fraction of the GPU each engine owns, rounded down to 0.001
+    """
+    budget = vram_total_bytes * gpu_memory_utilization
+    needs = [required + headroom_gb * BYTES_TO_GIB for required in required_bytes]
+    spare = budget - sum(needs)
+
+    if spare >= 0:
+        total_kv = sum(kv_cache_bytes)
+        if total_kv > 0:
+            weights = [kv / total_kv for kv in kv_cache_bytes]
+        else:
+            weights = [1 / len(needs)] * len(needs)
+        shares = [need + spare * weight for need, weight in zip(needs, weights)]
+    else:
+        shares = [budget * need / sum(needs) for need in needs]
+
+    return [int(share / vram_total_bytes * 1000) / 1000 for share in shares]
+
+
+def free_memory_at_start(memory_fractions: list[float]) -> list[float]:
+    """Fraction of the GPU free when each of several engines starts.
+
+    vLLM's gpu_memory_utilization is a per-instance budget, and an engine
+    fails to start if the GPU's free memory is below its flag times the
+    GPU's memory. Engines started earlier hold up to their own shares, so
+    each engine starts with what they leave.
+
+    Args:
+        memory_fractions: Fraction of the GPU each engine owns, in start order
+
+    Returns:
+        Free fraction of the GPU at each engine's start
+    """
+    free: list[float] = []
+    held = 0.0
+    for fraction in memory_fractions:
+        free.append(round(1.0 - held, 3))
+        held += fraction
+    return free
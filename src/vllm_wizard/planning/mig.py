@@ -0,0 +1,230 @@
+"""MIG layout planning: split one GPU into slices for several small models."""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from vllm_wizard.hardware.mig import (
+    MIG_COMPUTE_SLICES,
+    MIG_MEMORY_SLICES,
+    MIGProfile,
+    mig_device_name,
+    mig_profiles,
+)
+from vllm_wizard.planning.fleet import entry_fingerprint
+from vllm_wizard.planning.planner import run_plan
+from vllm_wizard.schemas.fleet import FleetEntry, FleetUnplaced
+from vllm_wizard.schemas.inputs import HardwareInput, PlanRequest
+from vllm_wizard.schemas.mig import MIGLayout, MIGSlice
+from vllm_wizard.schemas.outputs import ThroughputPoint
+
+
+@dataclass
+class SliceOption:
+    """An entry planned on one MIG profile."""
+
+    profile: MIGProfile
+    aggregate_toks_per_s: float
+    headroom_gb: float
+    serve_command: str
+
+
+def aggregate_toks_per_s_at(curve: list[ThroughputPoint], batch_size: int) -> float:
+    """Aggregate decode tokens/s at a batch size, read off a throughput curve.
+
+    The curve holds powers of two and max_num_seqs. Between two points the
+    decode step time is interpolated linearly, since it grows close to
+    linearly with the batch.
+
+    Args:
+        curve: Throughput curve from the performance estimate
+        batch_size: Sequences decoding together, at most the curve's last batch
+
+    Returns:
+        Aggregate decode tokens/s (0 for an empty curve)
+    """
+    if not curve:
+        return 0.0
+    below = curve[0]
+    for point in curve:
+        if point.batch_size == batch_size:
+            return point.aggregate_toks_per_s
+        if point.batch_size > batch_size:
+            span = point.batch_size - below.batch_size
+            if span <= 0:
+                return point.aggregate_toks_per_s
+            fraction = (batch_size - below.batch_size) / span
+            itl_ms = below.itl_ms + fraction * (point.itl_ms - below.itl_ms)
+            return batch_size / itl_ms * 1000
+        below = point
+    return below.aggregate_toks_per_s
+
+
+def size_on_profile(entry: FleetEntry, gpu: str, profile: MIGProfile) -> Union[SliceOption, str]:
+    """Plan an entry on a single MIG instance.
+
+    The option is scored by its aggregate decode tokens/s at the entry's
+    concurrency, capped at max_num_seqs. Batch-1 decode speed would follow
+    the instance's memory slices alone, while a batch is also limited by
+    its share of the SMs.
+
+    Args:
+        entry: Entry to plan
+        gpu: Parent GPU name
+        profile: MIG profile of the instance
+
+    Returns:
+        The option if the entry fits, else the reason it does not
+    """
+    request = PlanRequest(
+        model=entry.model,
+        hardware=HardwareInput(
+            gpu=mig_device_name(gpu, profile.name),
+            gpus=1,
+            tensor_parallel_size=1,
+            pipeline_parallel_size=1,
+        ),
+        workload=entry.workload,
+        policy=entry.policy,
+    )
+    try:
+        response = run_plan(request)
+    except (ValueError, FileNotFoundError) as e:
+        return str(e)
+
+    if not response.feasibility.fits:
+        return f"does not fit on a {profile.name} instance"
+
+    batch_size = min(entry.workload.concurrency, response.config.max_num_seqs)
+    return SliceOption(
+        profile=profile,
+        aggregate_toks_per_s=aggregate_toks_per_s_at(
+            response.performance.throughput_curve, batch_size
+        ),
+        headroom_gb=response.feasibility.headroom_gb,
+        serve_command=response.artifacts.serve_command,
+    )
+
+
+def plan_mig_layout(gpu: str, entries: list[FleetEntry]) -> MIGLayout:
+    """Choose the MIG slice layout with the most aggregate decode throughput.
+
+    Each entry is planned on every profile of the GPU, so its memory comes
+    from the instance's VRAM and its speed from the instance's share of the
+    SMs and memory bandwidth. A dynamic program over the compute (of 7) and
+    memory (of 8) slices left then gives each entry at most one instance,
+    placing as many entries as possible and, among those layouts, the one
+    with the highest aggregate decode tokens/s summed over the instances,
+    each at its entry's concurrency.
+
+    The slice budget is the only placement rule modelled. nvidia-smi may
+    still reject a layout within it, so instances are created largest first.
+
+    Args:
+        gpu: GPU to partition (e.g., "H100", "A100 40GB")
+        entries: Models and workloads, one instance each
+
+    Returns:
+        MIGLayout with the slices, unplaced entries and setup command
+
+    Raises:
+        ValueError: If the GPU does not support MIG or entry names repeat
+    """
+    profiles = mig_profiles(gpu)
+    if not profiles:
+        raise ValueError(f"{gpu} does not support MIG (A100, H100 and H200 do).")
+
+    duplicates = sorted(
+        name for name, count in Counter(entry.name for entry in entries).items() if count > 1
+    )
+    if duplicates:
+        raise ValueError(f"Duplicate entry names: {', '.join(duplicates)}")
+
+    # Plan each distinct spec once per profile
+    cache: dict[tuple[str, str], Union[SliceOption, str]] = {}
+    options: list[list[SliceOption]] = []
+    reasons: list[str] = []
+    for entry in entries:
+        fingerprint = entry_fingerprint(entry)
+        fitting: list[SliceOption] = []
+        reason = ""
+        for profile in profiles:
+            key = (fingerprint, profile.name)
+            if key not in cache:
+                cache[key] = size_on_profile(entry, gpu, profile)
+            result = cache[key]
+            if isinstance(result, SliceOption):
+                fitting.append(result)
+            else:
+                reason = result
+        options.append(fitting)
+        reasons.append(reason)
+
+    # best[(i, compute, memory)]: (placed, toks/s, choices) for entries[i:]
+    best: dict[tuple[int, int, int], tuple[int, float, tuple[Optional[SliceOption], ...]]] = {}
+
+    def solve(i: int, compute: int, memory: int) -> tuple[int, float, tuple]:
+        if i == len(entries):
+            return 0, 0.0, ()
+        key = (i, compute, memory)
+        if key not in best:
+            placed, toks, choices = solve(i + 1, compute, memory)
+            candidate = (placed, toks, (None,) + choices)
+            for option in options[i]:
+                profile = option.profile
+                if profile.compute_slices > compute or profile.memory_slices > memory:
+                    continue
+                placed, toks, choices = solve(
+                    i + 1, compute - profile.compute_slices, memory - profile.memory_slices
+                )
+                # Prefer placing more entries, then throughput
+                if (placed + 1, toks + option.aggregate_toks_per_s) > candidate[:2]:
+                    candidate = (
+                        placed + 1,
+                        toks + option.aggregate_toks_per_s,
+                        (option,) + choices,
+                    )
+            best[key] = candidate
+        return best[key]
+
+    _, total_toks, choices = solve(0, MIG_COMPUTE_SLICES, MIG_MEMORY_SLICES)
+
+    slices: list[MIGSlice] = []
+    unplaced: list[FleetUnplaced] = []
+    for entry, fitting, reason, choice in zip(entries, options, reasons, choices):
+        if choice is None:
+            if not fitting:
+                reason = f"fits no MIG instance of {gpu}: {reason}"
+            else:
+                reason = "no compute or memory slices left on the GPU"
+            unplaced.append(FleetUnplaced(entry=entry.name, reason=reason))
+            continue
+        slices.append(
+            MIGSlice(
+                entry=entry.name,
+                profile=choice.profile.name,
+                vram_gb=round(choice.profile.vram_mib / 1024, 2),
+                aggregate_toks_per_s=round(choice.aggregate_toks_per_s, 1),
+                headroom_gb=round(choice.headroom_gb, 2),
+                serve_command=choice.serve_command,
+            )
+        )
+
+    by_name = {profile.name: profile for profile in profiles}
+    slices.sort(
+        key=lambda s: (by_name[s.profile].compute_slices, by_name[s.profile].memory_slices),
+        reverse=True,
+    )
+    setup_command = ""
+    if slices:
+        setup_command = f"sudo nvidia-smi mig -cgi {','.join(s.profile for s in slices)} -C"
+
+    return MIGLayout(
+        gpu=gpu,
+        slices=slices,
+        unplaced=unplaced,
+        compute_slices_used=sum(by_name[s.profile].compute_slices for s in slices),
+        memory_slices_used=sum(by_name[s.profile].memory_slices for s in slices),
+        total_aggregate_toks_per_s=round(total_toks, 1),
+        setup_command=setup_command,
+    )
@@ -1,136 +1,615 @@
-"""Performance estimation heuristics for vLLM sizing."""
+"""Roofline performance estimation for vLLM sizing."""
 
+import math
+from dataclasses import dataclass
 from typing import Optional
 
-from vllm_wizard.schemas.inputs import Interconnect, Quantization
-from vllm_wizard.schemas.outputs import PerfEstimate
-
-# Baseline decode tokens per second by GPU class
-# These are rough estimates for ~7B parameter models at moderate context
-GPU_BASELINE_DECODE_TPS: dict[str, float] = {
-    # High-end consumer
-    "4090": 150.0,
-    "3090 ti": 120.0,
-    "3090": 110.0,
-    "4080": 130.0,
-    "3080 ti": 90.0,
-    "3080": 80.0,
-    # Professional
-    "rtx a6000": 130.0,
-    "rtx a5000": 100.0,
-    "rtx a4000": 70.0,
-    # Datacenter
-    "h200": 400.0,
-    "h100": 350.0,
-    "l40s": 180.0,
-    "l40": 160.0,
-    "a100 80gb": 220.0,
-    "a100 40gb": 200.0,
-    "a100": 200.0,
-    "l4": 100.0,
-    "a10g": 90.0,
-    "a10": 90.0,
-    "v100 32gb": 80.0,
-    "v100": 70.0,
-    "t4": 50.0,
+from vllm_wizard.hardware.specs import DEFAULT_GPU_SPEC, GPUSpec, get_gpu_spec
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.memory import (
+    DEFAULT_MAX_CUDA_GRAPH_SIZE,
+    compute_kv_cache_memory,
+    compute_weights_memory,
+)
+from vllm_wizard.schemas.inputs import DType, Interconnect, KVCacheDType, Quantization
+from vllm_wizard.schemas.outputs import PerfEstimate, ThroughputPoint
+
+# Achievable fraction of peak HBM bandwidth (low, high)
+MEMORY_EFFICIENCY_RANGE: tuple[float, float] = (0.55, 0.85)
+
+# Achievable fraction of peak dense tensor throughput (low, high)
+COMPUTE_EFFICIENCY_RANGE: tuple[float, float] = (0.35, 0.65)
+
+# CPU time to launch one decoder layer's dozen or so kernels without CUDA graphs
+EAGER_LAUNCH_S_PER_LAYER = 60e-6
+
+# Point-to-point bandwidth between GPUs in one node, in GB/s
+INTRA_NODE_GBPS: dict[Interconnect, float] = {
+    Interconnect.NVLINK: 300.0,
+    Interconnect.PCIE: 25.0,
+    # Peer traffic bounces through the CPUs and their inter-socket link
+    Interconnect.CROSS_SOCKET: 12.0,
+    Interconnect.UNKNOWN: 50.0,
 }
 
-# Baseline prefill tokens per second by GPU class
-GPU_BASELINE_PREFILL_TPS: dict[str, float] = {
-    "4090": 3000.0,
-    "3090": 2200.0,
-    "h200": 12000.0,
-    "h100": 10000.0,
-    "a100 80gb": 5000.0,
-    "a100": 4500.0,
-    "l40s": 4000.0,
-    "l4": 2000.0,
-    "t4": 1000.0,
+# Inter-node network bandwidth per GPU when unspecified (200 Gb/s), in GB/s
+DEFAULT_INTER_NODE_GBPS = 25.0
+
+# Fixed latency of sending activations from one pipeline stage to the next
+PIPELINE_HOP_LATENCY_S = 10e-6
+
+# Extra TP efficiency factor when all-reduces cross the inter-node network
+# (only used without model architecture, when all-reduces cannot be sized)
+INTER_NODE_TP_EFFICIENCY = 0.5
+
+# Achievable fraction of a link's peak bandwidth in all-reduces
+ALLREDUCE_LINK_EFFICIENCY = 0.80
+
+# Fixed cost of one all-reduce: kernel launch and the final synchronization
+ALLREDUCE_BASE_LATENCY_S = 5e-6
+
+# Latency of each of the 2 * (tp_size - 1) steps of a ring all-reduce
+ALLREDUCE_STEP_LATENCY_S: dict[Interconnect, float] = {
+    Interconnect.NVLINK: 0.5e-6,
+    Interconnect.PCIE: 2e-6,
+    Interconnect.CROSS_SOCKET: 4e-6,
 }
+INTER_NODE_ALLREDUCE_STEP_LATENCY_S = 5e-6
 
-# Default baseline for unknown GPUs
-DEFAULT_DECODE_TPS = 80.0
-DEFAULT_PREFILL_TPS = 2000.0
+# All-reduces per decoder layer under tensor parallelism: after attention and after the MLP
+ALLREDUCES_PER_LAYER = 2
 
 
-def _get_gpu_baseline(
-    gpu_name: str, baseline_table: dict[str, float], default: float
-) -> float:
-    """Get baseline TPS for a GPU from lookup table."""
-    name_lower = gpu_name.lower()
+@dataclass
+class ModelCost:
+    """Per-token memory traffic and FLOPs of a model, before tensor parallelism."""
 
-    # Exact match
-    for key, value in baseline_table.items():
-        if key in name_lower:
-            return value
+    weights_bytes: int
+    kv_bytes_per_token: int
+    linear_flops_per_token: float
+    attention_flops_per_token_per_ctx: float
 
-    return default
 
+@dataclass
+class RooflinePoint:
+    """Decode performance at one batch size."""
+
+    batch_size: int
+    step_time_ms: float
+    decode_toks_per_s: float
+    per_seq_toks_per_s: float
+    memory_bound: bool
+
+
+def build_model_cost(
+    params_b: float,
+    metadata: Optional[ModelMetadata] = None,
+    quantization: Quantization = Quantization.NONE,
+    dtype: DType = DType.AUTO,
+    kv_cache_dtype: KVCacheDType = KVCacheDType.AUTO,
+) -> ModelCost:
+    """Derive bytes and FLOPs per token for the roofline model.
 
-def _scale_by_model_size(base_tps: float, params_b: float, reference_params_b: float = 7.0) -> float:
-    """Scale TPS by model size relative to reference.
+    Linear layers cost 2 FLOPs per parameter per token. Attention costs
+    4 * layers * num_heads * head_dim FLOPs per token for every token of
+    context (QK^T and AV). Without metadata the attention and KV terms are 0.
 
-    Uses inverse scaling with exponent ~0.85 (between linear and sqrt).
+    Args:
+        params_b: Model parameters in billions
+        metadata: Model metadata for KV and attention terms
+        quantization: Quantization method (sets weight bytes)
+        dtype: Model weight dtype
+        kv_cache_dtype: KV cache dtype
+
+    Returns:
+        ModelCost for the model
     """
-    if params_b <= 0:
-        return base_tps
+    weights_bytes = compute_weights_memory(params_b, dtype, quantization, metadata)
+
+    kv_bytes_per_token = 0
+    attention_flops = 0.0
+    if metadata is not None:
+        kv_bytes_per_token = compute_kv_cache_memory(
+            metadata=metadata,
+            context_len=1,
+            concurrency=1,
+            kv_dtype=kv_cache_dtype,
+            dtype=dtype,
+            fragmentation_factor=1.0,
+        )
+        attention_flops = (
+            4.0 * metadata.num_hidden_layers * metadata.num_attention_heads * metadata.head_dim
+        )
 
-    # Scale factor: (reference / actual)^0.85
-    scale = (reference_params_b / params_b) ** 0.85
-    return base_tps * scale
+    return ModelCost(
+        weights_bytes=weights_bytes,
+        kv_bytes_per_token=kv_bytes_per_token,
+        linear_flops_per_token=2.0 * params_b * 1e9,
+        attention_flops_per_token_per_ctx=attention_flops,
+    )
 
 
-def _scale_by_tensor_parallel(
-    tps: float,
-    tp_size: int,
-    interconnect: Interconnect = Interconnect.UNKNOWN,
-) -> float:
-    """Scale TPS by tensor parallel size.
+def get_compute_precision(quantization: Quantization) -> str:
+    """Tensor-core precision used for the matmuls."""
+    if quantization == Quantization.FP8:
+        return "fp8"
+    if quantization == Quantization.INT8:
+        return "int8"
+    # AWQ/GPTQ dequantize to fp16 before the matmul
+    return "fp16"
 
-    TP generally improves throughput but with communication overhead.
+
+def get_tp_efficiency(tp_size: int, interconnect: Interconnect = Interconnect.UNKNOWN) -> float:
+    """Fraction of ideal tensor-parallel speedup retained after communication.
+
+    A flat approximation for models without architecture metadata; with it,
+    tensor_parallel_cost() sizes the all-reduces instead.
     """
     if tp_size <= 1:
-        return tps
+        return 1.0
 
-    # Efficiency factor based on interconnect
     if interconnect == Interconnect.NVLINK:
-        efficiency = 0.90  # Good scaling with NVLink
+        return 0.90  # Good scaling with NVLink
     elif interconnect == Interconnect.PCIE:
-        efficiency = 0.75  # PCIe has more overhead
+        return 0.75  # PCIe has more overhead
+    elif interconnect == Interconnect.CROSS_SOCKET:
+        return 0.60  # No peer-to-peer; all-reduces cross the socket link
+    return 0.80  # Unknown, assume moderate
+
+
+def count_inter_node_hops(tp_size: int, pp_size: int, gpus_per_node: int) -> int:
+    """Pipeline stage boundaries that cross a node boundary.
+
+    Ranks are packed onto nodes stage by stage, so a pipeline spanning N
+    nodes crosses the network N - 1 times (never more than pp_size - 1).
+    """
+    nodes_spanned = math.ceil(tp_size * pp_size / max(1, gpus_per_node))
+    return max(0, min(pp_size - 1, nodes_spanned - 1))
+
+
+def pipeline_hop_cost(
+    metadata: Optional[ModelMetadata],
+    pp_size: int,
+    tp_size: int = 1,
+    gpus_per_node: int = 8,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+    inter_node_gbps: Optional[float] = None,
+    dtype: DType = DType.AUTO,
+) -> tuple[float, float]:
+    """Time to pass activations through every pipeline stage boundary.
+
+    Each of the pp_size - 1 boundaries sends one hidden-state vector per
+    token; boundaries between nodes use the inter-node network and the
+    rest use the intra-node interconnect.
+
+    Args:
+        metadata: Model metadata (None if the hidden size is unknown)
+        pp_size: Pipeline parallel size
+        tp_size: Tensor parallel size
+        gpus_per_node: GPUs in each node
+        interconnect: Intra-node GPU interconnect type
+        inter_node_gbps: Inter-node bandwidth per GPU in GB/s (None for default)
+        dtype: Model activation dtype
+
+    Returns:
+        (fixed latency in seconds, seconds per token) summed over all boundaries
+    """
+    hops = pp_size - 1
+    if hops <= 0:
+        return 0.0, 0.0
+
+    inter_hops = count_inter_node_hops(tp_size, pp_size, gpus_per_node)
+    hidden_bytes = 0.0
+    if metadata is not None:
+        hidden_bytes = metadata.hidden_size * (4 if dtype == DType.FP32 else 2)
+
+    intra_bw = INTRA_NODE_GBPS[interconnect] * 1e9
+    inter_bw = (inter_node_gbps or DEFAULT_INTER_NODE_GBPS) * 1e9
+    s_per_token = hidden_bytes * ((hops - inter_hops) / intra_bw + inter_hops / inter_bw)
+
+    return hops * PIPELINE_HOP_LATENCY_S, s_per_token
+
+
+def assumed_interconnect(spec: GPUSpec, interconnect: Interconnect) -> Interconnect:
+    """Interconnect to cost all-reduces over, filling in an unknown one from the GPU.
+
+    SXM parts with NVLink are taken to be on an NVLink baseboard; anything
+    else is taken to be PCIe cards, whose NVLink bridges join pairs at most.
+
+    Args:
+        spec: GPU specs
+        interconnect: Intra-node GPU interconnect type, possibly unknown
+
+    Returns:
+        The interconnect, or the GPU's likely one if it was unknown
+    """
+    if interconnect != Interconnect.UNKNOWN:
+        return interconnect
+    if spec.sxm and spec.nvlink_gbps:
+        return Interconnect.NVLINK
+    return Interconnect.PCIE
+
+
+def allreduce_link_gbps(spec: GPUSpec, interconnect: Interconnect) -> float:
+    """Peak per-direction bandwidth a GPU all-reduces over inside a node, in GB/s.
+
+    NVLink and PCIe use the GPU's own links, so NVLink 4 on H100 beats
+    NVLink 3 on A100 and a Gen5 slot beats Gen4. Across sockets there is
+    no peer-to-peer path and traffic is staged through host memory, which
+    halves the PCIe rate. An unknown interconnect is the GPU's likely one
+    (see assumed_interconnect).
+
+    Args:
+        spec: GPU specs
+        interconnect: Intra-node GPU interconnect type
+
+    Returns:
+        Link bandwidth in GB/s
+    """
+    interconnect = assumed_interconnect(spec, interconnect)
+    if interconnect == Interconnect.NVLINK:
+        return spec.nvlink_gbps or INTRA_NODE_GBPS[Interconnect.NVLINK]
+    if interconnect == Interconnect.CROSS_SOCKET:
+        return spec.pcie_gbps / 2
+    return spec.pcie_gbps
+
+
+def allreduce_time(
+    message_bytes: float, tp_size: int, link_gbps: float, step_latency_s: float
+) -> float:
+    """Time of one ring all-reduce.
+
+    A ring all-reduce takes 2 * (tp_size - 1) steps, each sending
+    1/tp_size of the message to the next rank. Small messages are bound by
+    the per-step latency and large ones by the link bandwidth.
+
+    Args:
+        message_bytes: Bytes reduced by every rank
+        tp_size: Ranks taking part
+        link_gbps: Peak per-direction link bandwidth in GB/s
+        step_latency_s: Latency of one ring step in seconds
+
+    Returns:
+        All-reduce time in seconds (0 for a single rank)
+    """
+    if tp_size <= 1:
+        return 0.0
+    steps = 2 * (tp_size - 1)
+    bandwidth = link_gbps * 1e9 * ALLREDUCE_LINK_EFFICIENCY
+    return ALLREDUCE_BASE_LATENCY_S + steps * (
+        step_latency_s + message_bytes / tp_size / bandwidth
+    )
+
+
+def tensor_parallel_cost(
+    spec: GPUSpec,
+    metadata: Optional[ModelMetadata],
+    tp_size: int,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+    gpus_per_node: int = 8,
+    inter_node_gbps: Optional[float] = None,
+    dtype: DType = DType.AUTO,
+) -> tuple[float, float]:
+    """Time spent in tensor-parallel all-reduces over one forward pass.
+
+    Every decoder layer all-reduces its attention and MLP outputs, one
+    hidden-state vector per token, so the cost is a fixed latency per
+    all-reduce plus a bandwidth term growing with the tokens in the pass.
+    A TP group larger than a node all-reduces over the inter-node network.
+
+    Args:
+        spec: GPU specs
+        metadata: Model metadata (None if the layers and hidden size are unknown)
+        tp_size: Tensor parallel size
+        interconnect: Intra-node GPU interconnect type
+        gpus_per_node: GPUs in each node
+        inter_node_gbps: Inter-node bandwidth per GPU in GB/s (None for default)
+        dtype: Model activation dtype
+
+    Returns:
+        (fixed latency in seconds, seconds per token) summed over all layers,
+        (0, 0) without tensor parallelism or metadata
+    """
+    if tp_size <= 1 or metadata is None:
+        return 0.0, 0.0
+
+    if tp_size > gpus_per_node:
+        link_gbps = inter_node_gbps or DEFAULT_INTER_NODE_GBPS
+        step_latency_s = INTER_NODE_ALLREDUCE_STEP_LATENCY_S
     else:
-        efficiency = 0.80  # Unknown, assume moderate
+        interconnect = assumed_interconnect(spec, interconnect)
+        link_gbps = allreduce_link_gbps(spec, interconnect)
+        step_latency_s = ALLREDUCE_STEP_LATENCY_S[interconnect]
+
+    allreduces = ALLREDUCES_PER_LAYER * metadata.num_hidden_layers
+    hidden_bytes = metadata.hidden_size * (4 if dtype == DType.FP32 else 2)
+    latency_s = allreduce_time(0.0, tp_size, link_gbps, step_latency_s)
+    s_per_token = allreduce_time(hidden_bytes, tp_size, link_gbps, 0.0) - ALLREDUCE_BASE_LATENCY_S
 
-    # Linear scaling with efficiency penalty
-    return tps * tp_size * efficiency
+    return allreduces * latency_s, allreduces * s_per_token
 
 
-def _scale_by_context(tps: float, context_len: int, reference_context: int = 2048) -> float:
-    """Scale TPS by context length.
+def tensor_parallel_scaling(
+    spec: GPUSpec,
+    metadata: Optional[ModelMetadata],
+    tp_size: int,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+    gpus_per_node: int = 8,
+    inter_node_gbps: Optional[float] = None,
+    dtype: DType = DType.AUTO,
+) -> tuple[float, float, float]:
+    """How tensor parallelism slows each rank down.
+
+    With model metadata the all-reduces are costed explicitly; without it
+    the flat get_tp_efficiency() factor stands in for them.
+
+    Args:
+        spec: GPU specs
+        metadata: Model metadata (None if the architecture is unknown)
+        tp_size: Tensor parallel size
+        interconnect: Intra-node GPU interconnect type
+        gpus_per_node: GPUs in each node
+        inter_node_gbps: Inter-node bandwidth per GPU in GB/s (None for default)
+        dtype: Model activation dtype
 
-    Longer contexts reduce decode TPS due to attention overhead.
+    Returns:
+        (TP efficiency, all-reduce latency in seconds, all-reduce seconds per
+        token) for one forward pass
     """
-    if context_len <= reference_context:
-        return tps
+    if metadata is None:
+        tp_eff = get_tp_efficiency(tp_size, interconnect)
+        if tp_size > gpus_per_node:
+            tp_eff *= INTER_NODE_TP_EFFICIENCY
+        return tp_eff, 0.0, 0.0
+
+    latency_s, s_per_token = tensor_parallel_cost(
+        spec, metadata, tp_size, interconnect, gpus_per_node, inter_node_gbps, dtype
+    )
+    return 1.0, latency_s, s_per_token
+
+
+def decode_step_time(
+    spec: GPUSpec,
+    cost: ModelCost,
+    batch_size: int,
+    kv_len: int,
+    tp_size: int = 1,
+    precision: str = "fp16",
+    memory_efficiency: float = 0.70,
+    compute_efficiency: float = 0.50,
+    tp_efficiency: float = 1.0,
+    pp_size: int = 1,
+    hop_latency_s: float = 0.0,
+    hop_s_per_token: float = 0.0,
+    allreduce_latency_s: float = 0.0,
+    allreduce_s_per_token: float = 0.0,
+) -> tuple[float, bool]:
+    """Time for one decode step of a batch.
+
+    Each step reads all weights once plus the KV cache of every sequence,
+    and does one token of compute per sequence. The step takes the larger
+    of the memory and compute times.
+
+    With pipeline parallelism the batch is split into min(pp_size, batch)
+    micro-batches that flow through pp_size stages, each holding 1/pp_size
+    of the layers. A stage is idle whenever there are fewer micro-batches
+    than stages (the pipeline bubble), and every token also pays the
+    activation transfers between stages.
+
+    Tensor parallelism splits the work of each stage and adds its
+    all-reduces, which are not overlapped with compute.
+
+    Args:
+        spec: GPU specs
+        cost: Model cost
+        batch_size: Sequences decoded together
+        kv_len: Context tokens held per sequence
+        tp_size: Tensor parallel size
+        precision: Matmul precision ("fp16", "fp8", "int8")
+        memory_efficiency: Achieved fraction of peak bandwidth
+        compute_efficiency: Achieved fraction of peak TFLOPS
+        tp_efficiency: Fraction of ideal TP speedup retained
+        pp_size: Pipeline parallel size
+        hop_latency_s: Fixed stage-to-stage transfer time over all stage boundaries
+        hop_s_per_token: Per-token stage-to-stage transfer time over all boundaries
+        allreduce_latency_s: Fixed TP all-reduce time over all layers
+        allreduce_s_per_token: Per-token TP all-reduce time over all layers
+
+    Returns:
+        (step time in seconds, whether the step is memory-bound)
+    """
+    micro_batches = max(1, min(pp_size, batch_size))
+    seqs_per_micro = batch_size / micro_batches
+    shards = tp_size * pp_size
+
+    bytes_read = (
+        cost.weights_bytes + cost.kv_bytes_per_token * kv_len * seqs_per_micro
+    ) / shards
+    flops = (
+        seqs_per_micro
+        * (cost.linear_flops_per_token + cost.attention_flops_per_token_per_ctx * kv_len)
+        / shards
+    )
+
+    t_memory = bytes_read / (spec.memory_bandwidth_gbps * 1e9 * memory_efficiency)
+    t_compute = flops / (spec.tflops_for(precision) * 1e12 * compute_efficiency)
+    allreduce_s = (allreduce_latency_s + allreduce_s_per_token * seqs_per_micro) / pp_size
+    stage_s = max(t_memory, t_compute) / tp_efficiency + allreduce_s
+
+    step_s = (
+        max(micro_batches, pp_size) * stage_s
+        + hop_latency_s
+        + hop_s_per_token * seqs_per_micro
+    )
+    return step_s, t_memory >= t_compute
+
+
+def prefill_time(
+    spec: GPUSpec,
+    cost: ModelCost,
+    prompt_tokens: int,
+    tp_size: int = 1,
+    precision: str = "fp16",
+    memory_efficiency: float = 0.70,
+    compute_efficiency: float = 0.50,
+    tp_efficiency: float = 1.0,
+    hop_latency_s: float = 0.0,
+    hop_s_per_token: float = 0.0,
+    allreduce_latency_s: float = 0.0,
+    allreduce_s_per_token: float = 0.0,
+) -> float:
+    """Time to prefill one prompt.
+
+    Prefill runs every prompt token through the linear layers in one pass
+    and causal attention over half the prompt on average, so it is
+    compute-bound for all but very short prompts. Pipeline stages run one
+    after another for a single prompt, so they add only the transfers
+    between stages.
+
+    Args:
+        spec: GPU specs
+        cost: Model cost
+        prompt_tokens: Prompt length
+        tp_size: Tensor parallel size
+        precision: Matmul precision ("fp16", "fp8", "int8")
+        memory_efficiency: Achieved fraction of peak bandwidth
+        compute_efficiency: Achieved fraction of peak TFLOPS
+        tp_efficiency: Fraction of ideal TP speedup retained
+        hop_latency_s: Fixed stage-to-stage transfer time over all stage boundaries
+        hop_s_per_token: Per-token stage-to-stage transfer time over all boundaries
+        allreduce_latency_s: Fixed TP all-reduce time over all layers
+        allreduce_s_per_token: Per-token TP all-reduce time over all layers
+
+    Returns:
+        Prefill time in seconds
+    """
+    flops = (
+        prompt_tokens * cost.linear_flops_per_token
+        + cost.attention_flops_per_token_per_ctx * prompt_tokens * prompt_tokens / 2
+    ) / tp_size
+    bytes_moved = (cost.weights_bytes + cost.kv_bytes_per_token * prompt_tokens) / tp_size
+
+    t_memory = bytes_moved / (spec.memory_bandwidth_gbps * 1e9 * memory_efficiency)
+    t_compute = flops / (spec.tflops_for(precision) * 1e12 * compute_efficiency)
+
+    return (
+        max(t_memory, t_compute) / tp_efficiency
+        + hop_latency_s
+        + hop_s_per_token * prompt_tokens
+        + allreduce_latency_s
+        + allreduce_s_per_token * prompt_tokens
+    )
+
+
+def eager_launch_overhead(metadata: Optional[ModelMetadata]) -> float:
+    """Kernel launch time per decode step that CUDA graph replay avoids, in seconds.
+
+    Args:
+        metadata: Model metadata (None if the layer count is unknown)
+
+    Returns:
+        Launch overhead in seconds (0 without metadata)
+    """
+    if metadata is None:
+        return 0.0
+    return metadata.num_hidden_layers * EAGER_LAUNCH_S_PER_LAYER
+
 
-    # Mild degradation: sqrt scaling
-    scale = (reference_context / context_len) ** 0.3
-    return tps * scale
+def curve_batch_sizes(max_num_seqs: int) -> list[int]:
+    """Powers of two below max_num_seqs, then max_num_seqs itself."""
+    sizes: list[int] = []
+    batch_size = 1
+    while batch_size < max_num_seqs:
+        sizes.append(batch_size)
+        batch_size *= 2
+    sizes.append(max(1, max_num_seqs))
+    return sizes
 
 
-def _scale_by_quantization(tps: float, quantization: Quantization) -> float:
-    """Scale TPS by quantization.
+def compute_roofline(
+    gpu_name: str,
+    params_b: float,
+    batch_sizes: list[int],
+    kv_len: int,
+    metadata: Optional[ModelMetadata] = None,
+    quantization: Quantization = Quantization.NONE,
+    dtype: DType = DType.AUTO,
+    kv_cache_dtype: KVCacheDType = KVCacheDType.AUTO,
+    tp_size: int = 1,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+    launch_overhead_s: float = 0.0,
+    max_graph_batch: int = 0,
+    pp_size: int = 1,
+    gpus_per_node: int = 8,
+    inter_node_gbps: Optional[float] = None,
+) -> list[RooflinePoint]:
+    """Decode throughput at each batch size, at mid-range efficiency.
+
+    Batch sizes above max_graph_batch have no captured CUDA graph and pay
+    launch_overhead_s on top of the roofline step time.
 
-    Quantization can provide modest speedups.
+    Args:
+        gpu_name: GPU model name
+        params_b: Model parameters in billions
+        batch_sizes: Batch sizes to evaluate
+        kv_len: Context tokens held per sequence
+        metadata: Model metadata for KV and attention terms
+        quantization: Quantization method
+        dtype: Model weight dtype
+        kv_cache_dtype: KV cache dtype
+        tp_size: Tensor parallel size
+        interconnect: GPU interconnect type
+        launch_overhead_s: Eager kernel launch time per decode step
+        max_graph_batch: Largest batch size with a captured CUDA graph (0 for eager)
+        pp_size: Pipeline parallel size
+        gpus_per_node: GPUs in each node
+        inter_node_gbps: Inter-node bandwidth per GPU in GB/s (None for default)
+
+    Returns:
+        One RooflinePoint per batch size
     """
-    speedup_factors = {
-        Quantization.NONE: 1.0,
-        Quantization.AWQ: 1.1,
-        Quantization.GPTQ: 1.05,
-        Quantization.INT8: 1.15,
-        Quantization.FP8: 1.2,
-    }
+    spec = get_gpu_spec(gpu_name) or DEFAULT_GPU_SPEC
+    cost = build_model_cost(params_b, metadata, quantization, dtype, kv_cache_dtype)
+    precision = get_compute_precision(quantization)
+    tp_eff, *allreduce = tensor_parallel_scaling(
+        spec, metadata, tp_size, interconnect, gpus_per_node, inter_node_gbps, dtype
+    )
+    hop_latency_s, hop_s_per_token = pipeline_hop_cost(
+        metadata, pp_size, tp_size, gpus_per_node, interconnect, inter_node_gbps, dtype
+    )
+    mem_eff = sum(MEMORY_EFFICIENCY_RANGE) / 2
+    compute_eff = sum(COMPUTE_EFFICIENCY_RANGE) / 2
+
+    points: list[RooflinePoint] = []
+    for batch_size in batch_sizes:
+        step_s, memory_bound = decode_step_time(
+            spec,
+            cost,
+            batch_size,
+            kv_len,
+            tp_size,
+            precision,
+            mem_eff,
+            compute_eff,
+            tp_eff,
+            pp_size,
+            hop_latency_s,
+            hop_s_per_token,
+            *allreduce,
+        )
+        if batch_size > max_graph_batch:
+            step_s += launch_overhead_s
+        points.append(
+            RooflinePoint(
+                batch_size=batch_size,
+                step_time_ms=step_s * 1000,
+                decode_toks_per_s=batch_size / step_s,
+                per_seq_toks_per_s=1 / step_s,
+                memory_bound=memory_bound,
+            )
+        )
 
-    return tps * speedup_factors.get(quantization, 1.0)
+    return points
 
 
 def estimate_performance(
@@ -142,10 +621,27 @@ def estimate_performance(
     quantization: Quantization = Quantization.NONE,
     interconnect: Interconnect = Interconnect.UNKNOWN,
     num_gpus: int = 1,
+    metadata: Optional[ModelMetadata] = None,
+    gen_tokens: int = 256,
+    dtype: DType = DType.AUTO,
+    kv_cache_dtype: KVCacheDType = KVCacheDType.AUTO,
+    batch_size: int = 1,
+    max_num_seqs: int = 256,
+    enforce_eager: bool = False,
+    max_graph_batch: int = DEFAULT_MAX_CUDA_GRAPH_SIZE,
+    pp_size: int = 1,
+    gpus_per_node: Optional[int] = None,
+    inter_node_gbps: Optional[float] = None,
 ) -> PerfEstimate:
-    """Estimate approximate performance metrics.
+    """Estimate approximate performance metrics with a roofline model.
 
-    Returns ranges to emphasize the heuristic nature of estimates.
+    Decode is bounded by reading weights plus KV cache from HBM each step;
+    prefill is bounded by tensor-core FLOPs. Ranges come from the spread of
+    achievable bandwidth and compute efficiency. The throughput curve gives
+    decode speed at mid-range efficiency for batch sizes up to max_num_seqs.
+    Decode steps without a captured CUDA graph also pay kernel launch time.
+    Pipeline parallelism adds stage-to-stage transfers and, when the batch
+    has fewer sequences than stages, idle pipeline bubbles.
 
     Args:
         gpu_name: GPU model name
@@ -156,64 +652,175 @@ def estimate_performance(
         quantization: Quantization method
         interconnect: GPU interconnect type
         num_gpus: Number of GPUs
+        metadata: Model metadata for KV and attention terms
+        gen_tokens: Typical generation token count
+        dtype: Model weight dtype
+        kv_cache_dtype: KV cache dtype
+        batch_size: Sequences decoded together
+        max_num_seqs: Largest batch size on the throughput curve
+        enforce_eager: Whether decode runs without CUDA graphs
+        max_graph_batch: Largest batch size with a captured CUDA graph
+        pp_size: Pipeline parallel size
+        gpus_per_node: GPUs in each node (None for all num_gpus in one node)
+        inter_node_gbps: Inter-node bandwidth per GPU in GB/s (None for default)
 
     Returns:
-        PerfEstimate with ranges and assumptions
+        PerfEstimate with ranges, throughput curve and assumptions
     """
-    # Get baseline decode TPS
-    base_decode = _get_gpu_baseline(gpu_name, GPU_BASELINE_DECODE_TPS, DEFAULT_DECODE_TPS)
-    base_prefill = _get_gpu_baseline(gpu_name, GPU_BASELINE_PREFILL_TPS, DEFAULT_PREFILL_TPS)
-
-    # Scale by model size
-    decode_tps = _scale_by_model_size(base_decode, params_b)
-    prefill_tps = _scale_by_model_size(base_prefill, params_b, reference_params_b=7.0)
-
-    # Scale by tensor parallel
-    decode_tps = _scale_by_tensor_parallel(decode_tps, tp_size, interconnect)
-    prefill_tps = _scale_by_tensor_parallel(prefill_tps, tp_size, interconnect)
-
-    # Scale by context length
-    decode_tps = _scale_by_context(decode_tps, context_len)
+    known_spec = get_gpu_spec(gpu_name)
+    spec = known_spec or DEFAULT_GPU_SPEC
+    cost = build_model_cost(params_b, metadata, quantization, dtype, kv_cache_dtype)
+    precision = get_compute_precision(quantization)
+    gpus_per_node = gpus_per_node or max(num_gpus, tp_size * pp_size)
+    tp_eff, *allreduce = tensor_parallel_scaling(
+        spec, metadata, tp_size, interconnect, gpus_per_node, inter_node_gbps, dtype
+    )
+    hops = pipeline_hop_cost(
+        metadata, pp_size, tp_size, gpus_per_node, interconnect, inter_node_gbps, dtype
+    )
 
-    # Scale by quantization
-    decode_tps = _scale_by_quantization(decode_tps, quantization)
-    prefill_tps = _scale_by_quantization(prefill_tps, quantization)
+    # Average KV length over a request's decode phase
+    kv_len = min(context_len, prompt_tokens + gen_tokens // 2)
 
-    # Generate ranges (±30% for decode, ±40% for prefill)
-    decode_low = decode_tps * 0.7
-    decode_high = decode_tps * 1.3
+    mem_low, mem_high = MEMORY_EFFICIENCY_RANGE
+    comp_low, comp_high = COMPUTE_EFFICIENCY_RANGE
 
-    prefill_low = prefill_tps * 0.6
-    prefill_high = prefill_tps * 1.4
+    launch_s = eager_launch_overhead(metadata)
+    if enforce_eager:
+        max_graph_batch = 0
+    step_launch_s = launch_s if batch_size > max_graph_batch else 0.0
 
-    # Estimate TTFT (Time To First Token)
-    # TTFT ≈ prompt_tokens / prefill_tps * 1000 (ms)
-    ttft_estimate = (prompt_tokens / prefill_tps) * 1000
-    ttft_low = (prompt_tokens / prefill_high) * 1000
-    ttft_high = (prompt_tokens / prefill_low) * 1000
+    pipeline = (pp_size, *hops, *allreduce)
+    step_slow, memory_bound = decode_step_time(
+        spec, cost, batch_size, kv_len, tp_size, precision, mem_low, comp_low, tp_eff, *pipeline
+    )
+    step_fast, _ = decode_step_time(
+        spec, cost, batch_size, kv_len, tp_size, precision, mem_high, comp_high, tp_eff, *pipeline
+    )
+    step_slow += step_launch_s
+    step_fast += step_launch_s
+    decode_low = batch_size / step_slow
+    decode_high = batch_size / step_fast
+
+    transfers = (*hops, *allreduce)
+    prefill_slow = prefill_time(
+        spec, cost, prompt_tokens, tp_size, precision, mem_low, comp_low, tp_eff, *transfers
+    )
+    prefill_fast = prefill_time(
+        spec, cost, prompt_tokens, tp_size, precision, mem_high, comp_high, tp_eff, *transfers
+    )
+    prefill_low = prompt_tokens / prefill_slow
+    prefill_high = prompt_tokens / prefill_fast
+
+    # TTFT is the prefill time of one prompt
+    ttft_low = prefill_fast * 1000
+    ttft_high = prefill_slow * 1000
+
+    curve = [
+        ThroughputPoint(
+            batch_size=point.batch_size,
+            per_user_toks_per_s=round(point.per_seq_toks_per_s, 1),
+            aggregate_toks_per_s=round(point.decode_toks_per_s, 1),
+            itl_ms=round(point.step_time_ms, 2),
+            memory_bound=point.memory_bound,
+        )
+        for point in compute_roofline(
+            gpu_name,
+            params_b,
+            curve_batch_sizes(max_num_seqs),
+            kv_len,
+            metadata,
+            quantization,
+            dtype,
+            kv_cache_dtype,
+            tp_size,
+            interconnect,
+            launch_s,
+            max_graph_batch,
+            pp_size,
+            gpus_per_node,
+            inter_node_gbps,
+        )
+    ]
 
     # Build assumptions list
     assumptions = [
         "Heuristic estimate; real performance depends on vLLM version, CUDA driver, and kernel selection.",
-        f"Based on reference {gpu_name} performance scaled for {params_b:.1f}B parameters.",
-        f"Context length scaling assumes typical attention patterns at {context_len} tokens.",
+        f"Roofline model for {spec.name}: {spec.memory_bandwidth_gbps:.0f} GB/s HBM, "
+        f"{spec.tflops_for(precision):.0f} dense {precision.upper()} TFLOPS.",
+        f"Decode is {'memory' if memory_bound else 'compute'}-bound at batch size {batch_size} "
+        f"with {kv_len} KV tokens per sequence; prefill assumed compute-bound.",
+        f"Efficiency ranges: {mem_low:.0%}-{mem_high:.0%} of peak bandwidth, "
+        f"{comp_low:.0%}-{comp_high:.0%} of peak TFLOPS.",
     ]
 
-    if tp_size > 1:
+    if known_spec is None:
+        assumptions.append(f"GPU '{gpu_name}' not in spec table; generic specs used.")
+
+    if metadata is None:
+        assumptions.append("No model architecture available; KV reads and attention FLOPs ignored.")
+
+    allreduce_latency_s, allreduce_s_per_token = allreduce
+    allreduce_step_s = (allreduce_latency_s + allreduce_s_per_token * batch_size) / pp_size
+    if tp_size > 1 and metadata is None:
         assumptions.append(
             f"Tensor parallel {tp_size}x scaling assumes {interconnect.value} interconnect efficiency."
         )
+        if tp_size > gpus_per_node:
+            assumptions.append(
+                f"Tensor parallel {tp_size}x spans {gpus_per_node}-GPU nodes; all-reduces over "
+                f"the network keep ~{INTER_NODE_TP_EFFICIENCY:.0%} of the intra-node efficiency."
+            )
+    elif tp_size > 1:
+        link_type = assumed_interconnect(spec, interconnect)
+        guessed = ", assumed from the GPU" if interconnect == Interconnect.UNKNOWN else ""
+        link = (
+            f"the {inter_node_gbps or DEFAULT_INTER_NODE_GBPS:.0f} GB/s network"
+            if tp_size > gpus_per_node
+            else f"{link_type.value} ({allreduce_link_gbps(spec, link_type):.0f} GB/s{guessed})"
+        )
+        assumptions.append(
+            f"Tensor parallel {tp_size}x: {ALLREDUCES_PER_LAYER * metadata.num_hidden_layers} "
+            f"all-reduces per forward pass over {link} add "
+            f"{allreduce_step_s * 1000:.2f} ms to each decode step at batch size {batch_size}."
+        )
+
+    bubble_fraction = 0.0
+    if pp_size > 1:
+        bubble_fraction = 1 - min(pp_size, batch_size) / pp_size
+        inter_hops = count_inter_node_hops(tp_size, pp_size, gpus_per_node)
+        network = f"{inter_node_gbps or DEFAULT_INTER_NODE_GBPS:.0f} GB/s"
+        assumptions.append(
+            f"Pipeline parallel {pp_size}x: batch {batch_size} fills "
+            f"{min(pp_size, batch_size)}/{pp_size} stages ({bubble_fraction:.0%} bubble); "
+            f"{inter_hops} of {pp_size - 1} stage boundaries cross the {network} network."
+        )
 
     if quantization != Quantization.NONE:
-        assumptions.append(f"Quantization ({quantization.value}) speedup factor applied.")
+        assumptions.append(
+            f"Quantization ({quantization.value}) reduces weight bytes read per decode step."
+        )
 
-    assumptions.append(
-        "Actual throughput varies significantly with batch size, prompt/generation ratio, and memory pressure."
-    )
+    if launch_s > 0:
+        if enforce_eager:
+            assumptions.append(
+                f"Eager mode: each decode step pays ~{launch_s * 1000:.1f} ms of kernel "
+                f"launches that CUDA graphs would avoid."
+            )
+        else:
+            assumptions.append(
+                f"CUDA graphs cover decode batches up to {max_graph_batch}, saving "
+                f"~{launch_s * 1000:.1f} ms of kernel launches per step; "
+                f"larger batches run eagerly."
+            )
 
     return PerfEstimate(
         decode_toks_per_s_range=(round(decode_low, 1), round(decode_high, 1)),
         prefill_toks_per_s_range=(round(prefill_low, 1), round(prefill_high, 1)),
         ttft_ms_range=(round(ttft_low, 1), round(ttft_high, 1)),
+        throughput_curve=curve,
+        cuda_graph_itl_saving_ms=round(launch_s * 1000, 2),
+        pipeline_bubble_fraction=round(bubble_fraction, 3),
+        allreduce_ms_per_step=round(allreduce_step_s * 1000, 3),
         assumptions=assumptions,
     )
@@ -1,32 +1,75 @@
 """Main planner orchestration for vLLM sizing."""
 
+import math
+import re
 from typing import Optional
 
-from vllm_wizard.hardware.detect import detect_gpus, get_gpu_by_name, recommend_tensor_parallel
-from vllm_wizard.models.metadata import load_model_metadata
+from vllm_wizard.hardware.detect import (
+    detect_gpus,
+    detect_topology,
+    get_gpu_by_name,
+    recommend_tensor_parallel,
+)
+from vllm_wizard.hardware.specs import device_group, gpu_types, slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata, load_model_metadata
 from vllm_wizard.planning.memory import (
     BYTES_TO_GIB,
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    DEFAULT_MAX_NUM_SEQS,
+    compute_activation_memory,
+    compute_cuda_graph_memory,
     compute_feasibility,
     compute_kv_cache_memory,
     compute_overhead,
     compute_weights_memory,
+    compute_weights_per_rank,
+    cuda_graph_capture_sizes,
+    free_memory_at_start,
+    split_memory_utilization,
 )
 from vllm_wizard.planning.perf import estimate_performance
 from vllm_wizard.planning.recommend import generate_recommendations
-from vllm_wizard.render.commands import render_docker_compose, render_docker_command, render_serve_command
-from vllm_wizard.schemas.inputs import PlanRequest
-from vllm_wizard.schemas.outputs import Artifacts, GPUInfo, PlanResponse
+from vllm_wizard.planning.trace import concurrent_kv_tokens
+from vllm_wizard.render.commands import (
+    render_colocated_compose,
+    render_colocated_serve_script,
+    render_docker_command,
+    render_docker_compose,
+    render_serve_command,
+)
+from vllm_wizard.schemas.inputs import Interconnect, PlanAgainst, PlanRequest
+from vllm_wizard.schemas.outputs import (
+    Artifacts,
+    ColocatedEngine,
+    ColocationReport,
+    GPUInfo,
+    PerfEstimate,
+    PlanResponse,
+    VLLMConfig,
+)
+from vllm_wizard.schemas.trace import WorkloadTrace
 
+# Port of the first co-located engine; later engines take the following ports
+COLOCATED_BASE_PORT = 8000
 
-def run_plan(request: PlanRequest) -> PlanResponse:
+# Detected interconnects ranked slowest first
+_INTERCONNECT_RANK = {Interconnect.CROSS_SOCKET: 0, Interconnect.PCIE: 1, Interconnect.NVLINK: 2}
+
+
+def run_plan(request: PlanRequest, memory_fraction: Optional[float] = None) -> PlanResponse:
     """Run the complete planning pipeline.
 
     Args:
         request: Complete planning request
+        memory_fraction: Fraction of each GPU the engine owns when it shares
+            the GPUs with other engines (None for the utilization policy)
 
     Returns:
         PlanResponse with feasibility, config, performance, and artifacts
     """
+    if request.colocate and memory_fraction is None:
+        return run_colocated_plan(request)
+
     # 1. Load model metadata
     metadata = load_model_metadata(
         model_id_or_path=request.model.model,
@@ -36,7 +79,7 @@ def run_plan(request: PlanRequest) -> PlanResponse:
     )
 
     # 2. Detect or configure hardware
-    gpus = _resolve_hardware(request)
+    gpus = resolve_hardware(request)
 
     if not gpus:
         raise ValueError(
@@ -44,49 +87,95 @@ def run_plan(request: PlanRequest) -> PlanResponse:
             "Provide --gpu and --vram-gb flags, or run on a system with nvidia-smi."
         )
 
-    # 3. Calculate total VRAM
+    # 3. Generate recommendations, within the memory free right now if asked
+    free_fraction = None
+    if memory_fraction is None and request.hardware.plan_against == PlanAgainst.FREE:
+        free_fraction = free_memory_utilization(gpus, request.policy.gpu_memory_utilization)
+        memory_fraction = free_fraction
+
     vram_total_bytes = sum(gpu.vram_mib * 1024 * 1024 for gpu in gpus)
-    tp_size = request.hardware.tensor_parallel_size or recommend_tensor_parallel(gpus)
+    config = generate_recommendations(
+        request=request,
+        metadata=metadata,
+        gpus=gpus,
+        vram_total_bytes=vram_total_bytes,
+        memory_fraction=memory_fraction,
+    )
+    if free_fraction is not None and request.explain:
+        config.explanations["gpu_memory_utilization"] = (
+            f"{request.policy.gpu_memory_utilization:.0%} of the memory free on the fullest GPU"
+        )
+    tp_size = config.tensor_parallel_size
+    pp_size = config.pipeline_parallel_size
 
-    # For TP, we use VRAM per GPU group
-    effective_vram = (vram_total_bytes // len(gpus)) * tp_size
+    # 4. Run the group on the best-connected GPUs of a detected node
+    request, gpus, topology_warnings = place_on_topology(request, gpus, config)
 
-    # 4. Compute memory breakdown
+    # 5. Compute the memory breakdown of the worst-loaded rank on the smallest GPU
+    group = device_group(gpus, tp_size * pp_size)
+    vram_per_gpu = min(gpu.vram_mib for gpu in group) * 1024 * 1024
     params_b = request.model.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
 
     weights_bytes = compute_weights_memory(
         params_b=params_b,
         dtype=request.model.dtype,
         quantization=request.model.quantization,
+        metadata=metadata,
     )
-
-    # Weights per GPU with TP
-    weights_per_tp = weights_bytes // tp_size
+    weights_per_rank = compute_weights_per_rank(weights_bytes, metadata, tp_size, pp_size)
 
     context_len = request.model.max_model_len or metadata.max_position_embeddings
 
+    # A trace sizes KV for its concurrent lengths rather than concurrency x max_model_len
+    trace = request.workload.trace
+    kv_tokens, kv_seqs, last_block_slack = context_len, request.workload.concurrency, 0
+    if trace is not None:
+        context_len = config.max_model_len
+        kv_tokens = concurrent_kv_tokens(trace, request.workload.concurrency, context_len)
+        kv_seqs = 1
+        # Every sequence's last block may be all but empty
+        last_block_slack = request.workload.concurrency * (request.policy.block_size - 1)
+
+    # Whole KV blocks, as vLLM allocates them
     kv_cache_bytes = compute_kv_cache_memory(
         metadata=metadata,
-        context_len=context_len,
-        concurrency=request.workload.concurrency,
+        context_len=kv_tokens + last_block_slack,
+        concurrency=kv_seqs,
         kv_dtype=request.model.kv_cache_dtype,
         dtype=request.model.dtype,
         fragmentation_factor=request.policy.fragmentation_factor,
+        tp_size=tp_size,
+        pp_size=pp_size,
+        block_size=request.policy.block_size,
     )
 
     overhead_bytes = compute_overhead(
-        vram_total_bytes=effective_vram,
+        vram_total_bytes=vram_per_gpu,
         tp_size=tp_size,
         fixed_overhead_gb=request.policy.overhead_gb,
     )
 
-    # 5. Compute feasibility
+    # Profile-run activations at the recommended scheduler limits
+    activation_bytes = compute_activation_memory(
+        metadata=metadata,
+        max_num_batched_tokens=config.max_num_batched_tokens or DEFAULT_MAX_NUM_BATCHED_TOKENS,
+        max_num_seqs=config.max_num_seqs or DEFAULT_MAX_NUM_SEQS,
+        dtype=request.model.dtype,
+        tp_size=tp_size,
+    )
+    cuda_graph_bytes = compute_cuda_graph_memory(
+        metadata, captured_graph_sizes(config), request.model.dtype, tp_size, pp_size
+    )
+
+    # 6. Compute feasibility, within the engine's share when it shares the GPUs
+    if memory_fraction is None:
+        memory_fraction = request.policy.gpu_memory_utilization
     feasibility = compute_feasibility(
-        weights_bytes=weights_per_tp,
+        weights_bytes=weights_per_rank,
         kv_cache_bytes=kv_cache_bytes,
         overhead_bytes=overhead_bytes,
-        vram_total_bytes=effective_vram,
-        gpu_memory_utilization=request.policy.gpu_memory_utilization,
+        vram_total_bytes=vram_per_gpu,
+        gpu_memory_utilization=memory_fraction,
         headroom_gb=request.policy.headroom_gb,
         context_len=context_len,
         concurrency=request.workload.concurrency,
@@ -94,27 +183,30 @@ def run_plan(request: PlanRequest) -> PlanResponse:
         kv_dtype=request.model.kv_cache_dtype,
         dtype=request.model.dtype,
         fragmentation_factor=request.policy.fragmentation_factor,
+        block_size=request.policy.block_size,
+        activation_bytes=activation_bytes,
+        cuda_graph_bytes=cuda_graph_bytes,
+        tp_size=tp_size,
+        pp_size=pp_size,
     )
 
-    # 6. Generate recommendations
-    config = generate_recommendations(
-        request=request,
-        metadata=metadata,
-        gpus=gpus,
-        vram_total_bytes=vram_total_bytes,
-    )
+    mixed_warning = mixed_gpu_warning(gpus, group)
+    if mixed_warning:
+        feasibility.warnings.append(mixed_warning)
+    if request.hardware.plan_against == PlanAgainst.FREE:
+        feasibility.warnings.extend(memory_in_use_warnings(gpus, free_fraction))
+    if tp_size * pp_size > 1 and any(gpu.mig_profile for gpu in group):
+        feasibility.warnings.append(
+            "MIG instances cannot be combined with tensor or pipeline parallelism: NCCL does "
+            "not run across MIG devices. Use a larger MIG profile or whole GPUs."
+        )
+    feasibility.warnings.extend(topology_warnings)
+    if trace is not None:
+        feasibility.kv_trace_tokens = kv_tokens
+        feasibility.warnings.extend(trace_warnings(trace, context_len))
 
     # 7. Estimate performance
-    performance = estimate_performance(
-        gpu_name=gpus[0].name,
-        params_b=params_b,
-        tp_size=config.tensor_parallel_size,
-        context_len=config.max_model_len,
-        prompt_tokens=request.workload.prompt_tokens,
-        quantization=request.model.quantization,
-        interconnect=request.hardware.interconnect,
-        num_gpus=len(gpus),
-    )
+    performance = estimate_plan_performance(request, metadata, gpus, config, params_b)
 
     # 8. Generate artifacts
     serve_command = render_serve_command(config)
@@ -135,29 +227,248 @@ def run_plan(request: PlanRequest) -> PlanResponse:
     )
 
 
-def _resolve_hardware(request: PlanRequest) -> list[GPUInfo]:
+def colocated_requests(request: PlanRequest) -> list[PlanRequest]:
+    """Split a request into one request per engine, primary model first.
+
+    Every engine keeps the request's hardware and policy; co-located
+    engines bring their own model and workload.
+    """
+    primary = request.model_copy(update={"colocate": []})
+    return [primary] + [
+        primary.model_copy(update={"model": engine.model, "workload": engine.workload})
+        for engine in request.colocate
+    ]
+
+
+def run_colocated_plan(request: PlanRequest) -> PlanResponse:
+    """Plan several engines started one after another on the same GPUs.
+
+    Each engine is first sized as if it had the GPUs to itself, using the
+    primary model's TP and PP layout. The memory budget is then split so
+    every engine's weights, KV cache and overhead fit in its share, and
+    each engine is planned again within that share. vLLM's
+    gpu_memory_utilization is a per-instance budget, so each engine's flag
+    is its own share; the engines started before it must leave at least
+    that much free.
+
+    Args:
+        request: Planning request with colocate entries
+
+    Returns:
+        PlanResponse for the primary engine, with every engine's share in
+        the colocation report and artifacts that start all of them
+    """
+    engines = colocated_requests(request)
+
+    # Size every engine alone on the primary model's device layout
+    primary = run_plan(engines[0])
+    layout = request.hardware.model_copy(
+        update={
+            "tensor_parallel_size": primary.config.tensor_parallel_size,
+            "pipeline_parallel_size": primary.config.pipeline_parallel_size,
+        }
+    )
+    engines = [engines[0]] + [
+        engine.model_copy(update={"hardware": layout}) for engine in engines[1:]
+    ]
+    sized = [primary] + [run_plan(engine) for engine in engines[1:]]
+
+    required_bytes = []
+    kv_cache_bytes = []
+    for response in sized:
+        feasibility = response.feasibility
+        required_gb = (
+            feasibility.weights_gb
+            + feasibility.kv_cache_gb
+            + feasibility.overhead_gb
+            + feasibility.activation_gb
+            + feasibility.cuda_graph_gb
+        )
+        required_bytes.append(int(required_gb * BYTES_TO_GIB))
+        kv_cache_bytes.append(int(feasibility.kv_cache_gb * BYTES_TO_GIB))
+
+    fractions = split_memory_utilization(
+        required_bytes,
+        kv_cache_bytes,
+        int(primary.feasibility.vram_total_gb * BYTES_TO_GIB),
+        primary.config.gpu_memory_utilization,
+        request.policy.headroom_gb,
+    )
+    free_fractions = free_memory_at_start(fractions)
+
+    # Plan every engine again within its share
+    colocated: list[ColocatedEngine] = []
+    responses: list[PlanResponse] = []
+    warnings: list[str] = []
+    for index, (engine, fraction, free) in enumerate(zip(engines, fractions, free_fractions)):
+        response = run_plan(engine, memory_fraction=fraction)
+        responses.append(response)
+        port = COLOCATED_BASE_PORT + index
+        config = response.config.model_copy(
+            update={"gpu_memory_utilization": fraction, "port": port}
+        )
+        if request.explain:
+            note = f"Engine {index + 1} of {len(engines)} owns {fraction:.3f} of each GPU"
+            if index > 0:
+                note += f"; engines started before it leave {free:.3f} free"
+            config.explanations = {**config.explanations, "gpu_memory_utilization": note}
+        if free < fraction:
+            warnings.append(
+                f"Engine {index + 1} ({engine.model.model}) needs {fraction:.3f} of each GPU "
+                f"free at startup, but engines started before it leave {free:.3f}"
+            )
+        if not response.feasibility.fits:
+            warnings.append(
+                f"Engine {index + 1} ({engine.model.model}) does not fit in its "
+                f"{fraction:.3f} share of each GPU"
+            )
+        colocated.append(
+            ColocatedEngine(
+                model=engine.model.model,
+                memory_fraction=fraction,
+                gpu_memory_utilization=fraction,
+                port=port,
+                feasibility=response.feasibility,
+                config=config,
+            )
+        )
+
+    configs = [engine.config for engine in colocated]
+    fits = not warnings
+    head = responses[0]
+    feasibility = head.feasibility.model_copy(
+        update={"fits": fits, "warnings": head.feasibility.warnings + warnings}
+    )
+    performance = head.performance.model_copy(
+        update={
+            "assumptions": head.performance.assumptions
+            + [
+                f"{len(engines)} engines share the GPUs' compute and memory bandwidth; "
+                "estimates assume this engine runs alone"
+            ]
+        }
+    )
+
+    return PlanResponse(
+        feasibility=feasibility,
+        config=configs[0],
+        performance=performance,
+        artifacts=Artifacts(
+            serve_command=render_colocated_serve_script(configs),
+            docker_compose=render_colocated_compose(configs),
+        ),
+        colocation=ColocationReport(
+            engines=colocated,
+            total_memory_fraction=round(sum(fractions), 3),
+            fits=fits,
+        ),
+    )
+
+
+def captured_graph_sizes(config: VLLMConfig) -> list[int]:
+    """Decode batch sizes a config captures CUDA graphs for (empty in eager mode)."""
+    if config.enforce_eager:
+        return []
+    return cuda_graph_capture_sizes(
+        config.max_num_seqs or DEFAULT_MAX_NUM_SEQS, config.cuda_graph_sizes
+    )
+
+
+def estimate_plan_performance(
+    request: PlanRequest,
+    metadata: ModelMetadata,
+    gpus: list[GPUInfo],
+    config: VLLMConfig,
+    params_b: float,
+) -> PerfEstimate:
+    """Estimate performance of a recommended config for a request's workload.
+
+    Args:
+        request: Planning request
+        metadata: Model metadata
+        gpus: Resolved GPUs
+        config: Recommended vLLM config (TP/PP size, context, max_num_seqs)
+        params_b: Model parameters in billions
+
+    Returns:
+        PerfEstimate with a throughput curve up to the config's max_num_seqs,
+        including kernel launch time for batches without a captured CUDA graph,
+        at the pace of the slowest GPU in the group
+    """
+    group = device_group(gpus, config.tensor_parallel_size * config.pipeline_parallel_size)
+    return estimate_performance(
+        gpu_name=slowest_gpu(group).name,
+        params_b=params_b,
+        tp_size=config.tensor_parallel_size,
+        context_len=config.max_model_len,
+        prompt_tokens=request.workload.prompt_tokens,
+        quantization=request.model.quantization,
+        interconnect=request.hardware.interconnect,
+        num_gpus=len(gpus),
+        metadata=metadata,
+        gen_tokens=request.workload.gen_tokens,
+        dtype=request.model.dtype,
+        kv_cache_dtype=request.model.kv_cache_dtype,
+        max_num_seqs=config.max_num_seqs or 256,
+        enforce_eager=bool(config.enforce_eager),
+        max_graph_batch=max(captured_graph_sizes(config), default=0),
+        pp_size=config.pipeline_parallel_size,
+        gpus_per_node=max(1, len(gpus) // request.hardware.nodes),
+        inter_node_gbps=request.hardware.inter_node_gbps,
+    )
+
+
+def resolve_hardware(request: PlanRequest) -> list[GPUInfo]:
     """Resolve hardware configuration from request or detection.
 
     Args:
         request: Planning request
 
     Returns:
-        List of GPUInfo objects
+        List of GPUInfo objects across all nodes
     """
     hardware = request.hardware
 
+    # Free memory is only known for GPUs detected just now
+    if hardware.plan_against == PlanAgainst.FREE:
+        if hardware.gpu.lower() != "auto":
+            raise ValueError(
+                "--plan-against free reads live memory usage; use --gpu auto on the serving host."
+            )
+        detected = detect_gpus(use_cache=False, processes=True)
+        if not detected:
+            raise ValueError("--plan-against free needs nvidia-smi to read free memory.")
+        return connected_subset(detected, hardware.gpus) * hardware.nodes
+
     # Auto-detect if requested
     if hardware.gpu.lower() == "auto":
         detected = detect_gpus()
         if detected:
-            # Limit to requested number of GPUs
-            return detected[: hardware.gpus]
+            # Limit to requested number of GPUs; other nodes mirror this one
+            return connected_subset(detected, hardware.gpus) * hardware.nodes
+
+    # A list names each GPU of a node, e.g. "2x A100 80GB, 2x A100 40GB"
+    names = parse_gpu_names(hardware.gpu)
+    if len(names) > 1:
+        if hardware.gpus not in (1, len(names)):
+            raise ValueError(
+                f"--gpu lists {len(names)} GPUs per node but --gpus is {hardware.gpus}."
+            )
+        node: list[GPUInfo] = []
+        for name in names:
+            gpu = get_gpu_by_name(name)
+            if gpu is None and hardware.vram_gb:
+                gpu = GPUInfo(name=name, vram_mib=int(hardware.vram_gb * 1024))
+            if gpu is None:
+                raise ValueError(f"Unknown GPU {name!r}; give its VRAM with --vram-gb.")
+            node.append(gpu)
+        return node * hardware.nodes
 
     # Try to get GPU by name
     if hardware.gpu.lower() != "auto":
         gpu = get_gpu_by_name(hardware.gpu)
         if gpu:
-            return [gpu] * hardware.gpus
+            return [gpu] * (hardware.gpus * hardware.nodes)
 
     # Fall back to manual specification
     if hardware.vram_gb:
@@ -166,6 +477,280 @@ def _resolve_hardware(request: PlanRequest) -> list[GPUInfo]:
             name=hardware.gpu if hardware.gpu != "auto" else "Unknown GPU",
             vram_mib=vram_mib,
         )
-        return [gpu] * hardware.gpus
+        return [gpu] * (hardware.gpus * hardware.nodes)
 
     return []
+
+
+def _topology_applies(gpus: list[GPUInfo]) -> bool:
+    """Whether GPUs are whole, identical GPUs detected on this node."""
+    return (
+        len(gpu_types(gpus)) == 1
+        and len({gpu.index for gpu in gpus}) == len(gpus)
+        and all(gpu.index is not None and not gpu.mig_profile for gpu in gpus)
+    )
+
+
+def _physical_indices(gpus: list[GPUInfo]) -> list[int]:
+    """nvidia-smi indices of GPUs that passed _topology_applies, so all have one."""
+    return [gpu.index for gpu in gpus if gpu.index is not None]
+
+
+def connected_subset(detected: list[GPUInfo], count: int) -> list[GPUInfo]:
+    """The best-connected detected GPUs when only some of them are used.
+
+    Args:
+        detected: GPUs detected on this node
+        count: GPUs to use
+
+    Returns:
+        count GPUs, the first ones unless the topology shows a better set
+    """
+    if count >= len(detected) or not _topology_applies(detected):
+        return detected[:count]
+
+    topology = detect_topology()
+    indices = _physical_indices(detected)
+    if topology is None or max(indices) >= topology.gpu_count:
+        return detected[:count]
+
+    chosen = set(topology.best_group(count, indices))
+    return [gpu for gpu in detected if gpu.index in chosen]
+
+
+def trace_warnings(trace: WorkloadTrace, max_model_len: int) -> list[str]:
+    """Warn about traced requests a context limit would reject.
+
+    Args:
+        trace: Workload trace the plan was sized from
+        max_model_len: Context limit of the plan
+
+    Returns:
+        Warning messages, empty if every request fits
+    """
+    longer = trace.context_tokens.fraction_above(max_model_len)
+    if longer <= 0:
+        return []
+    return [
+        f"About {max(longer, 0.001):.1%} of traced requests exceed max_model_len "
+        f"{max_model_len} (longest {trace.context_tokens.max} tokens) and would be rejected."
+    ]
+
+
+def place_on_topology(
+    request: PlanRequest, gpus: list[GPUInfo], config: VLLMConfig
+) -> tuple[PlanRequest, list[GPUInfo], list[str]]:
+    """Place the TP x PP group on the best-connected GPUs of a detected node.
+
+    Reads `nvidia-smi topo -m` for whole, identical GPUs detected on a single
+    node. The group takes the GPUs with the best worst-case link, ordered by
+    NUMA node so consecutive ranks (one TP group per pipeline stage) share a
+    socket. The slowest link within a TP group becomes the interconnect of
+    the performance model unless --interconnect was given, and the config
+    is pinned with CUDA_VISIBLE_DEVICES if the group is not the first GPUs.
+
+    Args:
+        request: Planning request
+        gpus: Resolved GPUs
+        config: Recommended config; cuda_visible_devices is set in place
+
+    Returns:
+        (request with the detected interconnect, GPUs with the group first,
+        warnings)
+    """
+    tp_size = config.tensor_parallel_size
+    size = tp_size * config.pipeline_parallel_size
+    if request.hardware.nodes > 1 or size > len(gpus) or not _topology_applies(gpus):
+        return request, gpus, []
+
+    topology = detect_topology()
+    if topology is None or max(_physical_indices(gpus)) >= topology.gpu_count:
+        return request, gpus, []
+
+    def numa_node(index: int) -> int:
+        nodes = topology.numa_nodes([index])
+        return nodes[0] if nodes else -1
+
+    indices = topology.best_group(size, _physical_indices(gpus))
+    indices.sort(key=lambda index: (numa_node(index), index))
+
+    by_index = {gpu.index: gpu for gpu in gpus}
+    gpus = [by_index[index] for index in indices] + [
+        gpu for gpu in gpus if gpu.index not in indices
+    ]
+    if indices != list(range(size)) and config.data_parallel_size == 1:
+        config.cuda_visible_devices = ",".join(map(str, indices))
+
+    # TP groups exchange all-reduces every layer; PP stages only pass activations
+    if tp_size > 1:
+        tp_groups = [indices[start : start + tp_size] for start in range(0, size, tp_size)]
+    else:
+        tp_groups = [indices]
+    interconnect = min(
+        (topology.group_interconnect(group) for group in tp_groups),
+        key=lambda link: _INTERCONNECT_RANK.get(link, len(_INTERCONNECT_RANK)),
+    )
+
+    if interconnect != Interconnect.UNKNOWN:
+        if request.explain:
+            placement = [interconnect.value] + [
+                f"NUMA node {node}" for node in topology.numa_nodes(indices)
+            ]
+            config.explanations["cuda_visible_devices"] = (
+                f"Best-connected {size} of {topology.gpu_count} GPUs ({', '.join(placement)})"
+            )
+        if request.hardware.interconnect == Interconnect.UNKNOWN:
+            hardware = request.hardware.model_copy(update={"interconnect": interconnect})
+            request = request.model_copy(update={"hardware": hardware})
+
+    warnings: list[str] = []
+    crossing = [group for group in tp_groups if len(topology.numa_nodes(group)) > 1]
+    if tp_size > 1 and crossing:
+        per_socket = max(
+            sum(1 for index in _physical_indices(gpus) if numa_node(index) == node)
+            for node in topology.numa_nodes(indices)
+        )
+        warning = (
+            f"Tensor-parallel group on GPUs {','.join(map(str, crossing[0]))} spans CPU "
+            f"sockets (NUMA nodes {', '.join(map(str, topology.numa_nodes(crossing[0])))}): "
+            "every all-reduce crosses the inter-socket link, so TP scales markedly worse."
+        )
+        socket_tp = 2 ** int(math.log2(per_socket)) if per_socket else 0
+        if 1 < socket_tp < tp_size:
+            warning += (
+                f" Consider TP={socket_tp} within a socket, with pipeline or data "
+                "parallelism across sockets."
+            )
+        warnings.append(warning)
+    return request, gpus, warnings
+
+
+# "2x A100 80GB" or "2 x A100 80GB": a count of identical GPUs
+_GPU_COUNT_PATTERN = re.compile(r"^(\d+)\s*[x×]\s*(.+)$", re.IGNORECASE)
+
+
+def parse_gpu_names(value: str) -> list[str]:
+    """Expand a GPU list like "2x A100 80GB, A100 40GB" into one name per GPU.
+
+    Args:
+        value: Comma-separated GPU names, each optionally prefixed by a count
+
+    Returns:
+        One name per GPU; a plain name gives a single entry
+    """
+    names: list[str] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        match = _GPU_COUNT_PATTERN.match(item)
+        if match:
+            names.extend([match.group(2).strip()] * int(match.group(1)))
+        else:
+            names.append(item)
+    return names
+
+
+def free_memory_utilization(
+    gpus: list[GPUInfo], gpu_memory_utilization: float
+) -> Optional[float]:
+    """The --gpu-memory-utilization flag that fits in the memory free right now.
+
+    vLLM refuses to start unless the free memory covers the flag times the
+    total memory. The flag is the policy's fraction of the free memory on
+    the fullest GPU, expressed as a fraction of its total, so the same
+    slack is left for the other processes on the GPU to grow into.
+
+    Args:
+        gpus: Detected GPUs with free memory
+        gpu_memory_utilization: Fraction of the free memory to use
+
+    Returns:
+        Flag rounded down to 3 decimals, or None if no GPU reports free memory
+    """
+    fractions = [
+        gpu_memory_utilization * gpu.vram_free_mib / gpu.vram_mib
+        for gpu in gpus
+        if gpu.vram_free_mib is not None and gpu.vram_mib > 0
+    ]
+    if not fractions:
+        return None
+    return math.floor(min(fractions) * 1000) / 1000
+
+
+def memory_in_use_warnings(gpus: list[GPUInfo], free_fraction: Optional[float]) -> list[str]:
+    """Describe memory other processes hold when planning against free memory.
+
+    Args:
+        gpus: Detected GPUs with used memory and processes
+        free_fraction: Flag from free_memory_utilization
+
+    Returns:
+        Warnings naming each GPU with memory in use and the largest holders
+    """
+    if free_fraction is None:
+        return [
+            "Free memory is unknown for these GPUs (e.g., MIG instances); "
+            "planned against total memory."
+        ]
+
+    warnings = []
+    seen: set[str] = set()
+    for position, gpu in enumerate(gpus):
+        # Name the nvidia-smi index, since placement may reorder the GPUs
+        label = gpu.index if gpu.index is not None else position
+        key = gpu.uuid or str(label)
+        if key in seen or not gpu.vram_used_mib:
+            continue
+        seen.add(key)
+        holders = ", ".join(
+            f"pid {process.pid} {process.name} ({process.used_mib / 1024:.1f} GiB)"
+            for process in gpu.processes[:3]
+        )
+        warning = (
+            f"GPU {label} ({gpu.name}): {gpu.vram_used_mib / 1024:.1f} GiB in use, "
+            f"{gpu.vram_free_gib:.1f} GiB free"
+        )
+        warnings.append(warning + (f"; held by {holders}" if holders else ""))
+
+    if warnings:
+        warnings.append(
+            f"Planned against free memory: --gpu-memory-utilization {free_fraction} leaves "
+            "room for the memory in use above. Re-plan if those processes grow or exit."
+        )
+    return warnings
+
+
+def mixed_gpu_warning(gpus: list[GPUInfo], group: list[GPUInfo]) -> Optional[str]:
+    """Explain how unlike GPUs bound a group and how to split them.
+
+    Args:
+        gpus: All resolved GPUs
+        group: GPUs the TP x PP group runs on
+
+    Returns:
+        Warning text, or None if every GPU is the same model and size
+    """
+    types = gpu_types(gpus)
+    if len(types) < 2:
+        return None
+
+    smallest = min(group, key=lambda gpu: gpu.vram_mib)
+    slowest = slowest_gpu(group)
+    inventory = ", ".join(f"{count}x {gpu.name} ({gpu.vram_gib:.0f} GiB)" for gpu, count in types)
+    split = ", ".join(
+        f"TP={recommend_tensor_parallel([gpu] * count)} on the {gpu.name} GPUs"
+        for gpu, count in types
+    )
+
+    warning = (
+        f"Mixed GPUs ({inventory}): each rank is planned with the "
+        f"{smallest.vram_gib:.0f} GiB of the smallest group member and runs at the pace "
+        f"of the slowest ({slowest.name})."
+    )
+    if len(group) < len(gpus):
+        warning += f" {len(gpus) - len(group)} smaller or slower GPU(s) are left idle."
+    return (
+        warning + f" Consider one engine per GPU type ({split}), each pinned with "
+        "CUDA_VISIBLE_DEVICES."
+    )
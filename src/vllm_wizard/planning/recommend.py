@@ -2,13 +2,23 @@
 
 from typing import Optional
 
+from vllm_wizard.hardware.specs import device_group, slowest_gpu
 from vllm_wizard.models.metadata import ModelMetadata
 from vllm_wizard.planning.memory import (
     BYTES_TO_GIB,
+    DEFAULT_BLOCK_SIZE,
+    compute_activation_memory,
+    compute_blocks_per_seq,
+    compute_cuda_graph_memory,
     compute_kv_cache_memory,
     compute_overhead,
     compute_weights_memory,
+    compute_weights_per_rank,
+    cuda_graph_capture_sizes,
+    pipeline_stage_layers,
 )
+from vllm_wizard.planning.perf import eager_launch_overhead
+from vllm_wizard.planning.trace import concurrent_kv_tokens
 from vllm_wizard.schemas.inputs import (
     BatchingMode,
     DType,
@@ -44,6 +54,7 @@ def _recommend_tensor_parallel(
     weights_bytes: int,
     vram_per_gpu_bytes: int,
     requested_tp: Optional[int] = None,
+    metadata: Optional[ModelMetadata] = None,
 ) -> tuple[int, str]:
     """Recommend tensor parallel size."""
     if requested_tp is not None:
@@ -58,7 +69,7 @@ def _recommend_tensor_parallel(
         tp_size *= 2
 
     # Check if weights fit with this TP
-    weights_per_gpu = weights_bytes / tp_size
+    weights_per_gpu = compute_weights_per_rank(weights_bytes, metadata, tp_size)
     if weights_per_gpu > vram_per_gpu_bytes * 0.7:
         # Need more parallelism
         tp_size = min(num_gpus, tp_size * 2)
@@ -67,10 +78,42 @@ def _recommend_tensor_parallel(
     return tp_size, f"Optimal power-of-2 tensor parallel for {num_gpus} GPUs"
 
 
+def _recommend_pipeline_parallel(
+    num_gpus: int,
+    tp_size: int,
+    weights_bytes: int,
+    vram_per_gpu_bytes: int,
+    metadata: ModelMetadata,
+    requested_pp: Optional[int] = None,
+) -> tuple[int, str]:
+    """Recommend pipeline parallel size: the fewest stages whose heaviest rank fits."""
+    if requested_pp is not None:
+        return requested_pp, "User-specified pipeline parallel size"
+
+    max_pp = min(num_gpus // tp_size, metadata.num_hidden_layers)
+    if max_pp <= 1:
+        return 1, "Single pipeline stage"
+
+    for pp_size in range(1, max_pp + 1):
+        weights_per_rank = compute_weights_per_rank(weights_bytes, metadata, tp_size, pp_size)
+        if weights_per_rank <= vram_per_gpu_bytes * 0.7:
+            break
+
+    if pp_size == 1:
+        return 1, "Weights fit in one pipeline stage"
+
+    stages = pipeline_stage_layers(metadata.num_hidden_layers, pp_size)
+    return pp_size, (
+        f"{pp_size} pipeline stages of {min(stages)}-{max(stages)} layers "
+        f"to fit weights across {pp_size * tp_size} GPUs"
+    )
+
+
 def _recommend_max_model_len(
     requested: Optional[int],
     model_max: int,
     available_context: int,
+    trace_max: Optional[int] = None,
 ) -> tuple[int, str]:
     """Recommend max model length."""
     if requested is not None:
@@ -80,6 +123,16 @@ def _recommend_max_model_len(
             return available_context, f"Reduced to fit available VRAM ({available_context})"
         return requested, "User-specified context length"
 
+    # Long enough for every request in the trace, if the model and VRAM allow
+    if trace_max:
+        recommended = min(trace_max, model_max, available_context)
+        if recommended < trace_max:
+            return recommended, (
+                f"Longest request in the trace ({trace_max} tokens) capped to "
+                f"{'model maximum' if recommended == model_max else 'fit available VRAM'}"
+            )
+        return recommended, f"Longest request in the trace ({trace_max} tokens)"
+
     # Use smaller of model max and what fits
     recommended = min(model_max, available_context)
     return recommended, f"Maximum context that fits in VRAM (model supports up to {model_max})"
@@ -124,8 +177,12 @@ def _recommend_kv_cache_dtype(
 def _recommend_max_num_seqs(
     concurrency: int,
     mode: BatchingMode,
+    requested: Optional[int] = None,
 ) -> tuple[int, str]:
     """Recommend max_num_seqs."""
+    if requested is not None:
+        return requested, "User-specified sequence limit"
+
     if mode == BatchingMode.THROUGHPUT:
         seqs = max(concurrency, concurrency + 4)
         return seqs, "Increased for throughput mode batching"
@@ -142,8 +199,12 @@ def _recommend_max_batched_tokens(
     concurrency: int,
     mode: BatchingMode,
     vram_gb: float,
+    requested: Optional[int] = None,
 ) -> tuple[int, str]:
     """Recommend max_num_batched_tokens."""
+    if requested is not None:
+        return requested, "User-specified token budget"
+
     base = (prompt_tokens + gen_tokens) * concurrency
 
     # Adjust based on mode
@@ -164,11 +225,69 @@ def _recommend_max_batched_tokens(
     return recommended, f"Based on workload ({prompt_tokens}+{gen_tokens}) x {concurrency} with {mode.value} mode"
 
 
+def _recommend_cuda_graphs(
+    requested: Optional[bool],
+    available_for_kv: int,
+    kv_target_bytes: int,
+    concurrency: int,
+    max_num_seqs: int,
+    metadata: ModelMetadata,
+    dtype: DType,
+    tp_size: int,
+    pp_size: int = 1,
+) -> tuple[Optional[bool], Optional[list[int]], int, str]:
+    """Recommend CUDA graph capture, trading graph memory for decode latency.
+
+    Graphs for every batch size up to max_num_seqs are kept unless their
+    memory pushes the target KV cache out of budget. Then capture stops at
+    the target concurrency, and eager mode is the last resort.
+
+    Returns:
+        (enforce_eager, cuda_graph_sizes, graph memory bytes, explanation)
+    """
+    saving_ms = eager_launch_overhead(metadata) * 1000
+
+    if requested:
+        return True, None, 0, (
+            f"User-specified eager mode: decode steps pay ~{saving_ms:.1f} ms of kernel launches"
+        )
+
+    full_sizes = cuda_graph_capture_sizes(max_num_seqs)
+    full_bytes = compute_cuda_graph_memory(metadata, full_sizes, dtype, tp_size, pp_size)
+    full_note = (
+        f"CUDA graphs for decode batches up to {full_sizes[-1]} use "
+        f"{full_bytes / BYTES_TO_GIB:.2f} GiB and save ~{saving_ms:.1f} ms per decode step"
+    )
+    if requested is not None or available_for_kv - full_bytes >= kv_target_bytes:
+        return None, None, full_bytes, full_note
+
+    # Batches beyond the target concurrency rarely run; stop capturing there
+    cap = next((size for size in full_sizes if size >= concurrency), full_sizes[-1])
+    if cap < full_sizes[-1]:
+        reduced_bytes = compute_cuda_graph_memory(
+            metadata, cuda_graph_capture_sizes(max_num_seqs, [cap]), dtype, tp_size, pp_size
+        )
+        if available_for_kv - reduced_bytes >= kv_target_bytes:
+            return None, [cap], reduced_bytes, (
+                f"Capture limited to batches up to {cap} (target concurrency), freeing "
+                f"{(full_bytes - reduced_bytes) / BYTES_TO_GIB:.2f} GiB for the KV cache"
+            )
+
+    if available_for_kv >= kv_target_bytes:
+        return True, None, 0, (
+            f"Eager mode frees {full_bytes / BYTES_TO_GIB:.2f} GiB of CUDA graph memory "
+            f"for the KV cache, at ~{saving_ms:.1f} ms per decode step"
+        )
+
+    return None, None, full_bytes, full_note
+
+
 def generate_recommendations(
     request: PlanRequest,
     metadata: ModelMetadata,
     gpus: list[GPUInfo],
     vram_total_bytes: int,
+    memory_fraction: Optional[float] = None,
 ) -> VLLMConfig:
     """Generate recommended vLLM configuration.
 
@@ -177,6 +296,8 @@ def generate_recommendations(
         metadata: Model metadata
         gpus: List of available GPUs
         vram_total_bytes: Total VRAM in bytes (sum across all GPUs for TP)
+        memory_fraction: Fraction of each GPU the engine owns when it shares
+            the GPUs with other engines (None for the utilization policy)
 
     Returns:
         VLLMConfig with recommended settings
@@ -188,10 +309,12 @@ def generate_recommendations(
 
     explanations: dict[str, str] = {}
 
-    # Get GPU info
-    gpu_name = gpus[0].name if gpus else hardware.gpu
-    vram_per_gpu = vram_total_bytes // max(1, len(gpus)) if gpus else vram_total_bytes
-    num_gpus = len(gpus) if gpus else hardware.gpus
+    # Get GPU info; until the group is chosen any GPU may join it, so size
+    # parallelism for the smallest and slowest
+    gpu_name = slowest_gpu(gpus).name if gpus else hardware.gpu
+    vram_per_gpu = min(gpu.vram_mib for gpu in gpus) * 1024 * 1024 if gpus else vram_total_bytes
+    num_gpus = len(gpus) if gpus else hardware.gpus * hardware.nodes
+    gpus_per_node = num_gpus // hardware.nodes
 
     # Determine params
     params_b = model_input.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
@@ -201,42 +324,118 @@ def generate_recommendations(
         params_b=params_b,
         dtype=model_input.dtype,
         quantization=model_input.quantization,
+        metadata=metadata,
     )
 
-    # Tensor parallel
+    # Tensor parallel within a node (or a pipeline stage's share of it); MIG
+    # instances cannot join a NCCL group, so each runs an engine of its own
+    mig = any(gpu.mig_profile for gpu in gpus)
+    if mig:
+        tp_gpus = 1
+    elif hardware.nodes > 1:
+        tp_gpus = gpus_per_node
+    else:
+        tp_gpus = max(1, num_gpus // (hardware.pipeline_parallel_size or 1))
     tp_size, tp_explanation = _recommend_tensor_parallel(
-        num_gpus=num_gpus,
+        num_gpus=tp_gpus,
         weights_bytes=weights_bytes,
         vram_per_gpu_bytes=vram_per_gpu,
         requested_tp=hardware.tensor_parallel_size,
+        metadata=metadata,
     )
+    if mig and hardware.tensor_parallel_size is None:
+        tp_explanation = "MIG instance - one engine per instance, no tensor parallelism"
     explanations["tensor_parallel_size"] = tp_explanation
 
-    # GPU memory utilization
-    base_util = policy.gpu_memory_utilization
-    gpu_util, util_explanation = _recommend_gpu_memory_utilization(gpu_name, base_util)
-    explanations["gpu_memory_utilization"] = util_explanation
+    # Pipeline parallel across the remaining GPUs, typically one stage per node
+    pp_size, pp_explanation = _recommend_pipeline_parallel(
+        num_gpus=1 if mig else num_gpus,
+        tp_size=tp_size,
+        weights_bytes=weights_bytes,
+        vram_per_gpu_bytes=vram_per_gpu,
+        metadata=metadata,
+        requested_pp=hardware.pipeline_parallel_size,
+    )
+    explanations["pipeline_parallel_size"] = pp_explanation
+
+    # The group runs on the largest GPUs, bounded by its smallest and slowest member
+    if gpus:
+        group = device_group(gpus, tp_size * pp_size)
+        vram_per_gpu = min(gpu.vram_mib for gpu in group) * 1024 * 1024
+        gpu_name = slowest_gpu(group).name
+
+    # Ranks beyond one node need Ray to launch workers on the other nodes
+    executor_backend = None
+    if tp_size * pp_size > gpus_per_node:
+        executor_backend = "ray"
+        explanations["distributed_executor_backend"] = (
+            f"{tp_size * pp_size} ranks span more than one {gpus_per_node}-GPU node"
+        )
 
-    # Calculate effective VRAM per TP group
-    effective_vram = vram_per_gpu * tp_size
-    allocatable = int(effective_vram * gpu_util)
+    # GPU memory utilization; a co-located engine sizes itself within its share
+    if memory_fraction is not None:
+        gpu_util = memory_fraction
+        explanations["gpu_memory_utilization"] = (
+            f"Engine owns {memory_fraction:.3f} of each GPU it shares with other engines"
+        )
+    else:
+        base_util = policy.gpu_memory_utilization
+        gpu_util, util_explanation = _recommend_gpu_memory_utilization(gpu_name, base_util)
+        explanations["gpu_memory_utilization"] = util_explanation
+
+    # Memory is budgeted per GPU for the worst-loaded TP rank
+    allocatable = int(vram_per_gpu * gpu_util)
 
     # Overhead
-    overhead_bytes = compute_overhead(effective_vram, tp_size, policy.overhead_gb)
+    overhead_bytes = compute_overhead(vram_per_gpu, tp_size, policy.overhead_gb)
+
+    # Max num seqs
+    max_num_seqs, seqs_explanation = _recommend_max_num_seqs(
+        workload.concurrency, workload.batching_mode, policy.max_num_seqs
+    )
+    explanations["max_num_seqs"] = seqs_explanation
+
+    # Max batched tokens
+    max_batched_tokens, batch_explanation = _recommend_max_batched_tokens(
+        workload.prompt_tokens,
+        workload.gen_tokens,
+        workload.concurrency,
+        workload.batching_mode,
+        vram_per_gpu * tp_size / BYTES_TO_GIB,
+        policy.max_num_batched_tokens,
+    )
+
+    # The profile run at this token budget sets the activation peak taken from the KV budget
+    activation_bytes = compute_activation_memory(
+        metadata, max_batched_tokens, max_num_seqs, model_input.dtype, tp_size
+    )
+    explanations["max_num_batched_tokens"] = (
+        f"{batch_explanation}; its profile run reserves "
+        f"{activation_bytes / BYTES_TO_GIB:.2f} GiB of activations"
+    )
 
     # Check if fits without quantization
-    weights_per_tp = weights_bytes // tp_size
-    available_for_kv = allocatable - weights_per_tp - overhead_bytes
+    weights_per_rank = compute_weights_per_rank(weights_bytes, metadata, tp_size, pp_size)
+    available_for_kv = allocatable - weights_per_rank - overhead_bytes - activation_bytes
 
-    # Initial context estimate
+    # Initial context estimate, from the trace's concurrent lengths when given
     context_for_check = model_input.max_model_len or metadata.max_position_embeddings
+    kv_tokens_check, kv_seqs_check = context_for_check, workload.concurrency
+    if workload.trace is not None:
+        kv_tokens_check = concurrent_kv_tokens(
+            workload.trace, workload.concurrency, context_for_check
+        ) + workload.concurrency * (policy.block_size - 1)
+        kv_seqs_check = 1
     kv_bytes_check = compute_kv_cache_memory(
         metadata=metadata,
-        context_len=context_for_check,
-        concurrency=workload.concurrency,
+        context_len=kv_tokens_check,
+        concurrency=kv_seqs_check,
         kv_dtype=model_input.kv_cache_dtype,
         dtype=model_input.dtype,
         fragmentation_factor=policy.fragmentation_factor,
+        tp_size=tp_size,
+        pp_size=pp_size,
+        block_size=policy.block_size,
     )
 
     fits_without_quant = available_for_kv >= kv_bytes_check
@@ -256,22 +455,43 @@ def generate_recommendations(
             params_b=params_b,
             dtype=model_input.dtype,
             quantization=effective_quant,
+            metadata=metadata,
         )
-        weights_per_tp = weights_bytes // tp_size
-        available_for_kv = allocatable - weights_per_tp - overhead_bytes
+        weights_per_rank = compute_weights_per_rank(weights_bytes, metadata, tp_size, pp_size)
+        available_for_kv = allocatable - weights_per_rank - overhead_bytes - activation_bytes
+
+    # Captured graph memory competes with the KV cache for the same budget
+    enforce_eager, cuda_graph_sizes, graph_bytes, graph_explanation = _recommend_cuda_graphs(
+        policy.enforce_eager,
+        available_for_kv,
+        kv_bytes_check,
+        workload.concurrency,
+        max_num_seqs,
+        metadata,
+        model_input.dtype,
+        tp_size,
+        pp_size,
+    )
+    explanations["cuda_graphs"] = graph_explanation
+    available_for_kv -= graph_bytes
 
-    # Calculate max context that fits
-    kv_per_token_per_seq = compute_kv_cache_memory(
+    # Calculate max context that fits, in whole blocks per sequence
+    block_bytes = compute_kv_cache_memory(
         metadata=metadata,
-        context_len=1,
+        context_len=policy.block_size,
         concurrency=1,
         kv_dtype=model_input.kv_cache_dtype,
         dtype=model_input.dtype,
         fragmentation_factor=policy.fragmentation_factor,
+        tp_size=tp_size,
+        pp_size=pp_size,
     )
+    num_gpu_blocks = max(0, available_for_kv) // block_bytes if block_bytes > 0 else 0
 
-    if kv_per_token_per_seq > 0 and workload.concurrency > 0:
-        available_context = available_for_kv // (kv_per_token_per_seq * workload.concurrency)
+    # With a trace, sequences share the cache and only one needs to reach the limit
+    context_seqs = 1 if workload.trace is not None else workload.concurrency
+    if block_bytes > 0 and context_seqs > 0:
+        available_context = (num_gpu_blocks // context_seqs) * policy.block_size
     else:
         available_context = metadata.max_position_embeddings
 
@@ -280,9 +500,22 @@ def generate_recommendations(
         model_input.max_model_len,
         metadata.max_position_embeddings,
         available_context,
+        trace_max=workload.trace.context_tokens.max if workload.trace is not None else None,
     )
     explanations["max_model_len"] = len_explanation
 
+    # The engine admits at most as many full-length sequences as its KV blocks hold
+    if policy.max_num_seqs is None and workload.trace is None and max_model_len > 0:
+        max_concurrency_by_blocks = num_gpu_blocks // compute_blocks_per_seq(
+            max_model_len, policy.block_size
+        )
+        if 0 < max_concurrency_by_blocks < max_num_seqs:
+            max_num_seqs = max_concurrency_by_blocks
+            explanations["max_num_seqs"] = (
+                f"{seqs_explanation}, capped at the {max_concurrency_by_blocks} sequences "
+                f"of {max_model_len:,} tokens that {num_gpu_blocks:,} KV blocks hold"
+            )
+
     # KV cache dtype
     kv_pressure = kv_bytes_check / allocatable if allocatable > 0 else 0
     kv_dtype_value, kv_explanation = _recommend_kv_cache_dtype(
@@ -290,21 +523,11 @@ def generate_recommendations(
     )
     explanations["kv_cache_dtype"] = kv_explanation
 
-    # Max num seqs
-    max_num_seqs, seqs_explanation = _recommend_max_num_seqs(
-        workload.concurrency, workload.batching_mode
-    )
-    explanations["max_num_seqs"] = seqs_explanation
-
-    # Max batched tokens
-    max_batched_tokens, batch_explanation = _recommend_max_batched_tokens(
-        workload.prompt_tokens,
-        workload.gen_tokens,
-        workload.concurrency,
-        workload.batching_mode,
-        effective_vram / BYTES_TO_GIB,
-    )
-    explanations["max_num_batched_tokens"] = batch_explanation
+    # Block size
+    block_size = None
+    if policy.block_size != DEFAULT_BLOCK_SIZE:
+        block_size = policy.block_size
+        explanations["block_size"] = f"User-specified {block_size}-token KV cache blocks"
 
     # Dtype
     dtype_value = model_input.dtype.value
@@ -318,6 +541,8 @@ def generate_recommendations(
     config = VLLMConfig(
         model=model_input.model,
         tensor_parallel_size=tp_size,
+        pipeline_parallel_size=pp_size,
+        distributed_executor_backend=executor_backend,
         dtype=dtype_value,
         gpu_memory_utilization=gpu_util,
         max_model_len=max_model_len,
@@ -325,6 +550,9 @@ def generate_recommendations(
         quantization=quant_value,
         max_num_seqs=max_num_seqs,
         max_num_batched_tokens=max_batched_tokens,
+        enforce_eager=enforce_eager,
+        cuda_graph_sizes=cuda_graph_sizes,
+        block_size=block_size,
         trust_remote_code=model_input.trust_remote_code if model_input.trust_remote_code else None,
         explanations=explanations if request.explain else {},
     )
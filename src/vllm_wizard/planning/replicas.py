@@ -0,0 +1,325 @@
+"""Data-parallel replica planning: tensor parallel width vs. replica count."""
+
+import math
+from typing import Optional
+
+from vllm_wizard.hardware.specs import DEFAULT_GPU_SPEC, get_gpu_spec, slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.memory import (
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    DEFAULT_MAX_NUM_SEQS,
+    compute_blocks_per_seq,
+    is_valid_tp_size,
+)
+from vllm_wizard.planning.planner import estimate_plan_performance, run_plan
+from vllm_wizard.planning.simulator import BLOCK_WATERMARK, StepCostModel, build_step_cost
+from vllm_wizard.planning.slo import (
+    estimate_steady_state,
+    load_plan_inputs,
+    slo_ratio,
+    step_latencies,
+)
+from vllm_wizard.render.commands import (
+    render_docker_command,
+    render_docker_compose,
+    render_serve_command,
+)
+from vllm_wizard.schemas.inputs import PlanRequest
+from vllm_wizard.schemas.outputs import Artifacts, PlanResponse, ReplicaLayout, ReplicaReport
+
+# Highest fraction of a replica's capacity planned for; the rest absorbs bursts,
+# since queueing delay grows without bound as load approaches capacity
+MAX_REPLICA_UTILIZATION = 0.8
+
+# Bisection steps when solving for the decode batch a request rate sustains
+_LOAD_SOLVER_STEPS = 40
+
+
+def candidate_tp_sizes(
+    num_gpus: int, metadata: ModelMetadata, gpus_per_node: int, requested: Optional[int] = None
+) -> list[int]:
+    """TP sizes that split the GPUs into whole replicas.
+
+    A size is valid when it divides the GPU count, shards the attention and
+    KV heads the way vLLM requires, and keeps every all-reduce within one
+    node.
+
+    Args:
+        num_gpus: GPUs to split into replicas
+        metadata: Model metadata
+        gpus_per_node: GPUs in each node
+        requested: User-specified TP size, which is the only candidate if set
+
+    Returns:
+        Valid TP sizes in ascending order
+    """
+    if requested is not None:
+        return [requested]
+
+    return [
+        tp_size
+        for tp_size in range(1, min(num_gpus, gpus_per_node) + 1)
+        if num_gpus % tp_size == 0 and is_valid_tp_size(metadata, tp_size)
+    ]
+
+
+def batch_at_rate(
+    cost: StepCostModel,
+    prompt_tokens: int,
+    gen_tokens: int,
+    rate: float,
+    max_batch: int,
+    max_num_batched_tokens: int,
+) -> Optional[float]:
+    """Mean decode batch of one replica serving a request rate.
+
+    By Little's law a replica serving `rate` requests/s keeps
+    rate * gen_tokens * TPOT sequences decoding, and TPOT grows with the
+    batch. The fixed point is found by bisection.
+
+    Args:
+        cost: Step cost model for one replica
+        prompt_tokens: Prompt length
+        gen_tokens: Output length
+        rate: Requests/s arriving at the replica
+        max_batch: Largest decode batch the replica sustains
+        max_num_batched_tokens: Scheduler token budget per step
+
+    Returns:
+        Mean decode batch, or None if the rate saturates the replica
+    """
+
+    def excess(batch: float) -> Optional[float]:
+        latencies = step_latencies(cost, prompt_tokens, gen_tokens, batch, max_num_batched_tokens)
+        if latencies is None:
+            return None
+        return rate * gen_tokens * latencies[1] - batch
+
+    at_max = excess(max_batch)
+    if at_max is None or at_max >= 0:
+        return None
+
+    low, high = 0.0, float(max_batch)
+    for _ in range(_LOAD_SOLVER_STEPS):
+        mid = (low + high) / 2
+        mid_excess = excess(mid)
+        if mid_excess is not None and mid_excess > 0:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def _with_tp(request: PlanRequest, tp_size: int) -> PlanRequest:
+    """Copy a request with the tensor parallel size fixed.
+
+    Replicas serve a request rate rather than a fixed concurrency, so an
+    unset max_num_seqs keeps vLLM's default instead of the concurrency-based
+    recommendation.
+    """
+    policy = request.policy
+    if policy.max_num_seqs is None:
+        policy = policy.model_copy(update={"max_num_seqs": DEFAULT_MAX_NUM_SEQS})
+
+    return request.model_copy(
+        update={
+            "hardware": request.hardware.model_copy(update={"tensor_parallel_size": tp_size}),
+            "policy": policy,
+        }
+    )
+
+
+def search_replica_layouts(request: PlanRequest) -> list[ReplicaLayout]:
+    """Score every TP x DP split of the GPUs against the target request rate.
+
+    Each TP size is planned as usual (which adds pipeline stages if the
+    weights need them); the remaining GPUs hold further replicas. Capacity
+    comes from the SLO search's saturated steady state, and latency at the
+    target rate from the mean batch each replica then decodes. A layout
+    sustains the target only at or below MAX_REPLICA_UTILIZATION.
+
+    Args:
+        request: Planning request, optionally with workload.target_qps
+
+    Returns:
+        Layouts best first. With a target: those sustaining it (and any
+        latency targets) by lowest request latency, then the rest by
+        capacity. Without a target: by capacity.
+    """
+    metadata, params_b, gpus = load_plan_inputs(request)
+    spec = get_gpu_spec(slowest_gpu(gpus).name) or DEFAULT_GPU_SPEC
+
+    workload = request.workload
+    target_qps = workload.target_qps
+    num_gpus = len(gpus)
+    gpus_per_node = max(1, num_gpus // request.hardware.nodes)
+    blocks_per_seq = compute_blocks_per_seq(
+        workload.prompt_tokens + workload.gen_tokens, request.policy.block_size
+    )
+
+    layouts: list[ReplicaLayout] = []
+    for tp_size in candidate_tp_sizes(
+        num_gpus, metadata, gpus_per_node, request.hardware.tensor_parallel_size
+    ):
+        plan = run_plan(_with_tp(request, tp_size))
+        config = plan.config
+        pp_size = config.pipeline_parallel_size
+        dp_size = num_gpus // (tp_size * pp_size)
+        if dp_size < 1:
+            continue
+
+        layout = ReplicaLayout(
+            tensor_parallel_size=tp_size,
+            pipeline_parallel_size=pp_size,
+            data_parallel_size=dp_size,
+            fits=False,
+        )
+
+        max_num_seqs = config.max_num_seqs or DEFAULT_MAX_NUM_SEQS
+        max_num_batched_tokens = config.max_num_batched_tokens or DEFAULT_MAX_NUM_BATCHED_TOKENS
+        usable_blocks = int(plan.feasibility.num_gpu_blocks * (1 - BLOCK_WATERMARK))
+
+        # A full pipeline shards weights and work like tp x pp tensor parallelism
+        cost = build_step_cost(
+            spec,
+            params_b,
+            metadata,
+            quantization=request.model.quantization,
+            dtype=request.model.dtype,
+            kv_cache_dtype=request.model.kv_cache_dtype,
+            tp_size=tp_size * pp_size,
+            interconnect=request.hardware.interconnect,
+            enforce_eager=bool(config.enforce_eager),
+        )
+        state = estimate_steady_state(
+            cost,
+            workload.prompt_tokens,
+            workload.gen_tokens,
+            max_num_seqs,
+            max_num_batched_tokens,
+            usable_blocks // blocks_per_seq,
+        )
+        if state is None:
+            layouts.append(layout)
+            continue
+
+        batch, ttft_s, tpot_s = state
+        replica_qps = batch / (tpot_s * workload.gen_tokens)
+        layout.fits = True
+        layout.max_batch_size = batch
+        layout.replica_qps = round(replica_qps, 3)
+        layout.aggregate_qps = round(replica_qps * dp_size, 3)
+        layout.aggregate_output_toks_per_s = round(batch / tpot_s * dp_size, 1)
+
+        if target_qps is not None:
+            utilization = target_qps / (replica_qps * dp_size)
+            layout.replicas_needed = math.ceil(
+                target_qps / (replica_qps * MAX_REPLICA_UTILIZATION)
+            )
+            layout.utilization = round(utilization, 3)
+
+            load_batch = batch_at_rate(
+                cost,
+                workload.prompt_tokens,
+                workload.gen_tokens,
+                target_qps / dp_size,
+                batch,
+                max_num_batched_tokens,
+            )
+            if load_batch is not None:
+                latencies = step_latencies(
+                    cost,
+                    workload.prompt_tokens,
+                    workload.gen_tokens,
+                    load_batch,
+                    max_num_batched_tokens,
+                )
+                if latencies is not None:
+                    ttft_s, tpot_s = latencies
+                    ratio = slo_ratio(workload, ttft_s * 1000, tpot_s * 1000)
+                    layout.meets_target = (
+                        ratio <= 1.0 and utilization <= MAX_REPLICA_UTILIZATION
+                    )
+
+        layout.ttft_ms = round(ttft_s * 1000, 1)
+        layout.tpot_ms = round(tpot_s * 1000, 2)
+        layouts.append(layout)
+
+    def request_latency(layout: ReplicaLayout) -> float:
+        return (layout.ttft_ms or 0.0) + workload.gen_tokens * (layout.tpot_ms or 0.0)
+
+    layouts.sort(
+        key=lambda layout: (
+            not layout.fits,
+            not layout.meets_target,
+            request_latency(layout) if layout.meets_target else -layout.aggregate_qps,
+            layout.tensor_parallel_size,
+        )
+    )
+    return layouts
+
+
+def run_replica_plan(request: PlanRequest) -> PlanResponse:
+    """Plan the best TP x DP layout of the GPUs for a target request rate.
+
+    Plans one replica of the top-ranked layout and sets data_parallel_size
+    to the number of replicas that fit. If no layout sustains the target,
+    the highest-capacity one is returned with a warning.
+
+    Args:
+        request: Planning request, optionally with workload.target_qps
+
+    Returns:
+        PlanResponse for one replica with the layout ranking attached
+    """
+    layouts = search_replica_layouts(request)
+    fitting = [layout for layout in layouts if layout.fits]
+    if not fitting:
+        raise ValueError("No layout has room for a single sequence in the KV cache.")
+
+    best = fitting[0]
+    chosen = _with_tp(request, best.tensor_parallel_size)
+    response = run_plan(chosen)
+
+    config = response.config.model_copy(update={"data_parallel_size": best.data_parallel_size})
+    if request.explain:
+        explanations = dict(config.explanations)
+        note = (
+            f"{best.data_parallel_size} replica(s) of TP {best.tensor_parallel_size} "
+            f"sustain ~{best.aggregate_qps:.2f} requests/s"
+        )
+        if best.replicas_needed is not None:
+            note += f"; {best.replicas_needed} needed for the target"
+        explanations["tensor_parallel_size"] = note
+        explanations["data_parallel_size"] = note
+        config.explanations = explanations
+
+    metadata, params_b, gpus = load_plan_inputs(chosen)
+    performance = estimate_plan_performance(chosen, metadata, gpus, config, params_b)
+
+    feasibility = response.feasibility
+    if request.workload.target_qps is not None and not best.meets_target:
+        feasibility = feasibility.model_copy(
+            update={
+                "warnings": feasibility.warnings
+                + ["No layout sustains the target request rate; showing the highest capacity."]
+            }
+        )
+
+    return response.model_copy(
+        update={
+            "feasibility": feasibility,
+            "config": config,
+            "performance": performance,
+            "artifacts": Artifacts(
+                serve_command=render_serve_command(config),
+                docker_command=render_docker_command(config),
+                docker_compose=render_docker_compose(config),
+            ),
+            "replicas": ReplicaReport(
+                target_qps=request.workload.target_qps,
+                num_gpus=len(gpus),
+                layouts=layouts,
+            ),
+        }
+    )
@@ -0,0 +1,361 @@
+"""Pareto-frontier search over TP, quantization, KV dtype, context and max_num_seqs."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional, Sequence
+
+from vllm_wizard.hardware.specs import slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata, load_model_metadata
+from vllm_wizard.planning.memory import (
+    BYTES_TO_GIB,
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    compute_activation_memory,
+    compute_cuda_graph_memory,
+    compute_feasibility,
+    compute_kv_cache_memory,
+    compute_overhead,
+    compute_weights_memory,
+    compute_weights_per_rank,
+    cuda_graph_capture_sizes,
+)
+from vllm_wizard.planning.perf import estimate_performance
+from vllm_wizard.planning.planner import resolve_hardware
+from vllm_wizard.planning.replicas import candidate_tp_sizes
+from vllm_wizard.schemas.inputs import (
+    DType,
+    Interconnect,
+    KVCacheDType,
+    PlanRequest,
+    PolicyInput,
+    Quantization,
+)
+
+
+@dataclass
+class SearchPoint:
+    """One feasible configuration and its objectives."""
+
+    tensor_parallel_size: int
+    data_parallel_size: int
+    quantization: Quantization
+    kv_cache_dtype: KVCacheDType
+    max_model_len: int
+    max_num_seqs: int
+    headroom_gb: float
+    decode_toks_per_s: float  # Aggregate over all replicas at a full batch
+    ttft_ms: float
+
+    def dominates(self, other: "SearchPoint") -> bool:
+        """Whether this point is at least as good as other on every objective."""
+        return (
+            self.headroom_gb >= other.headroom_gb
+            and self.decode_toks_per_s >= other.decode_toks_per_s
+            and self.ttft_ms <= other.ttft_ms
+            and self.max_model_len >= other.max_model_len
+        )
+
+
+@dataclass
+class SearchResult:
+    """Pareto frontier of a configuration search and how much of the space was pruned."""
+
+    frontier: list[SearchPoint]
+    num_combinations: int
+    num_evaluated: int
+    num_feasible: int
+    vram_total_bytes: int
+    num_gpus: int
+    skipped_context_lens: list[int] = field(default_factory=list)
+
+    @property
+    def num_pruned(self) -> int:
+        """Combinations skipped without evaluation."""
+        return self.num_combinations - self.num_evaluated
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "num_combinations": self.num_combinations,
+            "num_evaluated": self.num_evaluated,
+            "num_pruned": self.num_pruned,
+            "num_feasible": self.num_feasible,
+            "num_gpus": self.num_gpus,
+            "vram_total_gb": self.vram_total_bytes / BYTES_TO_GIB,
+            "skipped_context_lens": self.skipped_context_lens,
+            "frontier": [
+                {
+                    **asdict(point),
+                    "quantization": point.quantization.value,
+                    "kv_cache_dtype": point.kv_cache_dtype.value,
+                }
+                for point in self.frontier
+            ],
+        }
+
+
+def pareto_frontier(points: list[SearchPoint]) -> list[SearchPoint]:
+    """Keep the points no other point matches or beats on every objective.
+
+    Objectives are headroom, throughput and context (higher is better) and
+    TTFT (lower is better). After sorting best-first on each objective in
+    turn, any point's dominators come before it, so one pass against the
+    frontier found so far suffices. Of identical points the first is kept.
+
+    Args:
+        points: Feasible search points
+
+    Returns:
+        Non-dominated points, highest throughput first
+    """
+    ordered = sorted(
+        points,
+        key=lambda p: (-p.decode_toks_per_s, p.ttft_ms, -p.headroom_gb, -p.max_model_len),
+    )
+    frontier: list[SearchPoint] = []
+    for point in ordered:
+        if not any(kept.dominates(point) for kept in frontier):
+            frontier.append(point)
+    return frontier
+
+
+def search_configs(
+    metadata: ModelMetadata,
+    params_b: float,
+    gpu_name: str,
+    vram_per_gpu_bytes: int,
+    num_gpus: int,
+    tp_sizes: Sequence[int],
+    quantizations: Sequence[Quantization],
+    kv_cache_dtypes: Sequence[KVCacheDType],
+    context_lens: Sequence[int],
+    max_num_seqs: Sequence[int],
+    dtype: DType = DType.AUTO,
+    policy: Optional[PolicyInput] = None,
+    prompt_tokens: int = 512,
+    gen_tokens: int = 256,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+) -> SearchResult:
+    """Search the configuration space for the Pareto frontier.
+
+    Feasibility of the worst-loaded rank comes from compute_feasibility and
+    throughput and TTFT from estimate_performance. GPUs left over by a TP
+    size run further data-parallel replicas, which multiply throughput.
+
+    Memory only grows with context and max_num_seqs, so both are walked in
+    ascending order: the first infeasible max_num_seqs ends its context, and
+    a context infeasible at the smallest max_num_seqs ends its KV dtype.
+    A TP size and quantization whose weights and overhead alone leave no
+    headroom is skipped outright. Performance is cached by the inputs it
+    depends on, since every context beyond the workload's KV length
+    performs the same.
+
+    Args:
+        metadata: Model metadata
+        params_b: Model parameters in billions
+        gpu_name: GPU model name
+        vram_per_gpu_bytes: VRAM of one GPU in bytes
+        num_gpus: GPUs available for replicas
+        tp_sizes: Tensor parallel sizes to search
+        quantizations: Quantization methods to search
+        kv_cache_dtypes: KV cache dtypes to search
+        context_lens: max_model_len values to search
+        max_num_seqs: max_num_seqs values to search
+        dtype: Model weight dtype
+        policy: Memory policy (defaults if None)
+        prompt_tokens: Typical prompt length for TTFT and KV reads
+        gen_tokens: Typical generation length for KV reads
+        interconnect: GPU interconnect type
+
+    Returns:
+        SearchResult with the frontier and pruning statistics
+    """
+    policy = policy or PolicyInput()
+    contexts = sorted(set(context_lens))
+    seqs_grid = sorted(set(max_num_seqs))
+
+    # Contexts beyond what the model supports are not searched
+    skipped = [c for c in contexts if c > metadata.max_position_embeddings]
+    contexts = [c for c in contexts if c <= metadata.max_position_embeddings]
+
+    per_branch = len(kv_cache_dtypes) * len(contexts) * len(seqs_grid)
+    num_combinations = len(tp_sizes) * len(quantizations) * per_branch
+    allocatable = int(vram_per_gpu_bytes * policy.gpu_memory_utilization)
+    headroom_bytes = policy.headroom_gb * BYTES_TO_GIB
+    kv_len_cap = prompt_tokens + gen_tokens // 2
+
+    num_evaluated = 0
+    feasible: list[SearchPoint] = []
+    perf_cache: dict[tuple, tuple[float, float]] = {}
+
+    for tp_size in tp_sizes:
+        dp_size = max(1, num_gpus // tp_size)
+        overhead = compute_overhead(vram_per_gpu_bytes, tp_size, policy.overhead_gb)
+        for quantization in quantizations:
+            weights = compute_weights_per_rank(
+                compute_weights_memory(params_b, dtype, quantization, metadata),
+                metadata,
+                tp_size,
+            )
+            if weights + overhead + headroom_bytes > allocatable:
+                continue
+
+            for kv_dtype in kv_cache_dtypes:
+                for context_len in contexts:
+                    fits_any = False
+                    for seqs in seqs_grid:
+                        capture_sizes = cuda_graph_capture_sizes(seqs)
+                        report = compute_feasibility(
+                            weights_bytes=weights,
+                            kv_cache_bytes=compute_kv_cache_memory(
+                                metadata,
+                                context_len,
+                                seqs,
+                                kv_dtype,
+                                dtype,
+                                policy.fragmentation_factor,
+                                tp_size,
+                                block_size=policy.block_size,
+                            ),
+                            overhead_bytes=overhead,
+                            vram_total_bytes=vram_per_gpu_bytes,
+                            gpu_memory_utilization=policy.gpu_memory_utilization,
+                            headroom_gb=policy.headroom_gb,
+                            context_len=context_len,
+                            concurrency=seqs,
+                            metadata=metadata,
+                            kv_dtype=kv_dtype,
+                            dtype=dtype,
+                            fragmentation_factor=policy.fragmentation_factor,
+                            block_size=policy.block_size,
+                            activation_bytes=compute_activation_memory(
+                                metadata,
+                                max(DEFAULT_MAX_NUM_BATCHED_TOKENS, seqs),
+                                seqs,
+                                dtype,
+                                tp_size,
+                            ),
+                            cuda_graph_bytes=compute_cuda_graph_memory(
+                                metadata, capture_sizes, dtype, tp_size
+                            ),
+                            tp_size=tp_size,
+                        )
+                        num_evaluated += 1
+                        if not report.fits:
+                            break
+                        fits_any = True
+
+                        key = (tp_size, quantization, kv_dtype, min(context_len, kv_len_cap), seqs)
+                        if key not in perf_cache:
+                            perf = estimate_performance(
+                                gpu_name,
+                                params_b,
+                                tp_size=tp_size,
+                                context_len=context_len,
+                                prompt_tokens=prompt_tokens,
+                                quantization=quantization,
+                                interconnect=interconnect,
+                                num_gpus=tp_size,
+                                metadata=metadata,
+                                gen_tokens=gen_tokens,
+                                dtype=dtype,
+                                kv_cache_dtype=kv_dtype,
+                                batch_size=seqs,
+                                max_num_seqs=1,
+                                max_graph_batch=max(capture_sizes),
+                            )
+                            decode_low, decode_high = perf.decode_toks_per_s_range
+                            ttft_low, ttft_high = perf.ttft_ms_range or (0.0, 0.0)
+                            perf_cache[key] = (
+                                (decode_low + decode_high) / 2,
+                                (ttft_low + ttft_high) / 2,
+                            )
+                        decode_toks_per_s, ttft_ms = perf_cache[key]
+
+                        feasible.append(
+                            SearchPoint(
+                                tensor_parallel_size=tp_size,
+                                data_parallel_size=dp_size,
+                                quantization=quantization,
+                                kv_cache_dtype=kv_dtype,
+                                max_model_len=context_len,
+                                max_num_seqs=seqs,
+                                headroom_gb=round(report.headroom_gb, 2),
+                                decode_toks_per_s=round(decode_toks_per_s * dp_size, 1),
+                                ttft_ms=round(ttft_ms, 1),
+                            )
+                        )
+
+                    # Longer contexts need at least as much memory at every max_num_seqs
+                    if not fits_any:
+                        break
+
+    return SearchResult(
+        frontier=pareto_frontier(feasible),
+        num_combinations=num_combinations,
+        num_evaluated=num_evaluated,
+        num_feasible=len(feasible),
+        vram_total_bytes=vram_per_gpu_bytes,
+        num_gpus=num_gpus,
+        skipped_context_lens=skipped,
+    )
+
+
+def run_search(
+    request: PlanRequest,
+    context_lens: Sequence[int],
+    max_num_seqs: Sequence[int],
+    kv_cache_dtypes: Sequence[KVCacheDType] = (KVCacheDType.AUTO,),
+    quantizations: Sequence[Quantization] = (Quantization.NONE,),
+) -> SearchResult:
+    """Run a search using the model, hardware, workload and policy of a planning request.
+
+    Model metadata and hardware are resolved once. TP sizes are those that
+    split the GPUs into whole replicas, or the request's own if set.
+
+    Args:
+        request: Planning request providing model, hardware, workload and policy
+        context_lens: max_model_len values to search
+        max_num_seqs: max_num_seqs values to search
+        kv_cache_dtypes: KV cache dtypes to search
+        quantizations: Quantization methods to search
+
+    Returns:
+        SearchResult with the Pareto frontier
+    """
+    metadata = load_model_metadata(
+        model_id_or_path=request.model.model,
+        revision=request.model.revision,
+        trust_remote_code=request.model.trust_remote_code,
+        params_b=request.model.params_b,
+    )
+
+    gpus = resolve_hardware(request)
+    if not gpus:
+        raise ValueError(
+            "No GPUs detected or specified. "
+            "Provide --gpu and --vram-gb flags, or run on a system with nvidia-smi."
+        )
+
+    params_b = request.model.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
+    # Layouts span every GPU, so the smallest and slowest bound them all
+    vram_per_gpu = min(gpu.vram_mib for gpu in gpus) * 1024 * 1024
+    gpus_per_node = max(1, len(gpus) // request.hardware.nodes)
+
+    return search_configs(
+        metadata=metadata,
+        params_b=params_b,
+        gpu_name=slowest_gpu(gpus).name,
+        vram_per_gpu_bytes=vram_per_gpu,
+        num_gpus=len(gpus),
+        tp_sizes=candidate_tp_sizes(
+            len(gpus), metadata, gpus_per_node, request.hardware.tensor_parallel_size
+        ),
+        quantizations=quantizations,
+        kv_cache_dtypes=kv_cache_dtypes,
+        context_lens=context_lens,
+        max_num_seqs=max_num_seqs,
+        dtype=request.model.dtype,
+        policy=request.policy,
+        prompt_tokens=request.workload.prompt_tokens,
+        gen_tokens=request.workload.gen_tokens,
+        interconnect=request.hardware.interconnect,
+    )
@@ -0,0 +1,656 @@
+"""Discrete-event simulation of vLLM continuous batching and paged KV allocation."""
+
+import heapq
+import random
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from vllm_wizard.hardware.specs import DEFAULT_GPU_SPEC, GPUSpec, get_gpu_spec, slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata, load_model_metadata
+from vllm_wizard.planning.perf import (
+    COMPUTE_EFFICIENCY_RANGE,
+    MEMORY_EFFICIENCY_RANGE,
+    build_model_cost,
+    eager_launch_overhead,
+    get_compute_precision,
+    tensor_parallel_scaling,
+)
+from vllm_wizard.planning.planner import resolve_hardware, run_plan
+from vllm_wizard.schemas.inputs import (
+    DType,
+    Interconnect,
+    KVCacheDType,
+    PlanRequest,
+    Quantization,
+)
+from vllm_wizard.schemas.outputs import LatencyStats, SimulationReport
+
+# Fixed CPU cost of scheduling and launching one engine step
+STEP_OVERHEAD_S = 0.0005
+
+# Fraction of blocks kept free when admitting new sequences (vLLM's watermark)
+BLOCK_WATERMARK = 0.01
+
+# Event kinds; step completions sort before arrivals at the same timestamp
+_STEP_DONE = 0
+_ARRIVAL = 1
+
+
+@dataclass
+class StepCostModel:
+    """Roofline cost of one engine step, shared by prefill chunks and decodes.
+
+    A step reads all weights once plus the KV cache touched by every scheduled
+    token, and does linear and attention FLOPs for each scheduled token. It takes
+    the larger of the memory and compute times plus a fixed scheduling overhead
+    and the tensor-parallel all-reduces of every scheduled token.
+    """
+
+    weights_bytes: float
+    kv_bytes_per_token: float
+    linear_flops_per_token: float
+    attention_flops_per_token_per_ctx: float
+    bytes_per_s: float
+    flops_per_s: float
+    overhead_s: float = STEP_OVERHEAD_S
+    allreduce_latency_s: float = 0.0
+    allreduce_s_per_token: float = 0.0
+
+    def step_time(self, num_tokens: int, kv_tokens_read: float, attention_pairs: float) -> float:
+        """Duration of a step in seconds.
+
+        Args:
+            num_tokens: Tokens scheduled in the step (decodes plus prefill chunk tokens)
+            kv_tokens_read: Cached tokens read by attention across all sequences
+            attention_pairs: Query-key pairs computed by attention
+
+        Returns:
+            Step time in seconds
+        """
+        t_memory = (self.weights_bytes + self.kv_bytes_per_token * kv_tokens_read) / self.bytes_per_s
+        t_compute = (
+            num_tokens * self.linear_flops_per_token
+            + attention_pairs * self.attention_flops_per_token_per_ctx
+        ) / self.flops_per_s
+        t_allreduce = self.allreduce_latency_s + self.allreduce_s_per_token * num_tokens
+        return max(t_memory, t_compute) + self.overhead_s + t_allreduce
+
+
+def build_step_cost(
+    spec: GPUSpec,
+    params_b: float,
+    metadata: Optional[ModelMetadata] = None,
+    quantization: Quantization = Quantization.NONE,
+    dtype: DType = DType.AUTO,
+    kv_cache_dtype: KVCacheDType = KVCacheDType.AUTO,
+    tp_size: int = 1,
+    interconnect: Interconnect = Interconnect.UNKNOWN,
+    enforce_eager: bool = False,
+) -> StepCostModel:
+    """Build the per-GPU step cost model at mid-range efficiency.
+
+    Args:
+        spec: GPU specs
+        params_b: Model parameters in billions
+        metadata: Model metadata for KV and attention terms
+        quantization: Quantization method
+        dtype: Model weight dtype
+        kv_cache_dtype: KV cache dtype
+        tp_size: Tensor parallel size
+        interconnect: GPU interconnect type
+        enforce_eager: Whether steps pay kernel launches instead of replaying CUDA graphs
+
+    Returns:
+        StepCostModel for one tensor-parallel rank
+    """
+    model_cost = build_model_cost(params_b, metadata, quantization, dtype, kv_cache_dtype)
+    mem_eff = sum(MEMORY_EFFICIENCY_RANGE) / 2
+    compute_eff = sum(COMPUTE_EFFICIENCY_RANGE) / 2
+    tp_eff, allreduce_latency_s, allreduce_s_per_token = tensor_parallel_scaling(
+        spec, metadata, tp_size, interconnect, dtype=dtype
+    )
+    precision = get_compute_precision(quantization)
+
+    # Per-GPU traffic and FLOPs; TP splits both and pays for its all-reduces
+    return StepCostModel(
+        weights_bytes=model_cost.weights_bytes / tp_size,
+        kv_bytes_per_token=model_cost.kv_bytes_per_token / tp_size,
+        linear_flops_per_token=model_cost.linear_flops_per_token / tp_size,
+        attention_flops_per_token_per_ctx=model_cost.attention_flops_per_token_per_ctx / tp_size,
+        bytes_per_s=spec.memory_bandwidth_gbps * 1e9 * mem_eff * tp_eff,
+        flops_per_s=spec.tflops_for(precision) * 1e12 * compute_eff * tp_eff,
+        overhead_s=STEP_OVERHEAD_S + (eager_launch_overhead(metadata) if enforce_eager else 0.0),
+        allreduce_latency_s=allreduce_latency_s,
+        allreduce_s_per_token=allreduce_s_per_token,
+    )
+
+
+@dataclass
+class SimulationResult:
+    """Raw per-request metrics from a simulation run, in seconds."""
+
+    num_requests: int
+    rejected: int
+    duration_s: float
+    output_tokens: int
+    preemptions: int
+    steps: int
+    scheduled_seqs: int
+    queue_delay_s: np.ndarray
+    ttft_s: np.ndarray
+    tpot_s: np.ndarray
+    e2e_latency_s: np.ndarray
+
+    @property
+    def completed(self) -> int:
+        """Number of completed requests."""
+        return int(self.e2e_latency_s.size)
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Mean number of sequences scheduled per step."""
+        return self.scheduled_seqs / self.steps if self.steps else 0.0
+
+
+class _Seq:
+    """Scheduler state of one request.
+
+    Decoding sequences are not touched per step: their length is derived from
+    the global decode step counter, and block and finish events are keyed on it.
+    """
+
+    __slots__ = ("arrival", "prompt", "gen", "target", "prefilled", "generated", "blocks",
+                 "first_token", "d0")
+
+    def __init__(self, arrival: float, prompt: int, gen: int) -> None:
+        self.arrival = arrival
+        self.prompt = prompt
+        self.gen = gen
+        self.target = prompt  # Tokens to prefill (prompt, or prompt + output after preemption)
+        self.prefilled = 0
+        self.generated = 0  # Output tokens when decoding started
+        self.blocks = 0
+        self.first_token = -1.0
+        self.d0 = -1  # Decode step counter when decoding started; -1 while prefilling
+
+
+def poisson_arrivals(
+    rate: float,
+    num_requests: int,
+    prompt_tokens: int,
+    gen_tokens: int,
+    lengths: str = "fixed",
+    seed: int = 0,
+) -> Iterator[tuple[float, int, int]]:
+    """Generate a Poisson arrival process.
+
+    Args:
+        rate: Mean arrival rate in requests per second
+        num_requests: Number of requests to generate
+        prompt_tokens: Prompt length (mean when lengths is "exponential")
+        gen_tokens: Output length (mean when lengths is "exponential")
+        lengths: "fixed" or "exponential" length distribution
+        seed: Random seed
+
+    Yields:
+        (arrival time in seconds, prompt tokens, output tokens)
+    """
+    if rate <= 0:
+        raise ValueError("Arrival rate must be positive")
+    if lengths not in ("fixed", "exponential"):
+        raise ValueError(f"Unknown length distribution: {lengths}")
+
+    rng = random.Random(seed)
+    t = 0.0
+    for _ in range(num_requests):
+        t += rng.expovariate(rate)
+        if lengths == "fixed":
+            yield t, prompt_tokens, gen_tokens
+        else:
+            yield (
+                t,
+                max(1, int(rng.expovariate(1.0 / prompt_tokens))),
+                max(1, int(rng.expovariate(1.0 / gen_tokens))),
+            )
+
+
+def simulate(
+    arrivals: Iterable[tuple[float, int, int]],
+    cost: StepCostModel,
+    num_gpu_blocks: int,
+    block_size: int = 16,
+    max_num_seqs: int = 256,
+    max_num_batched_tokens: int = 8192,
+    chunked_prefill: bool = True,
+) -> SimulationResult:
+    """Replay arrivals against a model of the vLLM scheduler.
+
+    With chunked prefill, every step schedules all running decodes first, then
+    continues partial prefills and admits waiting requests with the remaining
+    token budget. Without it, a step either prefills newly admitted prompts or
+    decodes all running sequences, preferring prefills. KV cache is allocated
+    in blocks of block_size tokens; when a decode needs a block and none are
+    free, the most recently admitted sequence is preempted and recomputed later.
+    Without chunked prefill, a preempted sequence whose prompt plus output so
+    far exceeds max_num_batched_tokens can no longer be recomputed and is
+    rejected, as vLLM ignores it.
+
+    Per-step work is proportional to the number of events in the step, not the
+    batch size, so runs of millions of requests complete in seconds to minutes.
+
+    Args:
+        arrivals: (arrival time, prompt tokens, output tokens) in arrival order
+        cost: Step cost model
+        num_gpu_blocks: KV cache blocks available
+        block_size: Tokens per KV cache block
+        max_num_seqs: Maximum running sequences
+        max_num_batched_tokens: Maximum tokens scheduled per step
+        chunked_prefill: Whether prompts may be split across steps
+
+    Returns:
+        SimulationResult with per-request latencies
+    """
+    if max_num_batched_tokens < max_num_seqs:
+        raise ValueError("max_num_batched_tokens must be at least max_num_seqs")
+
+    watermark = int(num_gpu_blocks * BLOCK_WATERMARK)
+    free_blocks = num_gpu_blocks
+
+    waiting: deque[tuple[float, int, int]] = deque()  # Fresh requests, created lazily as _Seq
+    preempted: deque[_Seq] = deque()  # Resumed ahead of fresh requests
+    running: dict[int, _Seq] = {}  # Admission order; the last entry is preempted first
+    prefilling: dict[int, _Seq] = {}
+
+    # Decoding sequences are tracked in aggregate, keyed on the decode step counter.
+    # Each admission gets a fresh id, so heap entries of finished or preempted
+    # sequences are skipped when popped.
+    decode_step = 0
+    num_decoding = 0
+    decode_kv_tokens = 0  # Cached tokens summed over decoding sequences
+    block_heap: list[tuple[int, int]] = []  # (decode step needing a new block, id)
+    finish_heap: list[tuple[int, int]] = []  # (decode step producing the last token, id)
+
+    queue_delay = array("d")
+    ttft = array("d")
+    tpot = array("d")
+    e2e = array("d")
+    num_requests = 0
+    rejected = 0
+    output_tokens = 0
+    preemptions = 0
+    steps = 0
+    scheduled_seqs = 0
+    next_id = 0
+    first_arrival: Optional[float] = None
+    last_finish = 0.0
+    now = 0.0
+
+    def blocks_for(tokens: int) -> int:
+        return -(-tokens // block_size)
+
+    def release(sid: int, seq: _Seq) -> None:
+        nonlocal free_blocks, num_decoding, decode_kv_tokens
+        del running[sid]
+        free_blocks += seq.blocks
+        seq.blocks = 0
+        if seq.d0 >= 0:
+            num_decoding -= 1
+            decode_kv_tokens -= seq.target + decode_step - seq.d0
+        else:
+            del prefilling[sid]
+
+    def preempt_last() -> None:
+        nonlocal preemptions
+        sid, seq = next(reversed(running.items()))
+        if seq.d0 >= 0:
+            seq.generated += decode_step - seq.d0
+        release(sid, seq)
+        seq.target = seq.prompt + seq.generated
+        seq.prefilled = 0
+        seq.d0 = -1
+        preempted.appendleft(seq)
+        preemptions += 1
+
+    def start_decode(sid: int, seq: _Seq) -> None:
+        nonlocal num_decoding, decode_kv_tokens
+        seq.d0 = decode_step
+        num_decoding += 1
+        decode_kv_tokens += seq.target
+        heapq.heappush(block_heap, (decode_step + seq.blocks * block_size - seq.target, sid))
+        heapq.heappush(finish_heap, (decode_step + seq.gen - seq.generated, sid))
+
+    def finish(sid: int, seq: _Seq) -> None:
+        nonlocal last_finish
+        release(sid, seq)
+        e2e.append(now - seq.arrival)
+        if seq.gen > 1:
+            tpot.append((now - seq.first_token) / (seq.gen - 1))
+        last_finish = now
+
+    def schedule() -> Optional[tuple[float, list[tuple[int, _Seq]], bool]]:
+        """Pick the next step's work; returns (duration, finished prefills, ran decodes)."""
+        nonlocal free_blocks, next_id, steps, scheduled_seqs
+
+        budget = max_num_batched_tokens
+        prefill_tokens = 0
+        prefill_seqs = 0
+        prefill_kv = 0.0
+        prefill_pairs = 0.0
+        done_prefills: list[tuple[int, _Seq]] = []
+
+        def take_chunk(sid: int, seq: _Seq, chunk: int) -> None:
+            nonlocal budget, prefill_tokens, prefill_seqs, prefill_kv, prefill_pairs
+            start = seq.prefilled
+            seq.prefilled += chunk
+            budget -= chunk
+            prefill_tokens += chunk
+            prefill_seqs += 1
+            prefill_kv += seq.prefilled
+            prefill_pairs += chunk * (start + (chunk + 1) / 2)
+            if seq.prefilled == seq.target:
+                done_prefills.append((sid, seq))
+
+        def admit_next() -> bool:
+            nonlocal free_blocks, next_id, rejected
+            # Without chunking, vLLM ignores a recompute longer than the token budget
+            while not chunked_prefill and preempted and (
+                preempted[0].target > max_num_batched_tokens
+            ):
+                preempted.popleft()
+                rejected += 1
+            if not (preempted or waiting) or len(running) >= max_num_seqs or budget <= 0:
+                return False
+            seq = preempted[0] if preempted else _Seq(*waiting[0])
+            chunk = min(seq.target, budget)
+            if chunk < seq.target and not chunked_prefill:
+                return False
+            need = blocks_for(chunk)
+            if free_blocks - need < watermark:
+                return False
+            if preempted:
+                preempted.popleft()
+            else:
+                waiting.popleft()
+                queue_delay.append(now - seq.arrival)
+            sid = next_id
+            next_id += 1
+            free_blocks -= need
+            seq.blocks = need
+            running[sid] = seq
+            prefilling[sid] = seq
+            take_chunk(sid, seq, chunk)
+            return True
+
+        run_decodes = True
+        if not chunked_prefill:
+            # Prefill-priority: whole prompts only, decodes wait for a prefill-free step
+            while admit_next():
+                pass
+            run_decodes = prefill_tokens == 0
+
+        if run_decodes and num_decoding:
+            # Allocate a block for each decode crossing a block boundary this step
+            while block_heap and block_heap[0][0] <= decode_step:
+                _, sid = heapq.heappop(block_heap)
+                seq = running.get(sid)
+                if seq is None:
+                    continue
+                while free_blocks == 0 and sid in running:
+                    preempt_last()
+                if sid not in running:
+                    continue
+                free_blocks -= 1
+                seq.blocks += 1
+                heapq.heappush(block_heap, (decode_step + block_size, sid))
+            budget -= num_decoding
+
+        if chunked_prefill:
+            # Continue partial prefills in admission order, then admit new sequences
+            for sid, seq in list(prefilling.items()):
+                if budget <= 0:
+                    break
+                if running.get(sid) is not seq:
+                    continue
+                chunk = min(seq.target - seq.prefilled, budget)
+                need = blocks_for(seq.prefilled + chunk) - seq.blocks
+                while need > free_blocks and next(reversed(running)) != sid:
+                    preempt_last()
+                if need > free_blocks:
+                    chunk = (seq.blocks + free_blocks) * block_size - seq.prefilled
+                    need = free_blocks
+                if chunk <= 0:
+                    break
+                free_blocks -= need
+                seq.blocks += need
+                take_chunk(sid, seq, chunk)
+            while admit_next():
+                pass
+
+        decodes = num_decoding if run_decodes else 0
+        if decodes + prefill_tokens == 0:
+            return None
+
+        # Decodes read their whole cache and attend over it plus the new token
+        kv_read = prefill_kv + (decode_kv_tokens if decodes else 0)
+        pairs = prefill_pairs + (decode_kv_tokens + decodes if decodes else 0)
+        steps += 1
+        scheduled_seqs += decodes + prefill_seqs
+        duration = cost.step_time(decodes + prefill_tokens, kv_read, pairs)
+        return duration, done_prefills, decodes > 0
+
+    def complete(done_prefills: list[tuple[int, _Seq]], decoded: bool) -> None:
+        nonlocal decode_step, decode_kv_tokens, output_tokens
+        if decoded:
+            decode_step += 1
+            decode_kv_tokens += num_decoding
+            output_tokens += num_decoding
+            while finish_heap and finish_heap[0][0] <= decode_step:
+                _, sid = heapq.heappop(finish_heap)
+                seq = running.get(sid)
+                if seq is not None:
+                    finish(sid, seq)
+
+        # A completed prefill samples the next token
+        for sid, seq in done_prefills:
+            seq.generated += 1
+            output_tokens += 1
+            if seq.first_token < 0:
+                seq.first_token = now
+                ttft.append(now - seq.arrival)
+            if seq.generated >= seq.gen:
+                finish(sid, seq)
+            else:
+                del prefilling[sid]
+                start_decode(sid, seq)
+
+    arrival_iter = iter(arrivals)
+    events: list[tuple[float, int, Any]] = []
+
+    def push_next_arrival() -> None:
+        nxt = next(arrival_iter, None)
+        if nxt is not None:
+            heapq.heappush(events, (nxt[0], _ARRIVAL, nxt))
+
+    push_next_arrival()
+    busy = False
+
+    while events:
+        now, kind, payload = heapq.heappop(events)
+
+        if kind == _ARRIVAL:
+            arrival, prompt, gen = payload
+            num_requests += 1
+            if first_arrival is None:
+                first_arrival = arrival
+            too_long = not chunked_prefill and prompt > max_num_batched_tokens
+            if too_long or blocks_for(prompt + gen) > num_gpu_blocks - watermark:
+                rejected += 1
+            else:
+                waiting.append(payload)
+            push_next_arrival()
+            if busy:
+                continue
+        else:
+            complete(payload[1], payload[2])
+            busy = False
+
+        step = schedule()
+        if step is not None:
+            busy = True
+            heapq.heappush(events, (now + step[0], _STEP_DONE, step))
+
+    # Requests the scheduler can no longer make progress on count as rejected,
+    # so every arrival is either completed or rejected
+    rejected += len(waiting) + len(preempted) + len(running)
+
+    return SimulationResult(
+        num_requests=num_requests,
+        rejected=rejected,
+        duration_s=last_finish - (first_arrival or 0.0),
+        output_tokens=output_tokens,
+        preemptions=preemptions,
+        steps=steps,
+        scheduled_seqs=scheduled_seqs,
+        queue_delay_s=np.frombuffer(queue_delay, dtype=np.float64),
+        ttft_s=np.frombuffer(ttft, dtype=np.float64),
+        tpot_s=np.frombuffer(tpot, dtype=np.float64),
+        e2e_latency_s=np.frombuffer(e2e, dtype=np.float64),
+    )
+
+
+def _latency_stats(values_s: np.ndarray) -> LatencyStats:
+    """Summarize latencies in seconds as milliseconds."""
+    if values_s.size == 0:
+        return LatencyStats(mean=0.0, p50=0.0, p90=0.0, p99=0.0)
+
+    p50, p90, p99 = np.percentile(values_s, [50, 90, 99]) * 1000
+    return LatencyStats(
+        mean=round(float(values_s.mean()) * 1000, 2),
+        p50=round(float(p50), 2),
+        p90=round(float(p90), 2),
+        p99=round(float(p99), 2),
+    )
+
+
+def run_simulation(
+    request: PlanRequest,
+    rate: float,
+    num_requests: int = 1000,
+    max_num_seqs: Optional[int] = None,
+    max_num_batched_tokens: Optional[int] = None,
+    chunked_prefill: bool = True,
+    lengths: str = "fixed",
+    seed: int = 0,
+    arrivals: Optional[Iterable[tuple[float, int, int]]] = None,
+) -> SimulationReport:
+    """Simulate serving a planning request's workload under Poisson arrivals.
+
+    The KV block pool is the num_gpu_blocks reported by compute_feasibility for
+    the request's block size. Scheduler limits default to the planner's
+    recommendations.
+
+    Args:
+        request: Planning request providing model, hardware, workload and policy
+        rate: Mean arrival rate in requests per second
+        num_requests: Number of requests to simulate
+        max_num_seqs: Scheduler sequence limit (None for the recommendation)
+        max_num_batched_tokens: Scheduler token budget (None for the recommendation)
+        chunked_prefill: Whether prompts may be split across steps
+        lengths: "fixed" or "exponential" prompt/output length distribution
+        seed: Random seed
+        arrivals: Explicit (time, prompt, output) arrivals replacing the Poisson process
+
+    Returns:
+        SimulationReport with latency percentiles and throughput
+    """
+    plan = run_plan(request)
+    config = plan.config
+    feasibility = plan.feasibility
+
+    metadata = load_model_metadata(
+        model_id_or_path=request.model.model,
+        revision=request.model.revision,
+        trust_remote_code=request.model.trust_remote_code,
+        params_b=request.model.params_b,
+    )
+    params_b = request.model.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
+    gpus = resolve_hardware(request)
+    spec = get_gpu_spec(slowest_gpu(gpus).name) or DEFAULT_GPU_SPEC
+
+    cost = build_step_cost(
+        spec,
+        params_b,
+        metadata,
+        quantization=request.model.quantization,
+        dtype=request.model.dtype,
+        kv_cache_dtype=request.model.kv_cache_dtype,
+        tp_size=config.tensor_parallel_size,
+        interconnect=request.hardware.interconnect,
+        enforce_eager=bool(config.enforce_eager),
+    )
+
+    num_gpu_blocks = feasibility.num_gpu_blocks
+    block_size = feasibility.block_size
+    if num_gpu_blocks == 0:
+        raise ValueError("No memory left for KV cache blocks after weights and overhead.")
+
+    seqs = max_num_seqs or config.max_num_seqs or 256
+    batched_tokens = max_num_batched_tokens or config.max_num_batched_tokens or 8192
+    batched_tokens = max(batched_tokens, seqs)
+
+    arrival_note = "Arrivals: replayed trace"
+    if arrivals is None:
+        arrival_note = f"Arrivals: Poisson at {rate:g} req/s, {lengths} lengths"
+        arrivals = poisson_arrivals(
+            rate=rate,
+            num_requests=num_requests,
+            prompt_tokens=request.workload.prompt_tokens,
+            gen_tokens=request.workload.gen_tokens,
+            lengths=lengths,
+            seed=seed,
+        )
+
+    result = simulate(
+        arrivals=arrivals,
+        cost=cost,
+        num_gpu_blocks=num_gpu_blocks,
+        block_size=block_size,
+        max_num_seqs=seqs,
+        max_num_batched_tokens=batched_tokens,
+        chunked_prefill=chunked_prefill,
+    )
+
+    duration = result.duration_s
+    completed = result.completed
+
+    return SimulationReport(
+        num_requests=result.num_requests,
+        completed=completed,
+        rejected=result.rejected,
+        duration_s=round(duration, 3),
+        request_throughput=round(completed / duration, 3) if duration > 0 else 0.0,
+        output_toks_per_s=round(result.output_tokens / duration, 1) if duration > 0 else 0.0,
+        mean_batch_size=round(result.mean_batch_size, 2),
+        preemptions=result.preemptions,
+        preemption_rate=round(result.preemptions / completed, 4) if completed else 0.0,
+        queue_delay_ms=_latency_stats(result.queue_delay_s),
+        ttft_ms=_latency_stats(result.ttft_s),
+        tpot_ms=_latency_stats(result.tpot_s),
+        e2e_latency_ms=_latency_stats(result.e2e_latency_s),
+        num_gpu_blocks=num_gpu_blocks,
+        block_size=block_size,
+        max_num_seqs=seqs,
+        max_num_batched_tokens=batched_tokens,
+        chunked_prefill=chunked_prefill,
+        assumptions=[
+            f"GPU: {spec.name}, tensor parallel size {config.tensor_parallel_size}",
+            arrival_note,
+            "Step time: roofline at mid-range efficiency plus "
+            f"{STEP_OVERHEAD_S * 1000:g} ms scheduling overhead",
+            "Preemption: recompute, most recently admitted sequence first",
+        ],
+    )
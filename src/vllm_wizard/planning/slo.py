@@ -0,0 +1,478 @@
+"""SLO-driven search for the highest-throughput config that meets latency targets."""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from vllm_wizard.hardware.specs import DEFAULT_GPU_SPEC, GPUSpec, get_gpu_spec, slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata, load_model_metadata
+from vllm_wizard.planning.memory import (
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    DEFAULT_MAX_NUM_SEQS,
+    compute_activation_memory,
+    compute_blocks_per_seq,
+    compute_cuda_graph_memory,
+    compute_kv_block_bytes,
+    is_valid_tp_size,
+)
+from vllm_wizard.planning.planner import (
+    captured_graph_sizes,
+    estimate_plan_performance,
+    resolve_hardware,
+    run_plan,
+)
+from vllm_wizard.planning.simulator import BLOCK_WATERMARK, StepCostModel, build_step_cost
+from vllm_wizard.render.commands import (
+    render_docker_command,
+    render_docker_compose,
+    render_serve_command,
+)
+from vllm_wizard.schemas.inputs import KVCacheDType, PlanRequest, Quantization, WorkloadInput
+from vllm_wizard.schemas.outputs import Artifacts, GPUInfo, PlanResponse, SLOReport
+
+# Scheduler limits searched for every parallelism and precision choice
+MAX_NUM_SEQS_GRID: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+MAX_NUM_BATCHED_TOKENS_GRID: tuple[int, ...] = (2048, 4096, 8192, 16384, 32768)
+
+
+@dataclass
+class SLOCandidate:
+    """One scored configuration of the SLO search."""
+
+    tensor_parallel_size: int
+    quantization: Quantization
+    kv_cache_dtype: KVCacheDType
+    max_num_seqs: int
+    max_num_batched_tokens: int
+    batch_size: int
+    ttft_ms: float
+    tpot_ms: float
+    output_toks_per_s: float
+    meets_slo: bool
+    slo_ratio: float  # Worst predicted/target ratio over the set targets
+
+
+def has_latency_targets(workload: WorkloadInput) -> bool:
+    """Whether a workload sets a TTFT or per-token latency target."""
+    return workload.target_ttft_ms is not None or workload.target_latency_ms is not None
+
+
+def step_latencies(
+    cost: StepCostModel,
+    prompt_tokens: int,
+    gen_tokens: int,
+    batch: float,
+    max_num_batched_tokens: int,
+) -> Optional[tuple[float, float]]:
+    """Latency of an engine decoding a steady batch with chunked prefill.
+
+    Every step decodes the whole batch plus the prefill load of replacing
+    the sequences that finish, which sets TPOT. A new prompt is prefilled in
+    chunks of the budget left after the decodes, which sets TTFT. Queueing
+    delay is not included.
+
+    Args:
+        cost: Step cost model for one tensor-parallel rank
+        prompt_tokens: Prompt length
+        gen_tokens: Output length
+        batch: Sequences decoding concurrently (may be fractional for a mean load)
+        max_num_batched_tokens: Scheduler token budget per step
+
+    Returns:
+        (TTFT seconds, TPOT seconds), or None if no prefill chunk fits the budget
+    """
+    chunk = min(prompt_tokens, max_num_batched_tokens - math.ceil(batch))
+    if chunk < 1:
+        return None
+
+    # Each step finishes batch / gen_tokens sequences whose replacements need prefill
+    prefill_per_step = batch * prompt_tokens / gen_tokens
+    decode_kv = batch * (prompt_tokens + gen_tokens / 2)
+
+    tpot = cost.step_time(
+        batch + prefill_per_step,
+        decode_kv,
+        decode_kv + prefill_per_step * prompt_tokens / 2,
+    )
+    chunk_step = cost.step_time(
+        batch + chunk,
+        decode_kv + prompt_tokens / 2,
+        decode_kv + chunk * prompt_tokens / 2,
+    )
+    ttft = math.ceil(prompt_tokens / chunk) * chunk_step
+
+    return ttft, tpot
+
+
+def estimate_steady_state(
+    cost: StepCostModel,
+    prompt_tokens: int,
+    gen_tokens: int,
+    max_num_seqs: int,
+    max_num_batched_tokens: int,
+    max_seqs_by_blocks: int,
+) -> Optional[tuple[int, float, float]]:
+    """Latency of a saturated engine with chunked prefill.
+
+    The decode batch is the smallest of max_num_seqs, the sequences whose KV
+    blocks fit, and the batch whose replacement prompts can be prefilled
+    within the token budget as fast as sequences finish. Latencies at that
+    batch come from step_latencies.
+
+    Args:
+        cost: Step cost model for one tensor-parallel rank
+        prompt_tokens: Prompt length
+        gen_tokens: Output length
+        max_num_seqs: Scheduler sequence limit
+        max_num_batched_tokens: Scheduler token budget per step
+        max_seqs_by_blocks: Sequences of prompt + output tokens that fit in KV blocks
+
+    Returns:
+        (batch size, TTFT seconds, TPOT seconds), or None if no sequence can run
+    """
+    sustainable = max_num_batched_tokens * gen_tokens // (prompt_tokens + gen_tokens)
+    batch = min(max_num_seqs, max_seqs_by_blocks, sustainable)
+    if batch < 1:
+        return None
+
+    latencies = step_latencies(cost, prompt_tokens, gen_tokens, batch, max_num_batched_tokens)
+    if latencies is None:
+        return None
+
+    ttft, tpot = latencies
+    return batch, ttft, tpot
+
+
+def _candidate_tp_sizes(num_gpus: int, metadata: ModelMetadata, requested: Optional[int]) -> list[int]:
+    """Power-of-2 TP sizes that fit the GPU count and vLLM can shard the heads over."""
+    if requested is not None:
+        return [requested]
+
+    sizes: list[int] = []
+    tp_size = 1
+    while tp_size <= num_gpus:
+        if is_valid_tp_size(metadata, tp_size):
+            sizes.append(tp_size)
+        tp_size *= 2
+    return sizes
+
+
+def _candidate_precisions(
+    request: PlanRequest, spec: GPUSpec
+) -> list[tuple[Quantization, KVCacheDType]]:
+    """Quantization and KV dtype pairs to try, highest precision first.
+
+    User-specified values are kept; otherwise FP8 is tried on GPUs with FP8
+    tensor cores and AWQ everywhere.
+    """
+    if request.model.quantization != Quantization.NONE:
+        quantizations = [request.model.quantization]
+    else:
+        quantizations = [Quantization.NONE]
+        if spec.supports_fp8:
+            quantizations.append(Quantization.FP8)
+        quantizations.append(Quantization.AWQ)
+
+    if request.model.kv_cache_dtype != KVCacheDType.AUTO:
+        kv_dtypes = [request.model.kv_cache_dtype]
+    else:
+        kv_dtypes = [KVCacheDType.AUTO]
+        if spec.supports_fp8:
+            kv_dtypes.append(KVCacheDType.FP8_E4M3FN)
+
+    return [(quant, kv_dtype) for quant in quantizations for kv_dtype in kv_dtypes]
+
+
+def _variant(
+    request: PlanRequest,
+    tp_size: int,
+    quantization: Quantization,
+    kv_dtype: KVCacheDType,
+    max_num_seqs: Optional[int] = None,
+    max_num_batched_tokens: Optional[int] = None,
+) -> PlanRequest:
+    """Copy a request with parallelism, precision and optionally scheduler limits fixed."""
+    policy = request.policy
+    if max_num_seqs is not None:
+        policy = policy.model_copy(
+            update={"max_num_seqs": max_num_seqs, "max_num_batched_tokens": max_num_batched_tokens}
+        )
+
+    return request.model_copy(
+        update={
+            "model": request.model.model_copy(
+                update={"quantization": quantization, "kv_cache_dtype": kv_dtype}
+            ),
+            "hardware": request.hardware.model_copy(update={"tensor_parallel_size": tp_size}),
+            "policy": policy,
+        }
+    )
+
+
+def slo_ratio(workload: WorkloadInput, ttft_ms: float, tpot_ms: float) -> float:
+    """Worst predicted/target ratio; at most 1.0 when every target is met."""
+    ratios = [0.0]
+    if workload.target_ttft_ms is not None:
+        ratios.append(ttft_ms / workload.target_ttft_ms)
+    if workload.target_latency_ms is not None:
+        ratios.append(tpot_ms / workload.target_latency_ms)
+    return max(ratios)
+
+
+def load_plan_inputs(request: PlanRequest) -> tuple[ModelMetadata, float, list[GPUInfo]]:
+    """Load model metadata, parameter count and GPUs as run_plan does."""
+    metadata = load_model_metadata(
+        model_id_or_path=request.model.model,
+        revision=request.model.revision,
+        trust_remote_code=request.model.trust_remote_code,
+        params_b=request.model.params_b,
+    )
+    params_b = request.model.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
+
+    gpus = resolve_hardware(request)
+    if not gpus:
+        raise ValueError(
+            "No GPUs detected or specified. "
+            "Provide --gpu and --vram-gb flags, or run on a system with nvidia-smi."
+        )
+    return metadata, params_b, gpus
+
+
+def search_slo_configs(request: PlanRequest) -> list[SLOCandidate]:
+    """Score every TP size, precision and scheduler limit against the latency targets.
+
+    KV capacity for each TP size and precision comes from the planner's block
+    accounting; latencies come from the simulator's step cost model.
+
+    Args:
+        request: Planning request with target_ttft_ms and/or target_latency_ms
+
+    Returns:
+        Candidates best first: those meeting the targets by descending
+        throughput, then the rest by how far they miss
+    """
+    metadata, params_b, gpus = load_plan_inputs(request)
+    spec = get_gpu_spec(slowest_gpu(gpus).name) or DEFAULT_GPU_SPEC
+
+    workload = request.workload
+    precisions = _candidate_precisions(request, spec)
+
+    policy = request.policy
+    seqs_grid = (policy.max_num_seqs,) if policy.max_num_seqs else MAX_NUM_SEQS_GRID
+    tokens_grid = (
+        (policy.max_num_batched_tokens,)
+        if policy.max_num_batched_tokens
+        else MAX_NUM_BATCHED_TOKENS_GRID
+    )
+    blocks_per_seq = compute_blocks_per_seq(
+        workload.prompt_tokens + workload.gen_tokens, policy.block_size
+    )
+
+    candidates: list[SLOCandidate] = []
+    for tp_size in _candidate_tp_sizes(len(gpus), metadata, request.hardware.tensor_parallel_size):
+        for quantization, kv_dtype in precisions:
+            plan = run_plan(_variant(request, tp_size, quantization, kv_dtype))
+            if plan.feasibility.num_gpu_blocks == 0:
+                continue
+
+            # The plan's blocks are sized after the profile run and graph capture at
+            # its recommended limits; other limits move both and the KV budget with them
+            planned_reserved = compute_activation_memory(
+                metadata,
+                plan.config.max_num_batched_tokens or DEFAULT_MAX_NUM_BATCHED_TOKENS,
+                plan.config.max_num_seqs or DEFAULT_MAX_NUM_SEQS,
+                request.model.dtype,
+                tp_size,
+            ) + compute_cuda_graph_memory(
+                metadata, captured_graph_sizes(plan.config), request.model.dtype, tp_size
+            )
+            block_bytes = compute_kv_block_bytes(
+                metadata, policy.block_size, kv_dtype, request.model.dtype, tp_size
+            )
+
+            cost = build_step_cost(
+                spec,
+                params_b,
+                metadata,
+                quantization=quantization,
+                dtype=request.model.dtype,
+                kv_cache_dtype=kv_dtype,
+                tp_size=tp_size,
+                interconnect=request.hardware.interconnect,
+                enforce_eager=bool(plan.config.enforce_eager),
+            )
+
+            for max_num_seqs in seqs_grid:
+                graph_sizes = captured_graph_sizes(
+                    plan.config.model_copy(update={"max_num_seqs": max_num_seqs})
+                )
+                graph_bytes = compute_cuda_graph_memory(
+                    metadata, graph_sizes, request.model.dtype, tp_size
+                )
+                for max_num_batched_tokens in tokens_grid:
+                    if max_num_batched_tokens < max_num_seqs:
+                        continue
+
+                    reserved = graph_bytes + compute_activation_memory(
+                        metadata,
+                        max_num_batched_tokens,
+                        max_num_seqs,
+                        request.model.dtype,
+                        tp_size,
+                    )
+                    num_gpu_blocks = plan.feasibility.num_gpu_blocks + (
+                        (planned_reserved - reserved) // block_bytes
+                    )
+                    usable_blocks = int(max(num_gpu_blocks, 0) * (1 - BLOCK_WATERMARK))
+                    max_seqs_by_blocks = usable_blocks // blocks_per_seq
+
+                    state = estimate_steady_state(
+                        cost,
+                        workload.prompt_tokens,
+                        workload.gen_tokens,
+                        max_num_seqs,
+                        max_num_batched_tokens,
+                        max_seqs_by_blocks,
+                    )
+                    if state is None:
+                        continue
+
+                    batch, ttft_s, tpot_s = state
+                    ratio = slo_ratio(workload, ttft_s * 1000, tpot_s * 1000)
+                    candidates.append(
+                        SLOCandidate(
+                            tensor_parallel_size=tp_size,
+                            quantization=quantization,
+                            kv_cache_dtype=kv_dtype,
+                            max_num_seqs=max_num_seqs,
+                            max_num_batched_tokens=max_num_batched_tokens,
+                            batch_size=batch,
+                            ttft_ms=ttft_s * 1000,
+                            tpot_ms=tpot_s * 1000,
+                            output_toks_per_s=batch / tpot_s,
+                            meets_slo=ratio <= 1.0,
+                            slo_ratio=ratio,
+                        )
+                    )
+
+    # Ties prefer fewer GPUs, higher precision, then the lowest TTFT
+    ranks = {precision: rank for rank, precision in enumerate(precisions)}
+    candidates.sort(
+        key=lambda c: (
+            not c.meets_slo,
+            -round(c.output_toks_per_s, 1) if c.meets_slo else c.slo_ratio,
+            c.tensor_parallel_size,
+            ranks[(c.quantization, c.kv_cache_dtype)],
+            c.ttft_ms,
+            c.max_num_seqs,
+        )
+    )
+    return candidates
+
+
+def run_slo_plan(request: PlanRequest) -> PlanResponse:
+    """Plan the highest-throughput configuration that meets the latency targets.
+
+    Searches tensor parallel size, quantization, KV cache dtype, max_num_seqs
+    and max_num_batched_tokens, then plans the chosen configuration. If no
+    configuration meets the targets, the one that misses them least is
+    returned with negative margins and a warning.
+
+    Args:
+        request: Planning request with target_ttft_ms and/or target_latency_ms
+
+    Returns:
+        PlanResponse for the chosen configuration with the SLO report attached
+    """
+    workload = request.workload
+    if not has_latency_targets(workload):
+        raise ValueError("SLO planning needs --target-ttft-ms and/or --target-latency-ms.")
+
+    candidates = search_slo_configs(request)
+    if not candidates:
+        raise ValueError("No configuration has room for a single sequence in the KV cache.")
+
+    best = candidates[0]
+    chosen = _variant(
+        request,
+        best.tensor_parallel_size,
+        best.quantization,
+        best.kv_cache_dtype,
+        best.max_num_seqs,
+        best.max_num_batched_tokens,
+    )
+    response = run_plan(chosen)
+
+    config = response.config.model_copy(
+        update={
+            "quantization": (
+                best.quantization.value if best.quantization != Quantization.NONE else None
+            ),
+            "kv_cache_dtype": (
+                best.kv_cache_dtype.value if best.kv_cache_dtype != KVCacheDType.AUTO else None
+            ),
+        }
+    )
+    if request.explain:
+        explanations = dict(config.explanations)
+        note = (
+            f"Chosen by SLO search: {best.output_toks_per_s:.0f} output tok/s at batch "
+            f"{best.batch_size}, TTFT {best.ttft_ms:.0f} ms, TPOT {best.tpot_ms:.1f} ms"
+        )
+        for key in (
+            "tensor_parallel_size",
+            "quantization",
+            "kv_cache_dtype",
+            "max_num_seqs",
+            "max_num_batched_tokens",
+        ):
+            explanations[key] = note
+        config.explanations = explanations
+
+    metadata, params_b, gpus = load_plan_inputs(chosen)
+    performance = estimate_plan_performance(chosen, metadata, gpus, config, params_b)
+
+    slo = SLOReport(
+        target_ttft_ms=workload.target_ttft_ms,
+        target_tpot_ms=workload.target_latency_ms,
+        ttft_ms=round(best.ttft_ms, 1),
+        tpot_ms=round(best.tpot_ms, 2),
+        ttft_margin_ms=(
+            round(workload.target_ttft_ms - best.ttft_ms, 1)
+            if workload.target_ttft_ms is not None
+            else None
+        ),
+        tpot_margin_ms=(
+            round(workload.target_latency_ms - best.tpot_ms, 2)
+            if workload.target_latency_ms is not None
+            else None
+        ),
+        meets_slo=best.meets_slo,
+        batch_size=best.batch_size,
+        output_toks_per_s=round(best.output_toks_per_s, 1),
+        candidates_evaluated=len(candidates),
+        candidates_meeting_slo=sum(1 for c in candidates if c.meets_slo),
+    )
+
+    feasibility = response.feasibility
+    if not best.meets_slo:
+        feasibility = feasibility.model_copy(
+            update={
+                "warnings": feasibility.warnings
+                + ["No configuration meets the latency targets; showing the closest miss."]
+            }
+        )
+
+    return response.model_copy(
+        update={
+            "feasibility": feasibility,
+            "config": config,
+            "performance": performance,
+            "artifacts": Artifacts(
+                serve_command=render_serve_command(config),
+                docker_command=render_docker_command(config),
+                docker_compose=render_docker_compose(config),
+            ),
+            "slo": slo,
+        }
+    )
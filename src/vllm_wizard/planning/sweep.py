@@ -0,0 +1,284 @@
+"""Vectorized feasibility sweeps over context, concurrency and dtype grids."""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from vllm_wizard.hardware.detect import recommend_tensor_parallel
+from vllm_wizard.hardware.specs import device_group
+from vllm_wizard.models.metadata import ModelMetadata, load_model_metadata
+from vllm_wizard.planning.memory import (
+    BYTES_TO_GIB,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_MAX_NUM_BATCHED_TOKENS,
+    DEFAULT_MAX_NUM_SEQS,
+    compute_activation_memory,
+    compute_cuda_graph_memory,
+    compute_overhead,
+    compute_weights_memory,
+    compute_weights_per_rank,
+    cuda_graph_capture_sizes,
+    get_kv_bytes_per_element,
+    kv_heads_per_rank,
+    pipeline_stage_layers,
+)
+from vllm_wizard.planning.planner import resolve_hardware
+from vllm_wizard.schemas.inputs import DType, KVCacheDType, PlanRequest, Quantization
+
+
+@dataclass
+class SweepResult:
+    """Feasibility matrix and frontier for a sweep grid.
+
+    Grid arrays are indexed as (quantization, kv_cache_dtype, context_len, concurrency).
+    """
+
+    quantizations: list[Quantization]
+    kv_cache_dtypes: list[KVCacheDType]
+    context_lens: np.ndarray
+    concurrencies: np.ndarray
+    vram_total_bytes: int
+    allocatable_bytes: int
+    fits: np.ndarray
+    headroom_bytes: np.ndarray
+    max_concurrency_at_context: np.ndarray
+    max_context_at_concurrency: np.ndarray
+
+    @property
+    def num_points(self) -> int:
+        """Number of evaluated grid points."""
+        return int(self.fits.size)
+
+    @property
+    def vram_total_gb(self) -> float:
+        """VRAM of the tensor parallel group in GiB."""
+        return self.vram_total_bytes / BYTES_TO_GIB
+
+    @property
+    def vram_target_alloc_gb(self) -> float:
+        """Target allocation in GiB."""
+        return self.allocatable_bytes / BYTES_TO_GIB
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "quantizations": [q.value for q in self.quantizations],
+            "kv_cache_dtypes": [k.value for k in self.kv_cache_dtypes],
+            "context_lens": self.context_lens.tolist(),
+            "concurrencies": self.concurrencies.tolist(),
+            "vram_total_gb": self.vram_total_gb,
+            "vram_target_alloc_gb": self.vram_target_alloc_gb,
+            "fits": self.fits.tolist(),
+            "max_concurrency_at_context": self.max_concurrency_at_context.tolist(),
+            "max_context_at_concurrency": self.max_context_at_concurrency.tolist(),
+        }
+
+
+def compute_sweep(
+    metadata: ModelMetadata,
+    params_b: float,
+    vram_total_bytes: int,
+    context_lens: Sequence[int],
+    concurrencies: Sequence[int],
+    kv_cache_dtypes: Sequence[KVCacheDType] = (KVCacheDType.AUTO,),
+    quantizations: Sequence[Quantization] = (Quantization.NONE,),
+    dtype: DType = DType.AUTO,
+    tp_size: int = 1,
+    pp_size: int = 1,
+    gpu_memory_utilization: float = 0.90,
+    overhead_gb: Optional[float] = None,
+    fragmentation_factor: float = 1.0,
+    headroom_gb: float = 1.0,
+    activation_bytes: int = 0,
+    cuda_graph_bytes: int = 0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> SweepResult:
+    """Evaluate the memory model over a full grid in one batched computation.
+
+    Produces the same numbers as calling compute_kv_cache_memory and
+    compute_feasibility once per point, without the per-point Python overhead.
+    Like compute_feasibility, memory is that of the worst-loaded rank.
+
+    Args:
+        metadata: Model metadata
+        params_b: Model parameters in billions
+        vram_total_bytes: VRAM of one GPU in bytes
+        context_lens: Context lengths to evaluate
+        concurrencies: Concurrency levels to evaluate
+        kv_cache_dtypes: KV cache dtypes to evaluate
+        quantizations: Quantization methods to evaluate
+        dtype: Model weight dtype
+        tp_size: Tensor parallel size
+        pp_size: Pipeline parallel size
+        gpu_memory_utilization: Target GPU memory utilization
+        overhead_gb: Fixed overhead in GB (None for automatic)
+        fragmentation_factor: Explicit KV safety margin on top of the block count
+        headroom_gb: Minimum headroom in GB
+        activation_bytes: Peak profile-run activation memory in bytes
+        cuda_graph_bytes: Captured CUDA graph memory in bytes
+        block_size: Tokens per KV cache block
+
+    Returns:
+        SweepResult with the feasibility matrix and frontier
+    """
+    ctx = np.asarray(context_lens, dtype=np.int64)
+    # Each sequence holds whole blocks
+    ctx_blocks = -(-ctx // block_size) * block_size
+    conc = np.asarray(concurrencies, dtype=np.int64)
+
+    allocatable_bytes = int(vram_total_bytes * gpu_memory_utilization)
+    # Activations and CUDA graphs are reserved before the KV cache, like overhead
+    overhead_bytes = (
+        compute_overhead(vram_total_bytes, tp_size, overhead_gb)
+        + activation_bytes
+        + cuda_graph_bytes
+    )
+
+    # (Q,) weights per rank for each quantization
+    weights = np.array(
+        [
+            compute_weights_per_rank(
+                compute_weights_memory(params_b, dtype, q, metadata), metadata, tp_size, pp_size
+            )
+            for q in quantizations
+        ],
+        dtype=np.int64,
+    )
+
+    # (K,) bytes per element for each KV dtype
+    bytes_per_element = np.array(
+        [get_kv_bytes_per_element(k, dtype) for k in kv_cache_dtypes], dtype=np.float64
+    )
+
+    # KV elements per token across the layers of the largest pipeline stage
+    elements_per_token = (
+        2
+        * kv_heads_per_rank(metadata.num_key_value_heads, tp_size)
+        * metadata.head_dim
+        * max(pipeline_stage_layers(metadata.num_hidden_layers, pp_size))
+    )
+
+    # (K, L, C) KV cache bytes, same operation order as compute_kv_cache_memory
+    tokens = np.outer(ctx_blocks, conc) * elements_per_token
+    kv_bytes = np.floor(
+        tokens[None, :, :] * bytes_per_element[:, None, None] * fragmentation_factor
+    ).astype(np.int64)
+
+    # (Q, K, L, C) headroom and feasibility
+    required = weights[:, None, None, None] + kv_bytes[None, :, :, :] + overhead_bytes
+    headroom_bytes = allocatable_bytes - required
+    fits = headroom_bytes >= headroom_gb * BYTES_TO_GIB
+
+    # Frontier: KV budget left after weights and overhead
+    available_for_kv = allocatable_bytes - weights - overhead_bytes  # (Q,)
+    available = np.maximum(available_for_kv, 0)[:, None, None]
+
+    # (K, L) KV bytes for one sequence at each context
+    kv_per_seq = np.floor(
+        (ctx_blocks * elements_per_token)[None, :]
+        * bytes_per_element[:, None]
+        * fragmentation_factor
+    ).astype(np.int64)
+    max_concurrency = np.where(
+        kv_per_seq[None] > 0, available // np.maximum(kv_per_seq[None], 1), 0
+    )
+
+    # (K,) KV bytes per block for one sequence
+    kv_per_block = np.floor(
+        block_size * elements_per_token * bytes_per_element * fragmentation_factor
+    ).astype(np.int64)
+    total_blocks = np.where(
+        kv_per_block[None] > 0, available[:, :, 0] // np.maximum(kv_per_block[None], 1), 0
+    )
+    max_context = (total_blocks[:, :, None] // np.maximum(conc, 1)[None, None, :]) * block_size
+
+    return SweepResult(
+        quantizations=list(quantizations),
+        kv_cache_dtypes=list(kv_cache_dtypes),
+        context_lens=ctx,
+        concurrencies=conc,
+        vram_total_bytes=vram_total_bytes,
+        allocatable_bytes=allocatable_bytes,
+        fits=fits,
+        headroom_bytes=headroom_bytes,
+        max_concurrency_at_context=max_concurrency,
+        max_context_at_concurrency=max_context,
+    )
+
+
+def run_sweep(
+    request: PlanRequest,
+    context_lens: Sequence[int],
+    concurrencies: Sequence[int],
+    kv_cache_dtypes: Sequence[KVCacheDType] = (KVCacheDType.AUTO,),
+    quantizations: Sequence[Quantization] = (Quantization.NONE,),
+) -> SweepResult:
+    """Run a sweep using the model, hardware and policy of a planning request.
+
+    Model metadata and hardware are resolved once; the request's own context,
+    concurrency, KV dtype and quantization are replaced by the grid axes.
+
+    Args:
+        request: Planning request providing model, hardware and policy
+        context_lens: Context lengths to evaluate
+        concurrencies: Concurrency levels to evaluate
+        kv_cache_dtypes: KV cache dtypes to evaluate
+        quantizations: Quantization methods to evaluate
+
+    Returns:
+        SweepResult for the grid
+    """
+    metadata = load_model_metadata(
+        model_id_or_path=request.model.model,
+        revision=request.model.revision,
+        trust_remote_code=request.model.trust_remote_code,
+        params_b=request.model.params_b,
+    )
+
+    gpus = resolve_hardware(request)
+    if not gpus:
+        raise ValueError(
+            "No GPUs detected or specified. "
+            "Provide --gpu and --vram-gb flags, or run on a system with nvidia-smi."
+        )
+
+    pp_size = request.hardware.pipeline_parallel_size or 1
+    tp_size = request.hardware.tensor_parallel_size or recommend_tensor_parallel(
+        gpus[: max(1, len(gpus) // pp_size)]
+    )
+    group = device_group(gpus, tp_size * pp_size)
+    vram_per_gpu = min(gpu.vram_mib for gpu in group) * 1024 * 1024
+
+    params_b = request.model.params_b or (metadata.num_params / 1e9 if metadata.num_params else 7.0)
+    max_num_seqs = request.policy.max_num_seqs or DEFAULT_MAX_NUM_SEQS
+
+    graph_sizes = [] if request.policy.enforce_eager else cuda_graph_capture_sizes(max_num_seqs)
+
+    return compute_sweep(
+        metadata=metadata,
+        params_b=params_b,
+        vram_total_bytes=vram_per_gpu,
+        context_lens=context_lens,
+        concurrencies=concurrencies,
+        kv_cache_dtypes=kv_cache_dtypes,
+        quantizations=quantizations,
+        dtype=request.model.dtype,
+        tp_size=tp_size,
+        pp_size=pp_size,
+        gpu_memory_utilization=request.policy.gpu_memory_utilization,
+        overhead_gb=request.policy.overhead_gb,
+        fragmentation_factor=request.policy.fragmentation_factor,
+        headroom_gb=request.policy.headroom_gb,
+        block_size=request.policy.block_size,
+        activation_bytes=compute_activation_memory(
+            metadata,
+            request.policy.max_num_batched_tokens or DEFAULT_MAX_NUM_BATCHED_TOKENS,
+            max_num_seqs,
+            request.model.dtype,
+            tp_size,
+        ),
+        cuda_graph_bytes=compute_cuda_graph_memory(
+            metadata, graph_sizes, request.model.dtype, tp_size, pp_size
+        ),
+    )
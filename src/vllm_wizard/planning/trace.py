@@ -0,0 +1,339 @@
+"""Workload traces: stream request logs into length histograms for KV sizing."""
+
+import csv
+import gzip
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+from vllm_wizard.schemas.trace import LengthStats, WorkloadTrace
+
+# Histogram resolution: buckets per doubling of length (~4.4% wide)
+BUCKETS_PER_DOUBLING = 16
+
+# One-sided z-score of the percentile of concurrent KV tokens that is sized for
+KV_SIZING_Z = 2.326  # 99th percentile
+
+# Record fields accepted for each value, first match wins
+PROMPT_FIELDS = (
+    "prompt_tokens",
+    "input_tokens",
+    "input_length",
+    "input_len",
+    "prompt_len",
+    "num_prompt_tokens",
+)
+OUTPUT_FIELDS = (
+    "gen_tokens",
+    "output_tokens",
+    "completion_tokens",
+    "output_length",
+    "output_len",
+    "num_output_tokens",
+)
+TIMESTAMP_FIELDS = ("timestamp", "arrival_time", "time", "created", "ts")
+
+# Numeric timestamps above this are taken to be in milliseconds
+_MILLISECOND_EPOCH = 1e11
+
+
+@dataclass
+class LengthHistogram:
+    """Streaming histogram of token lengths with log-spaced buckets.
+
+    Memory is bounded by the number of distinct buckets (about 16 per
+    doubling, so a few hundred up to a million tokens), whatever the number
+    of values added.
+    """
+
+    count: float = 0.0
+    total: float = 0.0
+    min: Optional[int] = None
+    max: int = 0
+    buckets: dict[int, float] = field(default_factory=dict)
+
+    @staticmethod
+    def bucket_index(value: int) -> int:
+        """Bucket holding a length; bucket i covers lengths up to 2 ** (i / 16)."""
+        if value <= 1:
+            return 0
+        return math.ceil(BUCKETS_PER_DOUBLING * math.log2(value) - 1e-9)
+
+    @staticmethod
+    def bucket_upper(index: int) -> int:
+        """Largest length falling in a bucket."""
+        return int(2 ** (index / BUCKETS_PER_DOUBLING) + 1e-9)
+
+    def add(self, value: int, weight: float = 1.0) -> None:
+        """Add a length with a weight (1 per request unless time-weighted)."""
+        if weight <= 0:
+            return
+        self.count += weight
+        self.total += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+        index = self.bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0.0) + weight
+
+    def to_stats(self) -> LengthStats:
+        """Summarize the histogram with its mean and percentiles."""
+        stats = LengthStats(
+            count=round(self.count, 3),
+            mean=round(self.total / self.count, 2) if self.count else 0.0,
+            min=self.min or 0,
+            max=self.max,
+            buckets=[
+                (self.bucket_upper(index), round(self.buckets[index], 3))
+                for index in sorted(self.buckets)
+            ],
+        )
+        stats.p50 = stats.percentile(0.50)
+        stats.p90 = stats.percentile(0.90)
+        stats.p99 = stats.percentile(0.99)
+        return stats
+
+
+def _open_text(path: Path) -> IO[str]:
+    """Open a possibly gzip-compressed log for streaming text reads."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", newline="")
+    return open(path, "r", newline="")
+
+
+def _log_format(path: Path) -> str:
+    """Log format from the file suffix, ignoring a trailing .gz."""
+    suffixes = [suffix.lower() for suffix in path.suffixes if suffix.lower() != ".gz"]
+    last = suffixes[-1] if suffixes else ""
+    if last == ".csv":
+        return "csv"
+    if last == ".tsv":
+        return "tsv"
+    return "jsonl"
+
+
+def _iter_records(path: Path) -> Iterator[Optional[dict[str, Any]]]:
+    """Stream records from a JSONL, CSV or TSV log, one line at a time.
+
+    Yields None for lines that are not records, so callers can count them.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Trace file not found: {path}")
+
+    log_format = _log_format(path)
+    with _open_text(path) as f:
+        if log_format == "jsonl":
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+                    continue
+                yield record if isinstance(record, dict) else None
+        else:
+            delimiter = "," if log_format == "csv" else "\t"
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def _first_field(record: dict[str, Any], names: tuple[str, ...]) -> Any:
+    """Value of the first field present, also looking inside an OpenAI "usage" object."""
+    usage = record.get("usage")
+    for source in (record, usage if isinstance(usage, dict) else {}):
+        for name in names:
+            value = source.get(name)
+            if value not in (None, ""):
+                return value
+    return None
+
+
+def _as_length(value: Any) -> Optional[int]:
+    """Token count from a JSON number or CSV string, or None if unusable."""
+    try:
+        length = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return length if length >= 0 else None
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Seconds since the epoch from a number (s or ms) or an ISO 8601 string.
+
+    Args:
+        value: Timestamp field of a record
+
+    Returns:
+        Seconds, or None if the value is missing or unparseable
+    """
+    if value in (None, ""):
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            text = str(value).strip().replace("Z", "+00:00")
+            return datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            return None
+    return seconds / 1000 if seconds > _MILLISECOND_EPOCH else seconds
+
+
+def iter_trace(path: Path) -> Iterator[Optional[tuple[Optional[float], int, int]]]:
+    """Stream (timestamp, prompt tokens, output tokens) from a request log.
+
+    Accepts JSONL (one object per line), CSV and TSV with a header row,
+    optionally gzip-compressed. Field names follow common log and benchmark
+    formats (prompt_tokens/input_tokens, gen_tokens/output_tokens/
+    completion_tokens, timestamp/arrival_time/created).
+
+    Args:
+        path: Path to the log
+
+    Yields:
+        (timestamp in seconds or None, prompt tokens, output tokens), or None
+        for a record without a usable prompt and output length
+
+    Raises:
+        FileNotFoundError: If the log does not exist
+    """
+    for record in _iter_records(path):
+        if record is None:
+            yield None
+            continue
+        prompt = _as_length(_first_field(record, PROMPT_FIELDS))
+        output = _as_length(_first_field(record, OUTPUT_FIELDS))
+        if prompt is None or output is None:
+            yield None
+            continue
+        yield parse_timestamp(_first_field(record, TIMESTAMP_FIELDS)), prompt, output
+
+
+def read_trace(path: Path) -> WorkloadTrace:
+    """Summarize a request log into length distributions in one pass.
+
+    Besides the prompt, output and total length per request, the trace keeps
+    the length of the KV cache a sequence holds while it decodes, weighted by
+    the decode steps spent at it: a request grows from prompt to prompt plus
+    output, one token per step, so it is recorded at the quartiles of that
+    range with half its output length as weight each. That is the
+    distribution a running batch samples from.
+
+    Args:
+        path: Path to a JSONL, CSV or TSV log (optionally .gz)
+
+    Returns:
+        WorkloadTrace with histograms, percentiles and arrival rate
+
+    Raises:
+        FileNotFoundError: If the log does not exist
+        ValueError: If no record has both a prompt and an output length
+    """
+    prompts = LengthHistogram()
+    outputs = LengthHistogram()
+    contexts = LengthHistogram()
+    resident = LengthHistogram()
+    requests = 0
+    skipped = 0
+    first: Optional[float] = None
+    last: Optional[float] = None
+
+    for item in iter_trace(path):
+        if item is None:
+            skipped += 1
+            continue
+        timestamp, prompt, output = item
+        requests += 1
+        prompts.add(prompt)
+        outputs.add(output)
+        contexts.add(prompt + output)
+        resident.add(prompt + round(output / 4), output / 2)
+        resident.add(prompt + round(3 * output / 4), output / 2)
+        if timestamp is not None:
+            first = timestamp if first is None else min(first, timestamp)
+            last = timestamp if last is None else max(last, timestamp)
+
+    if requests == 0:
+        raise ValueError(f"No records with prompt and output token counts in {path}")
+
+    duration = last - first if first is not None and last is not None else None
+    rate = None
+    if duration and requests > 1:
+        rate = round((requests - 1) / duration, 4)
+
+    return WorkloadTrace(
+        source=str(path),
+        requests=requests,
+        skipped=skipped,
+        duration_s=round(duration, 3) if duration is not None else None,
+        request_rate=rate,
+        prompt_tokens=prompts.to_stats(),
+        gen_tokens=outputs.to_stats(),
+        context_tokens=contexts.to_stats(),
+        resident_tokens=resident.to_stats(),
+    )
+
+
+def concurrent_kv_tokens(
+    trace: WorkloadTrace,
+    concurrency: int,
+    max_model_len: int,
+    z: float = KV_SIZING_Z,
+) -> int:
+    """KV tokens held by a full batch of sequences drawn from a trace.
+
+    Each of the concurrent sequences holds a length drawn from the trace's
+    time-weighted resident distribution, capped at max_model_len. Their sum
+    has mean N * mean and standard deviation sqrt(N) * std, so the batch is
+    sized for that mean plus z deviations (the 99th percentile by default)
+    instead of every sequence at max_model_len.
+
+    Args:
+        trace: Workload trace
+        concurrency: Concurrent sequences
+        max_model_len: Longest context a sequence can hold
+        z: Deviations above the mean sized for
+
+    Returns:
+        KV tokens to budget for, at most concurrency * max_model_len
+    """
+    mean, std = trace.resident_tokens.clipped_moments(max_model_len)
+    tokens = concurrency * mean + z * math.sqrt(concurrency) * std
+    # A single sequence may always reach the longest request it could hold
+    tokens = max(tokens, min(trace.context_tokens.max, max_model_len))
+    return min(math.ceil(tokens), concurrency * max_model_len)
+
+
+def trace_arrivals(path: Path) -> Iterator[tuple[float, int, int]]:
+    """Stream a request log as simulator arrivals relative to its first request.
+
+    Records without lengths are skipped. Zero lengths are replayed as one
+    token, since every request has a prompt token and samples at least one
+    output token. Timestamps going backwards are held at the latest one
+    seen, so the arrivals stay in order.
+
+    Args:
+        path: Path to a JSONL, CSV or TSV log (optionally .gz)
+
+    Yields:
+        (arrival time in seconds, prompt tokens, output tokens)
+
+    Raises:
+        ValueError: If a record with lengths has no timestamp
+    """
+    start: Optional[float] = None
+    latest = 0.0
+    for item in iter_trace(path):
+        if item is None:
+            continue
+        timestamp, prompt, output = item
+        if timestamp is None:
+            raise ValueError(f"Trace {path} has requests without timestamps to replay")
+        if start is None:
+            start = timestamp
+        latest = max(latest, timestamp - start)
+        yield latest, max(prompt, 1), max(output, 1)
@@ -1,5 +1,7 @@
 """Command and artifact rendering for vLLM."""
 
+from typing import Optional
+
 from vllm_wizard.schemas.outputs import VLLMConfig
 
 
@@ -13,9 +15,17 @@ def render_serve_command(config: VLLMConfig) -> str:
         Complete vllm serve command string
     """
     parts = ["vllm", "serve", config.model]
+    if config.cuda_visible_devices:
+        parts[0] = f"CUDA_VISIBLE_DEVICES={config.cuda_visible_devices} vllm"
 
     # Required parameters
     parts.append(f"--tensor-parallel-size {config.tensor_parallel_size}")
+    if config.pipeline_parallel_size > 1:
+        parts.append(f"--pipeline-parallel-size {config.pipeline_parallel_size}")
+    if config.data_parallel_size > 1:
+        parts.append(f"--data-parallel-size {config.data_parallel_size}")
+    if config.distributed_executor_backend:
+        parts.append(f"--distributed-executor-backend {config.distributed_executor_backend}")
     parts.append(f"--dtype {config.dtype}")
     parts.append(f"--gpu-memory-utilization {config.gpu_memory_utilization}")
     parts.append(f"--max-model-len {config.max_model_len}")
@@ -33,15 +43,24 @@ def render_serve_command(config: VLLMConfig) -> str:
     if config.max_num_batched_tokens:
         parts.append(f"--max-num-batched-tokens {config.max_num_batched_tokens}")
 
+    if config.block_size:
+        parts.append(f"--block-size {config.block_size}")
+
     if config.swap_space:
         parts.append(f"--swap-space {config.swap_space}")
 
     if config.enforce_eager:
         parts.append("--enforce-eager")
 
+    if config.cuda_graph_sizes:
+        parts.append(f"--cuda-graph-sizes {' '.join(map(str, config.cuda_graph_sizes))}")
+
     if config.trust_remote_code:
         parts.append("--trust-remote-code")
 
+    if config.port:
+        parts.append(f"--port {config.port}")
+
     return " \\\n  ".join(parts)
 
 
@@ -57,9 +76,13 @@ def render_docker_command(config: VLLMConfig) -> str:
     # Build vLLM args
     vllm_args = _build_vllm_args(config)
 
+    gpus = "all"
+    if config.cuda_visible_devices:
+        gpus = f"'\"device={config.cuda_visible_devices}\"'"
+
     parts = [
         "docker run",
-        "--gpus all",
+        f"--gpus {gpus}",
         "-p 8000:8000",
         "-v $HF_HOME:/root/.cache/huggingface",
         "--ipc=host",
@@ -81,20 +104,75 @@ def render_docker_compose(config: VLLMConfig) -> str:
     Returns:
         docker-compose.yaml content
     """
+    return "version: '3.8'\n\nservices:\n" + _compose_service(config, "vllm")
+
+
+def render_colocated_compose(configs: list[VLLMConfig]) -> str:
+    """Render docker-compose.yaml with one service per co-located engine.
+
+    Each engine checks at startup that the free memory covers its own
+    gpu_memory_utilization share, and profiles the memory it uses. So that
+    neither sees another engine still loading, every service waits for the
+    previous one to report healthy before it starts.
+
+    Args:
+        configs: Engine configs in start order, each with its own port
+
+    Returns:
+        docker-compose.yaml content
+    """
+    services = []
+    for index, config in enumerate(configs):
+        depends_on = f"vllm-{index}" if index > 0 else None
+        services.append(_compose_service(config, f"vllm-{index + 1}", depends_on, healthcheck=True))
+    return "version: '3.8'\n\nservices:\n" + "\n".join(services)
+
+
+def render_colocated_serve_script(configs: list[VLLMConfig]) -> str:
+    """Render a shell script starting co-located engines one after another.
+
+    Args:
+        configs: Engine configs in start order, each with its own port
+
+    Returns:
+        Script that starts each engine once the previous one is healthy
+    """
+    blocks = []
+    for index, config in enumerate(configs):
+        command = render_serve_command(config)
+        if index < len(configs) - 1:
+            port = config.port or 8000
+            command += (
+                " &\n"
+                f"until curl -sf http://localhost:{port}/health > /dev/null; do sleep 5; done"
+            )
+        blocks.append(command)
+    return "\n\n".join(blocks)
+
+
+def _compose_service(
+    config: VLLMConfig,
+    name: str,
+    depends_on: Optional[str] = None,
+    healthcheck: bool = False,
+) -> str:
+    """Render one docker-compose service block for a vLLM engine."""
     # Build command arguments
     vllm_args = _build_vllm_args(config)
     command_args = " ".join(["--model", config.model] + vllm_args)
 
-    # Determine GPU count for reservation
-    gpu_count = config.tensor_parallel_size
+    # Reserve the pinned GPUs, else any GPUs of the needed count
+    if config.cuda_visible_devices:
+        device_ids = ", ".join(f'"{i}"' for i in config.cuda_visible_devices.split(","))
+        gpu_reservation = f"device_ids: [{device_ids}]"
+    else:
+        gpu_reservation = f"count: {_local_gpu_count(config)}"
+    port = config.port or 8000
 
-    compose = f"""version: '3.8'
-
-services:
-  vllm:
+    service = f"""  {name}:
     image: vllm/vllm-openai:latest
     ports:
-      - "8000:8000"
+      - "{port}:{port}"
     volumes:
       - ${{HF_HOME:-~/.cache/huggingface}}:/root/.cache/huggingface
     environment:
@@ -105,12 +183,25 @@ services:
         reservations:
           devices:
             - driver: nvidia
-              count: {gpu_count}
+              {gpu_reservation}
               capabilities: [gpu]
-    command: {command_args}
 """
-
-    return compose
+    if healthcheck:
+        probe = f"import urllib.request; urllib.request.urlopen('http://localhost:{port}/health')"
+        service += f"""    healthcheck:
+      test: ["CMD", "python3", "-c", "{probe}"]
+      interval: 10s
+      timeout: 5s
+      retries: 3
+      start_period: 600s
+"""
+    if depends_on:
+        service += f"""    depends_on:
+      {depends_on}:
+        condition: service_healthy
+"""
+    service += f"    command: {command_args}\n"
+    return service
 
 
 def render_k8s_values(config: VLLMConfig) -> str:
@@ -140,9 +231,9 @@ args:
 
 resources:
   limits:
-    nvidia.com/gpu: {config.tensor_parallel_size}
+    nvidia.com/gpu: {_local_gpu_count(config)}
   requests:
-    nvidia.com/gpu: {config.tensor_parallel_size}
+    nvidia.com/gpu: {_local_gpu_count(config)}
 
 service:
   type: ClusterIP
@@ -155,6 +246,20 @@ nodeSelector:
     return k8s
 
 
+def _local_gpu_count(config: VLLMConfig) -> int:
+    """GPUs the serving container needs on its own node.
+
+    Single-node deployments hold every TP x PP rank of every data-parallel
+    replica. With the Ray backend the ranks span nodes, and each node hosts
+    one tensor-parallel group.
+    """
+    if config.distributed_executor_backend == "ray":
+        return config.tensor_parallel_size
+    return (
+        config.tensor_parallel_size * config.pipeline_parallel_size * config.data_parallel_size
+    )
+
+
 def _build_vllm_args(config: VLLMConfig) -> list[str]:
     """Build list of vLLM CLI arguments from config.
 
@@ -171,6 +276,13 @@ def _build_vllm_args(config: VLLMConfig) -> list[str]:
         f"--max-model-len {config.max_model_len}",
     ]
 
+    if config.pipeline_parallel_size > 1:
+        args.append(f"--pipeline-parallel-size {config.pipeline_parallel_size}")
+    if config.data_parallel_size > 1:
+        args.append(f"--data-parallel-size {config.data_parallel_size}")
+    if config.distributed_executor_backend:
+        args.append(f"--distributed-executor-backend {config.distributed_executor_backend}")
+
     if config.kv_cache_dtype:
         args.append(f"--kv-cache-dtype {config.kv_cache_dtype}")
 
@@ -183,13 +295,22 @@ def _build_vllm_args(config: VLLMConfig) -> list[str]:
     if config.max_num_batched_tokens:
         args.append(f"--max-num-batched-tokens {config.max_num_batched_tokens}")
 
+    if config.block_size:
+        args.append(f"--block-size {config.block_size}")
+
     if config.swap_space:
         args.append(f"--swap-space {config.swap_space}")
 
     if config.enforce_eager:
         args.append("--enforce-eager")
 
+    if config.cuda_graph_sizes:
+        args.append(f"--cuda-graph-sizes {' '.join(map(str, config.cuda_graph_sizes))}")
+
     if config.trust_remote_code:
         args.append("--trust-remote-code")
 
+    if config.port:
+        args.append(f"--port {config.port}")
+
     return args
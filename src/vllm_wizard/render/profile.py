@@ -87,15 +87,22 @@ def profile_to_request(profile: Profile) -> PlanRequest:
     hardware_input = HardwareInput(
         gpu=profile.hardware.gpu_name,
         gpus=profile.hardware.gpus,
+        nodes=profile.hardware.nodes,
         vram_gb=profile.hardware.vram_gb,
         interconnect=profile.hardware.interconnect,
+        inter_node_gbps=profile.hardware.inter_node_gbps,
         tensor_parallel_size=profile.hardware.tp_size,
+        pipeline_parallel_size=profile.hardware.pp_size,
+        plan_against=profile.hardware.plan_against,
     )
 
     workload_input = WorkloadInput(
         prompt_tokens=profile.workload.prompt_tokens,
         gen_tokens=profile.workload.gen_tokens,
         concurrency=profile.workload.concurrency,
+        target_latency_ms=profile.workload.target_latency_ms,
+        target_ttft_ms=profile.workload.target_ttft_ms,
+        target_qps=profile.workload.target_qps,
         streaming=profile.workload.streaming,
         batching_mode=profile.workload.mode,
     )
@@ -105,6 +112,10 @@ def profile_to_request(profile: Profile) -> PlanRequest:
         overhead_gb=profile.policy.overhead_gb,
         fragmentation_factor=profile.policy.fragmentation_factor,
         headroom_gb=profile.policy.headroom_gb,
+        block_size=profile.policy.block_size,
+        max_num_seqs=profile.policy.max_num_seqs,
+        max_num_batched_tokens=profile.policy.max_num_batched_tokens,
+        enforce_eager=profile.policy.enforce_eager,
     )
 
     return PlanRequest(
@@ -112,6 +123,7 @@ def profile_to_request(profile: Profile) -> PlanRequest:
         hardware=hardware_input,
         workload=workload_input,
         policy=policy_input,
+        colocate=profile.colocate,
     )
 
 
@@ -138,15 +150,22 @@ def request_to_profile(request: PlanRequest, emit: Optional[list[str]] = None) -
     profile_hardware = ProfileHardware(
         gpu_name=request.hardware.gpu,
         gpus=request.hardware.gpus,
+        nodes=request.hardware.nodes,
         vram_gb=request.hardware.vram_gb,
         interconnect=request.hardware.interconnect,
+        inter_node_gbps=request.hardware.inter_node_gbps,
         tp_size=request.hardware.tensor_parallel_size,
+        pp_size=request.hardware.pipeline_parallel_size,
+        plan_against=request.hardware.plan_against,
     )
 
     profile_workload = ProfileWorkload(
         prompt_tokens=request.workload.prompt_tokens,
         gen_tokens=request.workload.gen_tokens,
         concurrency=request.workload.concurrency,
+        target_latency_ms=request.workload.target_latency_ms,
+        target_ttft_ms=request.workload.target_ttft_ms,
+        target_qps=request.workload.target_qps,
         streaming=request.workload.streaming,
         mode=request.workload.batching_mode,
     )
@@ -156,6 +175,10 @@ def request_to_profile(request: PlanRequest, emit: Optional[list[str]] = None) -
         overhead_gb=request.policy.overhead_gb,
         fragmentation_factor=request.policy.fragmentation_factor,
         headroom_gb=request.policy.headroom_gb,
+        block_size=request.policy.block_size,
+        max_num_seqs=request.policy.max_num_seqs,
+        max_num_batched_tokens=request.policy.max_num_batched_tokens,
+        enforce_eager=request.policy.enforce_eager,
     )
 
     profile_outputs = ProfileOutputs(
@@ -168,5 +191,6 @@ def request_to_profile(request: PlanRequest, emit: Optional[list[str]] = None) -
         hardware=profile_hardware,
         workload=profile_workload,
         policy=profile_policy,
+        colocate=request.colocate,
         outputs=profile_outputs,
     )
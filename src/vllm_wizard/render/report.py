@@ -1,14 +1,23 @@
 """Console report rendering with Rich."""
 
 import json
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from vllm_wizard.schemas.outputs import GPUInfo, OOMRisk, PlanResponse
+from vllm_wizard.schemas.fleet import FleetPlan
+from vllm_wizard.schemas.mig import MIGLayout
+from vllm_wizard.schemas.outputs import GPUInfo, OOMRisk, PlanResponse, SimulationReport
+from vllm_wizard.schemas.trace import WorkloadTrace
+
+if TYPE_CHECKING:
+    from vllm_wizard.hardware.detect import GPUTopology
+    from vllm_wizard.models.metadata import ModelMetadata
+    from vllm_wizard.planning.search import SearchResult
+    from vllm_wizard.planning.sweep import SweepResult
 
 
 def render_console_report(response: PlanResponse, console: Optional[Console] = None) -> None:
@@ -36,6 +45,18 @@ def render_console_report(response: PlanResponse, console: Optional[Console] = N
     # Performance estimates
     _render_performance(console, response)
 
+    # SLO search result
+    if response.slo is not None:
+        _render_slo(console, response)
+
+    # Replica layout ranking
+    if response.replicas is not None:
+        _render_replicas(console, response)
+
+    # Engines sharing the GPUs
+    if response.colocation is not None:
+        _render_colocation(console, response)
+
     # Serve command
     _render_command(console, response)
 
@@ -75,7 +96,17 @@ def _render_vram_table(console: Console, response: PlanResponse) -> None:
     """Render VRAM breakdown table."""
     f = response.feasibility
 
-    table = Table(title="VRAM Breakdown", show_header=True, header_style="bold")
+    title = "VRAM Breakdown"
+    if f.pipeline_parallel_size > 1:
+        ranks = f.tensor_parallel_size * f.pipeline_parallel_size
+        title += f" (per GPU, worst-loaded of {ranks} ranks"
+        if f.stage_layers:
+            title += f", stages of {'/'.join(map(str, f.stage_layers))} layers"
+        title += ")"
+    elif f.tensor_parallel_size > 1:
+        title += f" (per GPU, worst-loaded of {f.tensor_parallel_size} TP ranks)"
+
+    table = Table(title=title, show_header=True, header_style="bold")
     table.add_column("Component", style="cyan")
     table.add_column("Size (GiB)", justify="right")
     table.add_column("% of Allocatable", justify="right")
@@ -87,7 +118,7 @@ def _render_vram_table(console: Console, response: PlanResponse) -> None:
             return f"{(val / allocatable) * 100:.1f}%"
         return "-"
 
-    table.add_row("Total VRAM", f"{f.vram_total_gb:.2f}", "-")
+    table.add_row("GPU VRAM", f"{f.vram_total_gb:.2f}", "-")
     table.add_row(
         "Target Allocation",
         f"{f.vram_target_alloc_gb:.2f}",
@@ -97,6 +128,8 @@ def _render_vram_table(console: Console, response: PlanResponse) -> None:
     table.add_row("Model Weights", f"{f.weights_gb:.2f}", pct(f.weights_gb))
     table.add_row("KV Cache", f"{f.kv_cache_gb:.2f}", pct(f.kv_cache_gb))
     table.add_row("Overhead", f"{f.overhead_gb:.2f}", pct(f.overhead_gb))
+    table.add_row("Activations (profile run)", f"{f.activation_gb:.2f}", pct(f.activation_gb))
+    table.add_row("CUDA Graphs", f"{f.cuda_graph_gb:.2f}", pct(f.cuda_graph_gb))
     table.add_row("", "", "")
     table.add_row(
         "[bold]Headroom[/bold]",
@@ -110,6 +143,23 @@ def _render_vram_table(console: Console, response: PlanResponse) -> None:
     # Max calculations
     console.print(f"  Max concurrency at target context: {f.max_concurrency_at_context}")
     console.print(f"  Max context at target concurrency: {f.max_context_at_concurrency:,}")
+    if f.num_gpu_blocks:
+        console.print(
+            f"  KV cache blocks: {f.num_gpu_blocks:,} x {f.block_size} tokens "
+            f"({f.blocks_per_seq:,} per sequence, "
+            f"max concurrency {f.max_concurrency_by_blocks:,})"
+        )
+        console.print(f"  Last-block rounding waste: {f.kv_block_waste_gb:.3f} GiB")
+    if f.kv_heads_per_rank:
+        console.print(
+            f"  KV per token per rank: {f.kv_bytes_per_token / 1024:.1f} KiB "
+            f"({f.kv_heads_per_rank} KV heads per rank)"
+        )
+    if f.kv_trace_tokens:
+        console.print(
+            f"  KV cache sized from trace: {f.kv_trace_tokens:,} tokens "
+            "(99th percentile held by the concurrent requests)"
+        )
     console.print()
 
 
@@ -132,6 +182,30 @@ def _render_recommendations(console: Console, response: PlanResponse) -> None:
         str(config.tensor_parallel_size),
         explanations.get("tensor_parallel_size", ""),
     )
+    if config.data_parallel_size > 1:
+        table.add_row(
+            "data_parallel_size",
+            str(config.data_parallel_size),
+            explanations.get("data_parallel_size", ""),
+        )
+    if config.pipeline_parallel_size > 1:
+        table.add_row(
+            "pipeline_parallel_size",
+            str(config.pipeline_parallel_size),
+            explanations.get("pipeline_parallel_size", ""),
+        )
+    if config.cuda_visible_devices:
+        table.add_row(
+            "CUDA_VISIBLE_DEVICES",
+            config.cuda_visible_devices,
+            explanations.get("cuda_visible_devices", ""),
+        )
+    if config.distributed_executor_backend:
+        table.add_row(
+            "distributed_executor_backend",
+            config.distributed_executor_backend,
+            explanations.get("distributed_executor_backend", ""),
+        )
     table.add_row("dtype", config.dtype, explanations.get("dtype", ""))
     table.add_row(
         "gpu_memory_utilization",
@@ -172,6 +246,15 @@ def _render_recommendations(console: Console, response: PlanResponse) -> None:
             explanations.get("max_num_batched_tokens", ""),
         )
 
+    if config.enforce_eager:
+        table.add_row("enforce_eager", "true", explanations.get("cuda_graphs", ""))
+    elif config.cuda_graph_sizes:
+        table.add_row(
+            "cuda_graph_sizes",
+            " ".join(map(str, config.cuda_graph_sizes)),
+            explanations.get("cuda_graphs", ""),
+        )
+
     console.print(table)
     console.print()
 
@@ -197,6 +280,29 @@ def _render_performance(console: Console, response: PlanResponse) -> None:
             f"  TTFT: {perf.ttft_ms_range[0]:.0f} - {perf.ttft_ms_range[1]:.0f} ms"
         )
 
+    if perf.allreduce_ms_per_step:
+        console.print(f"  TP all-reduces: {perf.allreduce_ms_per_step:.2f} ms per decode step")
+
+    if perf.throughput_curve:
+        console.print()
+        table = Table(title="Decode Throughput by Batch Size", show_header=True, header_style="bold")
+        table.add_column("Batch", justify="right", style="cyan")
+        table.add_column("Per-User tok/s", justify="right")
+        table.add_column("Aggregate tok/s", justify="right")
+        table.add_column("ITL (ms)", justify="right")
+        table.add_column("Bound", justify="center")
+
+        for point in perf.throughput_curve:
+            table.add_row(
+                str(point.batch_size),
+                f"{point.per_user_toks_per_s:,.0f}",
+                f"{point.aggregate_toks_per_s:,.0f}",
+                f"{point.itl_ms:.1f}",
+                "memory" if point.memory_bound else "compute",
+            )
+
+        console.print(table)
+
     console.print()
     console.print("[dim]Assumptions:[/dim]")
     for assumption in perf.assumptions[:3]:  # Show first 3
@@ -204,6 +310,135 @@ def _render_performance(console: Console, response: PlanResponse) -> None:
     console.print()
 
 
+def _render_slo(console: Console, response: PlanResponse) -> None:
+    """Render the SLO search result and margins."""
+    slo = response.slo
+    assert slo is not None
+
+    status = "[green]met[/green]" if slo.meets_slo else "[red]missed[/red]"
+    console.print(f"[bold]Latency SLO[/bold] ({status})")
+
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Target (ms)", justify="right")
+    table.add_column("Predicted (ms)", justify="right")
+    table.add_column("Margin (ms)", justify="right")
+
+    for label, target, predicted, margin in (
+        ("TTFT", slo.target_ttft_ms, slo.ttft_ms, slo.ttft_margin_ms),
+        ("TPOT", slo.target_tpot_ms, slo.tpot_ms, slo.tpot_margin_ms),
+    ):
+        table.add_row(
+            label,
+            f"{target:g}" if target is not None else "-",
+            f"{predicted:.1f}",
+            f"{margin:+.1f}" if margin is not None else "-",
+        )
+
+    console.print(table)
+    console.print(
+        f"  Throughput: {slo.output_toks_per_s:.0f} output tokens/s at batch {slo.batch_size}"
+    )
+    console.print(
+        f"  [dim]{slo.candidates_meeting_slo} of {slo.candidates_evaluated} configurations "
+        "meet the targets; TTFT excludes queueing delay.[/dim]"
+    )
+    console.print()
+
+
+def _render_replicas(console: Console, response: PlanResponse) -> None:
+    """Render the ranked TP x DP layouts."""
+    replicas = response.replicas
+    assert replicas is not None
+
+    title = f"Replica Layouts ({replicas.num_gpus} GPUs"
+    if replicas.target_qps is not None:
+        title += f", target {replicas.target_qps:g} req/s"
+    title += ")"
+
+    table = Table(title=title, show_header=True, header_style="bold")
+    table.add_column("Layout", style="cyan")
+    table.add_column("Max req/s", justify="right")
+    table.add_column("Output tok/s", justify="right")
+    if replicas.target_qps is not None:
+        table.add_column("Replicas Needed", justify="right")
+        table.add_column("Load", justify="right")
+    table.add_column("TTFT (ms)", justify="right")
+    table.add_column("TPOT (ms)", justify="right")
+
+    for layout in replicas.layouts:
+        name = f"TP{layout.tensor_parallel_size}"
+        if layout.pipeline_parallel_size > 1:
+            name += f" PP{layout.pipeline_parallel_size}"
+        name += f" x {layout.data_parallel_size}"
+        if not layout.fits:
+            row = [name, "-", "-"]
+            if replicas.target_qps is not None:
+                row += ["-", "-"]
+            table.add_row(*row, "-", "-", style="dim")
+            continue
+
+        row = [name, f"{layout.aggregate_qps:.2f}", f"{layout.aggregate_output_toks_per_s:,.0f}"]
+        if replicas.target_qps is not None:
+            color = "green" if layout.meets_target else "red"
+            row += [
+                f"[{color}]{layout.replicas_needed}[/{color}]",
+                f"[{color}]{layout.utilization:.0%}[/{color}]",
+            ]
+        table.add_row(*row, f"{layout.ttft_ms:.0f}", f"{layout.tpot_ms:.1f}")
+
+    console.print(table)
+    latency_at = "the target rate" if replicas.target_qps is not None else "saturation"
+    console.print(
+        f"  [dim]Latencies at {latency_at}, excluding queueing delay; "
+        "the first layout is recommended.[/dim]"
+    )
+    console.print()
+
+
+def _render_colocation(console: Console, response: PlanResponse) -> None:
+    """Render the memory split between co-located engines."""
+    colocation = response.colocation
+    assert colocation is not None
+
+    table = Table(
+        title=f"Co-located Engines ({colocation.total_memory_fraction:.1%} of each GPU)",
+        show_header=True,
+        header_style="bold",
+    )
+    table.add_column("Engine", style="cyan")
+    table.add_column("Model")
+    table.add_column("Util Flag", justify="right")
+    table.add_column("Free at Start", justify="right")
+    table.add_column("Port", justify="right")
+    table.add_column("KV Cache (GiB)", justify="right")
+    table.add_column("Headroom (GiB)", justify="right")
+    table.add_column("Fits")
+
+    held = 0.0
+    for index, engine in enumerate(colocation.engines):
+        feasibility = engine.feasibility
+        fits = "[green]yes[/green]" if feasibility.fits else "[red]no[/red]"
+        table.add_row(
+            str(index + 1),
+            engine.model,
+            f"{engine.gpu_memory_utilization:.3f}",
+            f"{1.0 - held:.3f}",
+            str(engine.port),
+            f"{feasibility.kv_cache_gb:.2f}",
+            f"{feasibility.headroom_gb:.2f}",
+            fits,
+        )
+        held += engine.memory_fraction
+
+    console.print(table)
+    console.print(
+        "  [dim]Start engines in order, each once the previous one is healthy: each "
+        "needs its flag's share of the GPU free at startup.[/dim]"
+    )
+    console.print()
+
+
 def _render_command(console: Console, response: PlanResponse) -> None:
     """Render the serve command."""
     console.print("[bold]Recommended Command[/bold]")
@@ -238,12 +473,17 @@ def render_json(response: PlanResponse, indent: int = 2) -> str:
     return response.model_dump_json(indent=indent)
 
 
-def render_gpu_list(gpus: list[GPUInfo], console: Optional[Console] = None) -> None:
+def render_gpu_list(
+    gpus: list[GPUInfo],
+    console: Optional[Console] = None,
+    topology: Optional["GPUTopology"] = None,
+) -> None:
     """Render detected GPU list.
 
     Args:
         gpus: List of detected GPUs
         console: Optional console instance
+        topology: Links between the GPUs, shown as a matrix if given
     """
     if console is None:
         console = Console()
@@ -256,16 +496,434 @@ def render_gpu_list(gpus: list[GPUInfo], console: Optional[Console] = None) -> N
     table.add_column("#", style="dim")
     table.add_column("Name", style="cyan")
     table.add_column("VRAM (GiB)", justify="right")
+    table.add_column("Free (GiB)", justify="right")
     table.add_column("Driver", justify="center")
     table.add_column("CUDA", justify="center")
 
     for i, gpu in enumerate(gpus):
+        free_gib = gpu.vram_free_gib
         table.add_row(
             str(i),
             gpu.name,
             f"{gpu.vram_gib:.1f}",
+            f"{free_gib:.1f}" if free_gib is not None else "-",
             gpu.driver_version or "-",
             gpu.cuda_version or "-",
         )
 
     console.print(table)
+
+    processes = [(i, process) for i, gpu in enumerate(gpus) for process in gpu.processes]
+    if processes:
+        console.print()
+        console.print("[bold]Processes:[/bold]")
+        for i, process in processes:
+            console.print(
+                f"  GPU {i}: pid {process.pid} {process.name} "
+                f"({process.used_mib / 1024:.1f} GiB)"
+            )
+
+    if topology is not None and topology.gpu_count > 1:
+        console.print()
+        matrix = Table(title="GPU Topology", show_header=True, header_style="bold")
+        matrix.add_column("", style="dim")
+        for i in range(topology.gpu_count):
+            matrix.add_column(f"GPU{i}", justify="center")
+        matrix.add_column("NUMA", justify="center")
+        for i, links in enumerate(topology.links):
+            numa = topology.numa_nodes([i])
+            matrix.add_row(f"GPU{i}", *links, str(numa[0]) if numa else "-")
+        console.print(matrix)
+        console.print(
+            "[dim]NV# = NVLink (# links), PIX/PXB = PCIe switch, PHB/NODE = PCIe via "
+            "the CPU, SYS = across CPU sockets[/dim]"
+        )
+
+
+def render_registry_list(
+    entries: list[tuple[str, "ModelMetadata"]], console: Optional[Console] = None
+) -> None:
+    """Render the models in the registry.
+
+    Args:
+        entries: (registered name, metadata) pairs
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    if not entries:
+        console.print("[yellow]No models registered[/yellow]")
+        return
+
+    table = Table(title="Registered Models", show_header=True, header_style="bold")
+    table.add_column("Name", style="cyan")
+    table.add_column("Params (B)", justify="right")
+    table.add_column("Layers", justify="right")
+    table.add_column("KV Heads", justify="right")
+    table.add_column("Head Dim", justify="right")
+    table.add_column("Max Pos", justify="right")
+    table.add_column("Experts", justify="right")
+
+    for name, metadata in entries:
+        experts = (
+            f"{metadata.num_experts_per_tok or '?'}/{metadata.num_experts}"
+            if metadata.num_experts
+            else "-"
+        )
+        table.add_row(
+            name,
+            f"{metadata.params_billions:.2f}" if metadata.params_billions else "-",
+            str(metadata.num_hidden_layers),
+            str(metadata.num_key_value_heads),
+            str(metadata.head_dim),
+            str(metadata.max_position_embeddings),
+            experts,
+        )
+
+    console.print(table)
+
+
+def render_sweep_report(result: "SweepResult", console: Optional[Console] = None) -> None:
+    """Render the max-concurrency frontier of a sweep.
+
+    Args:
+        result: Sweep result to render
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    console.print()
+    console.print(
+        Panel(
+            f"vLLM Sizing Sweep - {result.num_points:,} grid points",
+            style="bold",
+        )
+    )
+    console.print(
+        f"  GPU VRAM: {result.vram_total_gb:.2f} GiB, "
+        f"Target Allocation: {result.vram_target_alloc_gb:.2f} GiB"
+    )
+    console.print()
+
+    num_concurrencies = len(result.concurrencies)
+
+    for qi, quant in enumerate(result.quantizations):
+        for ki, kv_dtype in enumerate(result.kv_cache_dtypes):
+            table = Table(
+                title=f"quantization={quant.value}, kv_cache_dtype={kv_dtype.value}",
+                show_header=True,
+                header_style="bold",
+            )
+            table.add_column("Context", justify="right", style="cyan")
+            table.add_column("Max Concurrency", justify="right")
+            table.add_column("Feasible Concurrencies", justify="right")
+
+            for li, context_len in enumerate(result.context_lens):
+                feasible = int(result.fits[qi, ki, li].sum())
+                max_conc = int(result.max_concurrency_at_context[qi, ki, li])
+                style = "green" if feasible else "red"
+                table.add_row(
+                    f"{int(context_len):,}",
+                    f"{max_conc:,}",
+                    f"[{style}]{feasible}/{num_concurrencies}[/{style}]",
+                )
+
+            console.print(table)
+            console.print()
+
+
+def render_search_report(
+    result: "SearchResult", console: Optional[Console] = None, limit: int = 20
+) -> None:
+    """Render the Pareto frontier of a configuration search.
+
+    Args:
+        result: Search result to render
+        console: Optional console instance
+        limit: Most frontier points to show, highest throughput first
+    """
+    if console is None:
+        console = Console()
+
+    console.print()
+    console.print(
+        Panel(
+            f"vLLM Configuration Search - {result.num_combinations:,} combinations",
+            style="bold",
+        )
+    )
+    console.print(
+        f"  Evaluated: {result.num_evaluated:,} (pruned {result.num_pruned:,}), "
+        f"feasible: {result.num_feasible:,}, Pareto frontier: {len(result.frontier):,}"
+    )
+    console.print(f"  GPUs: {result.num_gpus} x {result.vram_total_bytes / 1024**3:.2f} GiB")
+    if result.skipped_context_lens:
+        skipped = ", ".join(f"{c:,}" for c in result.skipped_context_lens)
+        console.print(f"  [yellow]Skipped contexts beyond the model's maximum: {skipped}[/yellow]")
+    console.print()
+
+    if not result.frontier:
+        console.print("[red]No configuration fits.[/red]")
+        console.print()
+        return
+
+    table = Table(
+        title="Pareto Frontier (headroom vs. throughput vs. TTFT vs. context)",
+        show_header=True,
+        header_style="bold",
+    )
+    table.add_column("TP x DP", style="cyan")
+    table.add_column("Quant")
+    table.add_column("KV Cache")
+    table.add_column("Context", justify="right")
+    table.add_column("Max Seqs", justify="right")
+    table.add_column("Headroom (GiB)", justify="right")
+    table.add_column("Decode tok/s", justify="right")
+    table.add_column("TTFT (ms)", justify="right")
+
+    for point in result.frontier[:limit]:
+        table.add_row(
+            f"{point.tensor_parallel_size} x {point.data_parallel_size}",
+            point.quantization.value,
+            point.kv_cache_dtype.value,
+            f"{point.max_model_len:,}",
+            str(point.max_num_seqs),
+            f"{point.headroom_gb:.2f}",
+            f"{point.decode_toks_per_s:,.0f}",
+            f"{point.ttft_ms:.1f}",
+        )
+
+    console.print(table)
+    if len(result.frontier) > limit:
+        console.print(
+            f"  [dim]Showing {limit} of {len(result.frontier):,} frontier points; "
+            "use --limit or --json for more.[/dim]"
+        )
+    console.print()
+
+
+def render_fleet_report(plan: FleetPlan, console: Optional[Console] = None) -> None:
+    """Render the placement of fleet entries onto nodes.
+
+    Args:
+        plan: Fleet placement to render
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    num_entries = len(plan.placements) + len(plan.unplaced)
+    console.print()
+    console.print(Panel(f"vLLM Fleet Placement - {num_entries:,} entries", style="bold"))
+    console.print(
+        f"  GPUs used: {plan.gpus_used:,} of {plan.gpus_total:,} "
+        f"on {plan.nodes_used:,} node(s)"
+    )
+    if plan.kept:
+        moved = len(plan.placements) - len(plan.kept)
+        console.print(f"  Kept from previous plan: {len(plan.kept):,}, placed: {moved:,}")
+    console.print()
+
+    if plan.placements:
+        table = Table(title="Placements", show_header=True, header_style="bold")
+        table.add_column("Entry", style="cyan")
+        table.add_column("Node")
+        table.add_column("GPU")
+        table.add_column("GPU Indices")
+        table.add_column("TP", justify="right")
+        table.add_column("Headroom (GB)", justify="right")
+
+        for placement in plan.placements:
+            table.add_row(
+                placement.entry,
+                placement.node,
+                placement.gpu,
+                ",".join(map(str, placement.gpu_indices)),
+                str(placement.tensor_parallel_size),
+                f"{placement.headroom_gb:.2f}",
+            )
+
+        console.print(table)
+        console.print()
+
+    if plan.unplaced:
+        console.print("[red]Unplaced:[/red]")
+        for unplaced in plan.unplaced:
+            console.print(f"  [red]- {unplaced.entry}: {unplaced.reason}[/red]")
+        console.print()
+
+
+def render_mig_report(layout: MIGLayout, console: Optional[Console] = None) -> None:
+    """Render a MIG slice layout and the entry served on each slice.
+
+    Args:
+        layout: MIG layout to render
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    console.print()
+    console.print(Panel(f"vLLM MIG Layout - {layout.gpu}", style="bold"))
+    console.print(
+        f"  Slices used: {layout.compute_slices_used}/7 compute, "
+        f"{layout.memory_slices_used}/8 memory"
+    )
+    console.print(f"  Aggregate decode: {layout.total_aggregate_toks_per_s:,.1f} tok/s")
+    console.print()
+
+    if layout.slices:
+        table = Table(title="Instances", show_header=True, header_style="bold")
+        table.add_column("Entry", style="cyan")
+        table.add_column("Profile")
+        table.add_column("VRAM (GiB)", justify="right")
+        table.add_column("Aggregate (tok/s)", justify="right")
+        table.add_column("Headroom (GB)", justify="right")
+
+        for mig_slice in layout.slices:
+            table.add_row(
+                mig_slice.entry,
+                mig_slice.profile,
+                f"{mig_slice.vram_gb:.2f}",
+                f"{mig_slice.aggregate_toks_per_s:,.1f}",
+                f"{mig_slice.headroom_gb:.2f}",
+            )
+
+        console.print(table)
+        console.print()
+        console.print("[bold]Create the instances:[/bold]")
+        console.print(f"  {layout.setup_command}")
+        console.print(
+            "  Pin each engine to its instance with CUDA_VISIBLE_DEVICES=<MIG UUID> "
+            "from nvidia-smi -L."
+        )
+        console.print()
+
+    if layout.unplaced:
+        console.print("[red]Unplaced:[/red]")
+        for unplaced in layout.unplaced:
+            console.print(f"  [red]- {unplaced.entry}: {unplaced.reason}[/red]")
+        console.print()
+
+
+def render_trace_report(trace: WorkloadTrace, console: Optional[Console] = None) -> None:
+    """Render the length distributions and arrival rate of a request log.
+
+    Args:
+        trace: Workload trace to render
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    console.print()
+    console.print(Panel(f"Workload Trace - {trace.source or 'request log'}", style="bold"))
+    console.print(f"  Requests: {trace.requests:,} ({trace.skipped:,} skipped)")
+    if trace.duration_s is not None:
+        console.print(f"  Duration: {trace.duration_s:,.1f} s")
+    if trace.request_rate is not None:
+        console.print(f"  Arrival rate: {trace.request_rate:,.3f} req/s")
+    console.print()
+
+    table = Table(title="Token Lengths", show_header=True, header_style="bold")
+    table.add_column("Tokens", style="cyan")
+    for column in ("Mean", "p50", "p90", "p99", "Max"):
+        table.add_column(column, justify="right")
+
+    for label, stats in (
+        ("Prompt", trace.prompt_tokens),
+        ("Output", trace.gen_tokens),
+        ("Prompt + output", trace.context_tokens),
+        ("Resident while decoding", trace.resident_tokens),
+    ):
+        table.add_row(
+            label,
+            f"{stats.mean:,.0f}",
+            f"{stats.p50:,}",
+            f"{stats.p90:,}",
+            f"{stats.p99:,}",
+            f"{stats.max:,}",
+        )
+
+    console.print(table)
+    console.print()
+    console.print("  Percentiles are upper bounds of ~4% wide histogram buckets.")
+    console.print()
+
+
+def render_simulation_report(report: SimulationReport, console: Optional[Console] = None) -> None:
+    """Render latency percentiles and throughput of a simulation run.
+
+    Args:
+        report: Simulation report to render
+        console: Optional console instance
+    """
+    if console is None:
+        console = Console()
+
+    console.print()
+    console.print(
+        Panel(
+            f"vLLM Serving Simulation - {report.num_requests:,} requests",
+            style="bold",
+        )
+    )
+    console.print(
+        f"  Scheduler: max_num_seqs={report.max_num_seqs}, "
+        f"max_num_batched_tokens={report.max_num_batched_tokens:,}"
+    )
+    console.print(f"  Chunked Prefill: {'on' if report.chunked_prefill else 'off'}")
+    console.print(
+        f"  KV Cache: {report.num_gpu_blocks:,} blocks x {report.block_size} tokens"
+    )
+    console.print()
+
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Latency (ms)", style="cyan")
+    table.add_column("Mean", justify="right")
+    table.add_column("P50", justify="right")
+    table.add_column("P90", justify="right")
+    table.add_column("P99", justify="right")
+
+    for label, stats in [
+        ("Queue Delay", report.queue_delay_ms),
+        ("TTFT", report.ttft_ms),
+        ("TPOT", report.tpot_ms),
+        ("End-to-End", report.e2e_latency_ms),
+    ]:
+        table.add_row(
+            label,
+            f"{stats.mean:,.1f}",
+            f"{stats.p50:,.1f}",
+            f"{stats.p90:,.1f}",
+            f"{stats.p99:,.1f}",
+        )
+
+    console.print(table)
+    console.print()
+
+    console.print("[bold]Throughput[/bold]")
+    console.print(
+        f"  Completed: {report.completed:,} in {report.duration_s:,.1f} s "
+        f"({report.request_throughput:.2f} req/s)"
+    )
+    console.print(f"  Output: {report.output_toks_per_s:,.0f} tokens/s")
+    console.print(f"  Mean Batch Size: {report.mean_batch_size:.1f}")
+
+    preempt_style = "yellow" if report.preemptions else "green"
+    console.print(
+        f"  Preemptions: [{preempt_style}]{report.preemptions:,}[/{preempt_style}] "
+        f"({report.preemption_rate:.3f} per request)"
+    )
+    if report.rejected:
+        console.print(
+            f"  [red]Rejected: {report.rejected:,} requests never fit in the KV cache[/red]"
+        )
+
+    console.print()
+    console.print("[dim]Assumptions:[/dim]")
+    for assumption in report.assumptions:
+        console.print(f"  [dim]- {assumption}[/dim]")
+    console.print()
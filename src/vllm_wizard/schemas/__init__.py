@@ -1,27 +1,48 @@
 """Pydantic schemas for vLLM Wizard."""
 
+from vllm_wizard.schemas.fleet import (
+    FleetEntry,
+    FleetInventory,
+    FleetNode,
+    FleetPlacement,
+    FleetPlan,
+    FleetUnplaced,
+)
 from vllm_wizard.schemas.inputs import (
     BatchingMode,
     DType,
+    EngineInput,
     HardwareInput,
     Interconnect,
     KVCacheDType,
     ModelInput,
+    PlanAgainst,
     PlanRequest,
     PolicyInput,
     Quantization,
     WorkloadInput,
 )
+from vllm_wizard.schemas.mig import MIGLayout, MIGSlice
 from vllm_wizard.schemas.outputs import (
     Artifacts,
+    ColocatedEngine,
+    ColocationReport,
     FeasibilityReport,
     GPUInfo,
+    GPUProcess,
+    LatencyStats,
     OOMRisk,
     PerfEstimate,
     PlanResponse,
+    ReplicaLayout,
+    ReplicaReport,
+    SimulationReport,
+    SLOReport,
+    ThroughputPoint,
     VLLMConfig,
 )
 from vllm_wizard.schemas.profile import Profile
+from vllm_wizard.schemas.trace import LengthStats, WorkloadTrace
 
 __all__ = [
     # Inputs
@@ -29,6 +50,7 @@ __all__ = [
     "HardwareInput",
     "WorkloadInput",
     "PolicyInput",
+    "EngineInput",
     "PlanRequest",
     # Enums
     "DType",
@@ -36,14 +58,37 @@ __all__ = [
     "KVCacheDType",
     "Interconnect",
     "BatchingMode",
+    "PlanAgainst",
     "OOMRisk",
     # Outputs
     "GPUInfo",
+    "GPUProcess",
     "FeasibilityReport",
     "VLLMConfig",
     "PerfEstimate",
+    "ThroughputPoint",
     "Artifacts",
     "PlanResponse",
+    "LatencyStats",
+    "SimulationReport",
+    "SLOReport",
+    "ReplicaLayout",
+    "ReplicaReport",
+    "ColocatedEngine",
+    "ColocationReport",
+    # Fleet
+    "FleetNode",
+    "FleetInventory",
+    "FleetEntry",
+    "FleetPlacement",
+    "FleetUnplaced",
+    "FleetPlan",
+    # MIG
+    "MIGSlice",
+    "MIGLayout",
+    # Trace
+    "LengthStats",
+    "WorkloadTrace",
     # Profile
     "Profile",
 ]
@@ -0,0 +1,78 @@
+"""Fleet schemas for placing many models onto a GPU inventory."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from vllm_wizard.schemas.inputs import Interconnect, ModelInput, PolicyInput, WorkloadInput
+
+
+class FleetNode(BaseModel):
+    """One node of the GPU inventory."""
+
+    name: str = Field(..., description="Unique node name")
+    gpu: str = Field(..., description="GPU name (e.g., 'H100', 'L40S')")
+    gpus: int = Field(..., description="GPUs in the node", ge=1)
+    vram_gb: Optional[float] = Field(
+        None, description="VRAM per GPU in GB (None to look up the GPU name)", gt=0
+    )
+    interconnect: Interconnect = Field(Interconnect.UNKNOWN, description="GPU interconnect type")
+
+
+class FleetInventory(BaseModel):
+    """GPU inventory available to a fleet."""
+
+    nodes: list[FleetNode] = Field(..., description="Nodes available for placement")
+
+
+class FleetEntry(BaseModel):
+    """One model and workload to place on the inventory."""
+
+    name: str = Field(..., description="Unique entry name")
+    model: ModelInput = Field(..., description="Model to serve")
+    workload: WorkloadInput = Field(default_factory=WorkloadInput, description="Workload")
+    policy: PolicyInput = Field(default_factory=PolicyInput, description="Policy")
+    tensor_parallel_size: Optional[int] = Field(
+        None, description="Fixed tensor parallel size (None for the smallest that fits)", ge=1
+    )
+
+
+class FleetEntries(BaseModel):
+    """Models and workloads to place."""
+
+    entries: list[FleetEntry] = Field(..., description="Entries to place")
+
+
+class FleetPlacement(BaseModel):
+    """One entry placed on the GPUs of a node."""
+
+    entry: str = Field(..., description="Entry name")
+    fingerprint: str = Field(..., description="Hash of the entry spec; changes force re-placement")
+    node: str = Field(..., description="Node name")
+    gpu: str = Field(..., description="GPU name of the node")
+    gpu_indices: list[int] = Field(..., description="GPU indices used within the node")
+    tensor_parallel_size: int = Field(..., description="Tensor parallel size")
+    headroom_gb: float = Field(..., description="Headroom per GPU in GB")
+    serve_command: str = Field(..., description="vllm serve command for the entry")
+
+
+class FleetUnplaced(BaseModel):
+    """An entry that could not be placed."""
+
+    entry: str = Field(..., description="Entry name")
+    reason: str = Field(..., description="Why the entry was not placed")
+
+
+class FleetPlan(BaseModel):
+    """Placement of every entry onto the inventory."""
+
+    placements: list[FleetPlacement] = Field(
+        default_factory=list, description="Placed entries by node and GPU index"
+    )
+    unplaced: list[FleetUnplaced] = Field(default_factory=list, description="Entries left over")
+    gpus_used: int = Field(0, description="GPUs holding at least one entry")
+    gpus_total: int = Field(0, description="GPUs in the inventory")
+    nodes_used: int = Field(0, description="Nodes holding at least one entry")
+    kept: list[str] = Field(
+        default_factory=list, description="Entries kept where a previous plan placed them"
+    )
@@ -5,6 +5,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from vllm_wizard.schemas.trace import WorkloadTrace
+
 
 class DType(str, Enum):
     """Data type for model weights."""
@@ -40,9 +42,18 @@ class Interconnect(str, Enum):
 
     PCIE = "pcie"
     NVLINK = "nvlink"
+    # PCIe between GPUs under different CPU sockets (topology "SYS")
+    CROSS_SOCKET = "cross-socket"
     UNKNOWN = "unknown"
 
 
+class PlanAgainst(str, Enum):
+    """GPU memory a plan budgets from."""
+
+    TOTAL = "total"
+    FREE = "free"
+
+
 class BatchingMode(str, Enum):
     """Batching optimization mode."""
 
@@ -68,11 +79,24 @@ class ModelInput(BaseModel):
 class HardwareInput(BaseModel):
     """Hardware configuration inputs."""
 
-    gpu: str = Field("auto", description="GPU name or 'auto' for detection")
-    gpus: int = Field(1, description="Number of GPUs", ge=1)
+    gpu: str = Field(
+        "auto", description="GPU name, a comma-separated list of GPUs per node, or 'auto'"
+    )
+    gpus: int = Field(1, description="Number of GPUs per node", ge=1)
+    nodes: int = Field(1, description="Number of identical nodes", ge=1)
     vram_gb: Optional[float] = Field(None, description="VRAM per GPU in GB", gt=0)
     interconnect: Interconnect = Field(Interconnect.UNKNOWN, description="GPU interconnect type")
+    inter_node_gbps: Optional[float] = Field(
+        None, description="Inter-node network bandwidth per GPU in GB/s (None for 200 Gb/s)", gt=0
+    )
     tensor_parallel_size: Optional[int] = Field(None, description="Tensor parallel size", ge=1)
+    pipeline_parallel_size: Optional[int] = Field(
+        None, description="Pipeline parallel size", ge=1
+    )
+    plan_against: PlanAgainst = Field(
+        PlanAgainst.TOTAL,
+        description="Budget from each GPU's total memory, or from what is free right now",
+    )
 
 
 class WorkloadInput(BaseModel):
@@ -81,9 +105,18 @@ class WorkloadInput(BaseModel):
     prompt_tokens: int = Field(512, description="Typical prompt token count", ge=1)
     gen_tokens: int = Field(256, description="Typical generation token count", ge=1)
     concurrency: int = Field(1, description="Simultaneous sequences", ge=1)
-    target_latency_ms: Optional[float] = Field(None, description="Target latency in ms", gt=0)
+    target_latency_ms: Optional[float] = Field(
+        None, description="Target per-output-token latency (TPOT) in ms", gt=0
+    )
+    target_ttft_ms: Optional[float] = Field(None, description="Target time to first token in ms", gt=0)
+    target_qps: Optional[float] = Field(
+        None, description="Target request rate in requests/s across all replicas", gt=0
+    )
     streaming: bool = Field(True, description="Enable streaming responses")
     batching_mode: BatchingMode = Field(BatchingMode.BALANCED, description="Batching mode")
+    trace: Optional[WorkloadTrace] = Field(
+        None, description="Length distributions from a request log, for sizing the KV cache"
+    )
 
 
 class PolicyInput(BaseModel):
@@ -94,9 +127,26 @@ class PolicyInput(BaseModel):
     )
     overhead_gb: Optional[float] = Field(None, description="Fixed overhead in GB", ge=0)
     fragmentation_factor: float = Field(
-        1.15, description="KV cache fragmentation factor", ge=1.0, le=2.0
+        1.0, description="Extra KV cache margin on top of whole blocks", ge=1.0, le=2.0
     )
     headroom_gb: float = Field(1.0, description="Minimum headroom in GB", ge=0)
+    block_size: int = Field(16, description="Tokens per KV cache block", ge=1)
+    max_num_seqs: Optional[int] = Field(
+        None, description="Scheduler sequence limit (None to recommend)", ge=1
+    )
+    max_num_batched_tokens: Optional[int] = Field(
+        None, description="Scheduler token budget per step (None to recommend)", ge=1
+    )
+    enforce_eager: Optional[bool] = Field(
+        None, description="Run without CUDA graphs (None to recommend)"
+    )
+
+
+class EngineInput(BaseModel):
+    """A further engine sharing the primary model's GPUs."""
+
+    model: ModelInput
+    workload: WorkloadInput = Field(default_factory=WorkloadInput)
 
 
 class PlanRequest(BaseModel):
@@ -106,4 +156,7 @@ class PlanRequest(BaseModel):
     hardware: HardwareInput = Field(default_factory=HardwareInput)
     workload: WorkloadInput = Field(default_factory=WorkloadInput)
     policy: PolicyInput = Field(default_factory=PolicyInput)
+    colocate: list[EngineInput] = Field(
+        default_factory=list, description="Further engines started on the same GPUs, in order"
+    )
     explain: bool = Field(False, description="Include explanations for recommendations")
@@ -0,0 +1,34 @@
+"""MIG layout schemas for serving small models on slices of one GPU."""
+
+from pydantic import BaseModel, Field
+
+from vllm_wizard.schemas.fleet import FleetUnplaced
+
+
+class MIGSlice(BaseModel):
+    """One entry served on its own MIG instance."""
+
+    entry: str = Field(..., description="Entry name")
+    profile: str = Field(..., description="MIG profile (e.g., '3g.40gb')")
+    vram_gb: float = Field(..., description="Memory of the instance in GiB")
+    aggregate_toks_per_s: float = Field(
+        ..., description="Estimated aggregate decode tokens/s at the entry's concurrency"
+    )
+    headroom_gb: float = Field(..., description="Headroom on the instance in GiB")
+    serve_command: str = Field(..., description="vllm serve command for the entry")
+
+
+class MIGLayout(BaseModel):
+    """Slice layout of one GPU and the entry served on each slice."""
+
+    gpu: str = Field(..., description="GPU being partitioned")
+    slices: list[MIGSlice] = Field(default_factory=list, description="Instances, largest first")
+    unplaced: list[FleetUnplaced] = Field(
+        default_factory=list, description="Entries left without an instance"
+    )
+    compute_slices_used: int = Field(0, description="Compute slices used, of 7")
+    memory_slices_used: int = Field(0, description="Memory slices used, of 8")
+    total_aggregate_toks_per_s: float = Field(
+        0.0, description="Aggregate decode tokens/s summed over every instance"
+    )
+    setup_command: str = Field("", description="nvidia-smi command creating the instances")
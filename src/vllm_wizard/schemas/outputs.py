@@ -14,6 +14,14 @@ class OOMRisk(str, Enum):
     HIGH = "high"
 
 
+class GPUProcess(BaseModel):
+    """A compute process holding GPU memory."""
+
+    pid: int = Field(..., description="Process ID")
+    name: str = Field(..., description="Process name")
+    used_mib: int = Field(..., description="GPU memory held in MiB")
+
+
 class GPUInfo(BaseModel):
     """GPU information from detection."""
 
@@ -22,6 +30,18 @@ class GPUInfo(BaseModel):
     compute_capability: Optional[str] = Field(None, description="CUDA compute capability")
     driver_version: Optional[str] = Field(None, description="NVIDIA driver version")
     cuda_version: Optional[str] = Field(None, description="CUDA version")
+    mig_profile: Optional[str] = Field(
+        None, description="MIG profile (e.g., '1g.10gb') if the device is a MIG instance"
+    )
+    uuid: Optional[str] = Field(None, description="Device UUID for CUDA_VISIBLE_DEVICES")
+    index: Optional[int] = Field(
+        None, description="nvidia-smi index of the GPU (of the parent GPU for a MIG instance)"
+    )
+    vram_used_mib: Optional[int] = Field(None, description="VRAM in use when detected, in MiB")
+    vram_free_mib: Optional[int] = Field(None, description="VRAM free when detected, in MiB")
+    processes: list[GPUProcess] = Field(
+        default_factory=list, description="Compute processes holding memory on the GPU"
+    )
 
     @property
     def vram_gb(self) -> float:
@@ -33,6 +53,11 @@ class GPUInfo(BaseModel):
         """VRAM in GiB (base 1024)."""
         return self.vram_mib / 1024
 
+    @property
+    def vram_free_gib(self) -> Optional[float]:
+        """Free VRAM in GiB when detected, else None."""
+        return None if self.vram_free_mib is None else self.vram_free_mib / 1024
+
 
 class FeasibilityReport(BaseModel):
     """VRAM feasibility analysis report."""
@@ -44,6 +69,12 @@ class FeasibilityReport(BaseModel):
     weights_gb: float = Field(..., description="Model weights memory in GiB")
     kv_cache_gb: float = Field(..., description="KV cache memory in GiB")
     overhead_gb: float = Field(..., description="Overhead memory in GiB")
+    activation_gb: float = Field(
+        0.0, description="Peak profile-run activation memory in GiB, taken from the KV budget"
+    )
+    cuda_graph_gb: float = Field(
+        0.0, description="Captured decode CUDA graph memory in GiB, taken from the KV budget"
+    )
     headroom_gb: float = Field(..., description="Available headroom in GiB")
     max_concurrency_at_context: int = Field(
         ..., description="Max concurrency at target context length"
@@ -51,6 +82,27 @@ class FeasibilityReport(BaseModel):
     max_context_at_concurrency: int = Field(
         ..., description="Max context length at target concurrency"
     )
+    block_size: int = Field(16, description="Tokens per KV cache block")
+    num_gpu_blocks: int = Field(0, description="KV cache blocks that fit in the KV budget")
+    blocks_per_seq: int = Field(0, description="KV cache blocks per sequence at target context")
+    max_concurrency_by_blocks: int = Field(
+        0, description="Sequences at target context that fit in num_gpu_blocks"
+    )
+    kv_block_waste_gb: float = Field(
+        0.0, description="KV memory in partly filled last blocks at target concurrency, in GiB"
+    )
+    tensor_parallel_size: int = Field(
+        1, description="Ranks the model is split across; memory figures are per rank"
+    )
+    pipeline_parallel_size: int = Field(1, description="Pipeline stages")
+    stage_layers: list[int] = Field(
+        default_factory=list, description="Decoder layers held by each pipeline stage"
+    )
+    kv_heads_per_rank: int = Field(0, description="KV heads held by the worst-loaded rank")
+    kv_bytes_per_token: int = Field(0, description="KV cache bytes per token on one rank")
+    kv_trace_tokens: Optional[int] = Field(
+        None, description="Concurrent KV tokens sized from the workload trace"
+    )
     warnings: list[str] = Field(default_factory=list, description="Warning messages")
 
 
@@ -59,6 +111,11 @@ class VLLMConfig(BaseModel):
 
     model: str = Field(..., description="Model path or HF id")
     tensor_parallel_size: int = Field(1, description="Tensor parallel size")
+    pipeline_parallel_size: int = Field(1, description="Pipeline parallel size")
+    data_parallel_size: int = Field(1, description="Engine replicas serving in parallel")
+    distributed_executor_backend: Optional[str] = Field(
+        None, description="Executor backend for multi-node serving"
+    )
     dtype: str = Field("auto", description="Weight dtype")
     gpu_memory_utilization: float = Field(0.90, description="GPU memory utilization")
     max_model_len: int = Field(..., description="Maximum model length")
@@ -66,14 +123,32 @@ class VLLMConfig(BaseModel):
     quantization: Optional[str] = Field(None, description="Quantization method")
     swap_space: Optional[int] = Field(None, description="Swap space in GB")
     enforce_eager: Optional[bool] = Field(None, description="Enforce eager mode")
+    cuda_graph_sizes: Optional[list[int]] = Field(
+        None, description="Decode batch sizes to capture CUDA graphs for"
+    )
     max_num_seqs: Optional[int] = Field(None, description="Max concurrent sequences")
     max_num_batched_tokens: Optional[int] = Field(None, description="Max batched tokens")
+    block_size: Optional[int] = Field(None, description="Tokens per KV cache block")
     trust_remote_code: Optional[bool] = Field(None, description="Trust remote code")
+    port: Optional[int] = Field(None, description="API server port (None for vLLM's 8000)")
+    cuda_visible_devices: Optional[str] = Field(
+        None, description="GPUs to pin the engine to (None for the first GPUs)"
+    )
     explanations: dict[str, str] = Field(
         default_factory=dict, description="Parameter explanations"
     )
 
 
+class ThroughputPoint(BaseModel):
+    """Decode throughput and latency at one batch size."""
+
+    batch_size: int = Field(..., description="Sequences decoded together")
+    per_user_toks_per_s: float = Field(..., description="Tokens/s seen by each sequence")
+    aggregate_toks_per_s: float = Field(..., description="Tokens/s summed over the batch")
+    itl_ms: float = Field(..., description="Inter-token latency (decode step time) in ms")
+    memory_bound: bool = Field(..., description="Whether the step is limited by HBM bandwidth")
+
+
 class PerfEstimate(BaseModel):
     """Approximate performance estimates."""
 
@@ -86,11 +161,137 @@ class PerfEstimate(BaseModel):
     ttft_ms_range: Optional[tuple[float, float]] = Field(
         None, description="Time to first token range [low, high] in ms"
     )
+    throughput_curve: list[ThroughputPoint] = Field(
+        default_factory=list, description="Decode throughput by batch size up to max_num_seqs"
+    )
+    cuda_graph_itl_saving_ms: float = Field(
+        0.0, description="Decode step latency CUDA graphs save over eager mode, in ms"
+    )
+    pipeline_bubble_fraction: float = Field(
+        0.0, description="Fraction of pipeline stage time left idle at the estimated batch size"
+    )
+    allreduce_ms_per_step: float = Field(
+        0.0, description="Tensor-parallel all-reduce time per decode step at the estimated batch"
+    )
     assumptions: list[str] = Field(
         default_factory=list, description="Assumptions used in estimation"
     )
 
 
+class SLOReport(BaseModel):
+    """Result of searching for the highest-throughput config that meets latency targets."""
+
+    target_ttft_ms: Optional[float] = Field(None, description="Target time to first token in ms")
+    target_tpot_ms: Optional[float] = Field(None, description="Target time per output token in ms")
+    ttft_ms: float = Field(..., description="Predicted time to first token in ms")
+    tpot_ms: float = Field(..., description="Predicted time per output token in ms")
+    ttft_margin_ms: Optional[float] = Field(
+        None, description="Target minus predicted TTFT in ms (negative if missed)"
+    )
+    tpot_margin_ms: Optional[float] = Field(
+        None, description="Target minus predicted TPOT in ms (negative if missed)"
+    )
+    meets_slo: bool = Field(..., description="Whether all targets are met")
+    batch_size: int = Field(..., description="Sustained decode batch size")
+    output_toks_per_s: float = Field(..., description="Predicted output tokens/s at that batch")
+    candidates_evaluated: int = Field(..., description="Configurations scored by the search")
+    candidates_meeting_slo: int = Field(..., description="Configurations meeting all targets")
+
+
+class ReplicaLayout(BaseModel):
+    """One TP x PP x DP split of the GPUs, scored at a target request rate."""
+
+    tensor_parallel_size: int = Field(..., description="Tensor parallel size of each replica")
+    pipeline_parallel_size: int = Field(1, description="Pipeline stages of each replica")
+    data_parallel_size: int = Field(..., description="Replicas that fit on the GPUs")
+    fits: bool = Field(..., description="Whether a replica has room for one sequence")
+    max_batch_size: int = Field(0, description="Sustained decode batch of a saturated replica")
+    replica_qps: float = Field(0.0, description="Requests/s one replica sustains")
+    aggregate_qps: float = Field(0.0, description="Requests/s all replicas sustain")
+    aggregate_output_toks_per_s: float = Field(
+        0.0, description="Output tokens/s of all replicas when saturated"
+    )
+    replicas_needed: Optional[int] = Field(
+        None, description="Replicas needed for the target rate (None without a target)"
+    )
+    utilization: Optional[float] = Field(
+        None, description="Target rate over aggregate capacity (None without a target)"
+    )
+    ttft_ms: Optional[float] = Field(
+        None, description="Predicted TTFT at the target rate, or when saturated"
+    )
+    tpot_ms: Optional[float] = Field(
+        None, description="Predicted TPOT at the target rate, or when saturated"
+    )
+    meets_target: bool = Field(False, description="Whether the layout sustains the target")
+
+
+class ReplicaReport(BaseModel):
+    """Ranking of data-parallel layouts for the available GPUs."""
+
+    target_qps: Optional[float] = Field(None, description="Target requests/s")
+    num_gpus: int = Field(..., description="GPUs split into replicas")
+    layouts: list[ReplicaLayout] = Field(
+        default_factory=list, description="Layouts best first; the first is recommended"
+    )
+
+
+class ColocatedEngine(BaseModel):
+    """One of several engines sharing the same GPUs."""
+
+    model: str = Field(..., description="Model path or HF id")
+    memory_fraction: float = Field(..., description="Fraction of each GPU this engine owns")
+    gpu_memory_utilization: float = Field(
+        ..., description="--gpu-memory-utilization flag: this engine's own share"
+    )
+    port: int = Field(..., description="API server port")
+    feasibility: FeasibilityReport = Field(..., description="Feasibility within the engine's share")
+    config: VLLMConfig = Field(..., description="Engine config")
+
+
+class ColocationReport(BaseModel):
+    """Memory split between engines started one after another on the same GPUs."""
+
+    engines: list[ColocatedEngine] = Field(..., description="Engines in start order")
+    total_memory_fraction: float = Field(..., description="Fraction of each GPU all engines use")
+    fits: bool = Field(..., description="Whether every engine fits within its share")
+
+
+class LatencyStats(BaseModel):
+    """Latency distribution summary in milliseconds."""
+
+    mean: float = Field(..., description="Mean latency in ms")
+    p50: float = Field(..., description="Median latency in ms")
+    p90: float = Field(..., description="90th percentile latency in ms")
+    p99: float = Field(..., description="99th percentile latency in ms")
+
+
+class SimulationReport(BaseModel):
+    """Results of a continuous batching simulation."""
+
+    num_requests: int = Field(..., description="Requests offered")
+    completed: int = Field(..., description="Requests completed")
+    rejected: int = Field(0, description="Requests that can never fit in the KV cache")
+    duration_s: float = Field(..., description="Simulated time until the last completion")
+    request_throughput: float = Field(..., description="Completed requests per second")
+    output_toks_per_s: float = Field(..., description="Generated tokens per second")
+    mean_batch_size: float = Field(..., description="Mean sequences per engine step")
+    preemptions: int = Field(0, description="Sequences preempted for lack of KV blocks")
+    preemption_rate: float = Field(0.0, description="Preemptions per completed request")
+    queue_delay_ms: LatencyStats = Field(..., description="Arrival to first scheduling")
+    ttft_ms: LatencyStats = Field(..., description="Time to first token")
+    tpot_ms: LatencyStats = Field(..., description="Time per output token after the first")
+    e2e_latency_ms: LatencyStats = Field(..., description="Arrival to last token")
+    num_gpu_blocks: int = Field(..., description="KV cache blocks available")
+    block_size: int = Field(..., description="Tokens per KV cache block")
+    max_num_seqs: int = Field(..., description="Scheduler sequence limit")
+    max_num_batched_tokens: int = Field(..., description="Scheduler token budget per step")
+    chunked_prefill: bool = Field(..., description="Whether prefills were chunked")
+    assumptions: list[str] = Field(
+        default_factory=list, description="Assumptions used in the simulation"
+    )
+
+
 class Artifacts(BaseModel):
     """Generated artifacts."""
 
@@ -107,6 +308,13 @@ class PlanResponse(BaseModel):
     config: VLLMConfig = Field(..., description="Recommended vLLM config")
     performance: PerfEstimate = Field(..., description="Performance estimates")
     artifacts: Artifacts = Field(..., description="Generated artifacts")
+    slo: Optional[SLOReport] = Field(None, description="SLO search result, in SLO planning mode")
+    replicas: Optional[ReplicaReport] = Field(
+        None, description="Data-parallel layout ranking, in replica planning mode"
+    )
+    colocation: Optional[ColocationReport] = Field(
+        None, description="Memory split between engines, when several share the GPUs"
+    )
 
     def model_dump_json_pretty(self) -> str:
         """Return pretty-printed JSON."""
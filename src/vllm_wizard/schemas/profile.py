@@ -7,8 +7,10 @@ from pydantic import BaseModel, Field
 from vllm_wizard.schemas.inputs import (
     BatchingMode,
     DType,
+    EngineInput,
     Interconnect,
     KVCacheDType,
+    PlanAgainst,
     Quantization,
 )
 
@@ -29,10 +31,14 @@ class ProfileHardware(BaseModel):
     """Hardware section of profile."""
 
     gpu_name: str = Field("auto", description="GPU name")
-    gpus: int = Field(1, description="Number of GPUs")
+    gpus: int = Field(1, description="Number of GPUs per node")
+    nodes: int = Field(1, description="Number of nodes")
     vram_gb: Optional[float] = Field(None, description="VRAM per GPU in GB")
     interconnect: Interconnect = Field(Interconnect.UNKNOWN, description="Interconnect type")
+    inter_node_gbps: Optional[float] = Field(None, description="Inter-node GB/s per GPU")
     tp_size: Optional[int] = Field(None, description="Tensor parallel size")
+    pp_size: Optional[int] = Field(None, description="Pipeline parallel size")
+    plan_against: PlanAgainst = Field(PlanAgainst.TOTAL, description="Total or free memory")
 
 
 class ProfileWorkload(BaseModel):
@@ -41,6 +47,9 @@ class ProfileWorkload(BaseModel):
     prompt_tokens: int = Field(512, description="Typical prompt tokens")
     gen_tokens: int = Field(256, description="Typical generation tokens")
     concurrency: int = Field(1, description="Concurrent sequences")
+    target_latency_ms: Optional[float] = Field(None, description="Target TPOT in ms")
+    target_ttft_ms: Optional[float] = Field(None, description="Target TTFT in ms")
+    target_qps: Optional[float] = Field(None, description="Target requests/s")
     streaming: bool = Field(True, description="Enable streaming")
     mode: BatchingMode = Field(BatchingMode.BALANCED, description="Batching mode")
 
@@ -50,8 +59,12 @@ class ProfilePolicy(BaseModel):
 
     gpu_memory_utilization: float = Field(0.90, description="GPU memory utilization")
     overhead_gb: Optional[float] = Field(None, description="Fixed overhead GB")
-    fragmentation_factor: float = Field(1.15, description="Fragmentation factor")
+    fragmentation_factor: float = Field(1.0, description="Extra KV cache margin")
     headroom_gb: float = Field(1.0, description="Minimum headroom GB")
+    block_size: int = Field(16, description="Tokens per KV cache block")
+    max_num_seqs: Optional[int] = Field(None, description="Scheduler sequence limit")
+    max_num_batched_tokens: Optional[int] = Field(None, description="Scheduler token budget")
+    enforce_eager: Optional[bool] = Field(None, description="Run without CUDA graphs")
 
 
 class ProfileOutputs(BaseModel):
@@ -71,4 +84,7 @@ class Profile(BaseModel):
     hardware: ProfileHardware = Field(default_factory=ProfileHardware, description="Hardware config")
     workload: ProfileWorkload = Field(default_factory=ProfileWorkload, description="Workload config")
     policy: ProfilePolicy = Field(default_factory=ProfilePolicy, description="Policy config")
+    colocate: list[EngineInput] = Field(
+        default_factory=list, description="Further engines started on the same GPUs"
+    )
     outputs: ProfileOutputs = Field(default_factory=ProfileOutputs, description="Output config")
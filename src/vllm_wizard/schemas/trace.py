@@ -0,0 +1,92 @@
+"""Workload trace schemas: length distributions summarized from request logs."""
+
+import math
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class LengthStats(BaseModel):
+    """Histogram of token lengths with log-spaced buckets."""
+
+    count: float = Field(0.0, description="Total weight (requests, or tokens for time weights)")
+    mean: float = Field(0.0, description="Weighted mean length")
+    min: int = Field(0, description="Shortest length seen")
+    max: int = Field(0, description="Longest length seen")
+    p50: int = Field(0, description="Median length (bucket upper bound)")
+    p90: int = Field(0, description="90th percentile length (bucket upper bound)")
+    p99: int = Field(0, description="99th percentile length (bucket upper bound)")
+    buckets: list[tuple[int, float]] = Field(
+        default_factory=list, description="(bucket upper bound, weight), shortest first"
+    )
+
+    def percentile(self, q: float) -> int:
+        """Length at or below which a fraction q of the weight lies.
+
+        Args:
+            q: Fraction between 0 and 1
+
+        Returns:
+            Upper bound of the bucket holding the percentile, at most max
+        """
+        if not self.buckets:
+            return 0
+        target = q * self.count
+        cumulative = 0.0
+        for upper, weight in self.buckets:
+            cumulative += weight
+            if cumulative >= target:
+                return min(upper, self.max)
+        return self.max
+
+    def fraction_above(self, limit: int) -> float:
+        """Fraction of the weight in buckets reaching beyond a limit.
+
+        Args:
+            limit: Length threshold (e.g., max_model_len)
+
+        Returns:
+            Fraction between 0 and 1, rounded up to whole buckets
+        """
+        if not self.buckets or self.count <= 0 or self.max <= limit:
+            return 0.0
+        above = sum(weight for upper, weight in self.buckets if upper > limit)
+        return above / self.count
+
+    def clipped_moments(self, limit: int) -> tuple[float, float]:
+        """Mean and standard deviation with every length capped at a limit.
+
+        Args:
+            limit: Largest length counted (e.g., max_model_len)
+
+        Returns:
+            (mean, standard deviation) over the bucket upper bounds
+        """
+        if not self.buckets or self.count <= 0:
+            return 0.0, 0.0
+        mean = sum(min(upper, limit) * weight for upper, weight in self.buckets) / self.count
+        second = sum(min(upper, limit) ** 2 * weight for upper, weight in self.buckets)
+        return mean, math.sqrt(max(0.0, second / self.count - mean**2))
+
+
+class WorkloadTrace(BaseModel):
+    """Request lengths and rate summarized from a request log."""
+
+    source: Optional[str] = Field(None, description="File the trace was read from")
+    requests: int = Field(0, description="Requests with both lengths")
+    skipped: int = Field(0, description="Records without usable lengths")
+    duration_s: Optional[float] = Field(None, description="First to last timestamp in seconds")
+    request_rate: Optional[float] = Field(None, description="Mean arrival rate in requests/s")
+    prompt_tokens: LengthStats = Field(
+        default_factory=LengthStats, description="Prompt lengths per request"
+    )
+    gen_tokens: LengthStats = Field(
+        default_factory=LengthStats, description="Output lengths per request"
+    )
+    context_tokens: LengthStats = Field(
+        default_factory=LengthStats, description="Prompt plus output per request"
+    )
+    resident_tokens: LengthStats = Field(
+        default_factory=LengthStats,
+        description="KV tokens a decoding sequence holds, weighted by time spent decoding",
+    )
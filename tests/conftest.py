@@ -2,10 +2,38 @@
 
 import json
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
 from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.simulator import StepCostModel
+from vllm_wizard.schemas.fleet import FleetEntry
+from vllm_wizard.schemas.inputs import HardwareInput, ModelInput, PlanRequest, WorkloadInput
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep on-disk caches out of the user's home directory."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("VLLM_WIZARD_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the model registry out of the user's home directory."""
+    data_dir = tmp_path_factory.mktemp("data")
+    monkeypatch.setenv("VLLM_WIZARD_DATA_DIR", str(data_dir))
+    return data_dir
+
+
+@pytest.fixture(autouse=True)
+def hf_hub_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the Hugging Face hub cache at an empty temporary directory."""
+    hub_dir = tmp_path_factory.mktemp("hf_hub")
+    monkeypatch.setenv("HF_HUB_CACHE", str(hub_dir))
+    return hub_dir
 
 
 @pytest.fixture
@@ -123,3 +151,45 @@ def tmp_config_no_kv(tmp_path: Path, config_no_kv_heads: dict) -> Path:
     config_path = tmp_path / "config.json"
     config_path.write_text(json.dumps(config_no_kv_heads))
     return tmp_path
+
+
+@pytest.fixture
+def make_request() -> Callable[..., PlanRequest]:
+    """Factory for plan requests serving an 8B model on H100s with workload targets."""
+
+    def factory(gpus: int = 8, prompt_tokens: int = 512, **workload) -> PlanRequest:
+        return PlanRequest(
+            model=ModelInput(model="test-8b", params_b=8.0, max_model_len=4096),
+            hardware=HardwareInput(gpu="H100", gpus=gpus),
+            workload=WorkloadInput(prompt_tokens=prompt_tokens, gen_tokens=256, **workload),
+        )
+
+    return factory
+
+
+@pytest.fixture
+def cost() -> StepCostModel:
+    """Cost model with 1 ms weight reads and 1e-3 ms per token of compute."""
+    return StepCostModel(
+        weights_bytes=1e9,
+        kv_bytes_per_token=0.0,
+        linear_flops_per_token=1e6,
+        attention_flops_per_token_per_ctx=0.0,
+        bytes_per_s=1e12,
+        flops_per_s=1e12,
+        overhead_s=0.0,
+    )
+
+
+@pytest.fixture
+def make_entry() -> Callable[..., FleetEntry]:
+    """Factory for fleet entries serving a model of the given size at 4K context."""
+
+    def factory(name: str, params_b: float, **kwargs) -> FleetEntry:
+        return FleetEntry(
+            name=name,
+            model=ModelInput(model=f"test-{params_b:g}b", params_b=params_b, max_model_len=4096),
+            **kwargs,
+        )
+
+    return factory
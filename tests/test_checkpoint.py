@@ -0,0 +1,144 @@
+"""Tests for safetensors header reading."""
+
+import json
+import struct
+import time
+from pathlib import Path
+
+import pytest
+
+from vllm_wizard.models.checkpoint import load_checkpoint_info, read_safetensors_header
+from vllm_wizard.models.metadata import load_model_metadata
+from vllm_wizard.planning.memory import compute_weights_memory
+from vllm_wizard.schemas.inputs import DType, Quantization
+
+DTYPE_SIZES = {"BF16": 2, "F16": 2, "F32": 4, "I32": 4}
+
+
+def write_shard(path: Path, tensors: dict[str, tuple[str, list[int]]]) -> None:
+    """Write a safetensors header; tensor data is omitted since only headers are read."""
+    header: dict = {"__metadata__": {"format": "pt"}}
+    offset = 0
+    for name, (dtype, shape) in tensors.items():
+        size = DTYPE_SIZES[dtype]
+        for dim in shape:
+            size *= dim
+        header[name] = {"dtype": dtype, "shape": shape, "data_offsets": [offset, offset + size]}
+        offset += size
+
+    data = json.dumps(header).encode()
+    path.write_bytes(struct.pack("<Q", len(data)) + data)
+
+
+class TestReadHeader:
+    """Tests for read_safetensors_header."""
+
+    def test_reads_header(self, tmp_path: Path):
+        """Test the header is parsed without reading tensor data."""
+        write_shard(tmp_path / "model.safetensors", {"w": ("BF16", [4, 8])})
+        header = read_safetensors_header(tmp_path / "model.safetensors")
+        assert header["w"]["shape"] == [4, 8]
+
+    def test_rejects_short_file(self, tmp_path: Path):
+        """Test files shorter than the length prefix are rejected."""
+        path = tmp_path / "bad.safetensors"
+        path.write_bytes(b"abc")
+        with pytest.raises(ValueError):
+            read_safetensors_header(path)
+
+
+class TestCheckpointInfo:
+    """Tests for load_checkpoint_info."""
+
+    def test_single_file(self, tmp_path: Path):
+        """Test elements and bytes are summed per dtype."""
+        write_shard(
+            tmp_path / "model.safetensors",
+            {"a": ("BF16", [1000, 100]), "b": ("F32", [100])},
+        )
+        info = load_checkpoint_info(tmp_path)
+
+        assert info.num_tensors == 2
+        assert info.num_elements == 100_100
+        assert info.total_bytes == 200_000 + 400
+        # FP32 tensors are cast to 16-bit when loaded with dtype auto
+        assert info.auto_dtype_bytes == 200_000 + 200
+
+    def test_index_selects_shards(self, tmp_path: Path):
+        """Test only shards listed in the index are counted."""
+        write_shard(tmp_path / "model-00001-of-00002.safetensors", {"a": ("BF16", [10])})
+        write_shard(tmp_path / "model-00002-of-00002.safetensors", {"b": ("BF16", [20])})
+        write_shard(tmp_path / "consolidated.safetensors", {"a": ("BF16", [10]), "b": ("BF16", [20])})
+        index = {
+            "weight_map": {
+                "a": "model-00001-of-00002.safetensors",
+                "b": "model-00002-of-00002.safetensors",
+            }
+        }
+        (tmp_path / "model.safetensors.index.json").write_text(json.dumps(index))
+
+        info = load_checkpoint_info(tmp_path)
+
+        assert info.num_shards == 2
+        assert info.num_elements == 30
+
+    def test_missing_shard(self, tmp_path: Path):
+        """Test partially downloaded checkpoints are ignored."""
+        write_shard(tmp_path / "model-00001-of-00002.safetensors", {"a": ("BF16", [10])})
+        index = {"weight_map": {"a": "model-00001-of-00002.safetensors", "b": "model-00002-of-00002.safetensors"}}
+        (tmp_path / "model.safetensors.index.json").write_text(json.dumps(index))
+
+        assert load_checkpoint_info(tmp_path) is None
+
+    def test_no_safetensors(self, tmp_path: Path):
+        """Test directories without safetensors return None."""
+        assert load_checkpoint_info(tmp_path) is None
+
+    def test_many_shards_fast(self, tmp_path: Path):
+        """Test a 200-shard checkpoint is summarized quickly."""
+        weight_map = {}
+        for i in range(200):
+            name = f"model-{i + 1:05d}-of-00200.safetensors"
+            tensors = {f"layers.{i}.w{j}": ("BF16", [8192, 8192]) for j in range(10)}
+            write_shard(tmp_path / name, tensors)
+            weight_map.update({tensor: name for tensor in tensors})
+        (tmp_path / "model.safetensors.index.json").write_text(json.dumps({"weight_map": weight_map}))
+
+        start = time.perf_counter()
+        info = load_checkpoint_info(tmp_path)
+        elapsed = time.perf_counter() - start
+
+        assert info.num_tensors == 2000
+        assert info.total_bytes == 2000 * 8192 * 8192 * 2
+        assert elapsed < 1.0
+
+
+class TestExactWeights:
+    """Tests for exact weights from checkpoint headers."""
+
+    def test_metadata_uses_checkpoint(self, tmp_config_dir: Path):
+        """Test parameter count and weight bytes come from the headers."""
+        write_shard(tmp_config_dir / "model.safetensors", {"w": ("BF16", [1000, 1000])})
+        metadata = load_model_metadata(str(tmp_config_dir))
+
+        assert metadata.num_params == 1_000_000
+        assert metadata.weights_bytes == 2_000_000
+        assert compute_weights_memory(0.001, metadata=metadata) == 2_000_000
+
+    def test_explicit_dtype_uses_params(self, tmp_config_dir: Path):
+        """Test an explicit dtype rescales the exact parameter count."""
+        write_shard(tmp_config_dir / "model.safetensors", {"w": ("BF16", [1000, 1000])})
+        metadata = load_model_metadata(str(tmp_config_dir))
+
+        assert compute_weights_memory(0.001, DType.FP32, metadata=metadata) == 4_000_000
+
+    def test_prequantized_checkpoint(self, tmp_path: Path, llama_config: dict):
+        """Test prequantized checkpoints keep the config estimate for parameters."""
+        llama_config["quantization_config"] = {"quant_method": "awq", "bits": 4}
+        (tmp_path / "config.json").write_text(json.dumps(llama_config))
+        write_shard(tmp_path / "model.safetensors", {"qweight": ("I32", [1000, 125])})
+        metadata = load_model_metadata(str(tmp_path))
+
+        assert metadata.quant_method == "awq"
+        assert metadata.num_params > 1_000_000_000
+        assert compute_weights_memory(7.0, quantization=Quantization.AWQ, metadata=metadata) == 500_000
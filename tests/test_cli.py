@@ -8,7 +8,8 @@ import pytest
 from typer.testing import CliRunner
 
 from vllm_wizard.cli import app
-from vllm_wizard.schemas.outputs import GPUInfo
+from vllm_wizard.hardware.detect import GPUTopology
+from vllm_wizard.schemas.outputs import GPUInfo, GPUProcess
 
 runner = CliRunner()
 
@@ -95,6 +96,189 @@ class TestPlanCommand:
             assert result.exit_code == 0
             assert "VRAM Breakdown" in result.stdout or "Feasibility" in result.stdout
 
+    def test_plan_block_size(self, tmp_config_dir: Path):
+        """Test a non-default block size is reported and passed to vLLM."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--block-size", "32",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["feasibility"]["block_size"] == 32
+        assert data["feasibility"]["num_gpu_blocks"] > 0
+        assert "--block-size 32" in data["artifacts"]["serve_command"]
+
+    def test_plan_token_budget_reduces_kv(self, tmp_config_dir: Path):
+        """Test a larger --max-num-batched-tokens leaves fewer KV blocks."""
+        blocks = {}
+        for budget in ("2048", "32768"):
+            result = runner.invoke(
+                app,
+                [
+                    "plan",
+                    "--model", str(tmp_config_dir),
+                    "--params-b", "7",
+                    "--gpu", "A100 80GB",
+                    "--max-num-batched-tokens", budget,
+                    "--json",
+                ],
+            )
+            assert result.exit_code == 0
+            data = json.loads(result.stdout)
+            assert data["config"]["max_num_batched_tokens"] == int(budget)
+            blocks[budget] = data["feasibility"]["num_gpu_blocks"]
+
+        assert blocks["32768"] < blocks["2048"]
+
+    def test_plan_max_num_seqs_within_blocks(self, tmp_config_dir: Path):
+        """Test the sequence limit never exceeds what the KV blocks hold."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+                "--max-model-len", "4096",
+                "--batching-mode", "throughput",
+                "-c", "10",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        # Throughput mode asks for 14 sequences
+        assert data["config"]["max_num_seqs"] < 14
+        assert data["config"]["max_num_seqs"] <= data["feasibility"]["max_concurrency_by_blocks"]
+        assert (
+            data["feasibility"]["max_concurrency_at_context"]
+            == data["feasibility"]["max_concurrency_by_blocks"]
+        )
+
+    def test_plan_cuda_graph_tradeoff(self, tmp_config_dir: Path):
+        """Test graph capture is trimmed when it would crowd out the target KV cache."""
+        args = [
+            "plan",
+            "--model", str(tmp_config_dir),
+            "--params-b", "7",
+            "--gpu", "RTX 4090",
+            "--max-model-len", "3900",
+            "--max-num-seqs", "256",
+            "--json",
+        ]
+
+        roomy = json.loads(runner.invoke(app, args + ["-c", "2"]).stdout)
+        assert roomy["config"]["enforce_eager"] is None
+        assert roomy["config"]["cuda_graph_sizes"] is None
+        assert roomy["feasibility"]["cuda_graph_gb"] > 0
+
+        tight = json.loads(runner.invoke(app, args + ["-c", "12"]).stdout)
+        assert tight["config"]["cuda_graph_sizes"] == [16]
+        assert tight["feasibility"]["cuda_graph_gb"] < roomy["feasibility"]["cuda_graph_gb"]
+        assert "--cuda-graph-sizes 16" in tight["artifacts"]["serve_command"]
+
+        eager = json.loads(runner.invoke(app, args + ["-c", "2", "--enforce-eager"]).stdout)
+        assert eager["config"]["enforce_eager"] is True
+        assert eager["feasibility"]["cuda_graph_gb"] == 0
+        assert eager["feasibility"]["num_gpu_blocks"] > roomy["feasibility"]["num_gpu_blocks"]
+
+    def test_plan_tensor_parallel_per_rank(self, tmp_config_dir: Path):
+        """Test TP feasibility is reported for one GPU's rank."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--gpu", "A100 80GB",
+                "--gpus", "2",
+                "--tensor-parallel-size", "2",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        feasibility = json.loads(result.stdout)["feasibility"]
+        assert feasibility["tensor_parallel_size"] == 2
+        assert feasibility["vram_total_gb"] == pytest.approx(80.0)
+        assert feasibility["weights_gb"] < 7.0
+        assert feasibility["kv_heads_per_rank"] == 16
+
+    def test_plan_multi_node_pipeline(self):
+        """Test a model too large for one node is split into pipeline stages."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", "meta-llama/Llama-3.1-405B",
+                "--params-b", "405",
+                "--gpu", "H100",
+                "--vram-gb", "80",
+                "--gpus", "8",
+                "--nodes", "2",
+                "--max-model-len", "8192",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["config"]["tensor_parallel_size"] == 8
+        assert data["config"]["pipeline_parallel_size"] == 2
+        assert data["config"]["distributed_executor_backend"] == "ray"
+        assert data["feasibility"]["fits"]
+        assert "--pipeline-parallel-size 2" in data["artifacts"]["serve_command"]
+
+    def test_plan_target_qps(self, tmp_config_dir: Path):
+        """Test a request rate target ranks replica layouts."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--gpu", "H100",
+                "--gpus", "4",
+                "--target-qps", "1",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        layouts = data["replicas"]["layouts"]
+        assert {layout["tensor_parallel_size"] for layout in layouts} == {1, 2, 4}
+        assert data["config"]["tensor_parallel_size"] == layouts[0]["tensor_parallel_size"]
+        assert data["config"]["data_parallel_size"] == layouts[0]["data_parallel_size"]
+
+    def test_plan_slo_targets(self, tmp_config_dir: Path):
+        """Test latency targets switch plan to the SLO search."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--target-ttft-ms", "500",
+                "--target-latency-ms", "50",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        slo = json.loads(result.stdout)["slo"]
+        assert slo["meets_slo"]
+        assert slo["target_tpot_ms"] == 50
+        assert slo["tpot_ms"] + slo["tpot_margin_ms"] == pytest.approx(50, abs=0.01)
+
     def test_plan_with_explain(self, tmp_config_dir: Path):
         """Test plan command with explanations."""
         mock_gpus = [
@@ -132,6 +316,285 @@ class TestPlanCommand:
             assert "Error" in result.stdout
 
 
+    def test_plan_mixed_gpus(self, tmp_config_dir: Path):
+        """Test a mixed GPU list is bounded by its smallest member and warned about."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "2x A100 80GB, 2x A100 40GB",
+                "--tp", "4",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["config"]["tensor_parallel_size"] == 4
+        assert data["feasibility"]["vram_total_gb"] == pytest.approx(40, abs=1)
+        assert any("Mixed GPUs" in w for w in data["feasibility"]["warnings"])
+
+    def test_plan_mixed_gpus_count_mismatch(self, tmp_config_dir: Path):
+        """Test --gpus must match the length of a GPU list."""
+        result = runner.invoke(
+            app,
+            ["plan", "--model", str(tmp_config_dir), "--gpu", "A100 80GB, L4", "--gpus", "4"],
+        )
+
+        assert result.exit_code == 1
+        assert "lists 2 GPUs" in result.stdout
+
+
+    def test_plan_against_free_memory(self, tmp_config_dir: Path):
+        """Test free mode sizes the flag and KV cache from the memory left free."""
+        busy = GPUInfo(
+            name="NVIDIA A100-SXM4-80GB",
+            vram_mib=81920,
+            vram_used_mib=20480,
+            vram_free_mib=61440,
+            processes=[GPUProcess(pid=4242, name="sidecar", used_mib=20480)],
+        )
+        args = ["plan", "--model", str(tmp_config_dir), "--params-b", "7", "--json"]
+
+        with patch("vllm_wizard.planning.planner.detect_gpus", return_value=[busy]) as detect:
+            total = json.loads(runner.invoke(app, args).stdout)
+            result = runner.invoke(app, args + ["--plan-against", "free"])
+
+        assert result.exit_code == 0
+        detect.assert_called_with(use_cache=False, processes=True)
+        free = json.loads(result.stdout)
+        assert free["config"]["gpu_memory_utilization"] == pytest.approx(0.9 * 0.75, abs=0.001)
+        assert free["feasibility"]["vram_target_alloc_gb"] == pytest.approx(54, abs=0.1)
+        assert free["feasibility"]["headroom_gb"] < total["feasibility"]["headroom_gb"] - 17
+        assert any("pid 4242 sidecar" in w for w in free["feasibility"]["warnings"])
+
+    def test_plan_against_free_needs_detection(self, tmp_config_dir: Path):
+        """Test free mode refuses a named GPU whose usage is unknown."""
+        result = runner.invoke(
+            app,
+            ["plan", "--model", str(tmp_config_dir), "--gpu", "H100", "--plan-against", "free"],
+        )
+
+        assert result.exit_code == 1
+        assert "live memory" in result.stdout
+
+
+class TestPlanTopology:
+    """Tests for placing TP groups on the detected GPU topology."""
+
+    # Two sockets of two L40S GPUs; only GPUs 2 and 3 share a PCIe switch
+    GPUS = [GPUInfo(name="NVIDIA L40S", vram_mib=46068, index=i) for i in range(4)]
+    TOPOLOGY = GPUTopology(
+        links=[
+            ["X", "NODE", "SYS", "SYS"],
+            ["NODE", "X", "SYS", "SYS"],
+            ["SYS", "SYS", "X", "PIX"],
+            ["SYS", "SYS", "PIX", "X"],
+        ],
+        numa_affinity=[0, 0, 1, 1],
+    )
+
+    def _plan(self, tmp_config_dir: Path, *extra: str) -> dict:
+        args = ["plan", "--model", str(tmp_config_dir), "--params-b", "7", "--json", *extra]
+        with patch("vllm_wizard.planning.planner.detect_gpus", return_value=self.GPUS), patch(
+            "vllm_wizard.planning.planner.detect_topology", return_value=self.TOPOLOGY
+        ):
+            result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.stdout
+        return json.loads(result.stdout)
+
+    def test_pins_best_connected_gpus(self, tmp_config_dir: Path):
+        """Test a TP=2 group takes the switch-connected pair and is pinned to it."""
+        data = self._plan(tmp_config_dir, "--gpus", "2", "--tp", "2")
+
+        assert data["config"]["cuda_visible_devices"] == "2,3"
+        assert data["artifacts"]["serve_command"].startswith("CUDA_VISIBLE_DEVICES=2,3 vllm")
+        assert "device=2,3" in data["artifacts"]["docker_command"]
+        assert 'device_ids: ["2", "3"]' in data["artifacts"]["docker_compose"]
+        assert not any("sockets" in w for w in data["feasibility"]["warnings"])
+
+    def test_memory_warning_names_physical_gpu(self, tmp_config_dir: Path):
+        """Test memory in use is reported on the nvidia-smi index, not the list position."""
+        busy = self.GPUS[3].model_copy(
+            update={
+                "vram_used_mib": 4096,
+                "vram_free_mib": 41972,
+                "processes": [GPUProcess(pid=4242, name="sidecar", used_mib=4096)],
+            }
+        )
+        gpus = [gpu.model_copy(update={"vram_free_mib": 46068}) for gpu in self.GPUS[:3]]
+        with patch.object(self, "GPUS", gpus + [busy]):
+            data = self._plan(tmp_config_dir, "--gpus", "2", "--tp", "2", "--plan-against", "free")
+
+        warnings = data["feasibility"]["warnings"]
+        assert data["config"]["cuda_visible_devices"] == "2,3"
+        assert any(w.startswith("GPU 3 (NVIDIA L40S): 4.0 GiB in use") for w in warnings)
+        assert not any(w.startswith("GPU 1 ") for w in warnings)
+
+    def test_cross_socket_tp_is_slower(self, tmp_config_dir: Path):
+        """Test TP across sockets is estimated slower than over NVLink and warned about."""
+        cross = self._plan(tmp_config_dir, "--gpus", "4", "--tp", "4")
+        nvlink = self._plan(tmp_config_dir, "--gpus", "4", "--tp", "4", "--interconnect", "nvlink")
+
+        assert cross["config"]["cuda_visible_devices"] is None
+        assert any("spans CPU sockets" in w for w in cross["feasibility"]["warnings"])
+        assert any("TP=2 within a socket" in w for w in cross["feasibility"]["warnings"])
+        assert (
+            cross["performance"]["decode_toks_per_s_range"][1]
+            < nvlink["performance"]["decode_toks_per_s_range"][1]
+        )
+
+
+class TestPlanBatch:
+    """Tests for plan --batch."""
+
+    def _write_requests(self, path: Path, count: int) -> Path:
+        lines = [
+            json.dumps(
+                {
+                    "model": {"model": f"model-{i}", "params_b": 7},
+                    "hardware": {"gpu": "RTX 4090"},
+                    "workload": {"concurrency": i + 1},
+                }
+            )
+            for i in range(count)
+        ]
+        lines.insert(1, "")  # Blank lines are skipped
+        lines.append("{not valid json")
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_batch_ndjson_output(self, tmp_path: Path, workers: str):
+        """Test every request yields one NDJSON line, errors included."""
+        batch_path = self._write_requests(tmp_path / "requests.jsonl", 5)
+
+        result = runner.invoke(app, ["plan", "--batch", str(batch_path), "--workers", workers])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len(records) == 6
+        by_index = {r["index"]: r for r in records}
+        assert sorted(by_index) == [0, 2, 3, 4, 5, 6]
+        assert "error" in by_index[6]
+        assert by_index[0]["response"]["feasibility"]["fits"] is True
+
+    def test_batch_missing_file(self, tmp_path: Path):
+        """Test a missing batch file is reported."""
+        result = runner.invoke(app, ["plan", "--batch", str(tmp_path / "missing.jsonl")])
+        assert result.exit_code == 1
+        assert "not found" in result.stdout
+
+    def test_plan_requires_model(self):
+        """Test plan without --model, --profile or --batch fails."""
+        result = runner.invoke(app, ["plan"])
+        assert result.exit_code == 1
+        assert "--model" in result.stdout
+
+
+class TestSweepCommand:
+    """Tests for the sweep command."""
+
+    def test_sweep_json_output(self, tmp_config_dir: Path):
+        """Test sweep returns the full feasibility matrix."""
+        result = runner.invoke(
+            app,
+            [
+                "sweep",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+                "--max-model-len", "1024:4096:1024",
+                "--concurrency", "1,2,4",
+                "--kv-cache-dtype", "auto",
+                "--quantization", "none,awq",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["context_lens"] == [1024, 2048, 3072, 4096]
+        assert len(data["fits"]) == 2
+        assert len(data["max_concurrency_at_context"][0][0]) == 4
+
+    def test_sweep_console_output(self, tmp_config_dir: Path):
+        """Test sweep console report."""
+        result = runner.invoke(
+            app,
+            [
+                "sweep",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Sweep" in result.stdout
+
+    def test_sweep_invalid_grid(self, tmp_config_dir: Path):
+        """Test sweep rejects malformed grid ranges."""
+        result = runner.invoke(
+            app,
+            [
+                "sweep",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+                "--concurrency", "1:2:3:4",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "Error" in result.stdout
+
+
+class TestSearchCommand:
+    """Tests for the search command."""
+
+    def test_search_json_output(self, tmp_config_dir: Path):
+        """Test search returns the frontier and pruning statistics."""
+        result = runner.invoke(
+            app,
+            [
+                "search",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+                "--gpus", "2",
+                "--max-model-len", "1024:4096:1024",
+                "--quantization", "none,awq",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["num_combinations"] == 2 * 2 * 2 * 4 * 9
+        assert data["num_evaluated"] + data["num_pruned"] == data["num_combinations"]
+        assert data["frontier"]
+        assert {p["tensor_parallel_size"] for p in data["frontier"]} <= {1, 2}
+
+    def test_search_console_output(self, tmp_config_dir: Path):
+        """Test search console report."""
+        result = runner.invoke(
+            app,
+            [
+                "search",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--limit", "5",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Pareto Frontier" in result.stdout
+
+
 class TestGenerateCommand:
     """Tests for the generate command."""
 
@@ -189,3 +652,285 @@ class TestVersion:
         result = runner.invoke(app, ["--version"])
         assert result.exit_code == 0
         assert "vllm-wizard version" in result.stdout
+
+
+class TestSimulateCommand:
+    """Tests for the simulate command."""
+
+    def test_simulate_json_output(self, tmp_config_dir: Path):
+        """Test simulate returns latency percentiles as JSON."""
+        result = runner.invoke(
+            app,
+            [
+                "simulate",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--rate", "2",
+                "--num-requests", "100",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["completed"] == 100
+        assert "p99" in data["ttft_ms"]
+
+    def test_simulate_console_output(self, tmp_config_dir: Path):
+        """Test simulate console report."""
+        result = runner.invoke(
+            app,
+            [
+                "simulate",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--num-requests", "50",
+                "--no-chunked-prefill",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Simulation" in result.stdout
+
+
+class TestTraceOption:
+    """Tests for request-log traces on the CLI."""
+
+    def _write_trace(self, tmp_path: Path) -> Path:
+        """Mostly short requests with a few long ones, one per 100 ms."""
+        lines = []
+        for i in range(200):
+            prompt, gen = (6000, 500) if i % 50 == 0 else (400, 150)
+            record = {"timestamp": 1000 + i * 0.1, "prompt_tokens": prompt, "gen_tokens": gen}
+            lines.append(json.dumps(record))
+        path = tmp_path / "requests.jsonl"
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def _plan(self, tmp_config_dir: Path, *extra: str) -> dict:
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--concurrency", "32",
+                "--json",
+                *extra,
+            ],
+        )
+        assert result.exit_code == 0
+        return json.loads(result.stdout)
+
+    def test_trace_shrinks_kv_cache(self, tmp_config_dir: Path, tmp_path: Path):
+        """Test KV is sized from trace lengths instead of concurrency x max_model_len."""
+        trace = self._write_trace(tmp_path)
+
+        worst_case = self._plan(tmp_config_dir, "--max-model-len", "8192")
+        traced = self._plan(tmp_config_dir, "--max-model-len", "8192", "--trace", str(trace))
+
+        assert traced["feasibility"]["kv_cache_gb"] < worst_case["feasibility"]["kv_cache_gb"] / 4
+        assert traced["feasibility"]["kv_trace_tokens"] < 32 * 8192
+
+    def test_trace_sets_max_model_len(self, tmp_config_dir: Path, tmp_path: Path):
+        """Test the context limit covers the longest traced request."""
+        data = self._plan(tmp_config_dir, "--trace", str(self._write_trace(tmp_path)))
+
+        assert data["config"]["max_model_len"] == 6500
+
+    def test_trace_command(self, tmp_path: Path):
+        """Test the trace command summarizes a log as JSON."""
+        result = runner.invoke(app, ["trace", str(self._write_trace(tmp_path)), "--json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["requests"] == 200
+        assert data["context_tokens"]["max"] == 6500
+        assert data["request_rate"] == pytest.approx(10.0)
+
+    def test_simulate_replays_trace(self, tmp_config_dir: Path, tmp_path: Path):
+        """Test simulate replays the first requests of a trace."""
+        result = runner.invoke(
+            app,
+            [
+                "simulate",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--trace", str(self._write_trace(tmp_path)),
+                "--num-requests", "50",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["completed"] == 50
+        assert "Arrivals: replayed trace" in data["assumptions"]
+
+
+class TestFleetCommand:
+    """Tests for the fleet command."""
+
+    def test_fleet_incremental(self, tmp_path: Path):
+        """Test a placement file feeds an incremental re-run."""
+        inventory = tmp_path / "inventory.yaml"
+        inventory.write_text(
+            "nodes:\n"
+            "  - {name: node-a, gpu: H100, gpus: 8}\n"
+            "  - {name: node-b, gpu: L4, gpus: 4}\n"
+        )
+        entries = tmp_path / "entries.yaml"
+        entries.write_text(
+            "entries:\n"
+            "  - {name: chat, model: {model: test-70b, params_b: 70, max_model_len: 4096}}\n"
+            "  - {name: embed, model: {model: test-1b, params_b: 1, max_model_len: 2048}}\n"
+        )
+        placement = tmp_path / "placement.json"
+
+        result = runner.invoke(
+            app,
+            ["fleet", "-i", str(inventory), "-e", str(entries), "-o", str(placement)],
+        )
+        assert result.exit_code == 0
+        assert "Fleet Placement" in result.stdout
+        assert placement.exists()
+
+        result = runner.invoke(
+            app,
+            [
+                "fleet",
+                "-i", str(inventory),
+                "-e", str(entries),
+                "--previous", str(placement),
+                "--json",
+            ],
+        )
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert sorted(data["kept"]) == ["chat", "embed"]
+        nodes = {p["entry"]: p["node"] for p in data["placements"]}
+        assert nodes == {"chat": "node-a", "embed": "node-b"}
+
+    def test_fleet_missing_inventory(self, tmp_path: Path):
+        """Test a missing inventory file is an error."""
+        entries = tmp_path / "entries.yaml"
+        entries.write_text("entries: []\n")
+
+        result = runner.invoke(
+            app, ["fleet", "-i", str(tmp_path / "missing.yaml"), "-e", str(entries)]
+        )
+        assert result.exit_code == 1
+        assert "not found" in result.stdout
+
+
+class TestMigCommand:
+    """Tests for the mig command."""
+
+    def test_mig_layout(self, tmp_path: Path):
+        """Test entries are laid out on MIG instances of one GPU."""
+        entries = tmp_path / "entries.yaml"
+        entries.write_text(
+            "entries:\n"
+            "  - {name: chat, model: {model: test-8b, params_b: 8, max_model_len: 4096}}\n"
+            "  - {name: embed, model: {model: test-1b, params_b: 1, max_model_len: 2048}}\n"
+        )
+
+        result = runner.invoke(app, ["mig", "--gpu", "H100", "-e", str(entries), "--json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert {s["entry"] for s in data["slices"]} == {"chat", "embed"}
+        assert "nvidia-smi mig -cgi" in data["setup_command"]
+
+    def test_plan_on_mig_instance(self, tmp_config_dir: Path):
+        """Test a MIG instance is planned with its memory and without TP."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "1",
+                "--gpu", "2x H100 MIG 1g.10gb",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert data["config"]["tensor_parallel_size"] == 1
+        assert data["feasibility"]["vram_total_gb"] < 10
+
+
+class TestColocateOption:
+    """Tests for planning several engines on the same GPUs."""
+
+    def test_plan_colocate_json(self, tmp_config_dir: Path):
+        """Test each engine gets a share as its own utilization flag."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "A100 80GB",
+                "--max-model-len", "4096",
+                "--colocate", "model=small-1b,params_b=1,max_model_len=2048,concurrency=4",
+                "--colocate", "model=small-3b,params_b=3,max_model_len=2048",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        engines = data["colocation"]["engines"]
+        assert [e["model"] for e in engines[1:]] == ["small-1b", "small-3b"]
+        assert [e["port"] for e in engines] == [8000, 8001, 8002]
+        assert data["colocation"]["fits"]
+
+        for engine in engines:
+            assert engine["gpu_memory_utilization"] == engine["memory_fraction"]
+            assert engine["feasibility"]["fits"]
+        assert sum(e["gpu_memory_utilization"] for e in engines) <= 0.9
+        assert data["colocation"]["total_memory_fraction"] == pytest.approx(
+            sum(e["memory_fraction"] for e in engines), abs=0.001
+        )
+
+        compose = data["artifacts"]["docker_compose"]
+        assert compose.count("image: vllm/vllm-openai") == 3
+        assert "condition: service_healthy" in compose
+        assert "--gpu-memory-utilization " + str(engines[2]["gpu_memory_utilization"]) in compose
+
+    def test_colocate_does_not_fit(self, tmp_config_dir: Path):
+        """Test engines too large to share a GPU are flagged."""
+        result = runner.invoke(
+            app,
+            [
+                "plan",
+                "--model", str(tmp_config_dir),
+                "--params-b", "7",
+                "--gpu", "RTX 4090",
+                "--max-model-len", "4096",
+                "--colocate", "model=other-7b,params_b=7,max_model_len=4096",
+                "--json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)
+        assert not data["colocation"]["fits"]
+        assert not data["feasibility"]["fits"]
+        assert any("does not fit in its" in w for w in data["feasibility"]["warnings"])
+
+    def test_colocate_invalid_field(self, tmp_config_dir: Path):
+        """Test unknown engine fields are rejected."""
+        result = runner.invoke(
+            app,
+            ["plan", "--model", str(tmp_config_dir), "--colocate", "model=x,colour=blue"],
+        )
+
+        assert result.exit_code == 1
+        assert "Unknown co-located engine field" in result.stdout
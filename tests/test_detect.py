@@ -0,0 +1,300 @@
+"""Tests for GPU detection against a fake nvidia-smi."""
+
+import os
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from vllm_wizard.hardware import detect
+from vllm_wizard.hardware.detect import (
+    cuda_version_for_driver,
+    detect_gpus,
+    detect_topology,
+    parse_topology,
+)
+from vllm_wizard.schemas.inputs import Interconnect
+
+# Two sockets, each with two GPUs on one PCIe switch, plus a NIC column
+PCIE_TWO_SOCKET_TOPOLOGY = (
+    "\tGPU0\tGPU1\tGPU2\tGPU3\tNIC0\tCPU Affinity\tNUMA Affinity\tGPU NUMA ID\n"
+    "GPU0\t X \tNODE\tSYS\tSYS\tNODE\t0-31,64-95\t0\t\tN/A\n"
+    "GPU1\tNODE\t X \tSYS\tSYS\tPIX\t0-31,64-95\t0\t\tN/A\n"
+    "GPU2\tSYS\tSYS\t X \tPIX\tSYS\t32-63,96-127\t1\t\tN/A\n"
+    "GPU3\tSYS\tSYS\tPIX\t X \tSYS\t32-63,96-127\t1\t\tN/A\n"
+    "NIC0\tNODE\tPIX\tSYS\tSYS\t X \n"
+    "\n"
+    "Legend:\n"
+    "\n"
+    "  X    = Self\n"
+    "  SYS  = Connection traversing PCIe as well as the SMP interconnect between NUMA nodes\n"
+)
+
+NVLINK_PAIRS_TOPOLOGY = """        GPU0    GPU1    GPU2    GPU3    CPU Affinity    NUMA Affinity
+GPU0     X      NV4     SYS     SYS     0-15    0
+GPU1    NV4      X      SYS     SYS     0-15    0
+GPU2    SYS     SYS      X      NV4     16-31   1
+GPU3    SYS     SYS     NV4      X      16-31   1
+"""
+
+FAKE_NVIDIA_SMI = """#!/bin/sh
+echo "$@" >> "{calls}"
+case "$*" in
+  *compute_cap*)
+    echo "NVIDIA H100 80GB HBM3, 81559, 535.104.05, 9.0, Disabled, 6656, 74903, GPU-0000"
+    echo "NVIDIA H100 80GB HBM3, 81559, 535.104.05, 9.0, Disabled, 0, 81559, GPU-1111"
+    ;;
+  *compute-apps*)
+    echo "GPU-0000, 4242, 6144, /usr/bin/python3"
+    echo "GPU-0000, 4343, 512, sidecar, v2"
+    ;;
+  "topo -m")
+    printf "\tGPU0\tGPU1\tCPU Affinity\tNUMA Affinity\n"
+    printf "GPU0\t X \tNV18\t0-47\t0\n"
+    printf "GPU1\tNV18\t X \t0-47\t0\n"
+    ;;
+  *)
+    exit 6
+    ;;
+esac
+"""
+
+FAKE_OLD_NVIDIA_SMI = """#!/bin/sh
+echo "$@" >> "{calls}"
+case "$*" in
+  *compute_cap*)
+    echo 'Field "compute_cap" is not a valid field to query.'
+    exit 2
+    ;;
+  *)
+    echo "Tesla V100-SXM2-32GB, 32768, 470.82.01, [N/A], 0, 32768, GPU-2222"
+    ;;
+esac
+"""
+
+FAKE_MIG_NVIDIA_SMI = """#!/bin/sh
+echo "$@" >> "{calls}"
+case "$*" in
+  *compute_cap*)
+    echo "NVIDIA A100-SXM4-80GB, 81920, 535.104.05, 8.0, Enabled, 0, 81920, GPU-5d5ba0d6"
+    echo "NVIDIA A100-SXM4-80GB, 81920, 535.104.05, 8.0, Disabled, 0, 81920, GPU-1b2c3d4e"
+    ;;
+  -L)
+    echo "GPU 0: NVIDIA A100-SXM4-80GB (UUID: GPU-5d5ba0d6-d33d-2b2c-524d-9e3d8d2b8a77)"
+    echo "  MIG 3g.40gb     Device  0: (UUID: MIG-c6d4f1ef-42e4-5de3-91c7-45d71c87eb3f)"
+    echo "  MIG 1g.10gb     Device  1: (UUID: MIG-cba663e8-9bed-5b25-b243-5985ef7c9beb)"
+    echo "GPU 1: NVIDIA A100-SXM4-80GB (UUID: GPU-1b2c3d4e-d33d-2b2c-524d-9e3d8d2b8a77)"
+    ;;
+  *)
+    exit 6
+    ;;
+esac
+"""
+
+
+@pytest.fixture
+def fake_nvidia_smi(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Install a fake nvidia-smi on PATH and return a call counter."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls.log"
+    proc_dir = tmp_path / "proc"
+    (proc_dir / "gpus" / "0000:01:00.0").mkdir(parents=True)
+    (proc_dir / "version").write_text("NVRM version: NVIDIA UNIX Kernel Module  535.104.05\n")
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(detect, "NVIDIA_PROC_DIR", proc_dir)
+
+    def install(script: str = FAKE_NVIDIA_SMI):
+        smi = bin_dir / "nvidia-smi"
+        smi.write_text(script.format(calls=calls))
+        smi.chmod(smi.stat().st_mode | stat.S_IEXEC)
+
+    def count() -> int:
+        return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+    install()
+    install.count = count
+    install.proc_dir = proc_dir
+    return install
+
+
+class TestDetectGpus:
+    """Tests for detect_gpus."""
+
+    def test_single_query(self, fake_nvidia_smi):
+        """Test all fields come from one nvidia-smi call."""
+        gpus = detect_gpus(use_cache=False)
+
+        assert fake_nvidia_smi.count() == 1
+        assert len(gpus) == 2
+        assert gpus[0].name == "NVIDIA H100 80GB HBM3"
+        assert gpus[0].vram_mib == 81559
+        assert gpus[0].driver_version == "535.104.05"
+        assert gpus[0].compute_capability == "9.0"
+        assert gpus[0].cuda_version == "12.2"
+        assert gpus[0].vram_free_mib == 74903
+        assert gpus[0].processes == []
+        assert [gpu.index for gpu in gpus] == [0, 1]
+
+    def test_processes(self, fake_nvidia_smi):
+        """Test processes are matched to their GPU by UUID."""
+        gpus = detect_gpus(use_cache=False, processes=True)
+
+        assert fake_nvidia_smi.count() == 2
+        assert [(p.pid, p.name) for p in gpus[0].processes] == [
+            (4242, "/usr/bin/python3"),
+            (4343, "sidecar, v2"),
+        ]
+        assert gpus[1].processes == []
+
+    def test_old_driver_fallback(self, fake_nvidia_smi):
+        """Test drivers without compute_cap still detect GPUs."""
+        fake_nvidia_smi(FAKE_OLD_NVIDIA_SMI)
+        gpus = detect_gpus(use_cache=False)
+
+        assert len(gpus) == 1
+        assert gpus[0].compute_capability is None
+        assert gpus[0].cuda_version == "11.4"
+
+    def test_cache_skips_subprocess(self, fake_nvidia_smi):
+        """Test a second detection is served from the cache."""
+        first = detect_gpus()
+        second = detect_gpus()
+
+        assert fake_nvidia_smi.count() == 1
+        assert second == first
+
+    def test_cache_ttl_expiry(self, fake_nvidia_smi, monkeypatch: pytest.MonkeyPatch):
+        """Test an expired cache triggers a new query."""
+        detect_gpus()
+        later = time.time() + 2 * detect.DETECTION_CACHE_TTL_S
+        monkeypatch.setattr(detect.time, "time", lambda: later)
+        detect_gpus()
+
+        assert fake_nvidia_smi.count() == 2
+
+    def test_cache_invalidated_by_driver_change(self, fake_nvidia_smi):
+        """Test a driver upgrade invalidates the cache."""
+        detect_gpus()
+        (fake_nvidia_smi.proc_dir / "version").write_text(
+            "NVRM version: NVIDIA UNIX Kernel Module  550.54.15\n"
+        )
+        detect_gpus()
+
+        assert fake_nvidia_smi.count() == 2
+
+    def test_mig_instances(self, fake_nvidia_smi):
+        """Test GPUs in MIG mode are replaced by their instances."""
+        fake_nvidia_smi(FAKE_MIG_NVIDIA_SMI)
+        gpus = detect_gpus(use_cache=False)
+
+        assert fake_nvidia_smi.count() == 2
+        assert [gpu.mig_profile for gpu in gpus] == ["3g.40gb", "1g.10gb", None]
+        assert gpus[0].name == "NVIDIA A100-SXM4-80GB MIG 3g.40gb"
+        assert gpus[0].uuid == "MIG-c6d4f1ef-42e4-5de3-91c7-45d71c87eb3f"
+        assert gpus[0].vram_mib == 38146
+        assert gpus[0].driver_version == "535.104.05"
+        assert gpus[0].vram_free_mib is None
+        assert gpus[2].vram_mib == 81920
+
+    def test_mig_instances_invalidate_cache(self, fake_nvidia_smi):
+        """Test creating a MIG instance invalidates the cache."""
+        detect_gpus()
+        (fake_nvidia_smi.proc_dir / "capabilities" / "gpu0" / "mig" / "gi1").mkdir(parents=True)
+        detect_gpus()
+
+        assert fake_nvidia_smi.count() == 2
+
+    def test_no_nvidia_smi(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        """Test missing nvidia-smi returns an empty list."""
+        monkeypatch.setenv("PATH", str(tmp_path))
+        assert detect_gpus() == []
+
+
+class TestTopology:
+    """Tests for `nvidia-smi topo -m` parsing and TP group selection."""
+
+    def test_parse_matrix(self):
+        """Test links and NUMA affinity are read and NIC columns ignored."""
+        topology = parse_topology(PCIE_TWO_SOCKET_TOPOLOGY)
+
+        assert topology is not None
+        assert topology.gpu_count == 4
+        assert topology.links[0] == ["X", "NODE", "SYS", "SYS"]
+        assert topology.link(2, 3) == "PIX"
+        assert topology.numa_affinity == [0, 0, 1, 1]
+        assert topology.cpu_affinity[2] == "32-63,96-127"
+
+    def test_parse_space_aligned(self):
+        """Test a matrix aligned with spaces instead of tabs."""
+        topology = parse_topology(NVLINK_PAIRS_TOPOLOGY)
+
+        assert topology is not None
+        assert topology.link(0, 1) == "NV4"
+        assert topology.numa_nodes([0, 2]) == [0, 1]
+
+    def test_parse_garbage(self):
+        """Test output without a GPU matrix gives None."""
+        assert parse_topology("") is None
+        assert parse_topology("No devices were found") is None
+
+    def test_best_group_stays_on_one_socket(self):
+        """Test the best pair shares a PCIe switch rather than crossing sockets."""
+        topology = parse_topology(PCIE_TWO_SOCKET_TOPOLOGY)
+
+        assert topology.best_group(2) == [2, 3]
+        assert topology.best_group(2, among=[0, 1, 2]) == [0, 1]
+        assert topology.best_group(4) == [0, 1, 2, 3]
+
+    def test_group_interconnect(self):
+        """Test the worst link of a group sets its interconnect."""
+        pcie = parse_topology(PCIE_TWO_SOCKET_TOPOLOGY)
+        nvlink = parse_topology(NVLINK_PAIRS_TOPOLOGY)
+
+        assert nvlink.group_interconnect([0, 1]) == Interconnect.NVLINK
+        assert nvlink.group_interconnect([0, 1, 2, 3]) == Interconnect.CROSS_SOCKET
+        assert pcie.group_interconnect([0, 1]) == Interconnect.PCIE
+        assert pcie.group_interconnect([1, 2]) == Interconnect.CROSS_SOCKET
+
+    def test_large_node_uses_greedy_search(self):
+        """Test a node too large to score every group still finds an NVLink quad."""
+        links = [
+            ["X" if a == b else ("NV4" if a // 4 == b // 4 else "SYS") for b in range(32)]
+            for a in range(32)
+        ]
+        topology = detect.GPUTopology(links=links)
+
+        group = topology.best_group(4)
+        assert group == [0, 1, 2, 3]
+        assert topology.group_interconnect(group) == Interconnect.NVLINK
+
+    def test_detect_topology_cached(self, fake_nvidia_smi):
+        """Test the topology is read once and then served from the cache."""
+        first = detect_topology()
+        second = detect_topology()
+
+        assert fake_nvidia_smi.count() == 1
+        assert first == second
+        assert first.group_interconnect([0, 1]) == Interconnect.NVLINK
+
+
+class TestCudaVersionForDriver:
+    """Tests for driver to CUDA version mapping."""
+
+    @pytest.mark.parametrize(
+        "driver,cuda",
+        [
+            ("535.104.05", "12.2"),
+            ("550.54.14", "12.4"),
+            ("550.54.13", "12.3"),
+            ("570.86.10", "12.8"),
+            ("440.33.01", None),
+            (None, None),
+            ("garbage", None),
+        ],
+    )
+    def test_mapping(self, driver, cuda):
+        """Test minimum driver boundaries."""
+        assert cuda_version_for_driver(driver) == cuda
@@ -0,0 +1,149 @@
+"""Tests for fleet bin-packing."""
+
+import time
+from typing import Callable
+
+import pytest
+
+from vllm_wizard.planning.fleet import place_fleet, size_entry
+from vllm_wizard.schemas.fleet import FleetEntry, FleetInventory, FleetNode
+from vllm_wizard.schemas.inputs import WorkloadInput
+
+
+def make_inventory(*nodes: tuple[str, str, int]) -> FleetInventory:
+    """Inventory from (name, gpu, gpus) tuples."""
+    return FleetInventory(
+        nodes=[FleetNode(name=name, gpu=gpu, gpus=gpus) for name, gpu, gpus in nodes]
+    )
+
+
+class TestSizeEntry:
+    """Tests for per-GPU-type sizing."""
+
+    def test_smallest_tp_that_fits(self, make_entry: Callable[..., FleetEntry]):
+        """Test a 70B model needs more 80 GB GPUs than an 8B model."""
+        node = FleetNode(name="a", gpu="H100", gpus=8)
+
+        assert size_entry(make_entry("small", 8), node, 8).tensor_parallel_size == 1
+        assert size_entry(make_entry("large", 70), node, 8).tensor_parallel_size > 1
+
+    def test_too_large_raises(self, make_entry: Callable[..., FleetEntry]):
+        """Test a model that never fits reports why."""
+        node = FleetNode(name="a", gpu="L4", gpus=2)
+
+        with pytest.raises(ValueError, match="does not fit"):
+            size_entry(make_entry("huge", 405), node, 2)
+
+
+class TestPlaceFleet:
+    """Tests for best-fit decreasing placement."""
+
+    def test_packs_onto_fewest_gpus(self, make_entry: Callable[..., FleetEntry]):
+        """Test small models share a node instead of spreading out."""
+        inventory = make_inventory(("a", "H100", 8), ("b", "H100", 8))
+        plan = place_fleet(inventory, [make_entry(f"m{i}", 8) for i in range(4)])
+
+        assert not plan.unplaced
+        assert plan.gpus_used == 4
+        assert plan.nodes_used == 1
+        indices = [i for p in plan.placements for i in p.gpu_indices]
+        assert sorted(indices) == [0, 1, 2, 3]
+
+    def test_tp_groups_stay_within_a_node(self, make_entry: Callable[..., FleetEntry]):
+        """Test TP groups are aligned blocks on a single node."""
+        inventory = make_inventory(("a", "H100", 8), ("b", "H100", 8))
+        entries = [make_entry("large", 70)] + [make_entry(f"m{i}", 8) for i in range(7)]
+        plan = place_fleet(inventory, entries)
+
+        large = next(p for p in plan.placements if p.entry == "large")
+        start, tp_size = large.gpu_indices[0], large.tensor_parallel_size
+        assert large.gpu_indices == list(range(start, start + tp_size))
+        assert start % tp_size == 0
+        assert "CUDA_VISIBLE_DEVICES=" in large.serve_command
+        for node in ("a", "b"):
+            used = [i for p in plan.placements if p.node == node for i in p.gpu_indices]
+            assert len(used) == len(set(used))
+
+    def test_small_models_take_small_gpus(self, make_entry: Callable[..., FleetEntry]):
+        """Test an entry fitting either GPU type leaves the larger GPU free."""
+        inventory = make_inventory(("big", "H100", 1), ("small", "L4", 1))
+        plan = place_fleet(inventory, [make_entry("tiny", 1)])
+
+        assert plan.placements[0].node == "small"
+
+    def test_unplaced_when_full(self, make_entry: Callable[..., FleetEntry]):
+        """Test entries beyond capacity are reported, not dropped."""
+        inventory = make_inventory(("a", "H100", 2))
+        plan = place_fleet(inventory, [make_entry(f"m{i}", 8) for i in range(3)])
+
+        assert len(plan.placements) == 2
+        assert [u.entry for u in plan.unplaced] == ["m2"]
+        assert "free GPU" in plan.unplaced[0].reason
+
+    def test_duplicate_names_rejected(self, make_entry: Callable[..., FleetEntry]):
+        """Test entries must have unique names."""
+        with pytest.raises(ValueError, match="Duplicate entry"):
+            place_fleet(make_inventory(("a", "H100", 2)), [make_entry("x", 8)] * 2)
+
+    def test_hundreds_of_entries_are_fast(self, make_entry: Callable[..., FleetEntry]):
+        """Test placement scales to hundreds of entries and nodes."""
+        inventory = FleetInventory(
+            nodes=[FleetNode(name=f"h{i}", gpu="H100", gpus=8) for i in range(50)]
+            + [FleetNode(name=f"l{i}", gpu="L4", gpus=4) for i in range(50)]
+        )
+        sizes = [1, 3, 8, 14, 34, 70]
+        entries = [make_entry(f"e{i}", sizes[i % len(sizes)]) for i in range(500)]
+
+        start = time.perf_counter()
+        plan = place_fleet(inventory, entries)
+        elapsed = time.perf_counter() - start
+
+        assert len(plan.placements) + len(plan.unplaced) == 500
+        assert plan.gpus_used <= plan.gpus_total
+        assert elapsed < 3.0
+
+
+class TestIncrementalPlacement:
+    """Tests for re-placing only changed entries."""
+
+    def test_unchanged_entries_stay(self, make_entry: Callable[..., FleetEntry]):
+        """Test a change to one entry moves nothing else."""
+        inventory = make_inventory(("a", "H100", 8), ("b", "H100", 8))
+        entries = [make_entry("large", 70)] + [make_entry(f"m{i}", 8) for i in range(6)]
+        first = place_fleet(inventory, entries)
+
+        changed = list(entries)
+        changed[3] = make_entry("m2", 8, workload=WorkloadInput(concurrency=8))
+        second = place_fleet(inventory, changed, previous=first)
+
+        assert "m2" not in second.kept
+        assert len(second.kept) == len(entries) - 1
+        before = {p.entry: (p.node, p.gpu_indices) for p in first.placements}
+        after = {p.entry: (p.node, p.gpu_indices) for p in second.placements}
+        for name in second.kept:
+            assert after[name] == before[name]
+        # The changed entry still fits where it was
+        assert after["m2"] == before["m2"]
+
+    def test_removed_entries_free_their_gpus(self, make_entry: Callable[..., FleetEntry]):
+        """Test a new entry can reuse GPUs released by a removed one."""
+        inventory = make_inventory(("a", "H100", 2))
+        first = place_fleet(inventory, [make_entry("old", 8), make_entry("keep", 8)])
+
+        second = place_fleet(
+            inventory, [make_entry("keep", 8), make_entry("new", 8)], previous=first
+        )
+
+        assert second.kept == ["keep"]
+        assert not second.unplaced
+        old = next(p for p in first.placements if p.entry == "old")
+        new = next(p for p in second.placements if p.entry == "new")
+        assert new.gpu_indices == old.gpu_indices
+
+    def test_vanished_node_replaces(self, make_entry: Callable[..., FleetEntry]):
+        """Test entries on a node missing from the inventory are placed again."""
+        first = place_fleet(make_inventory(("a", "H100", 1)), [make_entry("m", 8)])
+        second = place_fleet(make_inventory(("b", "H100", 1)), [make_entry("m", 8)], first)
+
+        assert second.kept == []
+        assert second.placements[0].node == "b"
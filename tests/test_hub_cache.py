@@ -0,0 +1,107 @@
+"""Tests for offline Hugging Face hub cache resolution."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from vllm_wizard.models.hub_cache import get_hf_hub_cache, resolve_hub_snapshot
+from vllm_wizard.models.metadata import load_model_metadata
+
+COMMIT_A = "a" * 40
+COMMIT_B = "b" * 40
+
+
+def add_snapshot(hub_dir: Path, model_id: str, commit: str, config: dict, ref: str = "") -> Path:
+    """Create a cached snapshot, optionally pointed to by a ref."""
+    repo_dir = hub_dir / ("models--" + model_id.replace("/", "--"))
+    snapshot = repo_dir / "snapshots" / commit
+    snapshot.mkdir(parents=True)
+    (snapshot / "config.json").write_text(json.dumps(config))
+    if ref:
+        (repo_dir / "refs").mkdir(exist_ok=True)
+        (repo_dir / "refs" / ref).write_text(commit)
+    return snapshot
+
+
+class TestHubCacheDir:
+    """Tests for get_hf_hub_cache."""
+
+    def test_hf_hub_cache(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        """Test HF_HUB_CACHE takes precedence."""
+        monkeypatch.setenv("HF_HUB_CACHE", str(tmp_path / "hub"))
+        monkeypatch.setenv("HF_HOME", str(tmp_path / "home"))
+        assert get_hf_hub_cache() == tmp_path / "hub"
+
+    def test_hf_home(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        """Test HF_HOME/hub is used without HF_HUB_CACHE."""
+        monkeypatch.delenv("HF_HUB_CACHE", raising=False)
+        monkeypatch.delenv("HUGGINGFACE_HUB_CACHE", raising=False)
+        monkeypatch.setenv("HF_HOME", str(tmp_path / "home"))
+        assert get_hf_hub_cache() == tmp_path / "home" / "hub"
+
+    def test_xdg_default(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        """Test the XDG cache default."""
+        for var in ("HF_HUB_CACHE", "HUGGINGFACE_HUB_CACHE", "HF_HOME"):
+            monkeypatch.delenv(var, raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert get_hf_hub_cache() == tmp_path / "huggingface" / "hub"
+
+
+class TestResolveSnapshot:
+    """Tests for resolve_hub_snapshot."""
+
+    def test_main_ref(self, hf_hub_cache: Path, llama_config: dict):
+        """Test refs/main selects the snapshot by default."""
+        add_snapshot(hf_hub_cache, "org/model", COMMIT_A, llama_config)
+        expected = add_snapshot(hf_hub_cache, "org/model", COMMIT_B, llama_config, ref="main")
+        assert resolve_hub_snapshot("org/model") == expected
+
+    def test_branch_and_commit(self, hf_hub_cache: Path, llama_config: dict):
+        """Test revisions resolve through refs/ or as commit hashes."""
+        main = add_snapshot(hf_hub_cache, "org/model", COMMIT_A, llama_config, ref="main")
+        dev = add_snapshot(hf_hub_cache, "org/model", COMMIT_B, llama_config, ref="dev")
+
+        assert resolve_hub_snapshot("org/model", "dev") == dev
+        assert resolve_hub_snapshot("org/model", COMMIT_A) == main
+
+    def test_unknown_revision(self, hf_hub_cache: Path, llama_config: dict):
+        """Test an unresolvable revision does not fall back to another snapshot."""
+        add_snapshot(hf_hub_cache, "org/model", COMMIT_A, llama_config, ref="main")
+        assert resolve_hub_snapshot("org/model", "v2.0") is None
+
+    def test_without_refs(self, hf_hub_cache: Path, llama_config: dict):
+        """Test a snapshot is found when refs/ is missing."""
+        expected = add_snapshot(hf_hub_cache, "org/model", COMMIT_A, llama_config)
+        assert resolve_hub_snapshot("org/model") == expected
+
+    def test_not_cached(self):
+        """Test uncached models return None."""
+        assert resolve_hub_snapshot("org/missing") is None
+        assert resolve_hub_snapshot("../escape") is None
+
+
+class TestLoadFromHubCache:
+    """Tests for load_model_metadata with cached models."""
+
+    def test_cached_config_beats_size_table(self, hf_hub_cache: Path, llama_gqa_config: dict):
+        """Test a cached config is used instead of the known-size estimate."""
+        add_snapshot(hf_hub_cache, "meta-llama/Llama-3.1-8B", COMMIT_A, llama_gqa_config, ref="main")
+
+        metadata = load_model_metadata("meta-llama/Llama-3.1-8B")
+
+        assert metadata.num_key_value_heads == 8
+        assert metadata.vocab_size == 128256
+
+    def test_revision(self, hf_hub_cache: Path, llama_config: dict, llama_gqa_config: dict):
+        """Test --revision selects the cached snapshot."""
+        add_snapshot(hf_hub_cache, "org/custom", COMMIT_A, llama_config, ref="main")
+        add_snapshot(hf_hub_cache, "org/custom", COMMIT_B, llama_gqa_config, ref="gqa")
+
+        assert load_model_metadata("org/custom").num_key_value_heads == 32
+        assert load_model_metadata("org/custom", revision="gqa").num_key_value_heads == 8
+
+    def test_uncached_unknown_model(self):
+        """Test uncached, unknown models still ask for --params-b."""
+        with pytest.raises(ValueError, match="--params-b"):
+            load_model_metadata("org/unknown")
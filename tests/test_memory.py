@@ -1,16 +1,30 @@
 """Tests for memory calculations."""
 
+from dataclasses import replace
+
 import pytest
 
 from vllm_wizard.models.metadata import ModelMetadata
 from vllm_wizard.planning.memory import (
     BYTES_TO_GIB,
+    compute_activation_memory,
+    compute_blocks_per_seq,
+    compute_cuda_graph_memory,
     compute_feasibility,
+    compute_kv_block_bytes,
     compute_kv_cache_memory,
     compute_max_concurrency_at_context,
     compute_max_context_at_concurrency,
+    compute_num_gpu_blocks,
     compute_overhead,
     compute_weights_memory,
+    compute_weights_per_rank,
+    cuda_graph_capture_sizes,
+    free_memory_at_start,
+    is_valid_tp_size,
+    kv_heads_per_rank,
+    pipeline_stage_layers,
+    split_memory_utilization,
 )
 from vllm_wizard.schemas.inputs import DType, KVCacheDType, Quantization
 from vllm_wizard.schemas.outputs import OOMRisk
@@ -230,6 +244,324 @@ class TestFeasibility:
         assert result.fits is True
 
 
+class TestActivationMemory:
+    """Tests for the profile-run activation peak."""
+
+    def test_formula(self, llama_8b_metadata: ModelMetadata):
+        """Test MLP intermediates plus fp32 sampler buffers."""
+        # 8192 tokens * (2 * 4096 + 3 * 14336) * 2 bytes
+        mlp = 8192 * (2 * 4096 + 3 * 14336) * 2
+        # 256 sampled sequences * 128256 vocab * 4 bytes * 3 buffers
+        sampler = 256 * 128256 * 4 * 3
+        assert compute_activation_memory(llama_8b_metadata, 8192, 256) == mlp + sampler
+
+    def test_grows_with_token_budget(self, llama_8b_metadata: ModelMetadata):
+        """Test a larger batched-token budget raises the peak."""
+        small = compute_activation_memory(llama_8b_metadata, 2048)
+        large = compute_activation_memory(llama_8b_metadata, 32768)
+        assert large > 4 * small
+
+    def test_tp_shards_mlp(self, llama_8b_metadata: ModelMetadata):
+        """Test tensor parallelism shards the MLP intermediates."""
+        tp1 = compute_activation_memory(llama_8b_metadata, 8192, tp_size=1)
+        tp4 = compute_activation_memory(llama_8b_metadata, 8192, tp_size=4)
+        assert tp4 < tp1
+
+    def test_moe_routes_tokens_to_experts(self, llama_8b_metadata: ModelMetadata):
+        """Test MoE layers hold intermediates for every routed expert."""
+        dense = compute_activation_memory(llama_8b_metadata, 8192)
+        llama_8b_metadata.num_experts = 8
+        llama_8b_metadata.num_experts_per_tok = 2
+        assert compute_activation_memory(llama_8b_metadata, 8192) > dense
+
+    def test_reduces_kv_blocks(self, llama_metadata: ModelMetadata):
+        """Test activations come out of the KV budget."""
+        kwargs = dict(
+            weights_bytes=int(14 * BYTES_TO_GIB),
+            kv_cache_bytes=int(2 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(24 * BYTES_TO_GIB),
+            gpu_memory_utilization=1.0,
+            metadata=llama_metadata,
+            kv_dtype=KVCacheDType.FP16,
+        )
+        without = compute_feasibility(**kwargs)
+        with_act = compute_feasibility(**kwargs, activation_bytes=int(2 * BYTES_TO_GIB))
+
+        # 2 GiB of 8 MiB blocks
+        assert without.num_gpu_blocks - with_act.num_gpu_blocks == 256
+        assert with_act.activation_gb == pytest.approx(2.0)
+        assert with_act.headroom_gb == pytest.approx(without.headroom_gb - 2.0)
+
+
+class TestCudaGraphMemory:
+    """Tests for decode CUDA graph capture memory."""
+
+    def test_capture_sizes(self):
+        """Test one size expands to vLLM's pattern, capped at max_num_seqs."""
+        assert cuda_graph_capture_sizes(20) == [1, 2, 4, 8, 16]
+        assert cuda_graph_capture_sizes(256, [32]) == [1, 2, 4, 8, 16, 24, 32]
+        assert cuda_graph_capture_sizes(256, [1, 64, 512]) == [1, 64]
+        assert len(cuda_graph_capture_sizes(1024)) == 67
+
+    def test_eager_uses_no_memory(self, llama_metadata: ModelMetadata):
+        """Test enforce_eager captures nothing."""
+        assert compute_cuda_graph_memory(llama_metadata, []) == 0
+
+    def test_grows_with_capture_sizes(self, llama_metadata: ModelMetadata):
+        """Test more and larger captured batches hold more memory."""
+        small = compute_cuda_graph_memory(llama_metadata, cuda_graph_capture_sizes(8))
+        large = compute_cuda_graph_memory(llama_metadata, cuda_graph_capture_sizes(512))
+        assert large > 10 * small
+        assert large < 1 * BYTES_TO_GIB
+
+    def test_reduces_kv_blocks(self, llama_metadata: ModelMetadata):
+        """Test graph memory comes out of the KV budget."""
+        kwargs = dict(
+            weights_bytes=int(14 * BYTES_TO_GIB),
+            kv_cache_bytes=int(2 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(24 * BYTES_TO_GIB),
+            gpu_memory_utilization=1.0,
+            metadata=llama_metadata,
+            kv_dtype=KVCacheDType.FP16,
+        )
+        eager = compute_feasibility(**kwargs)
+        graphs = compute_feasibility(**kwargs, cuda_graph_bytes=int(0.5 * BYTES_TO_GIB))
+
+        assert eager.num_gpu_blocks - graphs.num_gpu_blocks == 64
+        assert graphs.cuda_graph_gb == pytest.approx(0.5)
+
+
+class TestTensorParallelRank:
+    """Tests for the per-rank tensor-parallel memory model."""
+
+    def test_kv_heads_replicated(self):
+        """Test KV heads split across ranks, one replica each once heads run out."""
+        assert kv_heads_per_rank(8, 1) == 8
+        assert kv_heads_per_rank(8, 4) == 2
+        assert kv_heads_per_rank(8, 8) == 1
+        assert kv_heads_per_rank(8, 16) == 1
+
+    def test_valid_tp_sizes_shard_kv_heads(self, llama_8b_metadata: ModelMetadata):
+        """Test TP sizes must split the KV heads, or be a multiple of them."""
+        metadata = replace(llama_8b_metadata, num_attention_heads=40)
+
+        assert [tp for tp in range(1, 11) if is_valid_tp_size(metadata, tp)] == [1, 2, 4, 8]
+        assert is_valid_tp_size(llama_8b_metadata, 16)
+        assert not is_valid_tp_size(llama_8b_metadata, 3)
+
+    def test_kv_per_rank_stops_shrinking(self, llama_8b_metadata: ModelMetadata):
+        """Test per-rank KV halves with TP until TP exceeds the KV heads."""
+        kv = {
+            tp: compute_kv_cache_memory(llama_8b_metadata, 4096, 1, tp_size=tp)
+            for tp in (1, 2, 8, 16)
+        }
+        assert kv[2] == kv[1] // 2
+        assert kv[8] == kv[1] // 8
+        assert kv[16] == kv[8]
+
+    def test_weights_single_rank(self, llama_8b_metadata: ModelMetadata):
+        """Test TP 1 holds the whole model."""
+        assert compute_weights_per_rank(16 * 10**9, llama_8b_metadata, 1) == 16 * 10**9
+
+    def test_weights_replicated_parts(self, llama_8b_metadata: ModelMetadata):
+        """Test replicated norms and KV heads leave ranks above an even split."""
+        weights = 16 * 10**9
+        tp8 = compute_weights_per_rank(weights, llama_8b_metadata, 8)
+        tp16 = compute_weights_per_rank(weights, llama_8b_metadata, 16)
+
+        assert weights // 8 < tp8 < weights // 8 * 1.01
+        # Beyond 8 ranks the K/V projections no longer shrink
+        assert tp16 > weights // 16 * 1.01
+
+    def test_feasibility_reports_rank(self, llama_8b_metadata: ModelMetadata):
+        """Test feasibility reports per-rank KV and warns about replication."""
+        report = compute_feasibility(
+            weights_bytes=int(1 * BYTES_TO_GIB),
+            kv_cache_bytes=int(1 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(80 * BYTES_TO_GIB),
+            metadata=llama_8b_metadata,
+            kv_dtype=KVCacheDType.FP16,
+            tp_size=16,
+        )
+
+        assert report.tensor_parallel_size == 16
+        assert report.kv_heads_per_rank == 1
+        # 2 * 1 head * 128 dim * 32 layers * 2 bytes
+        assert report.kv_bytes_per_token == 16384
+        assert any("replicated KV head" in w for w in report.warnings)
+
+
+class TestPipelineParallelRank:
+    """Tests for the per-stage pipeline-parallel memory model."""
+
+    def test_stage_layers(self):
+        """Test layers split evenly with the remainder before the last stage."""
+        assert pipeline_stage_layers(32, 1) == [32]
+        assert pipeline_stage_layers(32, 4) == [8, 8, 8, 8]
+        assert pipeline_stage_layers(126, 4) == [31, 32, 32, 31]
+
+    def test_weights_split_across_stages(self, llama_8b_metadata: ModelMetadata):
+        """Test each stage holds roughly half the model at PP 2."""
+        weights = 16 * 10**9
+        pp2 = compute_weights_per_rank(weights, llama_8b_metadata, 1, 2)
+
+        assert weights // 2 < pp2 < weights * 0.6
+
+    def test_kv_uses_largest_stage(self, llama_8b_metadata: ModelMetadata):
+        """Test per-stage KV covers only that stage's layers."""
+        full = compute_kv_cache_memory(llama_8b_metadata, 4096, 1)
+        staged = compute_kv_cache_memory(llama_8b_metadata, 4096, 1, pp_size=4)
+        assert staged == full // 4
+
+    def test_feasibility_reports_stages(self, llama_8b_metadata: ModelMetadata):
+        """Test feasibility reports pipeline stages."""
+        report = compute_feasibility(
+            weights_bytes=int(1 * BYTES_TO_GIB),
+            kv_cache_bytes=int(1 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(80 * BYTES_TO_GIB),
+            metadata=llama_8b_metadata,
+            pp_size=2,
+        )
+
+        assert report.pipeline_parallel_size == 2
+        assert report.stage_layers == [16, 16]
+
+
+class TestColocation:
+    """Tests for splitting one GPU between several engines."""
+
+    def test_each_engine_gets_its_needs(self):
+        """Test every share covers the engine's needs plus headroom."""
+        gib = BYTES_TO_GIB
+        required = [30 * gib, 8 * gib, 3 * gib]
+        kv = [10 * gib, 4 * gib, 0]
+        fractions = split_memory_utilization(required, kv, 80 * gib, 0.9, headroom_gb=1.0)
+
+        for need, fraction in zip(required, fractions):
+            assert fraction * 80 * gib >= need + 1 * gib - 0.001 * 80 * gib
+        assert sum(fractions) <= 0.9
+
+    def test_spare_follows_kv_cache(self):
+        """Test memory left over goes to the engine with the larger KV cache."""
+        gib = BYTES_TO_GIB
+        fractions = split_memory_utilization(
+            [10 * gib, 10 * gib], [8 * gib, 2 * gib], 80 * gib, 0.9, headroom_gb=0
+        )
+
+        assert fractions[0] > fractions[1]
+
+    def test_oversubscribed_split_proportionally(self):
+        """Test engines that cannot fit together still split the budget."""
+        gib = BYTES_TO_GIB
+        fractions = split_memory_utilization(
+            [60 * gib, 30 * gib], [0, 0], 80 * gib, 0.9, headroom_gb=0
+        )
+
+        assert sum(fractions) <= 0.9
+        assert fractions[0] == pytest.approx(2 * fractions[1], abs=0.002)
+
+    def test_free_memory_at_start(self):
+        """Test each engine starts with what the engines before it leave free."""
+        assert free_memory_at_start([0.5, 0.25, 0.125]) == [1.0, 0.5, 0.25]
+
+
+class TestBlockAccounting:
+    """Tests for paged KV block accounting."""
+
+    def test_block_bytes(self, llama_metadata: ModelMetadata):
+        """Test a 16-token block for LLaMA 7B in fp16 is 8 MiB."""
+        # 2 * 32 heads * 128 dim * 32 layers * 2 bytes = 512 KiB per token
+        block_bytes = compute_kv_block_bytes(llama_metadata, 16, KVCacheDType.FP16)
+        assert block_bytes == 16 * 512 * 1024
+
+    def test_blocks_per_seq_rounds_up(self):
+        """Test partly filled last blocks are counted whole."""
+        assert compute_blocks_per_seq(4096, 16) == 256
+        assert compute_blocks_per_seq(4097, 16) == 257
+        assert compute_blocks_per_seq(1, 32) == 1
+
+    def test_num_gpu_blocks(self):
+        """Test whole blocks carved from the KV budget."""
+        assert compute_num_gpu_blocks(100, 30) == 3
+        assert compute_num_gpu_blocks(-5, 30) == 0
+
+    def test_feasibility_reports_blocks(self, llama_metadata: ModelMetadata):
+        """Test feasibility exposes block counts without the fragmentation factor."""
+        # 9 GiB for KV at 8 MiB per block
+        result = compute_feasibility(
+            weights_bytes=int(14 * BYTES_TO_GIB),
+            kv_cache_bytes=int(2 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(24 * BYTES_TO_GIB),
+            gpu_memory_utilization=1.0,
+            context_len=4000,
+            concurrency=2,
+            metadata=llama_metadata,
+            kv_dtype=KVCacheDType.FP16,
+            block_size=16,
+        )
+
+        assert result.num_gpu_blocks == 9 * 128
+        assert result.blocks_per_seq == 250
+        assert result.max_concurrency_by_blocks == 4
+        # 4000 tokens fill 250 blocks exactly
+        assert result.kv_block_waste_gb == 0.0
+
+    def test_rounding_waste(self, llama_metadata: ModelMetadata):
+        """Test the empty tail of each last block is reported."""
+        result = compute_feasibility(
+            weights_bytes=int(14 * BYTES_TO_GIB),
+            kv_cache_bytes=int(2 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(24 * BYTES_TO_GIB),
+            context_len=4001,
+            concurrency=4,
+            metadata=llama_metadata,
+            kv_dtype=KVCacheDType.FP16,
+            block_size=32,
+        )
+
+        # 31 empty slots per sequence at 512 KiB per token
+        assert result.kv_block_waste_gb * BYTES_TO_GIB == pytest.approx(4 * 31 * 512 * 1024)
+
+    def test_kv_cache_in_whole_blocks(self, llama_metadata: ModelMetadata):
+        """Test each sequence's context is rounded up to whole blocks."""
+        exact = compute_kv_cache_memory(llama_metadata, 4001, 2, KVCacheDType.FP16)
+        blocks = compute_kv_cache_memory(
+            llama_metadata, 4001, 2, KVCacheDType.FP16, block_size=32
+        )
+
+        assert blocks == exact // 4001 * 4032
+
+    def test_fit_check_agrees_with_blocks(self, llama_metadata: ModelMetadata):
+        """Test max concurrency and the fit check follow the block count."""
+        kwargs = dict(
+            weights_bytes=int(14 * BYTES_TO_GIB),
+            overhead_bytes=int(1 * BYTES_TO_GIB),
+            vram_total_bytes=int(24 * BYTES_TO_GIB),
+            gpu_memory_utilization=1.0,
+            headroom_gb=0.0,
+            context_len=4001,
+            metadata=llama_metadata,
+            kv_dtype=KVCacheDType.FP16,
+            block_size=16,
+        )
+        result = compute_feasibility(kv_cache_bytes=0, concurrency=1, **kwargs)
+        limit = result.max_concurrency_by_blocks
+
+        assert result.max_concurrency_at_context == limit
+        for concurrency, fits in ((limit, True), (limit + 1, False)):
+            kv = compute_kv_cache_memory(
+                llama_metadata, 4001, concurrency, KVCacheDType.FP16, block_size=16
+            )
+            report = compute_feasibility(kv_cache_bytes=kv, concurrency=concurrency, **kwargs)
+            assert report.fits is fits
+
+
 class TestMaxCalculations:
     """Tests for max concurrency/context calculations."""
 
@@ -0,0 +1,121 @@
+"""Tests for MIG profiles and slice layouts."""
+
+from typing import Callable
+
+import pytest
+
+from vllm_wizard.hardware.detect import get_gpu_by_name, parse_mig_listing
+from vllm_wizard.hardware.mig import mig_profiles, parse_mig_name
+from vllm_wizard.hardware.specs import get_gpu_spec
+from vllm_wizard.planning.mig import plan_mig_layout, size_on_profile
+from vllm_wizard.schemas.fleet import FleetEntry
+from vllm_wizard.schemas.inputs import ModelInput, Quantization, WorkloadInput
+
+
+class TestMIGProfiles:
+    """Tests for MIG profiles as hardware."""
+
+    def test_profiles_by_gpu(self):
+        """Test each GPU gets its own profile sizes."""
+        assert [p.name for p in mig_profiles("NVIDIA A100-SXM4-40GB")][0] == "1g.5gb"
+        assert [p.name for p in mig_profiles("H100")][-1] == "7g.80gb"
+        assert mig_profiles("L4") == []
+
+    def test_parse_mig_name(self):
+        """Test parent and profile are split from a device name."""
+        parent, profile = parse_mig_name("NVIDIA H100 80GB HBM3 MIG 3g.40gb")
+
+        assert parent == "NVIDIA H100 80GB HBM3"
+        assert (profile.compute_slices, profile.memory_slices) == (3, 4)
+        assert parse_mig_name("H100") is None
+
+    def test_spec_scaled_to_slice(self):
+        """Test a slice gets its share of bandwidth and TFLOPS."""
+        whole = get_gpu_spec("H100")
+        mig = get_gpu_spec("H100 MIG 1g.10gb")
+
+        assert mig.memory_bandwidth_gbps == pytest.approx(whole.memory_bandwidth_gbps / 8)
+        assert mig.fp16_tflops == pytest.approx(whole.fp16_tflops / 7)
+        assert mig.supports_fp8
+
+    def test_vram_from_profile(self):
+        """Test a slice is sized by the decimal GB of its profile."""
+        gpu = get_gpu_by_name("A100 80GB MIG 3g.40gb")
+
+        assert gpu.mig_profile == "3g.40gb"
+        assert gpu.vram_mib == 40 * 1000**3 // 1024**2
+
+    def test_parse_mig_listing(self):
+        """Test MIG instances are grouped under their GPU."""
+        listing = (
+            "GPU 0: NVIDIA H100 80GB HBM3 (UUID: GPU-aaaa)\n"
+            "  MIG 1g.10gb     Device  0: (UUID: MIG-bbbb)\n"
+            "  MIG 1g.10gb     Device  1: (UUID: MIG-cccc)\n"
+            "GPU 1: NVIDIA H100 80GB HBM3 (UUID: GPU-dddd)\n"
+        )
+
+        assert parse_mig_listing(listing) == {
+            0: [("1g.10gb", "MIG-bbbb"), ("1g.10gb", "MIG-cccc")]
+        }
+
+
+class TestMIGLayout:
+    """Tests for choosing a slice layout."""
+
+    def test_layout_within_slice_budget(self, make_entry: Callable[..., FleetEntry]):
+        """Test every entry gets an instance within 7 compute and 8 memory slices."""
+        layout = plan_mig_layout("H100", [make_entry(f"m{i}", 1) for i in range(4)])
+
+        assert not layout.unplaced
+        assert layout.compute_slices_used <= 7
+        assert layout.memory_slices_used <= 8
+        assert layout.setup_command.startswith("sudo nvidia-smi mig -cgi ")
+        total = sum(s.aggregate_toks_per_s for s in layout.slices)
+        assert layout.total_aggregate_toks_per_s == pytest.approx(total, abs=0.5)
+
+    def test_larger_slices_add_throughput(self, make_entry: Callable[..., FleetEntry]):
+        """Test a lone entry takes a larger, faster slice than it needs."""
+        layout = plan_mig_layout("H100", [make_entry("only", 1)])
+
+        assert layout.slices[0].profile == "7g.80gb"
+
+    def test_concurrency_scores_compute_share(self):
+        """Test a 2g instance out-scores a compute-bound 1g instance with equal memory."""
+        one_g, two_g = (p for p in mig_profiles("H100") if p.name in ("1g.20gb", "2g.20gb"))
+
+        def scores(concurrency: int) -> list[float]:
+            entry = FleetEntry(
+                name="awq",
+                model=ModelInput(
+                    model="test-7b",
+                    params_b=7,
+                    max_model_len=256,
+                    quantization=Quantization.AWQ,
+                ),
+                workload=WorkloadInput(concurrency=concurrency, prompt_tokens=128, gen_tokens=64),
+            )
+            return [size_on_profile(entry, "H100", p).aggregate_toks_per_s for p in (one_g, two_g)]
+
+        single, concurrent = scores(1), scores(128)
+
+        assert single[0] == pytest.approx(single[1])
+        assert concurrent[1] > 1.5 * concurrent[0]
+
+    def test_more_entries_than_slices(self, make_entry: Callable[..., FleetEntry]):
+        """Test entries beyond seven instances are reported."""
+        layout = plan_mig_layout("H100", [make_entry(f"m{i}", 1) for i in range(8)])
+
+        assert len(layout.slices) == 7
+        assert "no compute or memory slices left" in layout.unplaced[0].reason
+
+    def test_too_large_for_any_slice(self, make_entry: Callable[..., FleetEntry]):
+        """Test a model larger than the whole GPU is unplaced."""
+        layout = plan_mig_layout("A100 40GB", [make_entry("huge", 70)])
+
+        assert not layout.slices
+        assert "fits no MIG instance" in layout.unplaced[0].reason
+
+    def test_gpu_without_mig(self, make_entry: Callable[..., FleetEntry]):
+        """Test GPUs without MIG are rejected."""
+        with pytest.raises(ValueError, match="does not support MIG"):
+            plan_mig_layout("L4", [make_entry("m", 1)])
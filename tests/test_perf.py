@@ -0,0 +1,247 @@
+"""Tests for roofline performance estimation."""
+
+import pytest
+
+from vllm_wizard.hardware.specs import device_group, get_gpu_spec, gpu_types, slowest_gpu
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.perf import (
+    allreduce_link_gbps,
+    allreduce_time,
+    compute_roofline,
+    estimate_performance,
+    tensor_parallel_cost,
+)
+from vllm_wizard.planning.planner import parse_gpu_names
+from vllm_wizard.schemas.inputs import Interconnect, Quantization
+from vllm_wizard.schemas.outputs import GPUInfo
+
+
+class TestGPUSpecs:
+    """Tests for GPU spec lookup."""
+
+    def test_longest_match(self):
+        """Test specific variants win over shorter keys."""
+        assert get_gpu_spec("NVIDIA H100 PCIe").name == "H100 PCIe"
+        assert get_gpu_spec("NVIDIA H100 80GB HBM3").name == "H100 SXM"
+        assert get_gpu_spec("NVIDIA A100-SXM4-80GB").name == "A100 80GB"
+        assert get_gpu_spec("NVIDIA A10G").name == "A10G"
+        assert get_gpu_spec("NVIDIA L40S").name == "L40S"
+
+    def test_unknown(self):
+        """Test unknown GPUs return None."""
+        assert get_gpu_spec("Mystery Accelerator") is None
+
+
+class TestMixedGPUs:
+    """Tests for planning across unlike GPUs."""
+
+    a100_80 = GPUInfo(name="NVIDIA A100-SXM4-80GB", vram_mib=81920)
+    a100_40 = GPUInfo(name="NVIDIA A100-SXM4-40GB", vram_mib=40960)
+    l4 = GPUInfo(name="NVIDIA L4", vram_mib=23034)
+
+    def test_parse_gpu_names(self):
+        """Test counts expand and plain names stay single."""
+        assert parse_gpu_names("H100") == ["H100"]
+        assert parse_gpu_names("2x A100 80GB, A100 40GB") == ["A100 80GB"] * 2 + ["A100 40GB"]
+        assert parse_gpu_names("3 × L4") == ["L4"] * 3
+
+    def test_slowest_gpu(self):
+        """Test the slowest device bounds throughput, FP8 support first."""
+        h100 = GPUInfo(name="NVIDIA H100 80GB HBM3", vram_mib=81559)
+
+        assert slowest_gpu([self.a100_80, self.a100_40]) == self.a100_40
+        assert slowest_gpu([h100, self.l4]) == self.l4
+        assert slowest_gpu([self.l4, self.a100_80]) == self.a100_80
+
+    def test_device_group_prefers_largest(self):
+        """Test a group takes the largest GPUs and leaves small ones idle."""
+        gpus = [self.l4, self.a100_40, self.a100_80, self.a100_40]
+
+        assert device_group(gpus, 1) == [self.a100_80]
+        assert device_group(gpus, 3) == [self.a100_80, self.a100_40, self.a100_40]
+
+    def test_gpu_types(self):
+        """Test GPUs are counted per type, largest first."""
+        types = gpu_types([self.a100_40, self.a100_80, self.a100_40])
+        assert types == [(self.a100_80, 1), (self.a100_40, 2)]
+
+
+class TestRoofline:
+    """Tests for the roofline decode model."""
+
+    def test_batch_one_is_memory_bound(self, llama_8b_metadata: ModelMetadata):
+        """Test single-sequence decode is limited by bandwidth."""
+        points = compute_roofline("H100", 8.0, [1], kv_len=1024, metadata=llama_8b_metadata)
+        assert points[0].memory_bound
+
+    def test_large_batch_is_compute_bound(self, llama_8b_metadata: ModelMetadata):
+        """Test very large batches hit the compute roof."""
+        points = compute_roofline("L4", 8.0, [1024], kv_len=128, metadata=llama_8b_metadata)
+        assert not points[0].memory_bound
+
+    def test_throughput_grows_with_batch(self, llama_8b_metadata: ModelMetadata):
+        """Test aggregate throughput rises and per-sequence speed falls with batch size."""
+        points = compute_roofline(
+            "A100 80GB", 8.0, [1, 8, 64], kv_len=1024, metadata=llama_8b_metadata
+        )
+        aggregate = [p.decode_toks_per_s for p in points]
+        per_seq = [p.per_seq_toks_per_s for p in points]
+        assert aggregate == sorted(aggregate)
+        assert per_seq == sorted(per_seq, reverse=True)
+
+    def test_bandwidth_ordering(self, llama_8b_metadata: ModelMetadata):
+        """Test decode speed follows HBM bandwidth across GPUs."""
+        h100 = estimate_performance("H100", 8.0, metadata=llama_8b_metadata)
+        l40s = estimate_performance("L40S", 8.0, metadata=llama_8b_metadata)
+        assert h100.decode_toks_per_s_range[0] > l40s.decode_toks_per_s_range[1]
+
+    def test_quantization_speeds_up_decode(self, llama_8b_metadata: ModelMetadata):
+        """Test 4-bit weights raise memory-bound decode throughput."""
+        base = estimate_performance("RTX 4090", 8.0, metadata=llama_8b_metadata)
+        awq = estimate_performance(
+            "RTX 4090", 8.0, metadata=llama_8b_metadata, quantization=Quantization.AWQ
+        )
+        assert awq.decode_toks_per_s_range[0] > base.decode_toks_per_s_range[0] * 2
+
+    def test_ttft_scales_with_prompt(self, llama_8b_metadata: ModelMetadata):
+        """Test TTFT grows with prompt length."""
+        short = estimate_performance("H100", 8.0, prompt_tokens=256, metadata=llama_8b_metadata)
+        long = estimate_performance("H100", 8.0, prompt_tokens=8192, metadata=llama_8b_metadata)
+        assert long.ttft_ms_range[0] > short.ttft_ms_range[1]
+
+    def test_ranges_ordered(self):
+        """Test low <= high and unknown GPUs are flagged."""
+        perf = estimate_performance("Mystery Accelerator", 7.0)
+        assert perf.decode_toks_per_s_range[0] <= perf.decode_toks_per_s_range[1]
+        assert perf.ttft_ms_range[0] <= perf.ttft_ms_range[1]
+        assert any("not in spec table" in a for a in perf.assumptions)
+
+    def test_throughput_curve(self, llama_8b_metadata: ModelMetadata):
+        """Test the curve spans batch sizes up to max_num_seqs."""
+        perf = estimate_performance("H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=48)
+        curve = perf.throughput_curve
+
+        assert [p.batch_size for p in curve] == [1, 2, 4, 8, 16, 32, 48]
+        assert curve[-1].aggregate_toks_per_s > curve[0].aggregate_toks_per_s * 10
+        assert curve[-1].per_user_toks_per_s < curve[0].per_user_toks_per_s
+        for point in curve:
+            assert point.itl_ms == pytest.approx(1000 / point.per_user_toks_per_s, rel=0.01)
+
+    def test_eager_pays_launch_overhead(self, llama_8b_metadata: ModelMetadata):
+        """Test eager decode is slower by the launch time CUDA graphs save."""
+        graphs = estimate_performance("H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=64)
+        eager = estimate_performance(
+            "H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=64, enforce_eager=True
+        )
+
+        assert graphs.cuda_graph_itl_saving_ms > 0
+        for with_graph, without in zip(graphs.throughput_curve, eager.throughput_curve):
+            assert without.itl_ms == pytest.approx(
+                with_graph.itl_ms + graphs.cuda_graph_itl_saving_ms, abs=0.02
+            )
+
+    def test_batches_above_capture_run_eagerly(self, llama_8b_metadata: ModelMetadata):
+        """Test only batches larger than the captured sizes pay launch time."""
+        full = estimate_performance("H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=64)
+        capped = estimate_performance(
+            "H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=64, max_graph_batch=16
+        )
+
+        for a, b in zip(full.throughput_curve, capped.throughput_curve):
+            if a.batch_size <= 16:
+                assert a.itl_ms == b.itl_ms
+            else:
+                assert b.itl_ms > a.itl_ms
+
+    def test_pipeline_bubble_at_small_batch(self, llama_8b_metadata: ModelMetadata):
+        """Test PP idles stages until the batch covers every stage."""
+        perf = estimate_performance(
+            "H100", 8.0, metadata=llama_8b_metadata, max_num_seqs=8, pp_size=4, num_gpus=4
+        )
+        curve = {point.batch_size: point for point in perf.throughput_curve}
+
+        assert perf.pipeline_bubble_fraction == 0.75
+        # Batches below 4 fill more stages at the same step time
+        assert curve[2].itl_ms == curve[1].itl_ms
+        assert curve[4].aggregate_toks_per_s == pytest.approx(
+            4 * curve[1].aggregate_toks_per_s, rel=0.05
+        )
+
+    def test_inter_node_hops_slow_prefill(self, llama_8b_metadata: ModelMetadata):
+        """Test stage boundaries over the network cost more than intra-node ones."""
+        kwargs = dict(metadata=llama_8b_metadata, prompt_tokens=8192, pp_size=2, num_gpus=2)
+        one_node = estimate_performance("H100", 8.0, gpus_per_node=2, **kwargs)
+        two_nodes = estimate_performance("H100", 8.0, gpus_per_node=1, **kwargs)
+
+        assert two_nodes.ttft_ms_range[1] > one_node.ttft_ms_range[1]
+        assert any("1 of 1 stage boundaries" in a for a in two_nodes.assumptions)
+
+
+class TestTensorParallelCost:
+    """Tests for the all-reduce cost of tensor parallelism."""
+
+    def _speedup(self, metadata: ModelMetadata, interconnect: Interconnect, tp_size: int) -> float:
+        """Decode speedup of TP over one GPU for an 8B model at batch size 1."""
+        kwargs = dict(metadata=metadata, interconnect=interconnect, num_gpus=8)
+        single = estimate_performance("L40S", 8.0, **kwargs)
+        sharded = estimate_performance("L40S", 8.0, tp_size=tp_size, **kwargs)
+        return sharded.decode_toks_per_s_range[1] / single.decode_toks_per_s_range[1]
+
+    def test_small_messages_are_latency_bound(self):
+        """Test a small all-reduce costs its latency and a large one its bandwidth."""
+        empty = allreduce_time(0, 8, 32.0, 2e-6)
+        small = allreduce_time(16 * 1024, 8, 32.0, 2e-6)
+        large = allreduce_time(64 * 1024**2, 8, 32.0, 2e-6)
+
+        assert small < empty * 1.1
+        assert large > empty * 50
+        assert allreduce_time(64 * 1024**2, 1, 32.0, 2e-6) == 0.0
+
+    def test_link_generations(self):
+        """Test NVLink and PCIe bandwidth follow the GPU generation."""
+        h100, a100, l40s = (get_gpu_spec(name) for name in ("H100", "A100 80GB", "L40S"))
+
+        assert allreduce_link_gbps(h100, Interconnect.NVLINK) > allreduce_link_gbps(
+            a100, Interconnect.NVLINK
+        )
+        assert allreduce_link_gbps(h100, Interconnect.PCIE) == 2 * allreduce_link_gbps(
+            l40s, Interconnect.PCIE
+        )
+        assert allreduce_link_gbps(l40s, Interconnect.CROSS_SOCKET) < allreduce_link_gbps(
+            l40s, Interconnect.PCIE
+        )
+
+    def test_unknown_interconnect_follows_gpu(self, llama_8b_metadata: ModelMetadata):
+        """Test an unknown interconnect uses NVLink on SXM parts and PCIe otherwise."""
+        h100, h100_pcie, l40s = (get_gpu_spec(name) for name in ("H100", "H100 PCIe", "L40S"))
+
+        assert allreduce_link_gbps(h100, Interconnect.UNKNOWN) == 450.0
+        assert allreduce_link_gbps(h100_pcie, Interconnect.UNKNOWN) == h100_pcie.pcie_gbps
+        assert allreduce_link_gbps(l40s, Interconnect.UNKNOWN) == l40s.pcie_gbps
+        assert tensor_parallel_cost(
+            h100, llama_8b_metadata, 8, Interconnect.UNKNOWN
+        ) == tensor_parallel_cost(h100, llama_8b_metadata, 8, Interconnect.NVLINK)
+
+    def test_tp8_on_pcie_scales_sublinearly(self, llama_8b_metadata: ModelMetadata):
+        """Test TP=8 over PCIe falls well short of 6x while NVLink scales better."""
+        pcie = self._speedup(llama_8b_metadata, Interconnect.PCIE, 8)
+        nvlink = self._speedup(llama_8b_metadata, Interconnect.NVLINK, 8)
+        cross_socket = self._speedup(llama_8b_metadata, Interconnect.CROSS_SOCKET, 8)
+
+        assert cross_socket < pcie < 5.5 < nvlink
+
+    def test_allreduce_grows_with_batch(self, llama_8b_metadata: ModelMetadata):
+        """Test the all-reduce share of a decode step grows with the batch."""
+        kwargs = dict(metadata=llama_8b_metadata, tp_size=4, interconnect=Interconnect.PCIE)
+        small = estimate_performance("L40S", 8.0, batch_size=1, **kwargs)
+        large = estimate_performance("L40S", 8.0, batch_size=256, **kwargs)
+
+        assert 0 < small.allreduce_ms_per_step < large.allreduce_ms_per_step
+        assert any("all-reduces per forward pass" in a for a in small.assumptions)
+
+    def test_without_metadata_uses_flat_efficiency(self):
+        """Test unknown architectures keep the flat TP efficiency."""
+        perf = estimate_performance("L40S", 8.0, tp_size=4, interconnect=Interconnect.PCIE)
+
+        assert perf.allreduce_ms_per_step == 0
+        assert any("interconnect efficiency" in a for a in perf.assumptions)
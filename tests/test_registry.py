@@ -0,0 +1,154 @@
+"""Tests for the model registry and token-aligned name matching."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from vllm_wizard.cli import app
+from vllm_wizard.hardware.detect import get_gpu_by_name
+from vllm_wizard.hardware.specs import get_gpu_spec
+from vllm_wizard.matching import longest_match, name_candidates, normalize_name
+from vllm_wizard.models.metadata import (
+    ModelMetadata,
+    import_model_configs,
+    load_model_metadata,
+    lookup_known_model_size,
+)
+from vllm_wizard.models.registry import ModelRegistry
+
+runner = CliRunner()
+
+
+class TestMatching:
+    """Tests for token-aligned longest-match lookups."""
+
+    def test_normalize_name(self):
+        """Separators collapse to spaces and dots stay inside tokens."""
+        assert normalize_name("meta-llama/Llama-3.1-8B") == "meta llama llama 3.1 8b"
+        assert normalize_name("NVIDIA A100-SXM4-80GB") == "nvidia a100 sxm4 80gb"
+
+    def test_candidates_longest_first(self):
+        """Candidates cover every contiguous token run, longest first."""
+        candidates = name_candidates("a-b-c")
+        assert candidates[0] == "a b c"
+        assert set(candidates) == {"a b c", "a b", "b c", "a", "b", "c"}
+
+    def test_longest_match_prefers_longer_key(self):
+        """The most specific key wins regardless of table order."""
+        table = {"llama 2 7b": 1, "codellama 7b": 2, "7b": 3}
+        assert longest_match("codellama-7b-instruct", table) == "codellama 7b"
+        assert longest_match("Llama-2-7b-hf", table) == "llama 2 7b"
+
+    def test_no_partial_token_match(self):
+        """Keys only match on whole tokens."""
+        assert longest_match("a100", {"a10": 1}) is None
+
+    def test_known_model_size_codellama(self):
+        """codellama ids never resolve to plain llama entries."""
+        assert lookup_known_model_size("codellama/CodeLlama-34b-hf") == 34.0
+        assert lookup_known_model_size("meta-llama/Llama-3.1-70B-Instruct") == 70.0
+        assert lookup_known_model_size("unknown-model") is None
+
+    def test_gpu_lookups(self):
+        """A10 and A100 are not confused by GPU lookups."""
+        assert get_gpu_spec("NVIDIA A10").name == "A10"
+        assert get_gpu_spec("NVIDIA A100-SXM4-80GB").name.startswith("A100")
+        assert get_gpu_by_name("A10").vram_mib == 24576
+        assert get_gpu_by_name("NVIDIA A100-SXM4-80GB").vram_mib == 81920
+
+
+class TestModelRegistry:
+    """Tests for the SQLite model registry."""
+
+    def test_missing_registry_is_empty(self, tmp_path: Path):
+        """Lookups on a missing registry return nothing and create no file."""
+        registry = ModelRegistry(tmp_path / "registry.sqlite")
+        assert registry.lookup("anything") is None
+        assert registry.get("anything") is None
+        assert len(registry) == 0
+        assert not registry.path.exists()
+
+    def test_exact_and_longest_match(self, tmp_path: Path):
+        """Exact names and the longest registered name in an id are found."""
+        registry = ModelRegistry(tmp_path / "registry.sqlite")
+        registry.add_many([("acme/llama-ft", {"a": 1}), ("acme/llama-ft-v2", {"a": 2})])
+
+        assert registry.get("ACME/Llama-FT") == {"a": 1}
+        assert registry.lookup("acme/llama-ft-v2") == ("acme/llama-ft-v2", {"a": 2})
+        assert registry.lookup("serving/acme/llama-ft-v2-awq") == ("acme/llama-ft-v2", {"a": 2})
+        assert registry.lookup("acme/llama") is None
+
+    def test_replace_and_remove(self, tmp_path: Path):
+        """Re-adding a name replaces its record; remove deletes it."""
+        registry = ModelRegistry(tmp_path / "registry.sqlite")
+        registry.add("model-a", {"v": 1})
+        registry.add("model-a", {"v": 2})
+        assert len(registry) == 1
+        assert list(registry) == [("model-a", {"v": 2})]
+
+        assert registry.remove("model-a")
+        assert not registry.remove("model-a")
+        assert len(registry) == 0
+
+    def test_record_round_trip(self, llama_8b_metadata: ModelMetadata):
+        """Metadata survives serialization and unknown keys are ignored."""
+        record = llama_8b_metadata.to_record()
+        record["future_field"] = 1
+        assert ModelMetadata.from_record(record) == llama_8b_metadata
+
+
+@pytest.fixture
+def configs_dir(tmp_path: Path, llama_gqa_config: dict, mistral_config: dict) -> Path:
+    """Directory with a model directory, a nested model directory and a bare config."""
+    root = tmp_path / "configs"
+    (root / "acme" / "support-ft").mkdir(parents=True)
+    (root / "acme" / "support-ft" / "config.json").write_text(json.dumps(llama_gqa_config))
+
+    moe_config = dict(mistral_config, num_local_experts=8, num_experts_per_tok=2, head_dim=128)
+    (root / "acme-moe.json").write_text(json.dumps(moe_config))
+    return root
+
+
+class TestImport:
+    """Tests for bulk config import."""
+
+    def test_import_names_and_fields(self, configs_dir: Path, tmp_path: Path):
+        """Configs are named by relative path or file stem and keep MoE shape."""
+        registry = ModelRegistry(tmp_path / "registry.sqlite")
+        names = import_model_configs(configs_dir, registry)
+
+        assert sorted(names) == ["acme-moe", "acme/support-ft"]
+
+        moe = ModelMetadata.from_record(registry.get("acme-moe"))
+        assert moe.num_experts == 8
+        assert moe.num_experts_per_tok == 2
+        assert moe.head_dim == 128
+
+        ft = ModelMetadata.from_record(registry.get("acme/support-ft"))
+        assert ft.num_key_value_heads == 8
+        assert ft.vocab_size == 128256
+
+    def test_load_model_metadata_uses_registry(self, configs_dir: Path):
+        """Registered fine-tunes resolve before the known-size table."""
+        import_model_configs(configs_dir)
+
+        metadata = load_model_metadata("acme/support-ft")
+        assert metadata.num_key_value_heads == 8
+        assert metadata.max_position_embeddings == 8192
+
+    def test_cli_import_and_list(self, configs_dir: Path):
+        """registry import then registry list shows the imported models."""
+        result = runner.invoke(app, ["registry", "import", str(configs_dir)])
+        assert result.exit_code == 0
+        assert "Imported 2" in result.output
+
+        result = runner.invoke(app, ["registry", "list", "--json"])
+        assert result.exit_code == 0
+        assert set(json.loads(result.output)) == {"acme-moe", "acme/support-ft"}
+
+    def test_cli_import_missing_dir(self, tmp_path: Path):
+        """Importing a missing directory fails cleanly."""
+        result = runner.invoke(app, ["registry", "import", str(tmp_path / "missing")])
+        assert result.exit_code == 1
@@ -0,0 +1,94 @@
+"""Tests for data-parallel replica planning."""
+
+from dataclasses import replace
+from typing import Callable
+
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.replicas import (
+    MAX_REPLICA_UTILIZATION,
+    batch_at_rate,
+    candidate_tp_sizes,
+    run_replica_plan,
+    search_replica_layouts,
+)
+from vllm_wizard.planning.simulator import StepCostModel
+from vllm_wizard.schemas.inputs import PlanRequest
+
+
+class TestLayouts:
+    """Tests for TP x DP layout enumeration."""
+
+    def test_tp_sizes_divide_gpus_and_heads(self, llama_8b_metadata: ModelMetadata):
+        """Test every TP size splits the GPUs into whole replicas."""
+        assert candidate_tp_sizes(8, llama_8b_metadata, 8) == [1, 2, 4, 8]
+        assert candidate_tp_sizes(6, llama_8b_metadata, 8) == [1, 2]
+        assert candidate_tp_sizes(16, llama_8b_metadata, 8) == [1, 2, 4, 8]
+        assert candidate_tp_sizes(8, llama_8b_metadata, 8, requested=4) == [4]
+
+    def test_tp_sizes_shard_kv_heads(self, llama_8b_metadata: ModelMetadata):
+        """Test TP sizes that divide the attention but not the KV heads are skipped."""
+        metadata = replace(llama_8b_metadata, num_attention_heads=40)
+
+        assert candidate_tp_sizes(5, metadata, 16) == [1]
+        assert candidate_tp_sizes(10, metadata, 16) == [1, 2]
+
+    def test_batch_grows_with_rate(self, cost: StepCostModel):
+        """Test Little's law: more requests/s keep more sequences decoding."""
+        low = batch_at_rate(cost, 512, 256, 1.0, 256, 8192)
+        high = batch_at_rate(cost, 512, 256, 10.0, 256, 8192)
+
+        assert 0 < low < high
+
+    def test_saturated_rate(self, cost: StepCostModel):
+        """Test a rate beyond the replica's capacity returns None."""
+        assert batch_at_rate(cost, 512, 256, 1e6, 8, 8192) is None
+
+
+class TestReplicaSearch:
+    """Tests for ranking layouts against a target request rate."""
+
+    def test_every_layout_uses_all_gpus(self, make_request: Callable[..., PlanRequest]):
+        """Test each layout fills the GPUs with replicas."""
+        layouts = search_replica_layouts(make_request(target_qps=1.0))
+
+        assert {layout.tensor_parallel_size for layout in layouts} == {1, 2, 4, 8}
+        for layout in layouts:
+            assert layout.tensor_parallel_size * layout.data_parallel_size == 8
+
+    def test_more_replicas_more_capacity(self, make_request: Callable[..., PlanRequest]):
+        """Test TP=1 x 8 replicas out-serves a single TP=8 engine."""
+        layouts = {
+            layout.tensor_parallel_size: layout
+            for layout in search_replica_layouts(make_request())
+        }
+        assert layouts[1].aggregate_qps > layouts[8].aggregate_qps
+        assert layouts[8].tpot_ms < layouts[1].tpot_ms
+
+    def test_high_rate_prefers_replicas(self, make_request: Callable[..., PlanRequest]):
+        """Test a rate only the widest DP sustains picks it."""
+        layouts = search_replica_layouts(make_request())
+        capacity = {layout.tensor_parallel_size: layout.aggregate_qps for layout in layouts}
+        target = capacity[1] * MAX_REPLICA_UTILIZATION * 0.99
+        assert target > max(capacity[tp] for tp in (2, 4, 8)) * MAX_REPLICA_UTILIZATION
+
+        response = run_replica_plan(make_request(target_qps=target))
+        assert response.config.tensor_parallel_size == 1
+        assert response.config.data_parallel_size == 8
+        assert response.replicas.layouts[0].meets_target
+        assert "--data-parallel-size 8" in response.artifacts.serve_command
+
+    def test_low_rate_prefers_latency(self, make_request: Callable[..., PlanRequest]):
+        """Test a rate every layout sustains picks the lowest latency."""
+        response = run_replica_plan(make_request(target_qps=0.5))
+
+        assert all(layout.meets_target for layout in response.replicas.layouts)
+        assert response.config.tensor_parallel_size == 8
+        assert response.config.data_parallel_size == 1
+
+    def test_unreachable_rate(self, make_request: Callable[..., PlanRequest]):
+        """Test an impossible rate returns the highest capacity with a warning."""
+        response = run_replica_plan(make_request(target_qps=1e6))
+
+        assert not response.replicas.layouts[0].meets_target
+        assert response.config.tensor_parallel_size == 1
+        assert any("request rate" in w for w in response.feasibility.warnings)
@@ -0,0 +1,120 @@
+"""Tests for the Pareto-frontier configuration search."""
+
+import time
+
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.memory import BYTES_TO_GIB
+from vllm_wizard.planning.search import SearchPoint, pareto_frontier, search_configs
+from vllm_wizard.schemas.inputs import KVCacheDType, Quantization
+
+
+def make_point(headroom: float, throughput: float, ttft: float, context: int = 4096) -> SearchPoint:
+    """Search point with the given objectives."""
+    return SearchPoint(
+        tensor_parallel_size=1,
+        data_parallel_size=1,
+        quantization=Quantization.NONE,
+        kv_cache_dtype=KVCacheDType.AUTO,
+        max_model_len=context,
+        max_num_seqs=1,
+        headroom_gb=headroom,
+        decode_toks_per_s=throughput,
+        ttft_ms=ttft,
+    )
+
+
+def search_8b(metadata: ModelMetadata, vram_gb: float, **kwargs):
+    """Search the default grid for an 8B model on one GPU."""
+    defaults = dict(
+        num_gpus=1,
+        tp_sizes=[1],
+        quantizations=[Quantization.NONE, Quantization.AWQ],
+        kv_cache_dtypes=[KVCacheDType.AUTO, KVCacheDType.FP8_E4M3FN],
+        context_lens=[2048, 4096, 8192],
+        max_num_seqs=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+    )
+    defaults.update(kwargs)
+    return search_configs(
+        metadata=metadata,
+        params_b=8.0,
+        gpu_name="H100",
+        vram_per_gpu_bytes=int(vram_gb * BYTES_TO_GIB),
+        **defaults,
+    )
+
+
+class TestParetoFrontier:
+    """Tests for non-dominated filtering."""
+
+    def test_dominated_points_removed(self):
+        """Test a point worse on every objective is dropped."""
+        best = make_point(10, 1000, 50)
+        worse = make_point(5, 500, 80)
+        assert pareto_frontier([worse, best]) == [best]
+
+    def test_tradeoffs_kept(self):
+        """Test points trading one objective for another all stay."""
+        fast = make_point(2, 2000, 50)
+        roomy = make_point(20, 500, 50)
+        responsive = make_point(2, 500, 10)
+        long_context = make_point(2, 500, 50, context=32768)
+
+        frontier = pareto_frontier([roomy, responsive, long_context, fast])
+        assert frontier[0] == fast
+        assert len(frontier) == 4
+
+    def test_duplicates_collapse(self):
+        """Test identical objectives keep only the first point."""
+        assert len(pareto_frontier([make_point(1, 1, 1), make_point(1, 1, 1)])) == 1
+
+
+class TestSearchConfigs:
+    """Tests for the pruned configuration search."""
+
+    def test_frontier_is_non_dominated(self, llama_8b_metadata: ModelMetadata):
+        """Test no frontier point dominates another."""
+        result = search_8b(llama_8b_metadata, 80)
+
+        assert result.frontier
+        for a in result.frontier:
+            for b in result.frontier:
+                assert a is b or not a.dominates(b)
+
+    def test_prunes_infeasible_branches(self, llama_8b_metadata: ModelMetadata):
+        """Test a tight GPU skips most of the space without evaluating it."""
+        result = search_8b(llama_8b_metadata, 24)
+
+        assert result.num_pruned > 0
+        assert result.num_evaluated < result.num_combinations
+        # Every feasible point and one failure per context were evaluated at most
+        assert result.num_evaluated <= result.num_feasible + 2 * 2 * 3
+
+    def test_weights_too_large_skips_quantization(self, llama_8b_metadata: ModelMetadata):
+        """Test fp16 weights that cannot fit are never evaluated."""
+        result = search_8b(llama_8b_metadata, 12)
+
+        assert {p.quantization for p in result.frontier} == {Quantization.AWQ}
+
+    def test_contexts_beyond_model_skipped(self, llama_8b_metadata: ModelMetadata):
+        """Test contexts above max_position_embeddings are not searched."""
+        result = search_8b(llama_8b_metadata, 80, context_lens=[4096, 65536])
+
+        assert result.skipped_context_lens == [65536]
+        assert {p.max_model_len for p in result.frontier} == {4096}
+
+    def test_thousands_of_combinations_are_fast(self, llama_8b_metadata: ModelMetadata):
+        """Test ~10^4 combinations search at interactive speed."""
+        start = time.perf_counter()
+        result = search_8b(
+            llama_8b_metadata,
+            80,
+            tp_sizes=[1, 2, 4, 8],
+            quantizations=[Quantization.NONE, Quantization.FP8, Quantization.AWQ],
+            context_lens=list(range(512, 8192 + 1, 512)),
+            max_num_seqs=list(range(8, 512 + 1, 8)),
+            num_gpus=8,
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result.num_combinations == 4 * 3 * 2 * 16 * 64
+        assert elapsed < 3.0
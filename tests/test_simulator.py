@@ -0,0 +1,153 @@
+"""Tests for the continuous batching simulator."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from vllm_wizard.planning.simulator import (
+    StepCostModel,
+    poisson_arrivals,
+    run_simulation,
+    simulate,
+)
+from vllm_wizard.schemas.inputs import HardwareInput, ModelInput, PlanRequest, WorkloadInput
+
+
+@pytest.fixture
+def cost() -> StepCostModel:
+    """Small step cost model: ~1 ms per decode step."""
+    return StepCostModel(
+        weights_bytes=1e9,
+        kv_bytes_per_token=1e5,
+        linear_flops_per_token=1e10,
+        attention_flops_per_token_per_ctx=1e6,
+        bytes_per_s=1e12,
+        flops_per_s=1e14,
+    )
+
+
+class TestSimulate:
+    """Tests for the simulation engine."""
+
+    def test_single_request(self, cost: StepCostModel):
+        """Test one request decodes one token per step after its prefill."""
+        result = simulate([(0.0, 100, 10)], cost, num_gpu_blocks=1000)
+
+        assert result.completed == 1
+        assert result.output_tokens == 10
+        assert result.steps == 10  # 1 prefill step + 9 decode steps
+        assert result.queue_delay_s[0] == 0.0
+        assert result.ttft_s[0] == pytest.approx(cost.step_time(100, 100, 100 * 50.5))
+
+    @pytest.mark.parametrize("chunked_prefill", [True, False])
+    def test_all_tokens_generated_under_preemption(self, cost: StepCostModel, chunked_prefill: bool):
+        """Test recompute preemption neither loses nor duplicates output tokens."""
+        arrivals = [(i * 0.001, 100, 200) for i in range(500)]
+        result = simulate(
+            arrivals,
+            cost,
+            num_gpu_blocks=200,
+            max_num_seqs=64,
+            max_num_batched_tokens=512,
+            chunked_prefill=chunked_prefill,
+        )
+
+        assert result.preemptions > 0
+        assert result.completed == 500
+        assert result.output_tokens == 500 * 200
+
+    def test_no_preemption_with_ample_blocks(self, cost: StepCostModel):
+        """Test a large block pool never preempts."""
+        arrivals = [(i * 0.001, 100, 200) for i in range(500)]
+        result = simulate(arrivals, cost, num_gpu_blocks=100_000, max_num_seqs=64)
+
+        assert result.preemptions == 0
+        assert result.mean_batch_size > 1
+
+    def test_max_num_seqs_limits_batch(self, cost: StepCostModel):
+        """Test the batch never exceeds max_num_seqs."""
+        arrivals = [(0.0, 50, 50)] * 100
+        result = simulate(arrivals, cost, num_gpu_blocks=100_000, max_num_seqs=8)
+
+        assert result.completed == 100
+        assert result.mean_batch_size <= 8
+
+    def test_rejects_requests_that_never_fit(self, cost: StepCostModel):
+        """Test requests larger than the whole block pool are rejected."""
+        result = simulate([(0.0, 5000, 10), (0.1, 100, 10)], cost, num_gpu_blocks=100)
+
+        assert result.rejected == 1
+        assert result.completed == 1
+
+    @pytest.mark.parametrize("chunked_prefill", [True, False])
+    def test_every_request_completes_or_is_rejected(
+        self, cost: StepCostModel, chunked_prefill: bool
+    ):
+        """Test recomputes longer than the token budget do not stall the queue."""
+        arrivals = [(i * 0.01, 7000, 3000) for i in range(50)]
+        result = simulate(
+            arrivals,
+            cost,
+            num_gpu_blocks=1100,
+            max_num_batched_tokens=8192,
+            chunked_prefill=chunked_prefill,
+        )
+
+        assert result.completed + result.rejected == result.num_requests == 50
+        if chunked_prefill:
+            assert result.completed == 50
+        else:
+            assert result.rejected > 0
+            assert result.completed > 1
+
+    def test_overload_increases_queue_delay(self, cost: StepCostModel):
+        """Test queueing delay grows with the arrival rate."""
+        light = simulate(poisson_arrivals(5, 2000, 200, 100), cost, num_gpu_blocks=20_000)
+        heavy = simulate(poisson_arrivals(500, 2000, 200, 100), cost, num_gpu_blocks=20_000)
+
+        assert heavy.queue_delay_s.mean() > light.queue_delay_s.mean()
+
+    def test_throughput(self, cost: StepCostModel):
+        """Test 10^5 requests simulate quickly."""
+        arrivals = poisson_arrivals(100, 100_000, 256, 64, lengths="exponential")
+        start = time.perf_counter()
+        result = simulate(arrivals, cost, num_gpu_blocks=50_000)
+        elapsed = time.perf_counter() - start
+
+        assert result.completed == 100_000
+        assert elapsed < 10.0
+
+
+class TestPoissonArrivals:
+    """Tests for arrival generation."""
+
+    def test_mean_rate(self):
+        """Test the empirical rate matches the requested rate."""
+        arrivals = list(poisson_arrivals(10.0, 10_000, 100, 100, seed=1))
+        assert len(arrivals) / arrivals[-1][0] == pytest.approx(10.0, rel=0.05)
+
+    def test_invalid_lengths(self):
+        """Test unknown length distributions are rejected."""
+        with pytest.raises(ValueError):
+            list(poisson_arrivals(1.0, 1, 100, 100, lengths="uniform"))
+
+
+class TestRunSimulation:
+    """Tests for request-level simulation."""
+
+    def test_report(self, tmp_config_dir: Path):
+        """Test a planning request is simulated end to end."""
+        request = PlanRequest(
+            model=ModelInput(model=str(tmp_config_dir), params_b=7.0),
+            hardware=HardwareInput(gpu="A100 80GB"),
+            workload=WorkloadInput(prompt_tokens=512, gen_tokens=128, concurrency=16),
+        )
+
+        report = run_simulation(request, rate=2.0, num_requests=200)
+
+        assert report.completed == 200
+        assert report.num_gpu_blocks > 0
+        assert report.max_num_seqs == 18
+        assert report.ttft_ms.p50 <= report.ttft_ms.p99
+        assert report.e2e_latency_ms.mean > report.ttft_ms.mean
@@ -0,0 +1,96 @@
+"""Tests for SLO-driven planning."""
+
+from functools import partial
+from typing import Callable
+
+import pytest
+
+from vllm_wizard.planning.simulator import StepCostModel
+from vllm_wizard.planning.slo import estimate_steady_state, run_slo_plan, search_slo_configs
+from vllm_wizard.schemas.inputs import KVCacheDType, PlanRequest, Quantization
+
+
+@pytest.fixture
+def slo_request(make_request: Callable[..., PlanRequest]) -> Callable[..., PlanRequest]:
+    """Requests on two H100s with 1K-token prompts."""
+    return partial(make_request, gpus=2, prompt_tokens=1024)
+
+
+class TestSteadyState:
+    """Tests for the saturated-engine latency model."""
+
+    def test_batch_limited_by_blocks(self, cost: StepCostModel):
+        """KV capacity caps the decode batch."""
+        batch, _, _ = estimate_steady_state(cost, 100, 100, 256, 8192, max_seqs_by_blocks=10)
+        assert batch == 10
+
+    def test_batch_limited_by_prefill_budget(self, cost: StepCostModel):
+        """The token budget must cover replacement prefills."""
+        # 1000 tokens, 3:1 prompt:output -> at most 250 sequences sustained
+        batch, _, _ = estimate_steady_state(cost, 300, 100, 512, 1000, max_seqs_by_blocks=10_000)
+        assert batch == 250
+
+    def test_chunked_ttft(self, cost: StepCostModel):
+        """Prompts longer than the leftover budget take several steps."""
+        _, ttft_one, _ = estimate_steady_state(cost, 1000, 1000, 1, 2048, 100)
+        _, ttft_chunked, _ = estimate_steady_state(cost, 1000, 1000, 1, 501, 100)
+        assert ttft_chunked > ttft_one
+        assert ttft_chunked == pytest.approx(2 * 1e-3, rel=0.01)
+
+    def test_tpot_grows_with_batch(self, cost: StepCostModel):
+        """Larger batches trade per-token latency for throughput."""
+        _, _, tpot_small = estimate_steady_state(cost, 1000, 100, 1, 32768, 10_000)
+        _, _, tpot_large = estimate_steady_state(cost, 1000, 100, 256, 32768, 10_000)
+        assert tpot_large > tpot_small
+
+    def test_no_room(self, cost: StepCostModel):
+        """No sequence fits -> None."""
+        assert estimate_steady_state(cost, 100, 100, 8, 8192, max_seqs_by_blocks=0) is None
+
+
+class TestSLOSearch:
+    """Tests for the SLO search and plan."""
+
+    def test_tighter_tpot_lowers_throughput(self, slo_request: Callable[..., PlanRequest]):
+        """A tighter per-token target forces a smaller batch."""
+        loose = run_slo_plan(slo_request(target_latency_ms=100))
+        tight = run_slo_plan(slo_request(target_latency_ms=8))
+
+        assert loose.slo.meets_slo and tight.slo.meets_slo
+        assert tight.slo.tpot_ms <= 8
+        assert tight.slo.output_toks_per_s < loose.slo.output_toks_per_s
+        assert tight.slo.tpot_margin_ms == pytest.approx(8 - tight.slo.tpot_ms, abs=0.01)
+
+    def test_best_candidate_is_applied(self, slo_request: Callable[..., PlanRequest]):
+        """The chosen scheduler limits and precision reach the config and command."""
+        response = run_slo_plan(slo_request(target_ttft_ms=500, target_latency_ms=30))
+        best = search_slo_configs(slo_request(target_ttft_ms=500, target_latency_ms=30))[0]
+
+        assert response.config.tensor_parallel_size == best.tensor_parallel_size
+        assert response.config.max_num_seqs == best.max_num_seqs
+        assert response.config.max_num_batched_tokens == best.max_num_batched_tokens
+        assert f"--max-num-seqs {best.max_num_seqs}" in response.artifacts.serve_command
+
+    def test_user_precision_is_kept(self, slo_request: Callable[..., PlanRequest]):
+        """User-specified quantization and KV dtype are not searched."""
+        request = slo_request(target_latency_ms=30)
+        request.model.quantization = Quantization.AWQ
+        request.model.kv_cache_dtype = KVCacheDType.FP8_E5M2
+
+        candidates = search_slo_configs(request)
+        assert {c.quantization for c in candidates} == {Quantization.AWQ}
+        assert {c.kv_cache_dtype for c in candidates} == {KVCacheDType.FP8_E5M2}
+
+    def test_unreachable_slo(self, slo_request: Callable[..., PlanRequest]):
+        """Impossible targets return the closest miss with a warning."""
+        response = run_slo_plan(slo_request(target_ttft_ms=0.001))
+
+        assert not response.slo.meets_slo
+        assert response.slo.ttft_margin_ms < 0
+        assert response.slo.candidates_meeting_slo == 0
+        assert any("latency targets" in w for w in response.feasibility.warnings)
+
+    def test_requires_targets(self, slo_request: Callable[..., PlanRequest]):
+        """SLO planning without targets is an error."""
+        with pytest.raises(ValueError, match="target"):
+            run_slo_plan(slo_request())
@@ -0,0 +1,115 @@
+"""Tests for vectorized sizing sweeps."""
+
+import time
+
+from vllm_wizard.models.metadata import ModelMetadata
+from vllm_wizard.planning.memory import (
+    BYTES_TO_GIB,
+    compute_feasibility,
+    compute_kv_cache_memory,
+    compute_overhead,
+    compute_weights_memory,
+)
+from vllm_wizard.planning.sweep import compute_sweep
+from vllm_wizard.schemas.inputs import DType, KVCacheDType, Quantization
+
+
+class TestComputeSweep:
+    """Tests for compute_sweep."""
+
+    def test_matches_scalar_model(self, llama_8b_metadata: ModelMetadata):
+        """Test every grid point agrees with the per-point memory functions."""
+        vram = 24 * BYTES_TO_GIB
+        context_lens = [1000, 4096, 8192]
+        concurrencies = [1, 4, 16]
+        kv_dtypes = [KVCacheDType.AUTO, KVCacheDType.FP8_E4M3FN]
+        quants = [Quantization.NONE, Quantization.AWQ]
+
+        result = compute_sweep(
+            metadata=llama_8b_metadata,
+            params_b=8.0,
+            vram_total_bytes=vram,
+            context_lens=context_lens,
+            concurrencies=concurrencies,
+            kv_cache_dtypes=kv_dtypes,
+            quantizations=quants,
+        )
+
+        assert result.fits.shape == (2, 2, 3, 3)
+        overhead = compute_overhead(vram)
+
+        for qi, quant in enumerate(quants):
+            weights = compute_weights_memory(8.0, DType.AUTO, quant)
+            for ki, kv_dtype in enumerate(kv_dtypes):
+                for li, ctx in enumerate(context_lens):
+                    for ci, conc in enumerate(concurrencies):
+                        kv = compute_kv_cache_memory(
+                            llama_8b_metadata, ctx, conc, kv_dtype, block_size=16
+                        )
+                        report = compute_feasibility(
+                            weights_bytes=weights,
+                            kv_cache_bytes=kv,
+                            overhead_bytes=overhead,
+                            vram_total_bytes=vram,
+                            context_len=ctx,
+                            concurrency=conc,
+                            metadata=llama_8b_metadata,
+                            kv_dtype=kv_dtype,
+                        )
+                        assert bool(result.fits[qi, ki, li, ci]) == report.fits
+                        assert (
+                            result.max_concurrency_at_context[qi, ki, li]
+                            == report.max_concurrency_at_context
+                        )
+                        assert (
+                            result.max_context_at_concurrency[qi, ki, ci]
+                            == report.max_context_at_concurrency
+                        )
+
+    def test_feasibility_monotone_in_concurrency(self, llama_metadata: ModelMetadata):
+        """Test that once a concurrency fails, larger ones fail too."""
+        result = compute_sweep(
+            metadata=llama_metadata,
+            params_b=7.0,
+            vram_total_bytes=24 * BYTES_TO_GIB,
+            context_lens=[4096],
+            concurrencies=list(range(1, 17)),
+        )
+
+        row = result.fits[0, 0, 0]
+        assert row[0]
+        assert not row[-1]
+        first_fail = int(row.argmin())
+        assert not row[first_fail:].any()
+
+    def test_large_grid_is_fast(self, llama_8b_metadata: ModelMetadata):
+        """Test a 10^5-point grid evaluates well under a second."""
+        start = time.perf_counter()
+        result = compute_sweep(
+            metadata=llama_8b_metadata,
+            params_b=8.0,
+            vram_total_bytes=80 * BYTES_TO_GIB,
+            context_lens=list(range(1024, 131072 + 1, 1024)),
+            concurrencies=list(range(1, 201)),
+            kv_cache_dtypes=[KVCacheDType.AUTO, KVCacheDType.FP8_E4M3FN],
+            quantizations=[Quantization.NONE, Quantization.AWQ],
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result.num_points == 4 * 128 * 200
+        assert elapsed < 1.0
+
+    def test_to_dict(self, llama_metadata: ModelMetadata):
+        """Test JSON-friendly conversion."""
+        result = compute_sweep(
+            metadata=llama_metadata,
+            params_b=7.0,
+            vram_total_bytes=24 * BYTES_TO_GIB,
+            context_lens=[2048],
+            concurrencies=[1, 2],
+        )
+
+        data = result.to_dict()
+        assert data["context_lens"] == [2048]
+        assert data["quantizations"] == ["none"]
+        assert len(data["fits"][0][0][0]) == 2
@@ -0,0 +1,212 @@
+"""Tests for workload trace ingestion and trace-based KV sizing."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from vllm_wizard.planning.trace import (
+    LengthHistogram,
+    concurrent_kv_tokens,
+    parse_timestamp,
+    read_trace,
+    trace_arrivals,
+)
+
+
+def write_jsonl(path: Path, records: list[dict]) -> Path:
+    """Write records as JSON lines."""
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+class TestLengthHistogram:
+    """Tests for the streaming length histogram."""
+
+    def test_buckets_bound_lengths(self):
+        """Test every length falls at or below its bucket's upper bound."""
+        for value in (1, 2, 3, 17, 1000, 4096, 100_000):
+            upper = LengthHistogram.bucket_upper(LengthHistogram.bucket_index(value))
+            assert value <= upper <= value * 1.05
+
+    def test_percentiles(self):
+        """Test percentiles land within a bucket of the exact value."""
+        histogram = LengthHistogram()
+        for value in range(1, 1001):
+            histogram.add(value)
+
+        stats = histogram.to_stats()
+
+        assert stats.mean == pytest.approx(500.5)
+        assert (stats.min, stats.max) == (1, 1000)
+        assert 500 <= stats.p50 <= 525
+        assert 990 <= stats.p99 <= 1000
+        assert len(stats.buckets) < 200
+
+    def test_weights(self):
+        """Test weighted values shift the mean and percentiles."""
+        histogram = LengthHistogram()
+        histogram.add(100, weight=9)
+        histogram.add(1000, weight=1)
+
+        stats = histogram.to_stats()
+
+        assert stats.mean == pytest.approx(190)
+        assert 100 <= stats.p50 <= 105
+        assert stats.p99 == 1000
+
+
+class TestReadTrace:
+    """Tests for reading request logs."""
+
+    def test_jsonl_aliases_and_skipped(self, tmp_path: Path):
+        """Test common field names are read and unusable records counted."""
+        path = write_jsonl(
+            tmp_path / "requests.jsonl",
+            [
+                {"timestamp": 100.0, "prompt_tokens": 1000, "gen_tokens": 200},
+                {"arrival_time": 101.0, "input_tokens": 3000, "output_tokens": 100},
+                {"created": 104, "usage": {"prompt_tokens": 500, "completion_tokens": 300}},
+                {"timestamp": 105.0, "prompt_tokens": 100},
+            ],
+        )
+        with open(path, "a") as f:
+            f.write("not json\n")
+
+        trace = read_trace(path)
+
+        assert (trace.requests, trace.skipped) == (3, 2)
+        assert trace.prompt_tokens.mean == pytest.approx(1500)
+        assert trace.gen_tokens.max == 300
+        assert trace.context_tokens.max == 3100
+        assert trace.duration_s == pytest.approx(4.0)
+        assert trace.request_rate == pytest.approx(0.5)
+
+    def test_csv_gzip(self, tmp_path: Path):
+        """Test a gzip-compressed CSV log with ISO timestamps."""
+        path = tmp_path / "requests.csv.gz"
+        with gzip.open(path, "wt") as f:
+            f.write("timestamp,input_length,output_length\n")
+            f.write("2024-01-01T00:00:00Z,200,50\n")
+            f.write("2024-01-01T00:00:10Z,400,150\n")
+
+        trace = read_trace(path)
+
+        assert trace.requests == 2
+        assert trace.prompt_tokens.mean == pytest.approx(300)
+        assert trace.duration_s == pytest.approx(10.0)
+
+    def test_resident_tokens_weighted_by_decode_time(self, tmp_path: Path):
+        """Test long outputs dominate the lengths held while decoding."""
+        path = write_jsonl(
+            tmp_path / "requests.jsonl",
+            [
+                {"prompt_tokens": 100, "gen_tokens": 10},
+                {"prompt_tokens": 100, "gen_tokens": 1000},
+            ],
+        )
+
+        trace = read_trace(path)
+
+        assert trace.context_tokens.mean == pytest.approx(605)
+        assert trace.resident_tokens.mean > 550
+        assert trace.resident_tokens.count == pytest.approx(1010)
+
+    def test_zero_lengths_are_kept(self, tmp_path: Path):
+        """Test records with zero output tokens count as requests, not skips."""
+        path = write_jsonl(
+            tmp_path / "requests.jsonl",
+            [
+                {"prompt_tokens": 1000, "gen_tokens": 0},
+                {"prompt_tokens": 500, "gen_tokens": 100},
+            ],
+        )
+
+        trace = read_trace(path)
+
+        assert (trace.requests, trace.skipped) == (2, 0)
+        assert trace.gen_tokens.min == 0
+        assert trace.prompt_tokens.mean == pytest.approx(750)
+
+    def test_no_usable_records(self, tmp_path: Path):
+        """Test a log without lengths is rejected."""
+        path = write_jsonl(tmp_path / "requests.jsonl", [{"prompt": "hello"}])
+
+        with pytest.raises(ValueError, match="No records"):
+            read_trace(path)
+
+    def test_missing_file(self, tmp_path: Path):
+        """Test a missing log raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            read_trace(tmp_path / "missing.jsonl")
+
+    def test_timestamp_units(self):
+        """Test seconds, milliseconds and ISO strings parse to seconds."""
+        assert parse_timestamp(1_700_000_000) == 1_700_000_000
+        assert parse_timestamp(1_700_000_000_500) == pytest.approx(1_700_000_000.5)
+        assert parse_timestamp("1970-01-01T00:01:00+00:00") == 60
+        assert parse_timestamp("yesterday") is None
+
+
+class TestConcurrentKVTokens:
+    """Tests for sizing KV from concurrent trace lengths."""
+
+    def test_heavy_tail_needs_less_than_worst_case(self, tmp_path: Path):
+        """Test a mostly-short trace needs far less than concurrency x max_model_len."""
+        records = [{"prompt_tokens": 500, "gen_tokens": 200}] * 99
+        records.append({"prompt_tokens": 30000, "gen_tokens": 2000})
+        trace = read_trace(write_jsonl(tmp_path / "requests.jsonl", records))
+
+        tokens = concurrent_kv_tokens(trace, concurrency=64, max_model_len=32768)
+
+        assert tokens < 64 * 32768 / 4
+        assert tokens >= 64 * 600
+
+    def test_capped_at_worst_case(self, tmp_path: Path):
+        """Test the estimate never exceeds every sequence at max_model_len."""
+        records = [{"prompt_tokens": 8000, "gen_tokens": 1000}] * 10
+        trace = read_trace(write_jsonl(tmp_path / "requests.jsonl", records))
+
+        assert concurrent_kv_tokens(trace, concurrency=4, max_model_len=4096) == 4 * 4096
+
+    def test_single_sequence_reaches_longest_request(self, tmp_path: Path):
+        """Test one sequence is sized for the longest request that fits."""
+        records = [{"prompt_tokens": 100, "gen_tokens": 10}] * 999
+        records.append({"prompt_tokens": 6000, "gen_tokens": 100})
+        trace = read_trace(write_jsonl(tmp_path / "requests.jsonl", records))
+
+        assert concurrent_kv_tokens(trace, concurrency=1, max_model_len=8192) >= 6100
+
+
+class TestTraceArrivals:
+    """Tests for replaying a trace in the simulator."""
+
+    def test_relative_monotonic_arrivals(self, tmp_path: Path):
+        """Test arrivals start at zero and never go backwards."""
+        path = write_jsonl(
+            tmp_path / "requests.jsonl",
+            [
+                {"timestamp": 50.0, "prompt_tokens": 10, "gen_tokens": 5},
+                {"timestamp": 52.0, "prompt_tokens": 20, "gen_tokens": 5},
+                {"timestamp": 51.0, "prompt_tokens": 30, "gen_tokens": 5},
+            ],
+        )
+
+        assert list(trace_arrivals(path)) == [(0.0, 10, 5), (2.0, 20, 5), (2.0, 30, 5)]
+
+    def test_zero_lengths_replay_one_token(self, tmp_path: Path):
+        """Test zero-length prompts and outputs replay as one token."""
+        path = write_jsonl(
+            tmp_path / "requests.jsonl",
+            [{"timestamp": 1.0, "prompt_tokens": 0, "gen_tokens": 0}],
+        )
+
+        assert list(trace_arrivals(path)) == [(0.0, 1, 1)]
+
+    def test_requires_timestamps(self, tmp_path: Path):
+        """Test replay fails on records without timestamps."""
+        path = write_jsonl(tmp_path / "requests.jsonl", [{"prompt_tokens": 10, "gen_tokens": 5}])
+
+        with pytest.raises(ValueError, match="timestamps"):
+            list(trace_arrivals(path))